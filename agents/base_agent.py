@@ -10,6 +10,7 @@ from pydantic import BaseModel
 import json
 import os
 from backend.services.llm_provider import get_langchain_chat_model
+from utils.tracing import current_span, span
 
 
 class BaseAgent:
@@ -40,7 +41,11 @@ class BaseAgent:
         additional_inputs: Dict[str, Any] = None
     ) -> tuple[CacheMeta, Optional[Any]]:
         """Check cache for existing result"""
-        return get_cache_meta(case_id, self.name, normalized_intent, case_summary, question_text, additional_inputs)
+        cache_meta, cached = get_cache_meta(case_id, self.name, normalized_intent, case_summary, question_text, additional_inputs)
+        active_span = current_span()
+        if active_span is not None:
+            active_span.set(cache_hit=cache_meta.cache_hit)
+        return cache_meta, cached
     
     def call_llm_with_schema(
         self,
@@ -54,7 +59,8 @@ class BaseAgent:
         """
         try:
             # Use structured output if available (LangChain supports this)
-            response = self.llm.invoke(prompt)
+            with span(f"llm.{self.name}", kind="llm") as llm_span:
+                response = self.llm.invoke(prompt)
             
             # Extract tokens from response metadata if available
             if hasattr(response, 'response_metadata') and response.response_metadata:
@@ -65,6 +71,8 @@ class BaseAgent:
                 # Fallback estimation
                 input_tokens = int(len(prompt.split()) * 1.3)
                 output_tokens = int(len(response.content.split()) * 1.3)
+            if llm_span is not None:
+                llm_span.set(tokens=int(input_tokens) + int(output_tokens))
             
             # Try to parse as JSON first
             try:
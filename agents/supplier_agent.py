@@ -19,11 +19,15 @@ PHASE 3: ExecutionConstraints Integration
 """
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from utils.schemas import SupplierShortlist, CaseSummary
-from utils.data_loader import get_suppliers_by_category, get_performance, get_market_data, get_category, get_requirements
+from utils.data_loader import get_suppliers_by_category, load_json_data, get_market_data, get_category, get_requirements
 from utils.rules import RuleEngine
 from utils.knowledge_layer import get_vector_context
+from utils.supplier_scoring import (
+    DEFAULT_CRITERIA, SupplierScoringEngine, clip_scores, priority_weight_scenarios
+)
 from agents.base_agent import BaseAgent
 import json
+import numpy as np
 
 if TYPE_CHECKING:
     from utils.execution_constraints import ExecutionConstraints
@@ -103,14 +107,14 @@ class SupplierEvaluationAgent(BaseAgent):
         category = get_category(case_summary.category_id)
         requirements = get_requirements(case_summary.category_id)
         
-        # Get performance for each supplier (with full details)
-        suppliers_with_perf = []
-        for supplier in suppliers:
-            perf = get_performance(supplier["supplier_id"])
-            suppliers_with_perf.append({
-                "supplier": supplier,
-                "performance": perf
-            })
+        # Get performance for each supplier (with full details), reading performance.json once
+        performance_by_supplier = {}
+        for perf in load_json_data("performance.json"):
+            performance_by_supplier.setdefault(perf["supplier_id"], perf)
+        suppliers_with_perf = [
+            {"supplier": supplier, "performance": performance_by_supplier.get(supplier["supplier_id"])}
+            for supplier in suppliers
+        ]
         
         # STEP 1: Apply deterministic eligibility checks (Table 3: rule-based eligibility checks)
         # Filter suppliers using RuleEngine eligibility rules (must-haves only)
@@ -123,6 +127,7 @@ class SupplierEvaluationAgent(BaseAgent):
                 force_include_all = True
         
         eligible_suppliers = []
+        eligibility_mask = []
         for supplier_data in suppliers_with_perf:
             supplier = supplier_data["supplier"]
             performance = supplier_data["performance"]
@@ -134,9 +139,11 @@ class SupplierEvaluationAgent(BaseAgent):
             
             if not force_include_all and rule_score is not None and rule_score == 0.0:
                 # Failed eligibility check (below threshold or missing must-haves) - exclude
+                eligibility_mask.append(False)
                 continue
             else:
                 # Passed eligibility or requires scoring - include for LLM evaluation
+                eligibility_mask.append(True)
                 eligible_suppliers.append(supplier_data)
         
         # If no eligible suppliers after deterministic filtering, return empty shortlist
@@ -159,26 +166,34 @@ class SupplierEvaluationAgent(BaseAgent):
         
         # STEP 2: Normalize performance data (Table 3: ML performance normalization)
         # For POC, we do simple normalization here. In production, this would use ML models.
-        normalized_suppliers = []
-        for supplier_data in eligible_suppliers:
-            supplier = supplier_data["supplier"]
-            performance = supplier_data["performance"]
-            
-            # Simple normalization: scale performance score to 0-10 range
-            perf_score = performance.get("overall_score", 5.0) if performance else 5.0
-            normalized_score = min(10.0, max(0.0, perf_score))  # Already in 0-10 range in data
-            
-            normalized_suppliers.append({
-                "supplier": supplier,
-                "performance": performance,
-                "normalized_score": normalized_score
-            })
+        # Scale performance scores to 0-10 for the whole panel at once (already 0-10 in data)
+        normalized_scores = clip_scores([
+            (d["performance"] or {}).get("overall_score", 5.0) for d in eligible_suppliers
+        ])
+        normalized_suppliers = [
+            {
+                "supplier": supplier_data["supplier"],
+                "performance": supplier_data["performance"],
+                "normalized_score": float(score)
+            }
+            for supplier_data, score in zip(eligible_suppliers, normalized_scores)
+        ]
         
         # PHASE 3: Build execution constraints injection
         constraints_injection = ""
         if execution_constraints and hasattr(execution_constraints, 'get_prompt_injection'):
             constraints_injection = execution_constraints.get_prompt_injection()
         
+        # Ranking stability of the eligible panel when the user's priority criteria weigh more
+        weight_sensitivity = self._weight_sensitivity(
+            suppliers_with_perf, eligibility_mask, getattr(execution_constraints, "priority_criteria", [])
+        )
+        sensitivity_section = (
+            f"\nRanking Sensitivity to Priority Criteria (deterministic weight what-ifs):\n"
+            f"{json.dumps(weight_sensitivity['suppliers'], indent=2)}\n"
+            if weight_sensitivity else ""
+        )
+        
         # Build prompt aligned with Table 3: LLM reasons to explain differences, summarize risks, structure comparisons
         # IMPORTANT: Does NOT select winners - that's a human decision
         prompt = f"""You are a Supplier Scoring Agent for dynamic sourcing pipelines (DTP-02/03).
@@ -206,7 +221,7 @@ Category Information:
 
 Category Requirements (Human-defined evaluation criteria):
 {json.dumps(requirements, indent=2) if requirements else "No requirements data"}
-
+{sensitivity_section}
 Your task:
 1. Score each eligible supplier based on performance data and category requirements
 2. Structure comparisons to highlight differences
@@ -250,6 +265,8 @@ Provide ONLY valid JSON, no markdown formatting."""
             "requirements": requirements,
             "deterministic_filtering_applied": True
         }
+        if weight_sensitivity:
+            llm_input_payload["weight_sensitivity"] = weight_sensitivity
         
         try:
             shortlist, output_dict, input_tokens, output_tokens = self.call_llm_with_schema(
@@ -332,6 +349,38 @@ Provide ONLY valid JSON, no markdown formatting."""
             # DO NOT cache fallback/error results - they should be retried
             return fallback, llm_input_payload, {}, 0, 0
     
+    @staticmethod
+    def _weight_sensitivity(
+        suppliers_with_perf: List[Dict[str, Any]],
+        eligibility_mask: List[bool],
+        priority_criteria: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Re-rank the panel under the default criteria weights and one what-if per priority
+        criterion. Suppliers that failed the rule-based eligibility checks are masked out.
+        """
+        scenarios = priority_weight_scenarios(DEFAULT_CRITERIA, priority_criteria or [])
+        if not scenarios:
+            return None
+        performance = []
+        for d in suppliers_with_perf:
+            perf = d["performance"] or {}
+            metrics = perf.get("metrics", {})
+            cost_variance = perf.get("cost_variance")
+            performance.append({
+                "supplier_id": d["supplier"]["supplier_id"],
+                "supplier_name": d["supplier"].get("name", d["supplier"]["supplier_id"]),
+                "quality_score": metrics.get("quality"),
+                "delivery_score": metrics.get("delivery"),
+                "responsiveness_score": metrics.get("responsiveness"),
+                "cost_variance": (
+                    cost_variance.get("variance_percent") if isinstance(cost_variance, dict) else cost_variance
+                ),
+            })
+        engine = SupplierScoringEngine.from_performance(performance)
+        engine.eligible = np.array(eligibility_mask, dtype=bool)
+        return engine.sensitivity(scenarios)
+    
     def create_fallback_output(self, schema: type, case_id: str, category_id: str, error_msg: str = "") -> SupplierShortlist:
         """Fallback output when LLM fails (deprecated - use inline fallback in except block)"""
         return SupplierShortlist(
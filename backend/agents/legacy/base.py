@@ -13,6 +13,7 @@ from pydantic import BaseModel
 from backend.rag.retriever import get_retriever
 from backend.services.llm_provider import get_langchain_chat_model
 from shared.schemas import ExecutionMetadata, TaskExecutionDetail
+from utils.tracing import metadata_fields
 
 
 class BaseAgent(ABC):
@@ -298,7 +299,8 @@ class BaseAgent(ABC):
             cache_hits=metadata["cache_hits"],
             total_tasks=metadata["total_tasks"],
             completed_tasks=metadata["completed_tasks"],
-            model_used=metadata["model_used"]
+            model_used=metadata["model_used"],
+            **metadata_fields(),
         )
 
 
@@ -113,14 +113,19 @@ class SupplierScoringAgent(BaseAgent):
         ineligible = context.get("ineligible_suppliers", [])
         all_suppliers = eligible + ineligible
         
+        scorecard_content = {
+            "suppliers": all_suppliers,
+            "eligible_count": len(eligible),
+            "ineligible_count": len(ineligible),
+        }
+        if context.get("sensitivity"):
+            # Ranking stability under the case's weight what-ifs
+            scorecard_content["sensitivity"] = context["sensitivity"]
+        
         supplier_scorecard = (
             ArtifactBuilder(ArtifactType.SUPPLIER_SCORECARD, AgentName.SUPPLIER_SCORING)
             .with_title("Supplier Scorecard")
-            .with_content({
-                "suppliers": all_suppliers,
-                "eligible_count": len(eligible),
-                "ineligible_count": len(ineligible),
-            })
+            .with_content(scorecard_content)
             .with_content_text(
                 f"Evaluated {len(all_suppliers)} suppliers. "
                 f"{len(eligible)} eligible, {len(ineligible)} ineligible."
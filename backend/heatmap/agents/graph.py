@@ -18,6 +18,7 @@ from backend.heatmap.agents.contract_agent import process_contract
 from backend.heatmap.agents.strategy_agent import process_strategy
 from backend.heatmap.agents.risk_agent import process_risk
 from backend.heatmap.agents.supervisor_agent import process_supervisor
+from utils.tracing import traced_node
 
 
 def should_continue(state: HeatmapState) -> str:
@@ -38,12 +39,12 @@ def tick_index(state: HeatmapState) -> dict:
 builder = StateGraph(HeatmapState)
 
 # Register nodes
-builder.add_node("spend_agent", process_spend)
-builder.add_node("contract_agent", process_contract)
-builder.add_node("strategy_agent", process_strategy)
-builder.add_node("risk_agent", process_risk)
-builder.add_node("supervisor", process_supervisor)
-builder.add_node("tick", tick_index)
+builder.add_node("spend_agent", traced_node("heatmap", "spend_agent", process_spend))
+builder.add_node("contract_agent", traced_node("heatmap", "contract_agent", process_contract))
+builder.add_node("strategy_agent", traced_node("heatmap", "strategy_agent", process_strategy))
+builder.add_node("risk_agent", traced_node("heatmap", "risk_agent", process_risk))
+builder.add_node("supervisor", traced_node("heatmap", "supervisor", process_supervisor))
+builder.add_node("tick", traced_node("heatmap", "tick", tick_index))
 
 # Define sequential chain per opportunity:
 # spend → contract → strategy → risk → supervisor → tick → (loop or end)
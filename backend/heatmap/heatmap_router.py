@@ -1,4 +1,4 @@
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Response, UploadFile
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Any, Dict
 from datetime import datetime, timezone
@@ -13,6 +13,7 @@ from backend.heatmap.services.feedback_service import get_feedback_service
 from backend.heatmap.services.case_bridge import get_case_bridge_service
 from backend.heatmap.run_pipeline_init import run_init
 from backend.infrastructure.storage_providers import get_heatmap_db
+from utils.metrics import PIPELINE_RUN_SECONDS
 from backend.heatmap.persistence.heatmap_models import (
     Opportunity,
     ReviewFeedback,
@@ -20,7 +21,9 @@ from backend.heatmap.persistence.heatmap_models import (
     HeatmapProcuraBotFeedback,
     ScoringConfigVersion,
 )
+from backend.services.conditional_get import make_etag, not_modified, table_revisions
 from backend.heatmap.context_builder import (
+    CATEGORY_CARDS_PATH,
     load_category_cards,
     category_cards_fingerprint,
     iter_category_card_names,
@@ -36,7 +39,12 @@ from backend.heatmap.services.heatmap_copilot import (
 from backend.heatmap.services.category_cards_store import apply_category_cards_patch
 from backend.heatmap.category_scoring_mix import apply_category_scoring_overlay
 from backend.heatmap.scoring_framework import eus_from_months_to_expiry, ius_from_implementation_months
-from backend.heatmap.services.learned_weights import load_learned_weights, normalize_full, recompute_total_and_tier
+from backend.heatmap.services.learned_weights import (
+    load_learned_weights,
+    normalize_full,
+    recompute_total_and_tier,
+    refresh_opportunity_scores,
+)
 from backend.heatmap.services.scoring_config_registry import (
     ensure_default_scoring_config,
     extract_weight_overrides,
@@ -306,6 +314,9 @@ def _start_heatmap_pipeline_background() -> Dict[str, Any]:
             _pipeline_status["running"] = False
             _pipeline_status["last_finished_at"] = time.time()
             _pipeline_lock.release()
+            PIPELINE_RUN_SECONDS.observe(
+                time.time() - t0, pipeline="heatmap", outcome="ok" if _pipeline_status["last_success"] else "error"
+            )
 
     threading.Thread(target=_run_job, daemon=True).start()
     return {
@@ -316,6 +327,61 @@ def _start_heatmap_pipeline_background() -> Dict[str, Any]:
     }
 
 
+def _start_opportunity_refresh_background(opportunity_ids: List[int]) -> Dict[str, Any]:
+    """
+    Re-score only the given opportunities in a background thread (used after System 1 approvals).
+    Shares the pipeline lock/status with the batch run so /run-status reflects it.
+    """
+    ids = [int(i) for i in opportunity_ids or []]
+    if not ids:
+        return {"success": False, "queued": False, "running": False, "message": "No opportunities to refresh."}
+
+    started = _pipeline_lock.acquire(blocking=False)
+    if not started:
+        return {
+            "success": True,
+            "queued": False,
+            "running": True,
+            "message": "Pipeline lock busy. Approved rows keep their upload-time scores.",
+        }
+
+    def _run_job():
+        t0 = time.time()
+        try:
+            _pipeline_status["running"] = True
+            _pipeline_status["last_started_at"] = t0
+            _pipeline_status["last_error"] = None
+            session = heatmap_db.get_db_session()
+            try:
+                refresh_opportunity_scores(session, ids)
+                session.commit()
+                _pipeline_status["opportunity_count"] = int(
+                    session.exec(select(func.count(Opportunity.id))).one() or 0
+                )
+            finally:
+                session.close()
+            _pipeline_status["last_duration_sec"] = round(time.time() - t0, 3)
+            _pipeline_status["last_success"] = True
+        except Exception as e:
+            _pipeline_status["last_success"] = False
+            _pipeline_status["last_error"] = str(e)
+        finally:
+            _pipeline_status["running"] = False
+            _pipeline_status["last_finished_at"] = time.time()
+            _pipeline_lock.release()
+            PIPELINE_RUN_SECONDS.observe(
+                time.time() - t0, pipeline="opportunity_refresh", outcome="ok" if _pipeline_status["last_success"] else "error"
+            )
+
+    threading.Thread(target=_run_job, daemon=True).start()
+    return {
+        "success": True,
+        "queued": True,
+        "running": True,
+        "message": f"Scoring refresh started for {len(ids)} opportunities.",
+    }
+
+
 @heatmap_router.post("/qa", response_model=HeatmapQAResponse)
 def heatmap_qa(req: HeatmapQARequest):
     session = heatmap_db.get_db_session()
@@ -547,9 +613,10 @@ def _months_until(dt: Optional[datetime], now: datetime) -> Optional[float]:
     return max(0.0, (t - now).total_seconds() / (86400.0 * 30.4375))
 
 
-def _refresh_time_dependent_scores(session, opps: List[Opportunity]) -> None:
+def _refresh_time_dependent_scores(session, opps: List[Opportunity]) -> bool:
+    """Recompute date-driven EUS/IUS and totals; returns True when rows were updated."""
     if not opps:
-        return
+        return False
     cards = load_category_cards()
     global_weights = normalize_full(load_learned_weights(session))
     now = datetime.now(timezone.utc)
@@ -592,10 +659,38 @@ def _refresh_time_dependent_scores(session, opps: List[Opportunity]) -> None:
         session.add(o)
     if changed:
         session.commit()
+    return changed
+
+
+# Time-dependent EUS/IUS refresh and pending ages move slowly; ETags roll over on this bucket.
+_TIME_BUCKET_SEC = 900
+
+
+def _cards_stamp() -> Optional[List[int]]:
+    try:
+        st = CATEGORY_CARDS_PATH.stat()
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def _opportunities_etag(session, enrich: bool, include_not_pursuing: bool) -> str:
+    return make_etag(
+        "opportunities",
+        table_revisions(session, ["opportunity", "reviewfeedback", "auditlog", "heatmaplearnedweights"]),
+        _cards_stamp(),
+        int(time.time() // _TIME_BUCKET_SEC),
+        _pipeline_status.get("last_duration_sec"),
+        _pipeline_status.get("opportunity_count"),
+        enrich,
+        include_not_pursuing,
+    )
 
 
 @heatmap_router.get("/opportunities")
 def list_opportunities(
+    request: Request,
+    response: Response,
     enrich: bool = Query(
         True,
         description="Include data_quality_warnings and kli_metrics (feedback-derived).",
@@ -607,13 +702,18 @@ def list_opportunities(
 ):
     session = heatmap_db.get_db_session()
     try:
+        cached = not_modified(request, response, _opportunities_etag(session, enrich, include_not_pursuing))
+        if cached is not None:
+            return cached
         statement = select(Opportunity)
         if not include_not_pursuing:
             statement = statement.where(
                 Opportunity.disposition.not_in(["not_pursuing", "supplier_exit_planned"])
             )
         results = session.exec(statement).all()
-        _refresh_time_dependent_scores(session, results)
+        if _refresh_time_dependent_scores(session, results):
+            # The refresh bumped the opportunity revision; hand out the post-refresh tag.
+            response.headers["ETag"] = _opportunities_etag(session, enrich, include_not_pursuing)
         cards = load_category_cards()
         cat_keys = iter_category_card_names(cards)
         fb_counts = _feedback_counts_by_opportunity(session) if enrich else {}
@@ -657,28 +757,50 @@ def list_opportunities(
 
 
 @heatmap_router.get("/metrics/dashboard")
-def heatmap_dashboard_metrics():
-    """Aggregates for heatmap KPI rollups (feedback + pipeline audit + tier counts)."""
-    session = heatmap_db.get_db_session()
+def heatmap_dashboard_metrics(request: Request, response: Response):
+    """
+    Aggregates for heatmap KPI rollups (feedback + pipeline audit + tier counts).
+    The ETag is the KPI snapshot id: table revisions + pipeline status + age bucket.
+    """
+    session = heatmap_db.get_read_session()
     try:
-        opps = session.exec(select(Opportunity)).all()
+        etag = make_etag(
+            "dashboard",
+            table_revisions(session, ["opportunity", "reviewfeedback", "auditlog", "heatmapprocurabotfeedback"]),
+            int(time.time() // _TIME_BUCKET_SEC),
+            _pipeline_status,
+        )
+        cached = not_modified(request, response, etag)
+        if cached is not None:
+            return cached
         fb_raw = session.exec(select(func.count(ReviewFeedback.id))).one()
         fb_total = int(fb_raw[0] if isinstance(fb_raw, (tuple, list)) else fb_raw)
+        # Aggregated in SQL off ix_opportunity_status_tier (see query_plans.HOT_QUERIES).
         tier_counts: Dict[str, int] = {}
         pending = 0
         approved = 0
+        n_opp = 0
+        for status, tier, n in session.exec(
+            select(Opportunity.status, Opportunity.tier, func.count()).group_by(
+                Opportunity.status, Opportunity.tier
+            )
+        ).all():
+            n = int(n)
+            n_opp += n
+            tier_counts[tier] = tier_counts.get(tier, 0) + n
+            if status == "Pending":
+                pending += n
+            elif status == "Approved":
+                approved += n
         ages: List[float] = []
-        for o in opps:
-            tier_counts[o.tier] = tier_counts.get(o.tier, 0) + 1
-            if o.status == "Pending":
-                pending += 1
-            elif o.status == "Approved":
-                approved += 1
-            if o.record_created_at and o.status == "Pending":
-                t = o.record_created_at
-                if t.tzinfo is None:
-                    t = t.replace(tzinfo=timezone.utc)
-                ages.append((datetime.now(timezone.utc) - t).total_seconds() / 86400.0)
+        for t in session.exec(
+            select(Opportunity.record_created_at).where(Opportunity.status == "Pending")
+        ).all():
+            if not t:
+                continue
+            if t.tzinfo is None:
+                t = t.replace(tzinfo=timezone.utc)
+            ages.append((datetime.now(timezone.utc) - t).total_seconds() / 86400.0)
 
         median_age = None
         if ages:
@@ -714,7 +836,6 @@ def heatmap_dashboard_metrics():
         qa_up = int(qa_vote_counts.get("up", 0))
         qa_signal_attr_accuracy = (qa_up / qa_total * 100.0) if qa_total else None
 
-        n_opp = len(opps)
         avg_fb = (fb_total / n_opp) if n_opp else 0.0
 
         return {
@@ -751,7 +872,7 @@ def heatmap_feedback_history(
     Per-opportunity feedback history for the heatmap review modal.
     Returned in reverse chronological order (most recent first).
     """
-    session = heatmap_db.get_db_session()
+    session = heatmap_db.get_read_session()
     try:
         stmt = (
             select(ReviewFeedback)
@@ -825,7 +946,7 @@ def heatmap_scoring_weights_get():
         normalize_full,
     )
 
-    session = heatmap_db.get_db_session()
+    session = heatmap_db.get_read_session()
     try:
         w = normalize_full(load_learned_weights(session))
         return ScoringWeightsResponse(weights=w, defaults=dict(DEFAULT_WEIGHTS_FLAT))
@@ -1,9 +1,10 @@
 import os
 import tempfile
 from pathlib import Path
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import SQLModel, Session
 from typing import Generator
 from backend.persistence.db_interface import DatabaseInterface
+from backend.persistence.sqlite_engine import create_sqlite_engine
 
 
 def _get_heatmap_db_path() -> Path:
@@ -22,19 +23,24 @@ DB_PATH = _get_heatmap_db_path()
 DB_URL = f"sqlite:///{DB_PATH}"
 
 _engine = None
+_read_engine = None
 
 def get_engine():
     global _engine
     if _engine is None:
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _engine = create_engine(
-            DB_URL,
-            echo=False,
-            connect_args={"check_same_thread": False}
-        )
+        _engine = create_sqlite_engine(DB_PATH)
     return _engine
 
 
+def get_read_engine():
+    global _read_engine
+    if _read_engine is None:
+        get_engine()
+        _read_engine = create_sqlite_engine(DB_PATH, read_only=True)
+    return _read_engine
+
+
 class HeatmapDatabase(DatabaseInterface):
     """
     SQLite implementation for the specific Heatmap database containing opportunities and feedback.
@@ -51,11 +57,70 @@ class HeatmapDatabase(DatabaseInterface):
             HeatmapLearnedWeights,
             HeatmapProcuraBotFeedback,
             ScoringConfigVersion,
+            System1UploadJob,
+            OpportunityContextCache,
         )
         from sqlalchemy import text
         engine = get_engine()
         SQLModel.metadata.create_all(engine)
         self._migrate_opportunity_columns(engine)
+        self._ensure_opportunity_search_index(engine)
+        from backend.persistence.migrations import HEATMAP_MIGRATIONS, apply_migrations
+
+        apply_migrations(engine, HEATMAP_MIGRATIONS)
+
+    def _ensure_opportunity_search_index(self, engine) -> None:
+        """
+        FTS5 index over opportunity text fields, kept in sync by triggers. Any update/delete of
+        an opportunity also drops its cached copilot context block.
+        """
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        cols = "supplier_name, contract_id, request_id, request_title, category, subcategory"
+        new_vals = ", ".join(f"new.{c.strip()}" for c in cols.split(","))
+        old_vals = ", ".join(f"old.{c.strip()}" for c in cols.split(","))
+        with engine.connect() as conn:
+            existed = conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name='opportunity_fts'")
+            ).fetchone()
+            try:
+                conn.execute(
+                    text(
+                        f"CREATE VIRTUAL TABLE IF NOT EXISTS opportunity_fts USING fts5({cols}, "
+                        "content='opportunity', content_rowid='id')"
+                    )
+                )
+            except OperationalError:
+                # SQLite built without FTS5: copilot falls back to scanning rows.
+                return
+            conn.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS opportunity_fts_ai AFTER INSERT ON opportunity BEGIN "
+                    f"INSERT INTO opportunity_fts(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS opportunity_fts_ad AFTER DELETE ON opportunity BEGIN "
+                    f"INSERT INTO opportunity_fts(opportunity_fts, rowid, {cols}) "
+                    f"VALUES ('delete', old.id, {old_vals}); "
+                    "DELETE FROM opportunitycontextcache WHERE opportunity_id = old.id; END"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS opportunity_fts_au AFTER UPDATE ON opportunity BEGIN "
+                    f"INSERT INTO opportunity_fts(opportunity_fts, rowid, {cols}) "
+                    f"VALUES ('delete', old.id, {old_vals}); "
+                    f"INSERT INTO opportunity_fts(rowid, {cols}) VALUES (new.id, {new_vals}); "
+                    "DELETE FROM opportunitycontextcache WHERE opportunity_id = old.id; END"
+                )
+            )
+            if not existed:
+                conn.execute(text("INSERT INTO opportunity_fts(opportunity_fts) VALUES ('rebuild')"))
+                conn.execute(text("DELETE FROM opportunitycontextcache"))
+            conn.commit()
 
     def _migrate_opportunity_columns(self, engine) -> None:
         """SQLite: add newer Opportunity columns without Alembic."""
@@ -122,6 +187,9 @@ class HeatmapDatabase(DatabaseInterface):
         engine = get_engine()
         return Session(engine)
 
+    def get_read_session(self) -> Session:
+        return Session(get_read_engine())
+
 heatmap_db = HeatmapDatabase()
 
 # Initialize on import
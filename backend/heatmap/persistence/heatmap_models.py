@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import LargeBinary
 from uuid import uuid4
 
 
@@ -132,3 +133,28 @@ class ScoringConfigVersion(SQLModel, table=True):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     published_at: Optional[datetime] = Field(default=None)
+
+
+class System1UploadJob(SQLModel, table=True):
+    """Staged System 1 upload preview; candidates are stored column-major and zlib-compressed."""
+    job_id: str = Field(primary_key=True)
+    status: str = Field(default="preview_ready", index=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+    expires_at: datetime = Field(index=True)
+    total_candidates: int = Field(default=0)
+    valid_candidates: int = Field(default=0)
+    approved_count: int = Field(default=0)
+    warning_rows_count: int = Field(default=0)
+    run_triggered: bool = Field(default=False)
+    created_opportunity_ids_json: str = Field(default="[]")
+    parsing_notes_json: str = Field(default="[]")
+    analysis_json: str = Field(default="{}")
+    uploaded_files_json: str = Field(default="[]")
+    candidates_blob: bytes = Field(default=b"", sa_column=Column(LargeBinary, nullable=False))
+
+
+class OpportunityContextCache(SQLModel, table=True):
+    """Formatted copilot provenance block per opportunity; dropped by a trigger on any row update."""
+    opportunity_id: int = Field(primary_key=True)
+    built_on: str = Field(default="")  # UTC date; blocks include days-to-expiry
+    detail_text: str = Field(default="")
@@ -1,12 +1,23 @@
 import os
 import json
+import logging
 import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import chromadb
 from chromadb.config import Settings
+from backend.rag.embedding_cache import cached_embeddings
+from backend.rag.embedding_models import (
+    check_collection_model,
+    embedding_model_name,
+    recover_interrupted_reembed,
+    reembed_collection,
+)
 from backend.rag.vector_store_interface import VectorStoreInterface
 from backend.services.llm_provider import get_langchain_embeddings
+from utils.metrics import VECTOR_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
 
 
 def _get_chroma_path() -> Path:
@@ -40,6 +51,7 @@ class HeatmapVectorStore(VectorStoreInterface):
             )
         )
         
+        recover_interrupted_reembed(self.client, COLLECTION_NAME)
         self.collection = self.client.get_or_create_collection(
             name=COLLECTION_NAME,
             metadata={"description": "Feedback and knowledge for the Heatmap agentic loops"}
@@ -47,12 +59,20 @@ class HeatmapVectorStore(VectorStoreInterface):
         
         self._embedding_fn = None
         try:
-            self._embedding_fn = get_langchain_embeddings(
+            # Query/chunk vectors are cached by (model, text); see backend.rag.embedding_cache
+            self._embedding_fn = cached_embeddings(get_langchain_embeddings(
                 default_model="text-embedding-3-small",
                 deployment_env="AZURE_OPENAI_EMBEDDING_DEPLOYMENT",
-            )
-        except Exception:
+            ))
+        except Exception as e:
+            logger.error("Embedding backend unavailable, using Chroma's built-in embedder: %s", e)
             self._embedding_fn = None
+        
+        # Vectors from different models must not share a collection
+        self.embedding_model = embedding_model_name(self._embedding_fn)
+        self._model_mismatch = check_collection_model(self.collection, self._embedding_fn)
+        if self._model_mismatch:
+            logger.error(self._model_mismatch)
     
     def add_chunks(self, chunks: List[str], document_id: str, metadata: Dict[str, Any]) -> List[str]:
         if not chunks:
@@ -81,11 +101,10 @@ class HeatmapVectorStore(VectorStoreInterface):
             
             metadatas.append(chunk_meta)
         
+        self._ensure_model()
         if self._embedding_fn:
-            try:
-                embeddings = self._embedding_fn.embed_documents(documents)
-            except Exception:
-                pass
+            # No fallback to Chroma's embedder on failure: that would mix vector spaces
+            embeddings = self._embedding_fn.embed_documents(documents)
                 
         if embeddings:
             self.collection.add(ids=chunk_ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
@@ -95,12 +114,10 @@ class HeatmapVectorStore(VectorStoreInterface):
         return chunk_ids
     
     def search(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None, where_document: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._ensure_model()
         query_embedding = None
         if self._embedding_fn:
-            try:
-                query_embedding = self._embedding_fn.embed_query(query)
-            except Exception:
-                pass
+            query_embedding = self._embedding_fn.embed_query(query)
                 
         kwargs = {"n_results": n_results}
         
@@ -114,7 +131,8 @@ class HeatmapVectorStore(VectorStoreInterface):
         if where_document:
             kwargs["where_document"] = where_document
             
-        return self.collection.query(**kwargs)
+        with VECTOR_QUERY_SECONDS.time(store="heatmap"):
+            return self.collection.query(**kwargs)
     
     def delete_document(self, document_id: str) -> int:
         results = self.collection.get(where={"document_id": document_id})
@@ -125,6 +143,16 @@ class HeatmapVectorStore(VectorStoreInterface):
         
     def count(self) -> int:
         return self.collection.count()
+    
+    def _ensure_model(self) -> None:
+        if self._model_mismatch:
+            raise RuntimeError(self._model_mismatch)
+    
+    def reembed(self, batch_size: int = 64) -> int:
+        """Rebuild the collection with the configured embedding model; returns chunk count."""
+        self.collection = reembed_collection(self.client, self.collection, self._embedding_fn, batch_size)
+        self._model_mismatch = None
+        return self.collection.count()
 
 
 _heatmap_vector_store = None
@@ -25,15 +25,15 @@ from backend.heatmap.services.pipeline_score_provenance import (
     build_langgraph_batch_provenance,
     parse_contract_end_datetime,
 )
+from utils.tracing import trace_request
 
 
-def run_init():
-    print("Generating CSVs to:", DATA_DIR)
-    generate_supplier_metrics()
-    generate_contracts()
-    generate_spend()
-
-    print("Reading CSVs to build initial LangGraph state matrix...")
+def build_initial_state():
+    """
+    Read the synthetic CSVs in DATA_DIR into the heatmap graph's initial state.
+    Returns (initial_state, new_estimates, timeline_choices); the last two map the
+    synthetic new-request rows back to their spend / timeline when persisting.
+    """
 
     category_cards = load_category_cards()
     supplier_metrics = load_supplier_metrics_map()
@@ -95,9 +95,6 @@ def run_init():
     heatmap_context["category_cards"] = category_cards
     heatmap_context["fis_contract_value_field"] = fis_key
 
-    print(f"Loaded {len(contracts)} opportunities. Executing Multi-Agent Pipeline...")
-    t_pipeline = time.time()
-
     with Session(get_engine()) as _w_sess:
         merged_w = weights_for_supervisor_state(load_learned_weights(_w_sess))
 
@@ -112,8 +109,23 @@ def run_init():
         "weights": merged_w,
         "heatmap_context": heatmap_context,
     }
+    return initial_state, new_estimates, timeline_choices
+
+
+def run_init():
+    print("Generating CSVs to:", DATA_DIR)
+    generate_supplier_metrics()
+    generate_contracts()
+    generate_spend()
+
+    print("Reading CSVs to build initial LangGraph state matrix...")
+    initial_state, new_estimates, timeline_choices = build_initial_state()
+
+    print(f"Loaded {len(initial_state['contracts'])} opportunities. Executing Multi-Agent Pipeline...")
+    t_pipeline = time.time()
 
-    final_state = heatmap_graph.invoke(initial_state, config={"recursion_limit": 1000})
+    with trace_request("heatmap.run_pipeline", opportunities=len(initial_state["contracts"])):
+        final_state = heatmap_graph.invoke(initial_state, config={"recursion_limit": 1000})
 
     print("Engine finished. Committing to SQLite database...")
     heatmap_db.init_db()
@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
@@ -14,6 +15,8 @@ from backend.heatmap.services.learned_weights import (
     update_weights_from_feedback,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class FeedbackService:
     """
@@ -156,7 +159,11 @@ class FeedbackService:
                 f"Detail: {comment or 'No additional comment.'}"
             )
             doc_id = f"feedback_{feedback.id or uuid4().hex}"
-            vs.add_chunks([chunk_text], doc_id, metadata)
+            try:
+                vs.add_chunks([chunk_text], doc_id, metadata)
+            except Exception as e:
+                # Feedback is already committed; review memory is best-effort.
+                logger.warning("Feedback %s not added to review memory: %s", doc_id, e)
 
             return True, out_snap
         finally:
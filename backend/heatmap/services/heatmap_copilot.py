@@ -10,12 +10,13 @@ import re
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
 from backend.heatmap.context_builder import load_category_cards
 from backend.heatmap.persistence.heatmap_models import Opportunity, ReviewFeedback
 from backend.infrastructure.storage_providers import get_heatmap_vector_store
 from backend.heatmap.services.feedback_memory import _parse_chroma_results
+from backend.heatmap.services.opportunity_search import cached_provenance_details, search_opportunity_ids
 from backend.services.llm_provider import get_openai_client, resolve_chat_model
 
 MAX_OPPS_IN_CONTEXT = 80
@@ -298,13 +299,52 @@ def _row_match_blob(o: Opportunity) -> str:
     ).lower()
 
 
+def _targeted_by_scan(session: Session, query_terms: List[str], top_ids: set) -> List[Opportunity]:
+    """Substring fallback when the FTS index is unavailable (non-SQLite heatmap DB)."""
+    targeted: List[Opportunity] = []
+    for o in session.exec(select(Opportunity).order_by(Opportunity.total_score.desc())):
+        if int(o.id or -1) in top_ids:
+            continue
+        blob = _row_match_blob(o)
+        if any(t in blob for t in query_terms):
+            targeted.append(o)
+        if len(targeted) >= MAX_TARGETED_OPPS_IN_CONTEXT:
+            break
+    return targeted
+
+
+def _targeted_opportunities(session: Session, query_terms: List[str], top_ids: set) -> List[Opportunity]:
+    ids = search_opportunity_ids(
+        session, query_terms, limit=MAX_TARGETED_OPPS_IN_CONTEXT, exclude_ids=top_ids
+    )
+    if ids is None:
+        return _targeted_by_scan(session, query_terms, top_ids)
+    if not ids:
+        return []
+    by_id = {int(o.id): o for o in session.exec(select(Opportunity).where(Opportunity.id.in_(ids))).all()}
+    return [by_id[i] for i in ids if i in by_id]
+
+
 def build_opportunities_context(session: Session, question: str = "") -> str:
-    stmt = select(Opportunity).order_by(Opportunity.total_score.desc())
-    rows = session.exec(stmt).all()
-    if not rows:
+    total_rows = int(session.exec(select(func.count()).select_from(Opportunity)).one())
+    if not total_rows:
         return "(No opportunities in database.)"
 
-    top_rows = rows[:MAX_OPPS_IN_CONTEXT]
+    top_rows = list(
+        session.exec(
+            select(Opportunity).order_by(Opportunity.total_score.desc()).limit(MAX_OPPS_IN_CONTEXT)
+        ).all()
+    )
+    query_terms = _extract_query_terms(question)
+    targeted: List[Opportunity] = []
+    if query_terms:
+        targeted = _targeted_opportunities(session, query_terms, {int(o.id or -1) for o in top_rows})
+
+    summary = {id(o): _format_opportunity_line(o) for o in [*top_rows, *targeted]}
+    detail_rows = [*top_rows[:PROVENANCE_DETAIL_LIMIT], *targeted[:PROVENANCE_TARGETED_DETAIL_LIMIT]]
+    details = cached_provenance_details(session, detail_rows, _format_opportunity_provenance_detail)
+    detail_by_obj = {id(o): details.get(int(o.id or -1), "") for o in detail_rows}
+
     lines: List[str] = [
         "Format: each row starts with a compact `id=...` summary. "
         f"For the top {PROVENANCE_DETAIL_LIMIT} rows (and targeted matches), a following "
@@ -312,37 +352,21 @@ def build_opportunities_context(session: Session, question: str = "") -> str:
         "evidence_refs, rationale) plus scoring_inputs — use these as the authoritative explanation of "
         "what underlying data drove each sub-score.",
     ]
-    for i, o in enumerate(top_rows):
-        lines.append(_format_opportunity_line(o))
-        if i < PROVENANCE_DETAIL_LIMIT:
-            det = _format_opportunity_provenance_detail(o)
-            if det:
-                lines.append(det)
-
-    query_terms = _extract_query_terms(question)
-    if query_terms:
-        top_ids = {int(o.id or -1) for o in top_rows}
-        targeted: List[Opportunity] = []
-        for o in rows:
-            if int(o.id or -1) in top_ids:
-                continue
-            blob = _row_match_blob(o)
-            if any(t in blob for t in query_terms):
-                targeted.append(o)
-            if len(targeted) >= MAX_TARGETED_OPPS_IN_CONTEXT:
-                break
-        if targeted:
-            lines.append("")
-            lines.append("=== TARGETED MATCHES FOR QUESTION TERMS ===")
-            for j, o in enumerate(targeted):
-                lines.append(_format_opportunity_line(o))
-                if j < PROVENANCE_TARGETED_DETAIL_LIMIT:
-                    det = _format_opportunity_provenance_detail(o)
-                    if det:
-                        lines.append(det)
-
-    if len(rows) > MAX_OPPS_IN_CONTEXT:
-        lines.append(f"... and {len(rows) - MAX_OPPS_IN_CONTEXT} more rows not shown.")
+    for o in top_rows:
+        lines.append(summary[id(o)])
+        if detail_by_obj.get(id(o)):
+            lines.append(detail_by_obj[id(o)])
+
+    if targeted:
+        lines.append("")
+        lines.append("=== TARGETED MATCHES FOR QUESTION TERMS ===")
+        for o in targeted:
+            lines.append(summary[id(o)])
+            if detail_by_obj.get(id(o)):
+                lines.append(detail_by_obj[id(o)])
+
+    if total_rows > MAX_OPPS_IN_CONTEXT:
+        lines.append(f"... and {total_rows - MAX_OPPS_IN_CONTEXT} more rows not shown.")
     return "\n".join(lines)
 
 
@@ -312,3 +312,47 @@ def sync_opportunity_scores_after_weight_change(
         sort_keys=True,
     )
     session.add(opp)
+
+
+def _stored_weight_matches(stored: Any, key: str, value: float) -> bool:
+    try:
+        return abs(float(stored.get(key)) - value) <= 1e-4
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
+def refresh_opportunity_scores(session: Session, opportunity_ids: List[int]) -> int:
+    """
+    Re-score only the given rows (one IN query) against current learned weights + category overlay.
+    Rows whose stored weights already match are only re-stamped, so upload-time nudges survive.
+    Returns the number of rows whose total/tier changed. Caller commits.
+    """
+    from backend.heatmap.category_scoring_mix import apply_category_scoring_overlay
+    from backend.heatmap.context_builder import load_category_cards
+
+    ids = sorted({int(i) for i in opportunity_ids or []})
+    if not ids:
+        return 0
+    base = load_learned_weights(session)
+    cards = load_category_cards()
+    now = datetime.now(timezone.utc)
+    changed = 0
+    for opp in session.exec(select(Opportunity).where(Opportunity.id.in_(ids))).all():
+        raw_c = cards.get((opp.category or "").strip()) or cards.get(opp.category or "")
+        w = normalize_full(apply_category_scoring_overlay(base, raw_c if isinstance(raw_c, dict) else {}))
+        keys = PS_NEW_KEYS if opp.contract_id is None else PS_CONTRACT_KEYS
+        try:
+            stored = json.loads(opp.weights_used_json or "{}")
+        except json.JSONDecodeError:
+            stored = {}
+        stale = not all(_stored_weight_matches(stored, k, w[k]) for k in keys)
+        if stale:
+            total, tier = recompute_total_and_tier(opp, w)
+            if total != opp.total_score or tier != opp.tier:
+                changed += 1
+            opp.total_score = total
+            opp.tier = tier
+            opp.weights_used_json = json.dumps({k: w[k] for k in keys})
+        opp.last_refresh_ts = now
+        session.add(opp)
+    return changed
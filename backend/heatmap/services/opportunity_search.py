@@ -0,0 +1,132 @@
+"""
+Opportunity lookup for the heatmap copilot.
+
+- search_opportunity_ids: FTS5 match over supplier / contract / request ids, titles and
+  categories (index + triggers live in heatmap_database), ordered by total_score.
+- cached_provenance_details: formatted provenance blocks from OpportunityContextCache;
+  the update trigger drops a row's block whenever it is rescored or edited.
+
+Both degrade to None / no caching when the heatmap DB is not SQLite or lacks FTS5 (or the
+index query fails), so the caller can fall back to scanning rows.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import weakref
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from backend.heatmap.persistence.heatmap_models import Opportunity, OpportunityContextCache
+from utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Per engine object (not id(), which a new engine can reuse once the old one is collected)
+_fts_ready: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+def _engine(session: Session) -> Engine:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _fts_available(session: Session) -> bool:
+    engine = _engine(session)
+    if engine not in _fts_ready:
+        ok = False
+        if engine.dialect.name == "sqlite":
+            try:
+                ok = session.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='opportunity_fts'")
+                ).first() is not None
+            except Exception:
+                ok = False
+        _fts_ready[engine] = ok
+    return _fts_ready[engine]
+
+
+def fts_match_expression(terms: Iterable[str]) -> str:
+    """OR of quoted phrases; the last token of each phrase is a prefix ("acme co" matches "acme corp")."""
+    phrases: List[str] = []
+    for term in terms:
+        tokens = re.findall(r"[0-9a-z]+", str(term or "").lower())
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '" *')
+    return " OR ".join(dict.fromkeys(phrases))
+
+
+def search_opportunity_ids(
+    session: Session,
+    terms: List[str],
+    *,
+    limit: int,
+    exclude_ids: Optional[Iterable[int]] = None,
+) -> Optional[List[int]]:
+    """Ids of opportunities matching any term, highest total_score first; None if no index."""
+    expr = fts_match_expression(terms)
+    if not expr:
+        return []
+    if not _fts_available(session):
+        return None
+    excluded = {int(i) for i in (exclude_ids or [])}
+    try:
+        rows = session.execute(
+            text(
+                "SELECT o.id FROM opportunity_fts f JOIN opportunity o ON o.id = f.rowid "
+                "WHERE opportunity_fts MATCH :expr ORDER BY o.total_score DESC LIMIT :lim"
+            ).bindparams(expr=expr, lim=int(limit) + len(excluded))
+        ).all()
+    except OperationalError as e:
+        logger.warning("Opportunity FTS query failed, falling back to a scan: %s", e)
+        return None
+    out = [int(r[0]) for r in rows if int(r[0]) not in excluded]
+    return out[:limit]
+
+
+def cached_provenance_details(
+    session: Session,
+    rows: List[Opportunity],
+    formatter: Callable[[Opportunity], str],
+) -> Dict[int, str]:
+    """
+    Provenance block per opportunity id, formatting and storing only cache misses.
+    New blocks are written in a separate session, so the caller's session is not committed.
+    """
+    ids = [int(o.id) for o in rows if o.id is not None]
+    if not ids:
+        return {}
+    today = datetime.now(timezone.utc).date().isoformat()
+    cache_ok = _fts_available(session)
+    cached: Dict[int, str] = {}
+    if cache_ok:
+        with session.no_autoflush:
+            for c in session.exec(
+                select(OpportunityContextCache).where(OpportunityContextCache.opportunity_id.in_(ids))
+            ).all():
+                if c.built_on == today:
+                    cached[int(c.opportunity_id)] = c.detail_text
+    misses = [o for o in rows if o.id is not None and int(o.id) not in cached]
+    CACHE_REQUESTS.inc(len(ids) - len(misses), cache="copilot_provenance", result="hit")
+    CACHE_REQUESTS.inc(len(misses), cache="copilot_provenance", result="miss")
+    for o in misses:
+        cached[int(o.id)] = formatter(o)
+    if cache_ok and misses:
+        try:
+            with Session(_engine(session)) as cache_session:
+                cache_session.execute(
+                    text(
+                        "INSERT OR REPLACE INTO opportunitycontextcache (opportunity_id, built_on, detail_text) "
+                        "VALUES (:oid, :built_on, :detail)"
+                    ),
+                    [{"oid": int(o.id), "built_on": today, "detail": cached[int(o.id)]} for o in misses],
+                )
+                cache_session.commit()
+        except Exception as e:
+            logger.warning("Could not store copilot provenance cache: %s", e)
+    return cached
@@ -0,0 +1,194 @@
+"""
+Concurrent LLM row extraction for System 1 document uploads (PDF/DOCX/TXT).
+
+Each document is extracted on a bounded thread pool with a per-file timeout measured from
+when the file actually starts. Non-empty results are cached on disk by content hash, so
+re-uploading the same file skips the LLM entirely.
+
+Env:
+- SYSTEM1_DOC_EXTRACT_CONCURRENCY (default 4)
+- SYSTEM1_DOC_EXTRACT_TIMEOUT_SEC (default 90)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.metrics import record_cache
+
+# Bump when the extraction prompt or row shape changes so stale cache entries are ignored.
+EXTRACTION_CACHE_VERSION = "1"
+EXTRACT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "system1_extract_cache"
+
+
+@dataclass
+class DocumentExtractionResult:
+    filename: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    note: Optional[str] = None
+    cache_hit: bool = False
+    timed_out: bool = False
+    elapsed_sec: float = 0.0
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(1.0, float(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content or b"").hexdigest()
+
+
+def _cache_path(digest: str, namespace: str) -> Path:
+    ns = hashlib.sha256(f"{EXTRACTION_CACHE_VERSION}|{namespace}".encode("utf-8")).hexdigest()[:12]
+    return EXTRACT_CACHE_DIR / f"{digest}_{ns}.json"
+
+
+def load_cached_rows(digest: str, namespace: str) -> Optional[List[Dict[str, Any]]]:
+    path = _cache_path(digest, namespace)
+    if not path.is_file():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return [r for r in rows if isinstance(r, dict)] if isinstance(rows, list) else None
+
+
+def store_cached_rows(digest: str, namespace: str, rows: List[Dict[str, Any]]) -> None:
+    """Atomic write; empty results are not cached (they usually mean the LLM was unavailable)."""
+    if not rows:
+        return
+    path = _cache_path(digest, namespace)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, default=str)
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def _extract_one(
+    filename: str,
+    content: bytes,
+    *,
+    text_extractor: Callable[[bytes, str], str],
+    row_extractor: Callable[..., List[Dict[str, Any]]],
+    namespace: str,
+    timeout_sec: float,
+) -> DocumentExtractionResult:
+    t0 = time.monotonic()
+    digest = content_hash(content)
+    cached = load_cached_rows(digest, namespace)
+    record_cache("extraction", cached is not None)
+    if cached is not None:
+        return DocumentExtractionResult(
+            filename=filename,
+            rows=cached,
+            cache_hit=True,
+            elapsed_sec=round(time.monotonic() - t0, 3),
+        )
+    text = text_extractor(content, filename)
+    if not text.strip():
+        return DocumentExtractionResult(
+            filename=filename,
+            note=f"No text extracted from {filename}",
+            elapsed_sec=round(time.monotonic() - t0, 3),
+        )
+    try:
+        rows = row_extractor(text, filename, timeout=timeout_sec)
+    except Exception:
+        rows = []
+    store_cached_rows(digest, namespace, rows)
+    return DocumentExtractionResult(
+        filename=filename,
+        rows=rows,
+        note=None if rows else (
+            f"{filename}: LLM extraction unavailable; provide CSV/XLS for deterministic parsing."
+        ),
+        elapsed_sec=round(time.monotonic() - t0, 3),
+    )
+
+
+def extract_documents_concurrently(
+    documents: List[Tuple[str, bytes]],
+    *,
+    text_extractor: Callable[[bytes, str], str],
+    row_extractor: Callable[..., List[Dict[str, Any]]],
+    namespace: str,
+    max_workers: Optional[int] = None,
+    timeout_sec: Optional[float] = None,
+) -> List[DocumentExtractionResult]:
+    """
+    Extract rows from every document, at most max_workers at a time. Results keep input order.
+    row_extractor is called as row_extractor(text, filename, timeout=seconds); a file still
+    running past its timeout is reported as timed out and its late result only warms the cache.
+    """
+    if not documents:
+        return []
+    workers = max_workers or _env_int("SYSTEM1_DOC_EXTRACT_CONCURRENCY", 4)
+    timeout = timeout_sec or _env_float("SYSTEM1_DOC_EXTRACT_TIMEOUT_SEC", 90.0)
+    results: List[Optional[DocumentExtractionResult]] = [None] * len(documents)
+    started: Dict[int, float] = {}
+
+    def _run(idx: int, filename: str, content: bytes) -> DocumentExtractionResult:
+        started[idx] = time.monotonic()
+        return _extract_one(
+            filename,
+            content,
+            text_extractor=text_extractor,
+            row_extractor=row_extractor,
+            namespace=namespace,
+            timeout_sec=timeout,
+        )
+
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(documents)), thread_name_prefix="s1-doc")
+    try:
+        pending = {
+            pool.submit(_run, idx, filename, content): idx
+            for idx, (filename, content) in enumerate(documents)
+        }
+        while pending:
+            done, _ = wait(list(pending), timeout=0.25, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx = pending.pop(fut)
+                try:
+                    results[idx] = fut.result()
+                except Exception as e:
+                    results[idx] = DocumentExtractionResult(
+                        filename=documents[idx][0],
+                        note=f"{documents[idx][0]}: extraction failed ({type(e).__name__}).",
+                    )
+            now = time.monotonic()
+            for fut, idx in list(pending.items()):
+                t0 = started.get(idx)
+                if t0 is not None and now - t0 > timeout:
+                    pending.pop(fut)
+                    results[idx] = DocumentExtractionResult(
+                        filename=documents[idx][0],
+                        note=f"{documents[idx][0]}: extraction timed out after {int(timeout)}s.",
+                        timed_out=True,
+                        elapsed_sec=round(now - t0, 3),
+                    )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return [r for r in results if r is not None]
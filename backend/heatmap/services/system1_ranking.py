@@ -0,0 +1,76 @@
+"""
+Ranking for System 1 staged candidates (file preview, ERP preview and bundle scan).
+
+Candidates stay plain dicts. CandidateTable copies only the four ranking fields into
+compact float arrays and ranks row indices, so top_n uses a heap (O(n log k)) instead of a
+full sort and callers materialize Pydantic rows only for what they return.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RANK_BY_MODES = ("completeness", "score", "hybrid")
+
+
+def normalize_rank_by(raw: Optional[str]) -> str:
+    v = str(raw or "completeness").strip().lower()
+    return v if v in RANK_BY_MODES else "completeness"
+
+
+def _col(rows: List[Dict[str, Any]], key: str) -> array:
+    return array("d", (float(r.get(key) or 0.0) for r in rows))
+
+
+class CandidateTable:
+    """Column view over scored candidate dicts; rows themselves are never copied."""
+
+    __slots__ = ("rows", "completeness", "confidence", "total_score", "spend")
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.completeness = _col(rows, "completeness_score")
+        self.confidence = _col(rows, "computed_confidence")
+        self.total_score = _col(rows, "computed_total_score")
+        self.spend = _col(rows, "estimated_spend_usd")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _key_fn(self, rank_by: str) -> Callable[[int], Tuple[float, ...]]:
+        comp, conf, total, spend = self.completeness, self.confidence, self.total_score, self.spend
+        if rank_by == "score":
+            return lambda i: (total[i], comp[i], conf[i], spend[i])
+        if rank_by == "hybrid":
+            return lambda i: (
+                (0.6 * comp[i]) + (0.3 * (10.0 * conf[i])) + (0.1 * total[i]),
+                total[i],
+                spend[i],
+            )
+        return lambda i: (comp[i], conf[i], total[i], spend[i])
+
+    def ranked_indices(self, rank_by: str, top_n: Optional[int] = None) -> List[int]:
+        """Best-first row indices; ties keep ingestion order (same as a stable descending sort)."""
+        key = self._key_fn(normalize_rank_by(rank_by))
+        idx = range(len(self.rows))
+        if top_n is not None and 0 < top_n < len(self.rows):
+            return heapq.nlargest(top_n, idx, key=key)
+        return sorted(idx, key=key, reverse=True)
+
+    def select(
+        self,
+        rank_by: str,
+        top_n: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Return (ranked selection, remaining rows). Without top_n everything is ranked and the
+        remainder is empty; with top_n the remainder keeps ingestion order (it is not sorted).
+        """
+        picked = self.ranked_indices(rank_by, top_n)
+        selected = [self.rows[i] for i in picked]
+        if len(picked) == len(self.rows):
+            return selected, []
+        chosen = set(picked)
+        rest = [r for i, r in enumerate(self.rows) if i not in chosen]
+        return selected, rest
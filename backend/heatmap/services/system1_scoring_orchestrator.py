@@ -483,11 +483,28 @@ def summarize_preview_completeness(rows: List[Dict[str, Any]]) -> Dict[str, Any]
     }
 
 
-def enrich_rows_for_preview(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def batch_spend_maxima(rows: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Spend denominators used to normalize FIS/ES/SCS within one upload batch."""
     renewals = [r for r in rows if str(r.get("row_type")) == "renewal"]
     new_rows = [r for r in rows if str(r.get("row_type")) != "renewal"]
-    max_renewal_spend = max([float(r.get("estimated_spend_usd") or 0.0) for r in renewals], default=0.0)
-    max_new_spend = max([float(r.get("estimated_spend_usd") or 0.0) for r in new_rows], default=0.0)
+    return {
+        "max_renewal_spend": max([float(r.get("estimated_spend_usd") or 0.0) for r in renewals], default=0.0),
+        "max_new_spend": max([float(r.get("estimated_spend_usd") or 0.0) for r in new_rows], default=0.0),
+    }
+
+
+def enrich_rows_for_preview(
+    rows: List[Dict[str, Any]],
+    *,
+    spend_maxima: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score rows for staged preview. spend_maxima lets callers re-score a subset of a batch
+    (e.g. edited rows at approve time) against the full batch's spend denominators.
+    """
+    maxima = spend_maxima or batch_spend_maxima(rows)
+    max_renewal_spend = float(maxima.get("max_renewal_spend") or 0.0)
+    max_new_spend = float(maxima.get("max_new_spend") or 0.0)
     cards = load_category_cards()
     try:
         session = get_heatmap_db().get_db_session()
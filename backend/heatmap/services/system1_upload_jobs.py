@@ -0,0 +1,270 @@
+"""
+Disk-backed store for System 1 staged upload jobs (preview -> approve).
+
+Jobs live in the heatmap SQLite DB so they survive restarts and are shared across
+uvicorn workers. Candidate rows are held column-major and zlib-compressed: large
+previews stay small on disk and a page of rows can be rebuilt without
+re-validating the whole job. Jobs expire after SYSTEM1_UPLOAD_JOB_TTL_HOURS.
+"""
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel import delete, select
+
+from backend.heatmap.persistence.heatmap_models import System1UploadJob
+from backend.infrastructure.storage_providers import get_heatmap_db
+
+_JSON_LIST_FIELDS = ("created_opportunity_ids", "parsing_notes", "uploaded_files")
+_SCALAR_FIELDS = (
+    "status",
+    "total_candidates",
+    "valid_candidates",
+    "approved_count",
+    "warning_rows_count",
+    "run_triggered",
+)
+
+
+def _ttl() -> timedelta:
+    try:
+        hours = float(os.getenv("SYSTEM1_UPLOAD_JOB_TTL_HOURS", "24"))
+    except (TypeError, ValueError):
+        hours = 24.0
+    return timedelta(hours=max(0.01, hours))
+
+
+def _utcnow() -> datetime:
+    # SQLite drops tzinfo on read; keep every comparison naive UTC.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_candidates(rows: List[Dict[str, Any]]) -> bytes:
+    """Pack row dicts as {"n": N, "columns": {key: [v0..vN-1]}} and compress."""
+    keys: Dict[str, None] = {}
+    for r in rows:
+        for k in r:
+            keys.setdefault(k, None)
+    payload = {"n": len(rows), "columns": {k: [r.get(k) for r in rows] for k in keys}}
+    raw = json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, 6)
+
+
+def decode_candidates(
+    blob: Optional[bytes],
+    *,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Inverse of encode_candidates; only the requested slice is materialized as dicts."""
+    if not blob:
+        return [], 0
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    total = int(payload.get("n") or 0)
+    columns: Dict[str, List[Any]] = payload.get("columns") or {}
+    start = max(0, int(offset or 0))
+    end = total if limit is None else min(total, start + max(0, int(limit)))
+    rows = [{k: col[i] for k, col in columns.items()} for i in range(start, end)]
+    return rows, total
+
+
+class System1UploadJobStore:
+    """CRUD for staged upload jobs. Jobs are exchanged as plain dicts (same shape as the API)."""
+
+    def _session(self):
+        return get_heatmap_db().get_db_session()
+
+    @staticmethod
+    def _row_to_dict(row: System1UploadJob, *, include_candidates: bool) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "job_id": row.job_id,
+            "status": row.status,
+            "created_at": row.created_at.isoformat() if row.created_at else "",
+            "expires_at": row.expires_at.isoformat() if row.expires_at else "",
+            "total_candidates": int(row.total_candidates or 0),
+            "valid_candidates": int(row.valid_candidates or 0),
+            "approved_count": int(row.approved_count or 0),
+            "warning_rows_count": int(row.warning_rows_count or 0),
+            "run_triggered": bool(row.run_triggered),
+            "created_opportunity_ids": json.loads(row.created_opportunity_ids_json or "[]"),
+            "parsing_notes": json.loads(row.parsing_notes_json or "[]"),
+            "analysis": json.loads(row.analysis_json or "{}"),
+            "uploaded_files": json.loads(row.uploaded_files_json or "[]"),
+        }
+        if include_candidates:
+            out["candidates"], _ = decode_candidates(row.candidates_blob)
+        return out
+
+    def _get_live_row(self, session, job_id: str) -> Optional[System1UploadJob]:
+        row = session.get(System1UploadJob, job_id)
+        if row is None or (row.expires_at and row.expires_at <= _utcnow()):
+            return None
+        return row
+
+    def create_job(self, job: Dict[str, Any]) -> None:
+        """Persist a new preview job and opportunistically purge expired ones."""
+        now = _utcnow()
+        row = System1UploadJob(
+            job_id=str(job["job_id"]),
+            status=str(job.get("status") or "preview_ready"),
+            created_at=now,
+            expires_at=now + _ttl(),
+            total_candidates=int(job.get("total_candidates") or 0),
+            valid_candidates=int(job.get("valid_candidates") or 0),
+            approved_count=int(job.get("approved_count") or 0),
+            warning_rows_count=int(job.get("warning_rows_count") or 0),
+            run_triggered=bool(job.get("run_triggered")),
+            created_opportunity_ids_json=json.dumps(list(job.get("created_opportunity_ids") or [])),
+            parsing_notes_json=json.dumps(list(job.get("parsing_notes") or [])),
+            analysis_json=json.dumps(dict(job.get("analysis") or {}), default=_json_default),
+            uploaded_files_json=json.dumps(list(job.get("uploaded_files") or [])),
+            candidates_blob=encode_candidates(list(job.get("candidates") or [])),
+        )
+        session = self._session()
+        try:
+            session.exec(delete(System1UploadJob).where(System1UploadJob.expires_at <= now))
+            session.add(row)
+            session.commit()
+        finally:
+            session.close()
+
+    def get_job(self, job_id: str, *, include_candidates: bool = True) -> Optional[Dict[str, Any]]:
+        session = self._session()
+        try:
+            row = self._get_live_row(session, job_id)
+            if row is None:
+                return None
+            return self._row_to_dict(row, include_candidates=include_candidates)
+        finally:
+            session.close()
+
+    def get_candidates(
+        self,
+        job_id: str,
+        *,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Return (page of candidate dicts, total candidate count), or None if the job is gone."""
+        session = self._session()
+        try:
+            row = self._get_live_row(session, job_id)
+            if row is None:
+                return None
+            return decode_candidates(row.candidates_blob, offset=offset, limit=limit)
+        finally:
+            session.close()
+
+    def update_job(self, job_id: str, **fields: Any) -> bool:
+        """Update scalar/JSON fields; pass candidates=[...] to replace the stored rows."""
+        session = self._session()
+        try:
+            row = self._get_live_row(session, job_id)
+            if row is None:
+                return False
+            for key in _SCALAR_FIELDS:
+                if key in fields:
+                    setattr(row, key, fields[key])
+            for key in _JSON_LIST_FIELDS:
+                if key in fields:
+                    setattr(row, f"{key}_json", json.dumps(list(fields[key] or [])))
+            if "analysis" in fields:
+                row.analysis_json = json.dumps(dict(fields["analysis"] or {}), default=_json_default)
+            if "candidates" in fields:
+                row.candidates_blob = encode_candidates(list(fields["candidates"] or []))
+            session.add(row)
+            session.commit()
+            return True
+        finally:
+            session.close()
+
+    def delete_job(self, job_id: str) -> bool:
+        session = self._session()
+        try:
+            row = session.get(System1UploadJob, job_id)
+            if row is None:
+                return False
+            session.delete(row)
+            session.commit()
+            return True
+        finally:
+            session.close()
+
+    def clear_jobs(self) -> int:
+        session = self._session()
+        try:
+            n = len(session.exec(select(System1UploadJob.job_id)).all())
+            session.exec(delete(System1UploadJob))
+            session.commit()
+            return n
+        finally:
+            session.close()
+
+    def purge_expired_jobs(self) -> int:
+        session = self._session()
+        try:
+            now = _utcnow()
+            n = len(
+                session.exec(
+                    select(System1UploadJob.job_id).where(System1UploadJob.expires_at <= now)
+                ).all()
+            )
+            if n:
+                session.exec(delete(System1UploadJob).where(System1UploadJob.expires_at <= now))
+                session.commit()
+            return n
+        finally:
+            session.close()
+
+    def latest_job(self, *, include_candidates: bool = True) -> Optional[Dict[str, Any]]:
+        session = self._session()
+        try:
+            row = session.exec(
+                select(System1UploadJob)
+                .where(System1UploadJob.expires_at > _utcnow())
+                .order_by(System1UploadJob.created_at.desc())
+            ).first()
+            if row is None:
+                return None
+            return self._row_to_dict(row, include_candidates=include_candidates)
+        finally:
+            session.close()
+
+    def find_uploaded_file(self, stored_name: str) -> Optional[Dict[str, Any]]:
+        """Look up file metadata (original filename etc.) for a persisted upload."""
+        if not stored_name:
+            return None
+        session = self._session()
+        try:
+            rows = session.exec(
+                select(System1UploadJob.uploaded_files_json).where(
+                    System1UploadJob.uploaded_files_json.contains(stored_name)
+                )
+            ).all()
+            for raw in rows:
+                for meta in json.loads(raw or "[]"):
+                    if str(meta.get("stored_name") or "") == stored_name:
+                        return meta
+            return None
+        finally:
+            session.close()
+
+
+_store: Optional[System1UploadJobStore] = None
+
+
+def get_system1_upload_job_store() -> System1UploadJobStore:
+    global _store
+    if _store is None:
+        _store = System1UploadJobStore()
+    return _store
@@ -39,6 +39,11 @@ class _SQLiteAppDatabase(DatabaseInterface):
 
         return get_db_session()
 
+    def get_read_session(self) -> Session:
+        from backend.persistence.database import get_read_session
+
+        return get_read_session()
+
 
 class _AzureSqlDatabase(DatabaseInterface):
     """
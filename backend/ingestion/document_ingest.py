@@ -126,7 +126,7 @@ class DocumentIngester:
                 region=metadata.get("region"),
                 dtp_relevance=json.dumps(metadata.get("dtp_relevance", [])),
                 chunk_count=len(chunks),
-                embedding_model="text-embedding-3-small",
+                embedding_model=getattr(self.vector_store, "embedding_model_label", None) or "text-embedding-3-small",
                 description=metadata.get("description"),
                 ingestion_id=ingestion_id
             )
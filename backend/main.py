@@ -16,12 +16,13 @@ from contextlib import asynccontextmanager
 from uuid import uuid4
 import threading
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request, Response
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from backend.services.llm_provider import get_openai_client, resolve_chat_model, using_azure_openai, has_llm_credentials
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, install_sqlalchemy_metrics, metrics_enabled, render as render_metrics
 
 # Load environment variables
 load_dotenv()
@@ -29,18 +30,13 @@ load_dotenv()
 # Import services
 from backend.services.case_service import get_case_service
 from backend.services.artifact_document_export import (
-    build_artifact_docx_bytes,
-    build_artifact_pdf_bytes,
-    build_artifact_pack_docx_bytes,
-    build_artifact_pack_markdown_bytes,
-    build_artifact_pack_pdf_bytes,
     build_plain_text_docx_bytes,
-    export_filename,
-    export_pack_filename,
     export_working_doc_filename,
 )
+from backend.services.export_cache import export_artifact, export_artifact_pack
+from backend.services.conditional_get import make_etag, not_modified, table_revisions
 from backend.services.docx_text import extract_text_from_docx_bytes
-from backend.services.working_document_revision import revise_working_document_text
+from backend.services.working_document_revision import revise_working_document
 from backend.services.chat_service import get_chat_service
 from backend.services.ingestion_service import get_ingestion_service
 from backend.persistence.models import CaseState, S2CProcuraBotFeedback, DocumentRecord, ArtifactPack
@@ -144,6 +140,10 @@ async def lifespan(app: FastAPI):
     # Startup
     initialize_storage_backends()
     print("[OK] Storage backends initialized")
+    if os.getenv("KNOWLEDGE_PREWARM", "1") != "0":
+        from utils.knowledge_layer import warm_knowledge_cache
+
+        threading.Thread(target=warm_knowledge_cache, name="knowledge-prewarm", daemon=True).start()
     yield
     # Shutdown
     print("[INFO] Shutting down")
@@ -171,9 +171,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from backend.heatmap.heatmap_router import heatmap_router, _start_heatmap_pipeline_background
+# Prometheus metrics (outermost, so latency includes compression/CORS)
+app.add_middleware(MetricsMiddleware)
+install_sqlalchemy_metrics()
+
+from backend.heatmap.heatmap_router import heatmap_router, _start_opportunity_refresh_background
 from backend.heatmap.persistence.heatmap_models import Opportunity, ReviewFeedback, AuditLog
 from backend.heatmap.services.system1_scoring_orchestrator import (
+    batch_spend_maxima,
     enrich_rows_for_preview,
     summarize_preview_completeness,
 )
@@ -182,12 +187,14 @@ from backend.heatmap.services.system1_flexible_ingestion import (
     StructuredFileAdapter,
 )
 from backend.heatmap.services.system1_ingestion_graph import get_system1_ingestion_graph
+from backend.heatmap.services.system1_ranking import CandidateTable, normalize_rank_by
+from backend.heatmap.services.system1_upload_jobs import get_system1_upload_job_store
+from backend.heatmap.services.system1_document_extraction import extract_documents_concurrently
 app.include_router(heatmap_router, prefix="/api/heatmap", tags=["heatmap"])
 
 
 ALLOWED_SYSTEM1_UPLOAD_EXTENSIONS = {".pdf", ".docx", ".txt", ".csv", ".xls", ".xlsx"}
-_system1_upload_jobs: Dict[str, Dict[str, Any]] = {}
-_system1_upload_lock = threading.Lock()
+_system1_job_store = get_system1_upload_job_store()
 _SYSTEM1_UPLOAD_FILES_DIR = os.path.join(os.path.dirname(__file__), "data", "system1_uploads")
 os.makedirs(_SYSTEM1_UPLOAD_FILES_DIR, exist_ok=True)
 
@@ -475,40 +482,6 @@ def _normalize_category(raw: Any) -> str:
     return out or "Uncategorized"
 
 
-def _normalize_rank_by(raw: Optional[str]) -> str:
-    v = str(raw or "completeness").strip().lower()
-    if v in {"completeness", "score", "hybrid"}:
-        return v
-    return "completeness"
-
-
-def _rank_candidates(candidates: List[Any], rank_by: str) -> List[Any]:
-    rb = _normalize_rank_by(rank_by)
-    if rb == "score":
-        key_fn = lambda c: (
-            float(getattr(c, "computed_total_score", None) or 0.0),
-            float(getattr(c, "completeness_score", None) or 0.0),
-            float(getattr(c, "computed_confidence", None) or 0.0),
-            float(getattr(c, "estimated_spend_usd", None) or 0.0),
-        )
-    elif rb == "hybrid":
-        key_fn = lambda c: (
-            (0.6 * float(getattr(c, "completeness_score", None) or 0.0))
-            + (0.3 * (10.0 * float(getattr(c, "computed_confidence", None) or 0.0)))
-            + (0.1 * float(getattr(c, "computed_total_score", None) or 0.0)),
-            float(getattr(c, "computed_total_score", None) or 0.0),
-            float(getattr(c, "estimated_spend_usd", None) or 0.0),
-        )
-    else:
-        key_fn = lambda c: (
-            float(getattr(c, "completeness_score", None) or 0.0),
-            float(getattr(c, "computed_confidence", None) or 0.0),
-            float(getattr(c, "computed_total_score", None) or 0.0),
-            float(getattr(c, "estimated_spend_usd", None) or 0.0),
-        )
-    return sorted(candidates, key=key_fn, reverse=True)
-
-
 def _extract_text_for_upload(content: bytes, filename: str) -> str:
     ext = os.path.splitext(filename)[1].lower()
     if ext in {".txt", ".csv"}:
@@ -529,13 +502,21 @@ def _extract_text_for_upload(content: bytes, filename: str) -> str:
     return ""
 
 
-def _extract_rows_from_text_with_llm(text: str, filename: str) -> List[Dict[str, Any]]:
+def _system1_extract_model() -> str:
+    default_model = os.getenv("SYSTEM1_UPLOAD_EXTRACT_MODEL", "gpt-4o-mini")
+    return resolve_chat_model(default_model, deployment_env="AZURE_OPENAI_SYSTEM1_EXTRACT_DEPLOYMENT")
+
+
+def _extract_rows_from_text_with_llm(
+    text: str,
+    filename: str,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
     client = get_openai_client()
     if not client or not text.strip():
         return []
     try:
-        default_model = os.getenv("SYSTEM1_UPLOAD_EXTRACT_MODEL", "gpt-4o-mini")
-        model = resolve_chat_model(default_model, deployment_env="AZURE_OPENAI_SYSTEM1_EXTRACT_DEPLOYMENT")
+        model = _system1_extract_model()
         prompt = f"""
 Extract sourcing opportunities from the uploaded text.
 Return JSON object with key "rows", where each row may contain:
@@ -560,6 +541,7 @@ Text source: {filename}
             response_format={"type": "json_object"},
             temperature=0.1,
             max_tokens=2200,
+            **({"timeout": timeout} if timeout else {}),
         )
         payload = json.loads((resp.choices[0].message.content or "{}").strip() or "{}")
         rows = payload.get("rows")
@@ -661,6 +643,14 @@ async def health_check():
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (disable with METRICS_ENABLED=0)."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/llm/provider")
 async def get_llm_provider_status():
     """Runtime LLM provider status (safe, no secrets)."""
@@ -671,14 +661,30 @@ async def get_llm_provider_status():
 # CASE ENDPOINTS
 # ============================================================
 
+def _case_version(session, case_id: str) -> Optional[str]:
+    return session.exec(select(CaseState.updated_at).where(CaseState.case_id == case_id)).first()
+
+
 @app.get("/api/cases", response_model=CaseListResponse)
 async def list_cases(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
     dtp_stage: Optional[str] = None,
     category_id: Optional[str] = None,
     limit: int = 50
 ):
-    """Get list of cases."""
+    """Get list of cases (ETag: latest updated_at + row count + filters)."""
+    session = get_app_db().get_read_session()
+    try:
+        latest, count = session.exec(select(func.max(CaseState.updated_at), func.count(CaseState.id))).one()
+    finally:
+        session.close()
+    etag = make_etag("cases", latest, count, status, dtp_stage, category_id, limit)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+
     service = get_case_service()
     cases = service.list_cases(
         status=status,
@@ -699,8 +705,19 @@ async def list_cases(
 
 
 @app.get("/api/cases/{case_id}", response_model=CaseDetail)
-async def get_case(case_id: str):
-    """Get case details."""
+async def get_case(case_id: str, request: Request, response: Response):
+    """Get case details (ETag: case updated_at + supplier performance revision)."""
+    session = get_app_db().get_read_session()
+    try:
+        version = _case_version(session, case_id)
+        revs = table_revisions(session, ["supplier_performance"])
+    finally:
+        session.close()
+    if version is not None:
+        cached = not_modified(request, response, make_etag("case", case_id, version, revs))
+        if cached is not None:
+            return cached
+
     service = get_case_service()
     case = service.get_case(case_id)
     
@@ -711,19 +728,32 @@ async def get_case(case_id: str):
 
 
 @app.get("/api/cases/{case_id}/documents/center")
-async def get_case_documents_center(case_id: str):
+async def get_case_documents_center(case_id: str, request: Request, response: Response):
     """
     Unified document center for case UI:
     - uploads: files uploaded directly for this case
     - internal_references: relevant internal docs by category/supplier
     - generated_outputs: artifact pack summaries for this case
+
+    ETag: case updated_at (bumped when packs are saved) + document_records revision.
     """
+    session = get_app_db().get_read_session()
+    try:
+        version = _case_version(session, case_id)
+        revs = table_revisions(session, ["document_records"])
+    finally:
+        session.close()
+    if version is not None:
+        cached = not_modified(request, response, make_etag("documents_center", case_id, version, revs))
+        if cached is not None:
+            return cached
+
     case_service = get_case_service()
     case = case_service.get_case(case_id)
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
 
-    session = get_app_db().get_db_session()
+    session = get_app_db().get_read_session()
     try:
         # 1) Files uploaded for this case
         case_docs = session.exec(
@@ -1021,7 +1051,7 @@ async def get_s2c_performance_metrics():
     - KLI Signal Attribution Accuracy: thumbs-up / total copilot explanation feedback
     - KPI Signal Coverage Rate: active cases with all required scoring inputs present
     """
-    session = get_app_db().get_db_session()
+    session = get_app_db().get_read_session()
     try:
         case_rows = session.exec(select(CaseState)).all()
         feedback_rows = session.exec(
@@ -1135,6 +1165,38 @@ async def get_s2c_performance_metrics():
         session.close()
 
 
+@app.get("/api/cases/{case_id}/artifact_packs")
+async def list_case_artifact_packs(
+    case_id: str,
+    request: Request,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+):
+    """
+    Artifact packs for a case (audit trail), oldest first, with artifacts and execution metadata.
+    X-Total-Count carries the pack count for paging.
+
+    ETag: case updated_at (bumped when packs are saved) + page.
+    """
+    session = get_app_db().get_read_session()
+    try:
+        version = _case_version(session, case_id)
+    finally:
+        session.close()
+    if version is not None:
+        cached = not_modified(request, response, make_etag("artifact_packs", case_id, version, offset, limit))
+        if cached is not None:
+            return cached
+
+    service = get_case_service()
+    if not service.get_case(case_id):
+        raise HTTPException(status_code=404, detail="Case not found")
+    packs = service.get_all_artifact_packs(case_id, offset=offset, limit=limit)
+    response.headers["X-Total-Count"] = str(service.count_artifact_packs(case_id))
+    return [p.model_dump() for p in packs]
+
+
 @app.get("/api/cases/{case_id}/artifacts/{artifact_id}/export")
 async def export_artifact_document(
     case_id: str,
@@ -1152,22 +1214,15 @@ async def export_artifact_document(
         raise HTTPException(status_code=400, detail="export_format must be docx or pdf")
 
     service = get_case_service()
-    case = service.get_case(case_id)
-    if not case:
+    case_name = service.get_case_name(case_id)
+    if case_name is None:
         raise HTTPException(status_code=404, detail="Case not found")
     artifact = service.get_artifact(case_id, artifact_id)
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
     try:
-        if fmt == "docx":
-            data = build_artifact_docx_bytes(artifact, case_id, case.name or case_id)
-            media = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            fname = export_filename(artifact, "docx")
-        else:
-            data = build_artifact_pdf_bytes(artifact, case_id, case.name or case_id)
-            media = "application/pdf"
-            fname = export_filename(artifact, "pdf")
+        data, media, fname = export_artifact(artifact, fmt, case_id, case_name)
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -1202,8 +1257,8 @@ async def export_artifact_pack_document(
         fmt = "md"
 
     service = get_case_service()
-    case = service.get_case(case_id)
-    if not case:
+    case_name = service.get_case_name(case_id)
+    if case_name is None:
         raise HTTPException(status_code=404, detail="Case not found")
 
     pack = service.get_artifact_pack_for_case(case_id, pack_id)
@@ -1211,24 +1266,7 @@ async def export_artifact_pack_document(
         raise HTTPException(status_code=404, detail="Artifact pack not found for this case")
 
     try:
-        if fmt == "md":
-            data = build_artifact_pack_markdown_bytes(
-                pack, case_id, case.name or case_id
-            )
-            media = "text/markdown; charset=utf-8"
-            fname = export_pack_filename(pack, "md")
-        elif fmt == "docx":
-            data = build_artifact_pack_docx_bytes(
-                pack, case_id, case.name or case_id
-            )
-            media = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            fname = export_pack_filename(pack, "docx")
-        else:
-            data = build_artifact_pack_pdf_bytes(
-                pack, case_id, case.name or case_id
-            )
-            media = "application/pdf"
-            fname = export_pack_filename(pack, "pdf")
+        data, media, fname = export_artifact_pack(pack, fmt, case_id, case_name)
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -1287,7 +1325,11 @@ async def revise_working_document_endpoint(
     body: WorkingDocumentReviseRequest,
 ):
     """
-    Apply a full-document ProcuraBot rewrite (LLM) to the stored RFX or contract plain text.
+    Apply a ProcuraBot rewrite (LLM) to the stored RFX or contract plain text.
+
+    Long drafts are revised per section (only sections the instruction touches); the response
+    lists the revised sections, any sections whose revision failed (left unchanged) and a
+    unified diff for review.
     """
     r = (body.role or "").lower().strip()
     if r not in ("rfx", "contract"):
@@ -1309,7 +1351,7 @@ async def revise_working_document_endpoint(
             detail="No draft text for this slot. Upload a .docx first or paste content via API.",
         )
 
-    revised = revise_working_document_text(
+    revision = revise_working_document(
         role=r,
         current_text=current,
         instruction=body.instruction,
@@ -1317,23 +1359,33 @@ async def revise_working_document_endpoint(
         category_id=case.category_id,
         dtp_stage=case.dtp_stage,
     )
-    if not revised:
+    if not revision:
         raise HTTPException(
             status_code=503,
             detail="Revision unavailable (check OPENAI_API_KEY or try again).",
         )
 
     ok = service.upsert_working_document_slot(
-        case_id, r, revised, slot.source_filename if slot else None, "copilot"
+        case_id, r, revision.text, slot.source_filename if slot else None, "copilot"
     )
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to save revised draft")
 
+    message = "Draft updated. Download Word or keep chatting."
+    if revision.failed_sections:
+        message = (
+            f"Draft partly updated: {len(revision.failed_sections)} section(s) could not be revised "
+            "and were left unchanged. Try again to revise them."
+        )
     return WorkingDocumentReviseResponse(
         success=True,
         role=r,
-        message="Draft updated. Download Word or keep chatting.",
-        chars=len(revised),
+        message=message,
+        chars=len(revision.text),
+        mode=revision.mode,
+        revised_sections=revision.revised_sections,
+        failed_sections=revision.failed_sections,
+        diff=revision.diff,
     )
 
 
@@ -1641,11 +1693,24 @@ async def ingest_document(
 
 @app.get("/api/documents", response_model=DocumentListResponse)
 async def list_documents(
+    request: Request,
+    response: Response,
     supplier_id: Optional[str] = None,
     category_id: Optional[str] = None,
     document_type: Optional[str] = None
 ):
-    """List ingested documents."""
+    """List ingested documents (ETag: document_records revision + filters)."""
+    session = get_app_db().get_read_session()
+    try:
+        revs = table_revisions(session, ["document_records"])
+    finally:
+        session.close()
+    cached = not_modified(
+        request, response, make_etag("documents", revs, supplier_id, category_id, document_type)
+    )
+    if cached is not None:
+        return cached
+
     service = get_ingestion_service()
     return service.list_documents(
         supplier_id=supplier_id,
@@ -1733,10 +1798,21 @@ async def ingest_data(
 
 @app.get("/api/ingest/history")
 async def get_ingestion_history(
+    request: Request,
+    response: Response,
     data_type: Optional[str] = None,
     limit: int = 50
 ):
-    """Get ingestion history."""
+    """Get ingestion history (ETag: ingestion_log revision + filters)."""
+    session = get_app_db().get_read_session()
+    try:
+        revs = table_revisions(session, ["ingestion_log"])
+    finally:
+        session.close()
+    cached = not_modified(request, response, make_etag("ingest_history", revs, data_type, limit))
+    if cached is not None:
+        return cached
+
     service = get_ingestion_service()
     history = service.get_ingestion_history(data_type=data_type, limit=limit)
     return {"history": history, "count": len(history)}
@@ -1780,15 +1856,8 @@ async def system1_upload_download_file(stored_name: str):
     if not os.path.isfile(abs_path):
         raise HTTPException(status_code=404, detail="Uploaded file not found.")
 
-    download_name = safe_stored
-    with _system1_upload_lock:
-        for job in _system1_upload_jobs.values():
-            for file_meta in (job.get("uploaded_files") or []):
-                if str(file_meta.get("stored_name") or "") == safe_stored:
-                    download_name = str(file_meta.get("original_filename") or safe_stored)
-                    break
-            if download_name != safe_stored:
-                break
+    file_meta = _system1_job_store.find_uploaded_file(safe_stored) or {}
+    download_name = str(file_meta.get("original_filename") or safe_stored)
     return FileResponse(abs_path, filename=download_name, media_type="application/octet-stream")
 
 
@@ -1808,9 +1877,7 @@ async def system1_admin_clear_uploaded_data():
             except Exception:
                 pass
 
-    with _system1_upload_lock:
-        cleared_jobs = len(_system1_upload_jobs)
-        _system1_upload_jobs.clear()
+    cleared_jobs = _system1_job_store.clear_jobs()
 
     session = get_heatmap_db().get_db_session()
     try:
@@ -1843,6 +1910,109 @@ async def system1_admin_clear_uploaded_data():
     }
 
 
+def _score_and_rank_preview_rows(
+    rows: List[System1UploadPreviewRow],
+    *,
+    top_n: Optional[int],
+    rank_by: str,
+    parsing_notes: List[str],
+) -> Tuple[List[System1UploadPreviewRow], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Score, rank and apply top_n. Returns (returned rows, remaining row dicts, analysis).
+    Only the returned rows are rebuilt as Pydantic models; the rest stay dicts for staging.
+    """
+    scored = enrich_rows_for_preview([c.model_dump() for c in rows])
+    for c in scored:
+        c["warnings"] = list(dict.fromkeys([*(c.get("warnings") or []), *(c.get("readiness_warnings") or [])]))
+        c["valid_for_approval"] = bool(c.get("valid_for_approval") and c.get("readiness_status") != "needs_review")
+    selected, rest = CandidateTable(scored).select(rank_by, top_n)
+    if rest:
+        parsing_notes.append(
+            f"Applied top_n={top_n} with rank_by={rank_by}; returned {len(selected)} rows."
+        )
+    analysis = summarize_preview_completeness(scored)
+    analysis["returned_rows"] = len(selected)
+    analysis["top_n_applied"] = int(top_n) if top_n is not None and top_n > 0 else None
+    analysis["rank_by_applied"] = rank_by
+    return [System1UploadPreviewRow(**r) for r in selected], rest, analysis
+
+
+def _staged_job_rows(
+    candidates: List[System1UploadPreviewRow],
+    rest: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Rows persisted on a preview job: the ranked top rows first, then everything outside top_n
+    (ingestion order) so it can still be paged and approved. Returns (rows, job counters).
+    """
+    rows = [c.model_dump() for c in candidates] + list(rest)
+    counts = {
+        "total_candidates": len(rows),
+        "valid_candidates": sum(1 for r in rows if r.get("valid_for_approval")),
+        "warning_rows_count": sum(1 for r in rows if r.get("readiness_status") == "ready_with_warnings"),
+    }
+    return rows, counts
+
+
+def _document_preview_rows(
+    document_files: List[Tuple[str, bytes]],
+    parsing_notes: List[str],
+) -> List[System1UploadPreviewRow]:
+    """LLM-extract rows from PDF/DOCX/TXT uploads on a bounded pool (cached by content hash)."""
+    results = extract_documents_concurrently(
+        document_files,
+        text_extractor=_extract_text_for_upload,
+        row_extractor=_extract_rows_from_text_with_llm,
+        namespace=_system1_extract_model(),
+    )
+    rows: List[System1UploadPreviewRow] = []
+    cache_hits = 0
+    for res in results:
+        if res.note:
+            parsing_notes.append(res.note)
+        cache_hits += int(res.cache_hit)
+        raw_rows = [{str(k).strip().lower(): v for k, v in r.items()} for r in res.rows]
+        for idx, raw in enumerate(raw_rows, start=1):
+            rows.append(_build_preview_row(raw, res.filename, "document", idx))
+    if cache_hits:
+        parsing_notes.append(f"Reused cached extraction for {cache_hits} document(s).")
+    return rows
+
+
+def _complete_deferred_document_preview(
+    job_id: str,
+    structured_rows: List[System1UploadPreviewRow],
+    document_files: List[Tuple[str, bytes]],
+    top_n: Optional[int],
+    rank_by: str,
+    parsing_notes: List[str],
+) -> None:
+    """
+    Background half of a deferred preview: extract documents, then re-rank the whole job.
+    `parsing_notes` are the notes from before the synchronous scoring pass (each note once).
+    """
+    try:
+        rows = list(structured_rows) + _document_preview_rows(document_files, parsing_notes)
+        candidates, rest, analysis = _score_and_rank_preview_rows(
+            rows, top_n=top_n, rank_by=rank_by, parsing_notes=parsing_notes
+        )
+        job_rows, counts = _staged_job_rows(candidates, rest)
+        _system1_job_store.update_job(
+            job_id,
+            status="preview_ready",
+            parsing_notes=parsing_notes,
+            candidates=job_rows,
+            analysis=analysis,
+            **counts,
+        )
+    except Exception as e:
+        _system1_job_store.update_job(
+            job_id,
+            status="preview_ready",
+            parsing_notes=[*parsing_notes, f"Document extraction failed: {e}"],
+        )
+
+
 @app.post("/api/system1/upload/preview", response_model=System1UploadPreviewResponse)
 async def system1_upload_preview(
     files: List[UploadFile] = File(...),
@@ -1850,15 +2020,19 @@ async def system1_upload_preview(
     ingestion_profile: Optional[str] = Form("default"),
     top_n: Optional[int] = Form(None),
     rank_by: Optional[str] = Form("completeness"),
+    defer_documents: bool = Form(False),
 ):
     """
     Stage 1: Upload files and preview normalized opportunity rows.
     No scoring writes are performed in this step.
+
+    With defer_documents=true, structured rows are returned immediately (status
+    "extracting_documents") and document rows are merged into the job as extraction finishes;
+    poll GET /api/system1/upload/jobs/{job_id}/preview.
     """
     if not files:
         raise HTTPException(status_code=400, detail="Upload at least one file.")
 
-    candidates: List[System1UploadPreviewRow] = []
     uploaded_files: List[Dict[str, Any]] = []
     parsing_notes: List[str] = []
 
@@ -1872,6 +2046,7 @@ async def system1_upload_preview(
             raise HTTPException(status_code=400, detail="column_mapping_json must be valid JSON object.")
 
     structured_files: List[Tuple[str, bytes]] = []
+    document_files: List[Tuple[str, bytes]] = []
     for f in files:
         filename = (f.filename or "").strip() or "upload.bin"
         ext = os.path.splitext(filename)[1].lower()
@@ -1884,24 +2059,12 @@ async def system1_upload_preview(
             continue
         uploaded_files.append(_persist_system1_uploaded_file(content, filename))
 
-        source_kind = "structured" if ext in {".csv", ".xls", ".xlsx"} else "document"
-        if source_kind == "structured":
+        if ext in {".csv", ".xls", ".xlsx"}:
             structured_files.append((filename, content))
         else:
-            text = _extract_text_for_upload(content, filename)
-            if not text.strip():
-                parsing_notes.append(f"No text extracted from {filename}")
-                continue
-            llm_rows = _extract_rows_from_text_with_llm(text, filename)
-            if llm_rows:
-                raw_rows = [{str(k).strip().lower(): v for k, v in r.items()} for r in llm_rows]
-            else:
-                parsing_notes.append(f"{filename}: LLM extraction unavailable; provide CSV/XLS for deterministic parsing.")
-                raw_rows = []
-
-            for idx, raw in enumerate(raw_rows, start=1):
-                candidates.append(_build_preview_row(raw, filename, source_kind, idx))
+            document_files.append((filename, content))
 
+    base_rows: List[System1UploadPreviewRow] = []
     if structured_files:
         structured_result = StructuredFileAdapter(
             structured_files,
@@ -1911,55 +2074,57 @@ async def system1_upload_preview(
         parsing_notes.extend(structured_result.notes)
         for filename, rows in structured_result.rows_by_source.items():
             for idx, raw in enumerate(rows, start=1):
-                candidates.append(_build_preview_row(raw, filename, "structured", idx))
-
-    if not candidates:
-        raise HTTPException(
-            status_code=400,
-            detail="No candidate opportunities extracted. Use CSV/XLS with mapped columns or richer document content.",
-        )
+                base_rows.append(_build_preview_row(raw, filename, "structured", idx))
 
-    scored_rows = enrich_rows_for_preview([c.model_dump() for c in candidates])
-    candidates = [System1UploadPreviewRow(**r) for r in scored_rows]
-    for c in candidates:
-        c.warnings = list(dict.fromkeys([*c.warnings, *c.readiness_warnings]))
-        c.valid_for_approval = bool(c.valid_for_approval and c.readiness_status != "needs_review")
-    rank_by_norm = _normalize_rank_by(rank_by)
-    candidates = _rank_candidates(candidates, rank_by_norm)
-    all_candidates = list(candidates)
-    if top_n is not None and top_n > 0 and len(candidates) > top_n:
-        candidates = candidates[:top_n]
+    job_id = f"up-{uuid4().hex[:12]}"
+    deferred = bool(defer_documents and document_files)
+    if deferred:
         parsing_notes.append(
-            f"Applied top_n={top_n} with rank_by={rank_by_norm}; returned {len(candidates)} rows."
+            f"Extracting {len(document_files)} document(s) in background; "
+            f"poll /api/system1/upload/jobs/{job_id}/preview for merged rows."
         )
+    else:
+        base_rows.extend(_document_preview_rows(document_files, parsing_notes))
+        if not base_rows:
+            raise HTTPException(
+                status_code=400,
+                detail="No candidate opportunities extracted. Use CSV/XLS with mapped columns or richer document content.",
+            )
 
-    job_id = f"up-{uuid4().hex[:12]}"
-    valid_candidates = sum(1 for c in all_candidates if c.valid_for_approval)
-    analysis = summarize_preview_completeness([c.model_dump() for c in all_candidates])
-    analysis["returned_rows"] = len(candidates)
-    analysis["top_n_applied"] = int(top_n) if top_n is not None and top_n > 0 else None
-    analysis["rank_by_applied"] = rank_by_norm
-    with _system1_upload_lock:
-        _system1_upload_jobs[job_id] = {
+    rank_by_norm = normalize_rank_by(rank_by)
+    # The background re-rank adds its own top_n note, so it starts from the pre-scoring notes
+    notes_before_scoring = list(parsing_notes)
+    candidates, rest, analysis = _score_and_rank_preview_rows(
+        base_rows, top_n=top_n, rank_by=rank_by_norm, parsing_notes=parsing_notes
+    )
+    status = "extracting_documents" if deferred else "preview_ready"
+    job_rows, counts = _staged_job_rows(candidates, rest)
+    _system1_job_store.create_job(
+        {
             "job_id": job_id,
-            "status": "preview_ready",
-            "created_at": datetime.utcnow().isoformat(),
-            "total_candidates": len(candidates),
+            "status": status,
+            **counts,
             "approved_count": 0,
             "created_opportunity_ids": [],
             "run_triggered": False,
-            "warning_rows_count": len([c for c in candidates if c.readiness_status == "ready_with_warnings"]),
             "parsing_notes": parsing_notes,
-            "candidates": [c.model_dump() for c in candidates],
+            "candidates": job_rows,
             "analysis": analysis,
             "uploaded_files": uploaded_files,
         }
+    )
+    if deferred:
+        threading.Thread(
+            target=_complete_deferred_document_preview,
+            args=(job_id, base_rows, document_files, top_n, rank_by_norm, notes_before_scoring),
+            daemon=True,
+        ).start()
 
     return System1UploadPreviewResponse(
         job_id=job_id,
-        status="preview_ready",
-        total_candidates=len(all_candidates),
-        valid_candidates=valid_candidates,
+        status=status,
+        total_candidates=counts["total_candidates"],
+        valid_candidates=counts["valid_candidates"],
         candidates=candidates,
         parsing_notes=parsing_notes,
         analysis=analysis,
@@ -2044,15 +2209,15 @@ async def system1_upload_scan_bundle(
             "rows_by_file": rows_by_file,
             "parsing_notes": parsing_notes,
             "top_n": top_n,
-            "rank_by": _normalize_rank_by(rank_by),
+            "rank_by": normalize_rank_by(rank_by),
             "row_builder": _build_preview_row,
-            "execution_trace": [],
         },
         config={"recursion_limit": 50},
     )
 
     parsing_notes = list(graph_state.get("parsing_notes") or [])
     candidates_dicts = list(graph_state.get("candidates") or [])
+    rest = list(graph_state.get("candidates_rest") or [])
     total_candidates = int(graph_state.get("total_candidates") or 0)
     valid_candidates = int(graph_state.get("valid_candidates") or 0)
     analysis = dict(graph_state.get("analysis") or {})
@@ -2066,21 +2231,21 @@ async def system1_upload_scan_bundle(
     candidates = [System1UploadPreviewRow(**r) for r in candidates_dicts]
 
     job_id = f"up-{uuid4().hex[:12]}"
-    with _system1_upload_lock:
-        _system1_upload_jobs[job_id] = {
+    job_rows, counts = _staged_job_rows(candidates, rest)
+    _system1_job_store.create_job(
+        {
             "job_id": job_id,
             "status": "preview_ready",
-            "created_at": datetime.utcnow().isoformat(),
-            "total_candidates": total_candidates,
+            **counts,
             "approved_count": 0,
             "created_opportunity_ids": [],
             "run_triggered": False,
-            "warning_rows_count": len([c for c in candidates if c.readiness_status == "ready_with_warnings"]),
             "parsing_notes": parsing_notes,
-            "candidates": [c.model_dump() for c in candidates],
+            "candidates": job_rows,
             "analysis": analysis,
             "uploaded_files": uploaded_files,
         }
+    )
 
     return System1UploadPreviewResponse(
         job_id=job_id,
@@ -2117,50 +2282,35 @@ async def system1_upload_preview_erp(body: System1ErpPreviewRequest):
     if not candidates:
         raise HTTPException(status_code=400, detail="No candidate opportunities extracted from ERP payload.")
 
-    scored_rows = enrich_rows_for_preview([c.model_dump() for c in candidates])
-    candidates = [System1UploadPreviewRow(**r) for r in scored_rows]
-    for c in candidates:
-        c.warnings = list(dict.fromkeys([*c.warnings, *c.readiness_warnings]))
-        c.valid_for_approval = bool(c.valid_for_approval and c.readiness_status != "needs_review")
-
-    rank_by_norm = _normalize_rank_by(body.rank_by)
-    candidates = _rank_candidates(candidates, rank_by_norm)
-    all_candidates = list(candidates)
-    if body.top_n is not None and body.top_n > 0 and len(candidates) > body.top_n:
-        candidates = candidates[: body.top_n]
-        result.notes.append(
-            f"Applied top_n={body.top_n} with rank_by={rank_by_norm}; returned {len(candidates)} rows."
-        )
+    rank_by_norm = normalize_rank_by(body.rank_by)
+    candidates, rest, analysis = _score_and_rank_preview_rows(
+        candidates, top_n=body.top_n, rank_by=rank_by_norm, parsing_notes=result.notes
+    )
 
     job_id = f"up-{uuid4().hex[:12]}"
-    valid_candidates = sum(1 for c in all_candidates if c.valid_for_approval)
-    analysis = summarize_preview_completeness([c.model_dump() for c in all_candidates])
-    analysis["returned_rows"] = len(candidates)
-    analysis["top_n_applied"] = int(body.top_n) if body.top_n is not None and body.top_n > 0 else None
-    analysis["rank_by_applied"] = rank_by_norm
     analysis["ingestion_diagnostics"] = result.diagnostics
+    job_rows, counts = _staged_job_rows(candidates, rest)
 
-    with _system1_upload_lock:
-        _system1_upload_jobs[job_id] = {
+    _system1_job_store.create_job(
+        {
             "job_id": job_id,
             "status": "preview_ready",
-            "created_at": datetime.utcnow().isoformat(),
-            "total_candidates": len(candidates),
+            **counts,
             "approved_count": 0,
             "created_opportunity_ids": [],
             "run_triggered": False,
-            "warning_rows_count": len([c for c in candidates if c.readiness_status == "ready_with_warnings"]),
             "parsing_notes": result.notes,
-            "candidates": [c.model_dump() for c in candidates],
+            "candidates": job_rows,
             "analysis": analysis,
             "uploaded_files": [],
         }
+    )
 
     return System1UploadPreviewResponse(
         job_id=job_id,
         status="preview_ready",
-        total_candidates=len(all_candidates),
-        valid_candidates=valid_candidates,
+        total_candidates=counts["total_candidates"],
+        valid_candidates=counts["valid_candidates"],
         candidates=candidates,
         parsing_notes=result.notes,
         analysis=analysis,
@@ -2172,25 +2322,40 @@ async def system1_upload_approve(body: System1UploadApproveRequest):
     """
     Stage 2: Approve selected preview rows, persist opportunities, then trigger a scoring refresh run.
     """
-    with _system1_upload_lock:
-        job = _system1_upload_jobs.get(body.job_id)
+    job = _system1_job_store.get_job(body.job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Preview job not found or expired.")
+    if job.get("status") == "extracting_documents":
+        raise HTTPException(
+            status_code=409,
+            detail="Document rows are still being extracted for this job. Retry once the preview is ready.",
+        )
 
-    candidates = [System1UploadPreviewRow(**r) for r in job.get("candidates", [])]
-    approved_ids = set(body.approved_row_ids or [])
+    job_rows: List[Dict[str, Any]] = list(job.get("candidates") or [])
     overrides = body.row_overrides or {}
     uploaded_files = list(job.get("uploaded_files") or [])
-    by_id = {r.row_id: r for r in candidates}
+    by_id = {str(r.get("row_id") or ""): r for r in job_rows}
     merged: List[System1UploadPreviewRow] = []
-    for rid in body.approved_row_ids or []:
-        base = by_id.get(rid)
-        if not base:
+    for rid in dict.fromkeys(body.approved_row_ids or []):
+        raw = by_id.get(rid)
+        if not raw:
             continue
-        merged.append(_merge_system1_upload_row(base, overrides.get(rid)))
-    rescored = enrich_rows_for_preview([r.model_dump() for r in merged])
-    rescored_rows = [System1UploadPreviewRow(**r) for r in rescored]
-    selected = [r for r in rescored_rows if r.valid_for_approval and r.readiness_status != "needs_review"]
+        merged.append(_merge_system1_upload_row(System1UploadPreviewRow(**raw), overrides.get(rid)))
+    # Filter before scoring: rows without edits keep their preview scores; only edited rows are
+    # re-scored, against the spend denominators of the whole staged batch.
+    merged = [r for r in merged if r.valid_for_approval]
+    edited = [r for r in merged if r.row_id in overrides]
+    if edited:
+        edited_by_id = {r.row_id: r.model_dump() for r in edited}
+        maxima = batch_spend_maxima(
+            [edited_by_id.get(str(r.get("row_id") or ""), r) for r in job_rows]
+        )
+        rescored = {
+            d["row_id"]: System1UploadPreviewRow(**d)
+            for d in enrich_rows_for_preview(list(edited_by_id.values()), spend_maxima=maxima)
+        }
+        merged = [rescored.get(r.row_id, r) for r in merged]
+    selected = [r for r in merged if r.valid_for_approval and r.readiness_status != "needs_review"]
     if not selected:
         raise HTTPException(
             status_code=400,
@@ -2208,55 +2373,54 @@ async def system1_upload_approve(body: System1UploadApproveRequest):
             ),
         )
 
-    session = get_heatmap_db().get_db_session()
-    created_ids: List[int] = []
-    try:
-        for row in selected:
-            comp = row.score_components or {}
-            ius = comp.get("ius_score", {}).get("value")
-            es = comp.get("es_score", {}).get("value")
-            csis = comp.get("csis_score", {}).get("value")
-            eus = comp.get("eus_score", {}).get("value")
-            fis = comp.get("fis_score", {}).get("value")
-            rss = comp.get("rss_score", {}).get("value")
-            scs = comp.get("scs_score", {}).get("value")
-            sas = comp.get("sas_score", {}).get("value")
-            is_new = row.row_type == "new_business"
-            justification = (
-                f"System1 staged scoring ({row.row_type}) by specialist orchestration. "
-                f"Readiness={row.readiness_status}; confidence={row.computed_confidence}."
-            )
-            row_source_name = str(row.source_filename or "").strip()
-            row_source_name_lc = row_source_name.lower()
-            if row_source_name_lc in {"bundle_scan", "scan_bundle", "bundle-scan", "bundle scan"}:
-                # Fused bundle rows are synthesized from multiple uploaded files.
-                row_artifacts = list(uploaded_files)
-            else:
-                row_artifacts = [
-                    f
-                    for f in uploaded_files
-                    if str(f.get("original_filename") or "").strip().lower() == row_source_name_lc
-                ]
-            months_to_expiry = row.months_to_expiry or _months_to_expiry_from_contract_end(row.contract_end_date)
-            score_provenance = {
-                "score_components": comp,
-                "row_type": row.row_type,
-                "source_kind": row.source_kind,
-                "source_filename": row.source_filename,
-                "supporting_artifacts": row_artifacts,
-                "scoring_inputs": {
-                    "contract_end_date": row.contract_end_date.isoformat() if row.contract_end_date else None,
-                    "months_to_expiry": months_to_expiry,
-                    "estimated_spend_usd": row.estimated_spend_usd,
-                    "implementation_timeline_months": row.implementation_timeline_months,
-                    "preferred_supplier_status": row.preferred_supplier_status,
-                    "request_title": row.request_title,
-                    "supplier_name": row.supplier_name,
-                    "category": row.category,
-                    "subcategory": row.subcategory,
-                },
-            }
-            opp = Opportunity(
+    opportunities: List[Opportunity] = []
+    for row in selected:
+        comp = row.score_components or {}
+        ius = comp.get("ius_score", {}).get("value")
+        es = comp.get("es_score", {}).get("value")
+        csis = comp.get("csis_score", {}).get("value")
+        eus = comp.get("eus_score", {}).get("value")
+        fis = comp.get("fis_score", {}).get("value")
+        rss = comp.get("rss_score", {}).get("value")
+        scs = comp.get("scs_score", {}).get("value")
+        sas = comp.get("sas_score", {}).get("value")
+        is_new = row.row_type == "new_business"
+        justification = (
+            f"System1 staged scoring ({row.row_type}) by specialist orchestration. "
+            f"Readiness={row.readiness_status}; confidence={row.computed_confidence}."
+        )
+        row_source_name = str(row.source_filename or "").strip()
+        row_source_name_lc = row_source_name.lower()
+        if row_source_name_lc in {"bundle_scan", "scan_bundle", "bundle-scan", "bundle scan"}:
+            # Fused bundle rows are synthesized from multiple uploaded files.
+            row_artifacts = list(uploaded_files)
+        else:
+            row_artifacts = [
+                f
+                for f in uploaded_files
+                if str(f.get("original_filename") or "").strip().lower() == row_source_name_lc
+            ]
+        months_to_expiry = row.months_to_expiry or _months_to_expiry_from_contract_end(row.contract_end_date)
+        score_provenance = {
+            "score_components": comp,
+            "row_type": row.row_type,
+            "source_kind": row.source_kind,
+            "source_filename": row.source_filename,
+            "supporting_artifacts": row_artifacts,
+            "scoring_inputs": {
+                "contract_end_date": row.contract_end_date.isoformat() if row.contract_end_date else None,
+                "months_to_expiry": months_to_expiry,
+                "estimated_spend_usd": row.estimated_spend_usd,
+                "implementation_timeline_months": row.implementation_timeline_months,
+                "preferred_supplier_status": row.preferred_supplier_status,
+                "request_title": row.request_title,
+                "supplier_name": row.supplier_name,
+                "category": row.category,
+                "subcategory": row.subcategory,
+            },
+        }
+        opportunities.append(
+            Opportunity(
                 contract_id=None if is_new else (row.contract_id or f"CNT-UP-{uuid4().hex[:10].upper()}"),
                 request_id=(f"REQ-UP-{uuid4().hex[:10].upper()}" if is_new else None),
                 supplier_name=row.supplier_name,
@@ -2289,31 +2453,45 @@ async def system1_upload_approve(body: System1UploadApproveRequest):
                 system1_readiness_status=row.readiness_status,
                 system1_warnings_json=json.dumps(row.readiness_warnings or []),
             )
-            session.add(opp)
-            session.commit()
-            session.refresh(opp)
-            created_ids.append(int(opp.id))
+        )
 
+    # One transaction: the unit of work batches the INSERTs (executemany + RETURNING) on flush,
+    # so ids are available without a refresh round trip per row.
+    session = get_heatmap_db().get_db_session()
+    try:
+        session.add_all(opportunities)
+        session.flush()
+        created_ids = [int(o.id) for o in opportunities]
+        session.commit()
     finally:
         session.close()
 
-    run_result = _start_heatmap_pipeline_background()
+    run_result = _start_opportunity_refresh_background(created_ids)
     run_triggered = bool(run_result.get("success"))
-    with _system1_upload_lock:
-        job["status"] = "approved"
-        job["approved_count"] = len(selected)
-        job["created_opportunity_ids"] = created_ids
-        job["run_triggered"] = run_triggered
-        job["warning_rows_count"] = len([r for r in selected if r.readiness_status == "ready_with_warnings"])
-        approved_set = set(body.approved_row_ids or [])
-        kept = [
-            r for r in (job.get("candidates") or [])
-            if str(r.get("row_id") or "") not in approved_set
-        ]
-        job["candidates"] = kept
-        job["total_candidates"] = len(kept)
-        job["valid_candidates"] = sum(1 for r in kept if bool(r.get("valid_for_approval")))
-        _system1_upload_jobs[body.job_id] = job
+    approved_set = set(body.approved_row_ids or [])
+    analysis = dict(job.get("analysis") or {})
+    returned = analysis.get("returned_rows")
+    kept = [
+        r for r in (job.get("candidates") or [])
+        if str(r.get("row_id") or "") not in approved_set
+    ]
+    if returned is not None:
+        # Keep the default preview page aligned with what is left of the top_n block
+        # (0 once every top row is approved).
+        top_ids = {str(r.get("row_id") or "") for r in (job.get("candidates") or [])[:int(returned)]}
+        analysis["returned_rows"] = len(top_ids - approved_set)
+    _system1_job_store.update_job(
+        body.job_id,
+        status="approved",
+        approved_count=len(selected),
+        created_opportunity_ids=created_ids,
+        run_triggered=run_triggered,
+        warning_rows_count=len([r for r in selected if r.readiness_status == "ready_with_warnings"]),
+        candidates=kept,
+        analysis=analysis,
+        total_candidates=len(kept),
+        valid_candidates=sum(1 for r in kept if bool(r.get("valid_for_approval"))),
+    )
 
     return System1UploadApproveResponse(
         success=True,
@@ -2327,8 +2505,7 @@ async def system1_upload_approve(body: System1UploadApproveRequest):
 
 @app.get("/api/system1/upload/jobs/{job_id}", response_model=System1UploadJobStatusResponse)
 async def system1_upload_job_status(job_id: str):
-    with _system1_upload_lock:
-        job = _system1_upload_jobs.get(job_id)
+    job = _system1_job_store.get_job(job_id, include_candidates=False)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
     return System1UploadJobStatusResponse(
@@ -2345,18 +2522,30 @@ async def system1_upload_job_status(job_id: str):
 
 
 @app.get("/api/system1/upload/jobs/{job_id}/preview", response_model=System1UploadPreviewResponse)
-async def system1_upload_job_preview(job_id: str):
-    with _system1_upload_lock:
-        job = _system1_upload_jobs.get(job_id)
-    if not job:
+async def system1_upload_job_preview(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+):
+    """
+    Return staged preview rows; offset/limit page through large jobs without decoding every row.
+    The default first page is the ranked top_n selection; rows beyond it follow in ingestion order.
+    """
+    job = _system1_job_store.get_job(job_id, include_candidates=False)
+    if job and limit is None and offset == 0:
+        returned = (job.get("analysis") or {}).get("returned_rows")
+        if returned is not None:
+            limit = int(returned)
+    page = _system1_job_store.get_candidates(job_id, offset=offset, limit=limit) if job else None
+    if not job or page is None:
         raise HTTPException(status_code=404, detail="Preview job not found or expired.")
-    candidates = [System1UploadPreviewRow(**r) for r in (job.get("candidates") or [])]
-    valid_candidates = sum(1 for c in candidates if c.valid_for_approval)
+    rows, total = page
+    candidates = [System1UploadPreviewRow(**r) for r in rows]
     return System1UploadPreviewResponse(
         job_id=job.get("job_id", job_id),
         status=job.get("status", "unknown"),
-        total_candidates=len(candidates),
-        valid_candidates=valid_candidates,
+        total_candidates=total,
+        valid_candidates=int(job.get("valid_candidates", 0)),
         candidates=candidates,
         parsing_notes=list(job.get("parsing_notes") or []),
         analysis=dict(job.get("analysis") or {}),
@@ -2365,22 +2554,16 @@ async def system1_upload_job_preview(job_id: str):
 
 @app.delete("/api/system1/upload/jobs/{job_id}", response_model=System1UploadJobDeleteResponse)
 async def system1_upload_job_delete(job_id: str):
-    with _system1_upload_lock:
-        removed = _system1_upload_jobs.pop(job_id, None) is not None
+    removed = _system1_job_store.delete_job(job_id)
     return System1UploadJobDeleteResponse(success=True, job_id=job_id, removed=removed)
 
 
 @app.get("/api/system1/upload/active-preview-summary", response_model=System1ActivePreviewSummaryResponse)
 async def system1_upload_active_preview_summary():
-    with _system1_upload_lock:
-        jobs = list(_system1_upload_jobs.values())
-    if not jobs:
+    latest = _system1_job_store.latest_job()
+    if not latest:
         return System1ActivePreviewSummaryResponse()
 
-    def _created_key(j: Dict[str, Any]) -> str:
-        return str(j.get("created_at") or "")
-
-    latest = sorted(jobs, key=_created_key, reverse=True)[0]
     raw_rows = list(latest.get("candidates") or [])
     total_rows = len(raw_rows)
     ready_rows = 0
@@ -4,10 +4,12 @@ Database connection and initialization for SQLite data lake.
 import os
 import tempfile
 from pathlib import Path
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import SQLModel, Session
 from sqlalchemy import text
 from typing import Generator
 
+from backend.persistence.sqlite_engine import create_sqlite_engine
+
 # Database path - use temp directory for Streamlit Cloud (read-only filesystem)
 def _get_db_path() -> Path:
     """Get writable database path."""
@@ -27,8 +29,9 @@ def _get_db_path() -> Path:
 DB_PATH = _get_db_path()
 DB_URL = f"sqlite:///{DB_PATH}"
 
-# Engine singleton
+# Engine singletons (read-write and read-only pools)
 _engine = None
+_read_engine = None
 
 
 def get_engine():
@@ -37,14 +40,19 @@ def get_engine():
     if _engine is None:
         # Ensure data directory exists
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _engine = create_engine(
-            DB_URL,
-            echo=False,
-            connect_args={"check_same_thread": False}
-        )
+        _engine = create_sqlite_engine(DB_PATH)
     return _engine
 
 
+def get_read_engine():
+    """Engine whose connections reject writes; used by read-only endpoints."""
+    global _read_engine
+    if _read_engine is None:
+        get_engine()  # creates the file and switches it to WAL first
+        _read_engine = create_sqlite_engine(DB_PATH, read_only=True)
+    return _read_engine
+
+
 def _sqlite_add_column_if_missing(table: str, column: str, ddl: str) -> None:
     """Best-effort migration for existing SQLite files (create_all does not add columns)."""
     engine = get_engine()
@@ -72,6 +80,9 @@ def init_db():
     _sqlite_add_column_if_missing("case_states", "cancel_reason_code", "cancel_reason_code TEXT")
     _sqlite_add_column_if_missing("case_states", "cancel_reason_text", "cancel_reason_text TEXT")
     _sqlite_add_column_if_missing("case_states", "cancelled_at", "cancelled_at TEXT")
+    from backend.persistence.migrations import APP_MIGRATIONS, apply_migrations
+
+    apply_migrations(engine, APP_MIGRATIONS)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -87,6 +98,11 @@ def get_db_session() -> Session:
     return Session(engine)
 
 
+def get_read_session() -> Session:
+    """Get a read-only database session (writes raise OperationalError)."""
+    return Session(get_read_engine())
+
+
 # Initialize on import
 try:
     init_db()
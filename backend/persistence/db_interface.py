@@ -23,3 +23,7 @@ class DatabaseInterface(ABC):
     def get_db_session(self) -> Session:
         """Get a database session (non-generator)."""
         pass
+
+    def get_read_session(self) -> Session:
+        """Session for read-only work; backends without a separate read pool reuse get_db_session."""
+        return self.get_db_session()
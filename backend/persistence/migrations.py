@@ -0,0 +1,137 @@
+"""
+Versioned schema migrations for the SQLite databases.
+
+`create_all` only creates missing tables, so anything added to an existing file (indexes,
+derived tables) goes here as an ordered, append-only `Migration`. Applied ids are recorded in
+`schema_migrations`; `apply_migrations` runs each pending migration once, in its own
+transaction, after `create_all` at startup. Never edit a shipped migration — add a new one.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    id: str
+    description: str
+    statements: Tuple[str, ...] = ()
+    # (table, column, column DDL) added only when missing: SQLite has no ADD COLUMN IF NOT EXISTS,
+    # and files created after the model gained the column already have it from create_all.
+    columns: Tuple[Tuple[str, str, str], ...] = ()
+
+
+def revision_counter_statements(*tables: str) -> Tuple[str, ...]:
+    """
+    `table_revision` row per table, bumped by triggers on every insert/update/delete. Read
+    endpoints turn these counters into ETags without scanning the tables themselves.
+    """
+    stmts = ["CREATE TABLE IF NOT EXISTS table_revision (name TEXT PRIMARY KEY, revision INTEGER NOT NULL)"]
+    for table in tables:
+        stmts.append(f"INSERT OR IGNORE INTO table_revision (name, revision) VALUES ('{table}', 0)")
+        for op, suffix in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            stmts.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_rev_{table}_{suffix} AFTER {op} ON {table} BEGIN "
+                f"UPDATE table_revision SET revision = revision + 1 WHERE name = '{table}'; END"
+            )
+    return tuple(stmts)
+
+
+APP_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        "app_0001_hot_query_indexes",
+        "Case list ordering/filters and per-case chat history",
+        (
+            "CREATE INDEX IF NOT EXISTS ix_case_states_updated_at ON case_states (updated_at)",
+            "CREATE INDEX IF NOT EXISTS ix_case_states_status_updated_at ON case_states (status, updated_at)",
+            "CREATE INDEX IF NOT EXISTS ix_case_states_dtp_stage_updated_at ON case_states (dtp_stage, updated_at)",
+            "CREATE INDEX IF NOT EXISTS ix_chat_messages_case_id_created_at ON chat_messages (case_id, created_at)",
+        ),
+    ),
+    Migration(
+        "app_0002_revision_counters",
+        "Revision counters for ETags on case detail / document center",
+        revision_counter_statements("supplier_performance", "document_records"),
+    ),
+    Migration(
+        "app_0003_chat_message_context_tokens",
+        "Per-message prompt token count for conversation context windows",
+        columns=(("chat_messages", "context_tokens", "context_tokens INTEGER"),),
+    ),
+    Migration(
+        "app_0004_ingestion_log_revision_counter",
+        "Revision counter for ETags on ingestion history",
+        revision_counter_statements("ingestion_log"),
+    ),
+)
+
+HEATMAP_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        "heatmap_0001_hot_query_indexes",
+        "Opportunity ranking/status rollups, feedback history and pipeline audit lookups",
+        (
+            "CREATE INDEX IF NOT EXISTS ix_opportunity_total_score ON opportunity (total_score)",
+            "CREATE INDEX IF NOT EXISTS ix_opportunity_source ON opportunity (source)",
+            "CREATE INDEX IF NOT EXISTS ix_opportunity_status_tier ON opportunity (status, tier)",
+            "CREATE INDEX IF NOT EXISTS ix_reviewfeedback_opportunity_id_timestamp "
+            "ON reviewfeedback (opportunity_id, timestamp)",
+            "CREATE INDEX IF NOT EXISTS ix_reviewfeedback_timestamp ON reviewfeedback (timestamp)",
+            "CREATE INDEX IF NOT EXISTS ix_auditlog_event_type_timestamp ON auditlog (event_type, timestamp)",
+        ),
+    ),
+    Migration(
+        "heatmap_0002_revision_counters",
+        "Revision counters for ETags on opportunity list / KPI dashboard",
+        revision_counter_statements(
+            "opportunity", "reviewfeedback", "auditlog", "heatmapprocurabotfeedback", "heatmaplearnedweights"
+        ),
+    ),
+)
+
+
+def applied_migrations(engine: Engine) -> List[str]:
+    with engine.connect() as conn:
+        exists = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'")
+        ).fetchone()
+        if not exists:
+            return []
+        return [r[0] for r in conn.execute(text("SELECT id FROM schema_migrations ORDER BY applied_at, id"))]
+
+
+def apply_migrations(engine: Engine, migrations: Sequence[Migration]) -> List[str]:
+    """Run pending migrations in order; returns the ids applied by this call."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations "
+                "(id TEXT PRIMARY KEY, description TEXT NOT NULL, applied_at TEXT NOT NULL)"
+            )
+        )
+    done = set(applied_migrations(engine))
+    applied: List[str] = []
+    for m in migrations:
+        if m.id in done:
+            continue
+        with engine.begin() as conn:
+            for table, column, ddl in m.columns:
+                existing = {r[1] for r in conn.execute(text(f"PRAGMA table_info({table})"))}
+                if column not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+            for stmt in m.statements:
+                conn.execute(text(stmt))
+            conn.execute(
+                text("INSERT INTO schema_migrations (id, description, applied_at) VALUES (:id, :d, :at)"),
+                {"id": m.id, "d": m.description, "at": datetime.now(timezone.utc).isoformat()},
+            )
+        logger.info("Applied migration %s", m.id)
+        applied.append(m.id)
+    return applied
@@ -330,7 +330,8 @@ class ChatMessage(SQLModel, table=True):
     # Metadata
     intent_classified: Optional[str] = None
     agents_called: Optional[str] = None  # JSON array
-    tokens_used: Optional[int] = None
+    tokens_used: Optional[int] = None  # LLM usage reported by the caller
+    context_tokens: Optional[int] = None  # Prompt tokens of this message, for context assembly
     estimated_cost_usd: Optional[float] = None
     
     # Timestamps
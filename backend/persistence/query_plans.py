@@ -0,0 +1,119 @@
+"""
+Registry of hot queries and an EXPLAIN QUERY PLAN checker.
+
+Each `HotQuery` mirrors a query issued by a listing/dashboard endpoint or service. The test
+suite builds both schemas (create_all + migrations) and fails if any registered query still
+scans a whole table or sorts through a temp B-tree, so index regressions show up before the
+data grows. Add an entry here whenever a new endpoint filters or orders a growing table.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+
+from backend.heatmap.persistence.heatmap_models import AuditLog, Opportunity, ReviewFeedback
+from backend.persistence.models import CaseState, ChatMessage
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    db: str  # "app" | "heatmap"
+    build: Callable[[], object]
+
+
+HOT_QUERIES: List[HotQuery] = [
+    # CaseService.list_cases
+    HotQuery("cases.list", "app", lambda: select(CaseState).order_by(CaseState.updated_at.desc()).limit(50)),
+    HotQuery(
+        "cases.list_by_status",
+        "app",
+        lambda: select(CaseState).where(CaseState.status == "In Progress").order_by(CaseState.updated_at.desc()).limit(50),
+    ),
+    HotQuery(
+        "cases.list_by_stage",
+        "app",
+        lambda: select(CaseState).where(CaseState.dtp_stage == "DTP-02").order_by(CaseState.updated_at.desc()).limit(50),
+    ),
+    # ConversationContextManager.get_recent_messages
+    HotQuery(
+        "chat.recent_messages",
+        "app",
+        lambda: select(ChatMessage)
+        .where(ChatMessage.case_id == "CASE-0001")
+        .order_by(ChatMessage.created_at.desc())
+        .limit(50),
+    ),
+    # heatmap_router: feedback history, pipeline audit, dashboard rollups, feedback counts
+    HotQuery(
+        "heatmap.feedback_history",
+        "heatmap",
+        lambda: select(ReviewFeedback)
+        .where(ReviewFeedback.opportunity_id == 1)
+        .order_by(ReviewFeedback.timestamp.desc())
+        .limit(50),
+    ),
+    HotQuery(
+        "heatmap.last_pipeline_audit",
+        "heatmap",
+        lambda: select(AuditLog)
+        .where(AuditLog.event_type == "HEATMAP_PIPELINE_RUN")
+        .order_by(AuditLog.timestamp.desc())
+        .limit(1),
+    ),
+    HotQuery(
+        "heatmap.dashboard_status_tier_counts",
+        "heatmap",
+        lambda: select(Opportunity.status, Opportunity.tier, func.count())
+        .group_by(Opportunity.status, Opportunity.tier),
+    ),
+    HotQuery(
+        "heatmap.dashboard_pending_ages",
+        "heatmap",
+        lambda: select(Opportunity.record_created_at).where(Opportunity.status == "Pending"),
+    ),
+    HotQuery(
+        "heatmap.feedback_counts",
+        "heatmap",
+        lambda: select(ReviewFeedback.opportunity_id, func.count()).group_by(ReviewFeedback.opportunity_id),
+    ),
+    # heatmap_copilot context builders
+    HotQuery(
+        "heatmap.copilot_top_opportunities",
+        "heatmap",
+        lambda: select(Opportunity).order_by(Opportunity.total_score.desc()).limit(25),
+    ),
+    HotQuery(
+        "heatmap.copilot_recent_feedback",
+        "heatmap",
+        lambda: select(ReviewFeedback).order_by(ReviewFeedback.timestamp.desc()).limit(30),
+    ),
+    # System 1 upload reset / batch pipeline re-run
+    HotQuery(
+        "heatmap.opportunities_by_source",
+        "heatmap",
+        lambda: select(Opportunity.id).where(Opportunity.source == "upload_staged"),
+    ),
+]
+
+
+def explain(conn: Connection, statement) -> List[str]:
+    """`EXPLAIN QUERY PLAN` detail lines for a SQLAlchemy statement (literal-bound)."""
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    return [str(row[3]) for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def plan_problems(details: List[str]) -> List[str]:
+    """Plan steps that read a whole table without an index or sort in a temp B-tree."""
+    bad = []
+    for d in details:
+        if d.startswith("SCAN ") and " USING " not in d:
+            bad.append(d)
+        elif d.startswith("USE TEMP B-TREE"):
+            bad.append(d)
+    return bad
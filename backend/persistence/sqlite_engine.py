@@ -0,0 +1,126 @@
+"""
+Tuned SQLAlchemy engines for the SQLite files (datalake.db, heatmap.db).
+
+Every connection gets WAL journaling (readers never block the writer), a busy timeout so
+concurrent writers wait instead of failing with "database is locked", synchronous=NORMAL
+(durable in WAL, no fsync per commit), a larger page cache and memory-mapped reads. Each
+database has a read-write pool and a separate read-only pool (`PRAGMA query_only`) for GET
+endpoints, so list/detail reads do not queue behind background writers.
+
+Lock-wait metrics (see utils.metrics): pool checkout wait, commit duration (where write-lock
+waits and fsync show up) and "database is locked" errors, per database file.
+
+Env:
+- SQLITE_BUSY_TIMEOUT_MS (default 15000)
+- SQLITE_CACHE_SIZE_KB (default 20000)
+- SQLITE_MMAP_SIZE_MB (default 256; 0 disables)
+- SQLITE_POOL_SIZE (default 5), SQLITE_MAX_OVERFLOW (default 10), SQLITE_POOL_TIMEOUT (default 30 s)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session, create_engine
+
+from utils.metrics import DB_COMMIT_SECONDS, DB_LOCK_ERRORS, DB_POOL_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    metrics_db = ""
+    metrics_mode = ""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - t0, db=self.metrics_db, mode=self.metrics_mode)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_db, pool.metrics_mode = self.metrics_db, self.metrics_mode
+        return pool
+
+
+def _apply_pragmas(dbapi_conn, read_only: bool) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute(f"PRAGMA busy_timeout = {_env_int('SQLITE_BUSY_TIMEOUT_MS', 15000)}")
+        if not read_only:
+            # Persistent in the file header; a read-only filesystem keeps the old mode.
+            try:
+                cur.execute("PRAGMA journal_mode = WAL")
+            except Exception as e:
+                logger.warning("SQLite WAL not enabled: %s", e)
+        cur.execute("PRAGMA synchronous = NORMAL")
+        cur.execute(f"PRAGMA cache_size = -{_env_int('SQLITE_CACHE_SIZE_KB', 20000)}")
+        cur.execute(f"PRAGMA mmap_size = {_env_int('SQLITE_MMAP_SIZE_MB', 256) * 1024 * 1024}")
+        cur.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            cur.execute("PRAGMA query_only = ON")
+    finally:
+        cur.close()
+
+
+def create_sqlite_engine(db_path: Path, *, read_only: bool = False) -> Engine:
+    """Pooled engine for `db_path`; `read_only=True` rejects writes on its connections."""
+    db_path = Path(db_path)
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=_TimedQueuePool,
+        pool_size=_env_int("SQLITE_POOL_SIZE", 5),
+        max_overflow=_env_int("SQLITE_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("SQLITE_POOL_TIMEOUT", 30),
+    )
+    engine.pool.metrics_db = db_path.name
+    engine.pool.metrics_mode = "ro" if read_only else "rw"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        _apply_pragmas(dbapi_conn, read_only)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(ctx):
+        msg = str(ctx.original_exception).lower()
+        if "database is locked" in msg or "database is busy" in msg:
+            DB_LOCK_ERRORS.inc(db=db_path.name)
+
+    return engine
+
+
+def _session_db(session: Session) -> str:
+    try:
+        return os.path.basename(session.get_bind().url.database or "") or "memory"
+    except Exception:
+        return "unknown"
+
+
+@event.listens_for(Session, "before_commit")
+def _commit_started(session: Session) -> None:
+    session.info["_commit_t0"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_finished(session: Session) -> None:
+    t0 = session.info.pop("_commit_t0", None)
+    if t0 is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - t0, db=_session_db(session))
@@ -0,0 +1,484 @@
+"""
+SQLite-backed LangGraph checkpointer for the case workflow (one thread per case id).
+
+A chat turn on a case with a checkpoint resumes from the saved `PipelineState` and only sends
+the per-turn inputs, instead of rebuilding the whole state from the case tables. Storage is
+delta-based: each checkpoint row holds versions and metadata only; channel values are stored
+once per distinct content (keyed by digest) and a new checkpoint just points at them, so an
+unchanged case summary, memory or agent output is not written again. Old checkpoints of a
+thread are compacted after every save, keeping the newest `keep`.
+
+`thread_revision` / `set_thread_revision` record which case revision a thread was last synced
+with; callers fall back to a full rebuild when the case changed outside the workflow.
+
+Env:
+- WORKFLOW_CHECKPOINTS: `1` (default) enables resuming chat turns from checkpoints; `0` disables
+- WORKFLOW_CHECKPOINT_PATH: database file (default `workflow_checkpoints.db` beside datalake.db)
+- WORKFLOW_CHECKPOINT_KEEP: checkpoints kept per case (default 3)
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import logging
+import os
+import random
+import threading
+from collections import Counter
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import bindparam, text
+
+from backend.persistence.sqlite_engine import create_sqlite_engine
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS workflow_checkpoints ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL DEFAULT '', checkpoint_id TEXT NOT NULL,"
+    " parent_checkpoint_id TEXT, type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    # (channel, version) -> content digest; NULL digest marks a channel that was cleared.
+    "CREATE TABLE IF NOT EXISTS workflow_channel_versions ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL DEFAULT '', channel TEXT NOT NULL,"
+    " version TEXT NOT NULL, digest TEXT,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS workflow_channel_values ("
+    " thread_id TEXT NOT NULL, digest TEXT NOT NULL, type TEXT, value BLOB,"
+    " PRIMARY KEY (thread_id, digest))",
+    "CREATE TABLE IF NOT EXISTS workflow_writes ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL DEFAULT '', checkpoint_id TEXT NOT NULL,"
+    " task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, type TEXT, value BLOB,"
+    " task_path TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE TABLE IF NOT EXISTS workflow_threads (thread_id TEXT PRIMARY KEY, revision TEXT)",
+)
+
+DEFAULT_KEEP = 3
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def checkpoints_enabled() -> bool:
+    return os.getenv("WORKFLOW_CHECKPOINTS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _default_path() -> Path:
+    env = os.getenv("WORKFLOW_CHECKPOINT_PATH")
+    if env:
+        return Path(env)
+    from backend.persistence.database import DB_PATH
+
+    return DB_PATH.parent / "workflow_checkpoints.db"
+
+
+def _digest(typed: Tuple[str, bytes]) -> str:
+    return hashlib.blake2b(typed[0].encode() + b"\0" + typed[1], digest_size=16).hexdigest()
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """Checkpoints in SQLite with content-addressed channel values and per-thread compaction."""
+
+    def __init__(self, db_path: Optional[Path] = None, keep: Optional[int] = None, serde=None):
+        super().__init__(serde=serde)
+        self.db_path = Path(db_path) if db_path else _default_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.keep = max(1, keep if keep is not None else _env_int("WORKFLOW_CHECKPOINT_KEEP", DEFAULT_KEEP))
+        self.engine = create_sqlite_engine(self.db_path)
+        self._write_lock = threading.Lock()
+        with self.engine.begin() as conn:
+            for ddl in _SCHEMA:
+                conn.execute(text(ddl))
+
+    # ------------------------------------------------------------------ reads
+
+    def _load_values(self, conn, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        if not versions:
+            return {}
+        rows = conn.execute(
+            text(
+                "SELECT channel, version, digest FROM workflow_channel_versions "
+                "WHERE thread_id = :t AND checkpoint_ns = :ns AND channel IN :channels"
+            ).bindparams(bindparam("channels", expanding=True)),
+            {"t": thread_id, "ns": checkpoint_ns, "channels": list(versions)},
+        ).fetchall()
+        wanted = {(k, str(v)) for k, v in versions.items()}
+        digests = {ch: d for ch, ver, d in rows if d and (ch, ver) in wanted}
+        if not digests:
+            return {}
+        stored = {
+            d: (typ, blob)
+            for d, typ, blob in conn.execute(
+                text(
+                    "SELECT digest, type, value FROM workflow_channel_values WHERE thread_id = :t AND digest IN :d"
+                ).bindparams(bindparam("d", expanding=True)),
+                {"t": thread_id, "d": sorted(set(digests.values()))},
+            ).fetchall()
+        }
+        return {ch: self.serde.loads_typed(stored[d]) for ch, d in digests.items() if d in stored}
+
+    def _load_writes(self, conn, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = conn.execute(
+            text(
+                "SELECT task_id, channel, type, value FROM workflow_writes "
+                "WHERE thread_id = :t AND checkpoint_ns = :ns AND checkpoint_id = :c "
+                "ORDER BY task_path, task_id, idx"
+            ),
+            {"t": thread_id, "ns": checkpoint_ns, "c": checkpoint_id},
+        ).fetchall()
+        return [(task_id, channel, self.serde.loads_typed((typ, blob))) for task_id, channel, typ, blob in rows]
+
+    def _tuple(self, conn, thread_id: str, row) -> CheckpointTuple:
+        checkpoint_ns, checkpoint_id, parent_id, typ, blob, meta_type, metadata = row
+        checkpoint = self.serde.loads_typed((typ, blob))
+        values = self._load_values(conn, thread_id, checkpoint_ns, checkpoint["channel_versions"])
+
+        def _config(cid: str) -> RunnableConfig:
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": cid}}
+
+        return CheckpointTuple(
+            config=_config(checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((meta_type, metadata)),
+            parent_config=_config(parent_id) if parent_id else None,
+            pending_writes=self._load_writes(conn, thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        sql = (
+            "SELECT checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM workflow_checkpoints WHERE thread_id = :t AND checkpoint_ns = :ns "
+        )
+        params = {"t": thread_id, "ns": checkpoint_ns}
+        if checkpoint_id:
+            sql += "AND checkpoint_id = :c"
+            params["c"] = checkpoint_id
+        else:
+            sql += "ORDER BY checkpoint_id DESC LIMIT 1"
+        with self.engine.connect() as conn:
+            row = conn.execute(text(sql), params).first()
+            return self._tuple(conn, thread_id, row) if row else None
+
+    def read_channels(self, thread_id: str, channels: Sequence[str], checkpoint_ns: str = "") -> Optional[Dict[str, Any]]:
+        """Selected channel values of the thread's latest checkpoint (None if it has none)."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT type, checkpoint FROM workflow_checkpoints WHERE thread_id = :t AND checkpoint_ns = :ns "
+                    "ORDER BY checkpoint_id DESC LIMIT 1"
+                ),
+                {"t": thread_id, "ns": checkpoint_ns},
+            ).first()
+            if row is None:
+                return None
+            versions = self.serde.loads_typed((row[0], row[1]))["channel_versions"]
+            wanted = {c: versions[c] for c in channels if c in versions}
+            return self._load_values(conn, thread_id, checkpoint_ns, wanted)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], {}
+        if config:
+            clauses.append("thread_id = :t")
+            params["t"] = config["configurable"]["thread_id"]
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = :ns")
+                params["ns"] = config["configurable"]["checkpoint_ns"]
+            if get_checkpoint_id(config):
+                clauses.append("checkpoint_id = :c")
+                params["c"] = get_checkpoint_id(config)
+        if before and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < :before")
+            params["before"] = get_checkpoint_id(before)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            f"FROM workflow_checkpoints {where}ORDER BY checkpoint_id DESC"
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(sql), params).fetchall()
+            for row in rows:
+                if limit is not None and limit <= 0:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                if limit is not None:
+                    limit -= 1
+                yield self._tuple(conn, row[0], row[1:])
+
+    # ----------------------------------------------------------------- writes
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+        version_rows, value_rows = [], {}
+        for channel, version in new_versions.items():
+            digest = None
+            if channel in values:
+                typed = self.serde.dumps_typed(values[channel])
+                digest = _digest(typed)
+                value_rows[digest] = {"t": thread_id, "d": digest, "type": typed[0], "v": typed[1]}
+            version_rows.append({"t": thread_id, "ns": checkpoint_ns, "ch": channel, "ver": str(version), "d": digest})
+        typ, blob = self.serde.dumps_typed(c)
+        meta_type, meta = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._write_lock, self.engine.begin() as conn:
+            if value_rows:
+                # Unchanged content is already stored for this thread; only new values add bytes.
+                conn.execute(
+                    text(
+                        "INSERT OR IGNORE INTO workflow_channel_values (thread_id, digest, type, value) "
+                        "VALUES (:t, :d, :type, :v)"
+                    ),
+                    list(value_rows.values()),
+                )
+            if version_rows:
+                conn.execute(
+                    text(
+                        "INSERT OR REPLACE INTO workflow_channel_versions "
+                        "(thread_id, checkpoint_ns, channel, version, digest) VALUES (:t, :ns, :ch, :ver, :d)"
+                    ),
+                    version_rows,
+                )
+            conn.execute(
+                text(
+                    "INSERT OR REPLACE INTO workflow_checkpoints "
+                    "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                    "VALUES (:t, :ns, :c, :p, :type, :cp, :mt, :m)"
+                ),
+                {
+                    "t": thread_id,
+                    "ns": checkpoint_ns,
+                    "c": checkpoint["id"],
+                    "p": config["configurable"].get("checkpoint_id"),
+                    "type": typ,
+                    "cp": blob,
+                    "mt": meta_type,
+                    "m": meta,
+                },
+            )
+            self._compact(conn, thread_id, self.keep)
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            typ, blob = self.serde.dumps_typed(value)
+            rows.append({
+                "t": thread_id, "ns": checkpoint_ns, "c": checkpoint_id, "task": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx), "ch": channel, "type": typ, "v": blob, "path": task_path,
+            })
+        if not rows:
+            return
+        # Special channels (errors, interrupts) overwrite; regular writes are idempotent per task.
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        with self._write_lock, self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"{verb} INTO workflow_writes "
+                    "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                    "VALUES (:t, :ns, :c, :task, :idx, :ch, :type, :v, :path)"
+                ),
+                rows,
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._write_lock, self.engine.begin() as conn:
+            for table in (
+                "workflow_checkpoints", "workflow_channel_versions", "workflow_channel_values",
+                "workflow_writes", "workflow_threads",
+            ):
+                conn.execute(text(f"DELETE FROM {table} WHERE thread_id = :t"), {"t": thread_id})
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        # Same scheme as InMemorySaver: zero-padded counter (sortable as text) + random suffix.
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(str(current).split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------- compaction
+
+    def compact(self, thread_id: str, keep: Optional[int] = None) -> int:
+        """Drop all but the newest `keep` checkpoints per namespace; returns checkpoints removed."""
+        with self._write_lock, self.engine.begin() as conn:
+            return self._compact(conn, thread_id, max(1, keep if keep is not None else self.keep))
+
+    def _compact(self, conn, thread_id: str, keep: int) -> int:
+        rows = conn.execute(
+            text(
+                "SELECT checkpoint_ns, checkpoint_id FROM workflow_checkpoints "
+                "WHERE thread_id = :t ORDER BY checkpoint_id DESC"
+            ),
+            {"t": thread_id},
+        ).fetchall()
+        seen: Counter = Counter()
+        dropped = []
+        for ns, checkpoint_id in rows:
+            seen[ns] += 1
+            if seen[ns] > keep:
+                dropped.append({"t": thread_id, "ns": ns, "c": checkpoint_id})
+        if not dropped:
+            return 0
+        for table in ("workflow_checkpoints", "workflow_writes"):
+            conn.execute(
+                text(f"DELETE FROM {table} WHERE thread_id = :t AND checkpoint_ns = :ns AND checkpoint_id = :c"),
+                dropped,
+            )
+        conn.execute(
+            text(
+                "UPDATE workflow_checkpoints SET parent_checkpoint_id = NULL "
+                "WHERE thread_id = :t AND checkpoint_ns = :ns AND parent_checkpoint_id = :c"
+            ),
+            dropped,
+        )
+
+        # Versions still referenced by a kept checkpoint; everything else (and any value no
+        # longer pointed at) goes.
+        referenced = set()
+        for ns, typ, blob in conn.execute(
+            text("SELECT checkpoint_ns, type, checkpoint FROM workflow_checkpoints WHERE thread_id = :t"),
+            {"t": thread_id},
+        ).fetchall():
+            for channel, version in self.serde.loads_typed((typ, blob))["channel_versions"].items():
+                referenced.add((ns, channel, str(version)))
+        stale = [
+            {"t": thread_id, "ns": ns, "ch": channel, "ver": version}
+            for ns, channel, version in conn.execute(
+                text("SELECT checkpoint_ns, channel, version FROM workflow_channel_versions WHERE thread_id = :t"),
+                {"t": thread_id},
+            ).fetchall()
+            if (ns, channel, version) not in referenced
+        ]
+        if stale:
+            conn.execute(
+                text(
+                    "DELETE FROM workflow_channel_versions "
+                    "WHERE thread_id = :t AND checkpoint_ns = :ns AND channel = :ch AND version = :ver"
+                ),
+                stale,
+            )
+        conn.execute(
+            text(
+                "DELETE FROM workflow_channel_values WHERE thread_id = :t AND digest NOT IN "
+                "(SELECT digest FROM workflow_channel_versions WHERE thread_id = :t AND digest IS NOT NULL)"
+            ),
+            {"t": thread_id},
+        )
+        return len(dropped)
+
+    # ------------------------------------------------------- case revisions
+
+    def thread_revision(self, thread_id: str) -> Optional[str]:
+        """Case revision the thread's latest checkpoint was synced with (None if never)."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text("SELECT revision FROM workflow_threads WHERE thread_id = :t"), {"t": thread_id}
+            ).scalar()
+
+    def set_thread_revision(self, thread_id: str, revision: Optional[str]) -> None:
+        with self._write_lock, self.engine.begin() as conn:
+            conn.execute(
+                text("INSERT OR REPLACE INTO workflow_threads (thread_id, revision) VALUES (:t, :r)"),
+                {"t": thread_id, "r": revision},
+            )
+
+    def stats(self, thread_id: str) -> Dict[str, int]:
+        """Checkpoint count and stored bytes for one thread."""
+        with self.engine.connect() as conn:
+            checkpoints, checkpoint_bytes = conn.execute(
+                text(
+                    "SELECT count(*), coalesce(sum(length(checkpoint) + length(metadata)), 0) "
+                    "FROM workflow_checkpoints WHERE thread_id = :t"
+                ),
+                {"t": thread_id},
+            ).one()
+            values, value_bytes = conn.execute(
+                text("SELECT count(*), coalesce(sum(length(value)), 0) FROM workflow_channel_values WHERE thread_id = :t"),
+                {"t": thread_id},
+            ).one()
+        return {
+            "checkpoints": int(checkpoints),
+            "values": int(values),
+            "bytes": int(checkpoint_bytes) + int(value_bytes),
+        }
+
+
+def _state_serde() -> JsonPlusSerializer:
+    """Serializer allowed to restore the pydantic models and enums the workflow state holds."""
+    import shared.schemas
+    import utils.case_memory
+    import utils.execution_constraints
+    import utils.schemas
+    from pydantic import BaseModel
+
+    allowed = []
+    for module in (utils.schemas, shared.schemas, utils.case_memory, utils.execution_constraints):
+        for name, obj in vars(module).items():
+            if inspect.isclass(obj) and obj.__module__ == module.__name__ and issubclass(obj, (BaseModel, Enum)):
+                allowed.append((module.__name__, name))
+    return JsonPlusSerializer(allowed_msgpack_modules=allowed)
+
+
+_checkpointer: Optional[SQLiteCheckpointSaver] = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_workflow_checkpointer() -> SQLiteCheckpointSaver:
+    """Get or create the workflow checkpointer singleton."""
+    global _checkpointer
+    if _checkpointer is None:
+        with _checkpointer_lock:
+            if _checkpointer is None:
+                _checkpointer = SQLiteCheckpointSaver(serde=_state_serde())
+    return _checkpointer
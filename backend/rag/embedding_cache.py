@@ -0,0 +1,257 @@
+"""
+Persistent embedding cache shared by the RAG and heatmap vector stores.
+
+Tasks, the heatmap copilot and feedback memory issue the same retrieval queries over and
+over, and each `embed_query` is a network round trip. `CachedEmbeddings` wraps a LangChain
+embeddings client and keys vectors by (model, whitespace-normalized text): a small in-process
+LRU answers hot queries, and a SQLite table (float32 blobs) keeps vectors across restarts.
+The table is trimmed least-recently-used first once it exceeds EMBEDDING_CACHE_MAX_ENTRIES.
+`embed_documents` goes through the same cache, so re-ingesting unchanged chunks is free too.
+
+Hits and misses are counted as cache_requests_total{cache="embedding"}; `stats()` breaks
+them down by tier.
+
+Env:
+- EMBEDDING_CACHE_MAX_ENTRIES (default 20000; 0 disables the cache)
+- EMBEDDING_CACHE_MEMORY_ENTRIES (default 1024)
+- EMBEDDING_CACHE_PATH (default data/embedding_cache.db)
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from backend.persistence.sqlite_engine import create_sqlite_engine
+from utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS embedding_cache ("
+    "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL, "
+    "last_used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_embedding_cache_last_used ON embedding_cache (last_used)",
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def normalize_text(value: str) -> str:
+    """Collapse whitespace; case is kept because embedding models are case-sensitive."""
+    return " ".join((value or "").split())
+
+
+def _is_azure(embeddings: Any) -> bool:
+    try:
+        from langchain_openai import AzureOpenAIEmbeddings
+    except ImportError:
+        return False
+    return isinstance(embeddings, AzureOpenAIEmbeddings)
+
+
+def model_name(embeddings: Any) -> str:
+    """
+    Model behind a LangChain embeddings client: the deployment for Azure OpenAI, else `model`.
+    Plain `OpenAIEmbeddings` also has a `deployment` field that defaults to ada-002 whatever
+    `model` is, so it is only read for Azure clients.
+    """
+    name = getattr(embeddings, "deployment", None) if _is_azure(embeddings) else None
+    return name or getattr(embeddings, "model", None) or ""
+
+
+def model_id(embeddings: Any) -> str:
+    """Stable id of the model behind a LangChain embeddings client (client type, model, dimensions)."""
+    dims = getattr(embeddings, "dimensions", None)
+    return f"{type(embeddings).__name__}:{model_name(embeddings)}" + (f":{dims}" if dims else "")
+
+
+def _key(model: str, normalized: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) vector cache."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: Optional[int] = None, memory_entries: Optional[int] = None):
+        self.db_path = Path(db_path or os.getenv("EMBEDDING_CACHE_PATH") or Path(__file__).resolve().parents[2] / "data" / "embedding_cache.db")
+        self.max_entries = _env_int("EMBEDDING_CACHE_MAX_ENTRIES", 20000) if max_entries is None else max_entries
+        self.memory_entries = _env_int("EMBEDDING_CACHE_MEMORY_ENTRIES", 1024) if memory_entries is None else memory_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.engine = None
+        if self.max_entries > 0:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.engine = create_sqlite_engine(self.db_path)
+            with self.engine.begin() as conn:
+                for stmt in _SCHEMA:
+                    conn.execute(text(stmt))
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for `texts` (None where missing), refreshing their LRU position."""
+        keys = [_key(model, normalize_text(t)) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(keys)
+        pending: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, k in enumerate(keys):
+                vec = self._memory.get(k)
+                if vec is not None:
+                    self._memory.move_to_end(k)
+                    out[i] = vec
+                    self._stats["memory_hits"] += 1
+                else:
+                    pending.setdefault(k, []).append(i)
+        disk_hits = 0
+        if pending and self.enabled:
+            found = self._load(list(pending))
+            for k, vec in found.items():
+                self._remember(k, vec)
+                for i in pending.pop(k):
+                    out[i] = vec
+                    disk_hits += 1
+        with self._lock:
+            self._stats["disk_hits"] += disk_hits
+            self._stats["misses"] += sum(len(idxs) for idxs in pending.values())
+        for vec in out:
+            record_cache("embedding", vec is not None)
+        return out
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        now = time.time()
+        rows = []
+        for t, vec in zip(texts, vectors):
+            k = _key(model, normalize_text(t))
+            vec = [float(x) for x in vec]
+            self._remember(k, vec)
+            rows.append({"k": k, "m": model, "d": len(vec), "v": array("f", vec).tobytes(), "t": now})
+        if not rows or not self.enabled:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT OR REPLACE INTO embedding_cache (key, model, dim, vector, last_used) "
+                        "VALUES (:k, :m, :d, :v, :t)"
+                    ),
+                    rows,
+                )
+                excess = int(conn.execute(text("SELECT count(*) FROM embedding_cache")).scalar() or 0) - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        text(
+                            "DELETE FROM embedding_cache WHERE key IN "
+                            "(SELECT key FROM embedding_cache ORDER BY last_used LIMIT :n)"
+                        ),
+                        {"n": excess},
+                    )
+        except Exception as e:
+            logger.warning("Embedding cache write failed: %s", e)
+
+    def _load(self, keys: List[str], batch_size: int = 500) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        try:
+            with self.engine.begin() as conn:
+                for start in range(0, len(keys), batch_size):
+                    batch = keys[start:start + batch_size]
+                    names = [f"k{i}" for i in range(len(batch))]
+                    rows = conn.execute(
+                        text(f"SELECT key, vector FROM embedding_cache WHERE key IN ({', '.join(':' + n for n in names)})"),
+                        dict(zip(names, batch)),
+                    ).fetchall()
+                    if rows:
+                        conn.execute(
+                            text("UPDATE embedding_cache SET last_used = :t WHERE key = :k"),
+                            [{"t": time.time(), "k": r[0]} for r in rows],
+                        )
+                    for key, blob in rows:
+                        found[key] = array("f", blob).tolist()
+        except Exception as e:
+            logger.warning("Embedding cache read failed: %s", e)
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+        total = s["memory_hits"] + s["disk_hits"] + s["misses"]
+        s["hit_rate"] = round((s["memory_hits"] + s["disk_hits"]) / total, 4) if total else 0.0
+        s["memory_entries"] = len(self._memory)
+        return s
+
+
+class CachedEmbeddings:
+    """LangChain-compatible embeddings client that consults an `EmbeddingCache` first."""
+
+    def __init__(self, inner: Any, cache: EmbeddingCache):
+        self.inner = inner
+        self.cache = cache
+        self.model = model_id(inner)
+        self.model_name = model_name(inner)
+
+    def embed_query(self, text_: str) -> List[float]:
+        cached = self.cache.get_many(self.model, [text_])[0]
+        if cached is not None:
+            return cached
+        vector = self.inner.embed_query(text_)
+        self.cache.put_many(self.model, [text_], [vector])
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model, texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = self.inner.embed_documents([texts[i] for i in missing])
+            self.cache.put_many(self.model, [texts[i] for i in missing], fresh)
+            for i, vec in zip(missing, fresh):
+                vectors[i] = vec
+        return vectors  # type: ignore[return-value]
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create embedding cache singleton."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
+
+
+def cached_embeddings(inner: Any) -> Any:
+    """Wrap an embeddings client with the shared cache (None and disabled cache pass through)."""
+    if inner is None:
+        return None
+    try:
+        cache = get_embedding_cache()
+    except Exception as e:
+        logger.warning("Embedding cache unavailable: %s", e)
+        return inner
+    return CachedEmbeddings(inner, cache) if cache.enabled else inner
@@ -0,0 +1,129 @@
+"""
+Embedding-model bookkeeping for Chroma collections.
+
+Vectors from different models live in different spaces, so each collection records the model
+it was built with in its metadata (`embedding_model`). The stores refuse to add or query with a
+different model instead of silently mixing spaces; `reembed_collection` migrates a collection
+to the currently configured model (run `python backend/scripts/reembed_collections.py`).
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from backend.rag.embedding_cache import CachedEmbeddings, model_id, model_name
+
+logger = logging.getLogger(__name__)
+
+# Recorded when no embeddings client is configured and Chroma embeds with its built-in model.
+CHROMA_DEFAULT_MODEL = "chroma-default"
+
+
+def embedding_model_name(embedding_fn: Any) -> str:
+    if embedding_fn is None:
+        return CHROMA_DEFAULT_MODEL
+    if isinstance(embedding_fn, CachedEmbeddings):
+        return embedding_fn.model
+    return model_id(embedding_fn)
+
+
+def embedding_model_label(embedding_fn: Any) -> str:
+    """Plain model or deployment name, as stored on `DocumentRecord.embedding_model`."""
+    if embedding_fn is None:
+        return CHROMA_DEFAULT_MODEL
+    if isinstance(embedding_fn, CachedEmbeddings):
+        return embedding_fn.model_name
+    return model_name(embedding_fn)
+
+
+def recorded_model(collection) -> Optional[str]:
+    return (collection.metadata or {}).get("embedding_model")
+
+
+def check_collection_model(collection, embedding_fn: Any) -> Optional[str]:
+    """
+    Record the current model on a collection that has none (new, empty or written before
+    models were tracked — those were built with the configuration in use). Returns an error
+    message when the collection was built with another model, else None.
+    """
+    current = embedding_model_name(embedding_fn)
+    built_with = recorded_model(collection)
+    if built_with is None:
+        collection.modify(metadata={**(collection.metadata or {}), "embedding_model": current})
+        return None
+    if built_with == current or collection.count() == 0:
+        if built_with != current:
+            collection.modify(metadata={**(collection.metadata or {}), "embedding_model": current})
+        return None
+    return (
+        f"Collection '{collection.name}' was embedded with {built_with} but the configured model is "
+        f"{current}; run backend/scripts/reembed_collections.py to migrate it."
+    )
+
+
+def _get_collection(client, name: str):
+    try:
+        return client.get_collection(name)
+    except Exception:
+        return None
+
+
+def recover_interrupted_reembed(client, name: str) -> None:
+    """
+    Clean up after a `reembed_collection` run that stopped part-way. While `name` holds chunks
+    the leftovers are redundant and dropped; when it is missing or empty (a store may have
+    recreated it empty), the chunks are put back under `name` from the backup of the original,
+    or else from a finished copy. A leftover is never dropped while it is the only copy.
+    """
+    backup = _get_collection(client, f"{name}__backup")
+    copy = _get_collection(client, f"{name}__reembed")
+    if backup is None and copy is None:
+        return
+    current = _get_collection(client, name)
+    if current is None or current.count() == 0:
+        restore = next((c for c in (backup, copy) if c is not None and c.count() > 0), None)
+        if restore is None:
+            return
+        if current is not None:
+            client.delete_collection(name)
+        restore.modify(name=name)
+        logger.warning("Restored %s from %s after an interrupted re-embed", name, restore.name)
+    for leftover in (backup, copy):
+        if leftover is not None and leftover.name != name:
+            client.delete_collection(leftover.name)
+
+
+def reembed_collection(client, collection, embedding_fn: Any, batch_size: int = 64):
+    """
+    Copy every chunk of `collection` into a fresh collection embedded with `embedding_fn`, then
+    swap it in under the original name. Chunk ids, documents and metadata are unchanged.
+    The original is kept as `<name>__backup` until the new collection holds the name, so an
+    interrupted run can be recovered (see recover_interrupted_reembed).
+    Returns the new collection object.
+    """
+    name = collection.name
+    tmp_name = f"{name}__reembed"
+    recover_interrupted_reembed(client, name)
+    collection = client.get_collection(name)
+    metadata = {**(collection.metadata or {}), "embedding_model": embedding_model_name(embedding_fn)}
+    target = client.create_collection(name=tmp_name, metadata=metadata)
+
+    copied, offset = 0, 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        ids = page.get("ids") or []
+        if not ids:
+            break
+        documents = page.get("documents") or [""] * len(ids)
+        kwargs = {"ids": ids, "documents": documents, "metadatas": page.get("metadatas")}
+        if embedding_fn is not None:
+            kwargs["embeddings"] = embedding_fn.embed_documents([d or "" for d in documents])
+        target.add(**kwargs)
+        copied += len(ids)
+        offset += len(ids)
+
+    collection.modify(name=f"{name}__backup")
+    target.modify(name=name)
+    client.delete_collection(f"{name}__backup")
+    logger.info("Re-embedded %d chunks of %s with %s", copied, name, metadata["embedding_model"])
+    return client.get_collection(name)
@@ -0,0 +1,212 @@
+"""
+On-disk BM25 index (SQLite FTS5) over RAG chunk text, kept next to the Chroma collection.
+
+Vector search misses exact tokens — contract ids, clause numbers, supplier names — that a
+keyword index finds immediately. `VectorStore` mirrors every add/delete/reset here, and the
+retriever fuses both result lists. Filters are applied in SQL before ranking, so a selective
+supplier/type/DTP-stage filter still yields the top matches instead of an empty post-filter.
+
+Env:
+- RAG_FTS_PATH: index file (default `rag_fts.db` beside the Chroma directory)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from backend.persistence.sqlite_engine import create_sqlite_engine
+
+logger = logging.getLogger(__name__)
+
+# Columns after `content` are stored but not tokenized; they carry the retrieval filters.
+_FILTER_COLUMNS = ("supplier_id", "category_id", "document_type", "dtp_relevance")
+
+_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chunk_fts USING fts5("
+    "content, chunk_id UNINDEXED, document_id UNINDEXED, "
+    + ", ".join(f"{c} UNINDEXED" for c in _FILTER_COLUMNS)
+    + ", metadata UNINDEXED, tokenize = 'porter unicode61')"
+)
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were will with".split()
+)
+_WORD = re.compile(r"[\w][\w\-./]*", re.UNICODE)
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str) -> str:
+    """
+    FTS5 MATCH string for free text: every term OR'd (BM25 rewards documents matching more of
+    them), and identifier-like words such as "CTR-2024-001" or "4.2.1" also as an exact phrase.
+    User input is always quoted, so FTS5 operators in it are treated as text.
+    """
+    parts: List[str] = []
+    seen = set()
+    for word in _WORD.findall(query or ""):
+        tokens = [t.lower() for t in _TOKEN.findall(word)]
+        if len(tokens) > 1:
+            phrase = '"' + " ".join(tokens) + '"'
+            if phrase not in seen:
+                seen.add(phrase)
+                parts.append(phrase)
+        for t in tokens:
+            if t in _STOPWORDS or t in seen:
+                continue
+            seen.add(t)
+            parts.append(f'"{t}"')
+    return " OR ".join(parts)
+
+
+def _default_path() -> Path:
+    env = os.getenv("RAG_FTS_PATH")
+    if env:
+        return Path(env)
+    from backend.rag.vector_store import CHROMA_PATH
+
+    return CHROMA_PATH.parent / "rag_fts.db"
+
+
+class LexicalIndex:
+    """FTS5 table of chunks keyed by Chroma chunk id."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else _default_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_sqlite_engine(self.db_path)
+        self._write_lock = threading.Lock()
+        with self.engine.begin() as conn:
+            conn.execute(text(_SCHEMA))
+
+    def add_chunks(self, chunk_ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict[str, Any]]) -> None:
+        rows = []
+        for chunk_id, doc, meta in zip(chunk_ids, documents, metadatas):
+            meta = dict(meta or {})
+            dtp = meta.get("dtp_relevance")
+            if isinstance(dtp, list):
+                dtp = json.dumps(dtp)
+            rows.append(
+                {
+                    "content": doc or "",
+                    "chunk_id": chunk_id,
+                    "document_id": meta.get("document_id"),
+                    "supplier_id": meta.get("supplier_id"),
+                    "category_id": meta.get("category_id"),
+                    "document_type": meta.get("document_type"),
+                    "dtp_relevance": dtp,
+                    "metadata": json.dumps(meta, default=str),
+                }
+            )
+        if not rows:
+            return
+        cols = ("content", "chunk_id", "document_id") + _FILTER_COLUMNS + ("metadata",)
+        insert = text(f"INSERT INTO chunk_fts ({', '.join(cols)}) VALUES ({', '.join(':' + c for c in cols)})")
+        with self._write_lock, self.engine.begin() as conn:
+            # FTS5 has no upsert; re-adding a chunk id replaces the previous row.
+            conn.execute(text("DELETE FROM chunk_fts WHERE chunk_id = :chunk_id"), [{"chunk_id": r["chunk_id"]} for r in rows])
+            conn.execute(insert, rows)
+
+    def delete_document(self, document_id: str) -> int:
+        with self._write_lock, self.engine.begin() as conn:
+            return conn.execute(text("DELETE FROM chunk_fts WHERE document_id = :d"), {"d": document_id}).rowcount or 0
+
+    def reset(self) -> None:
+        with self._write_lock, self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM chunk_fts"))
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return int(conn.execute(text("SELECT count(*) FROM chunk_fts")).scalar() or 0)
+
+    def revision(self) -> str:
+        """Cheap change marker (row count + highest rowid) for caches derived from the corpus."""
+        with self.engine.connect() as conn:
+            n, last = conn.execute(text("SELECT count(*), max(rowid) FROM chunk_fts")).one()
+        return f"{n}:{last or 0}"
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        supplier_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+        document_types: Optional[Iterable[str]] = None,
+        dtp_stage: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Best BM25 matches as chunk dicts (`chunk_id`, `content`, `metadata`, `score`); higher
+        score is better. Chunks without a DTP relevance list match every stage, as in the
+        vector path.
+        """
+        expr = match_expression(query)
+        if not expr:
+            return []
+        clauses = ["chunk_fts MATCH :q"]
+        params: Dict[str, Any] = {"q": expr, "n": int(n_results)}
+        if supplier_id:
+            clauses.append("supplier_id = :supplier_id")
+            params["supplier_id"] = supplier_id
+        if category_id:
+            clauses.append("category_id = :category_id")
+            params["category_id"] = category_id
+        types = [t for t in (document_types or []) if t]
+        if types:
+            names = [f"t{i}" for i in range(len(types))]
+            clauses.append(f"document_type IN ({', '.join(':' + n for n in names)})")
+            params.update(zip(names, types))
+        if dtp_stage:
+            clauses.append("(dtp_relevance IS NULL OR dtp_relevance IN ('', '[]') OR dtp_relevance LIKE :dtp)")
+            params["dtp"] = f'%"{dtp_stage}"%'
+        sql = (
+            "SELECT chunk_id, content, metadata, bm25(chunk_fts) AS rank FROM chunk_fts "
+            f"WHERE {' AND '.join(clauses)} ORDER BY rank LIMIT :n"
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(sql), params).fetchall()
+        out = []
+        for chunk_id, content, metadata, rank in rows:
+            try:
+                meta = json.loads(metadata) if metadata else {}
+            except ValueError:
+                meta = {}
+            # bm25() is negative, lower = better.
+            out.append({"chunk_id": chunk_id, "content": content, "metadata": meta, "score": -float(rank)})
+        return out
+
+    def backfill_from(self, collection, batch_size: int = 500) -> int:
+        """Copy every chunk of a Chroma collection into an empty index; returns rows added."""
+        if self.count() > 0:
+            return 0
+        added, offset = 0, 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            self.add_chunks(ids, page.get("documents") or [""] * len(ids), page.get("metadatas") or [{}] * len(ids))
+            added += len(ids)
+            offset += len(ids)
+        if added:
+            logger.info("Backfilled %d chunks into lexical index %s", added, self.db_path)
+        return added
+
+
+_lexical_index: Optional[LexicalIndex] = None
+_lexical_lock = threading.Lock()
+
+
+def get_lexical_index() -> LexicalIndex:
+    """Get or create lexical index singleton."""
+    global _lexical_index
+    if _lexical_index is None:
+        with _lexical_lock:
+            if _lexical_index is None:
+                _lexical_index = LexicalIndex()
+    return _lexical_index
@@ -1,12 +1,93 @@
 """
 Document retriever for agent-controlled RAG.
 Implements filtered retrieval with governance checks.
+
+Retrieval is hybrid: Chroma nearest neighbours and a BM25 keyword index (backend.rag.lexical_index)
+run side by side, are merged with reciprocal-rank fusion and optionally reranked by a local
+cross-encoder. The vector leg runs on a worker thread under a latency budget; if it overruns,
+the keyword results are returned on their own and the response says so.
+
+Env:
+- RAG_RETRIEVAL_BUDGET_MS: latency budget for one retrieval (default 2000)
+- RAG_CANDIDATE_MULTIPLIER: candidates fetched per leg = top_k * this (default 4)
+- RAG_RERANK_MODEL: sentence-transformers cross-encoder name/path; unset disables reranking
+- RAG_RERANK_CANDIDATES: fused chunks passed to the reranker (default 20)
 """
+import contextvars
 import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import List, Dict, Any, Optional
 from backend.infrastructure.storage_providers import get_app_db, get_legacy_vector_store
 from backend.persistence.models import DocumentRecord, SupplierPerformance, SpendMetric, SLAEvent
+from backend.rag.vector_store_interface import build_where
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
 from sqlmodel import select
+from utils.metrics import RETRIEVAL_STAGE_SECONDS
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Reciprocal-rank fusion constant; 60 is the standard choice and damps the head of each list.
+RRF_K = 60
+
+_vector_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-vector")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def reciprocal_rank_fusion(ranked: Dict[str, List[Dict[str, Any]]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """
+    Merge ranked chunk lists by summing 1 / (k + rank). Each leg's own score is kept as
+    `<leg>_score`; `score` becomes the fused score.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for leg, chunks in ranked.items():
+        for rank, chunk in enumerate(chunks, start=1):
+            entry = fused.get(chunk["chunk_id"])
+            if entry is None:
+                entry = fused[chunk["chunk_id"]] = {
+                    "chunk_id": chunk["chunk_id"],
+                    "content": chunk.get("content", ""),
+                    "metadata": chunk.get("metadata") or {},
+                    "score": 0.0,
+                }
+            entry[f"{leg}_score"] = chunk.get("score")
+            entry["score"] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda c: c["score"], reverse=True)
+
+
+_reranker = None
+_reranker_lock = threading.Lock()
+_reranker_failed = False
+
+
+def get_reranker():
+    """Cross-encoder named by RAG_RERANK_MODEL, loaded once; None when unset or unavailable."""
+    global _reranker, _reranker_failed
+    model = (os.getenv("RAG_RERANK_MODEL") or "").strip()
+    if not model or _reranker_failed:
+        return None
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None and not _reranker_failed:
+                try:
+                    from sentence_transformers import CrossEncoder
+
+                    _reranker = CrossEncoder(model)
+                except Exception as e:
+                    logger.warning("Reranker %s unavailable, using fused ranking: %s", model, e)
+                    _reranker_failed = True
+    return _reranker
 
 
 class DocumentRetriever:
@@ -22,8 +103,29 @@ class DocumentRetriever:
     
     def __init__(self):
         self.vector_store = get_legacy_vector_store()
+        self.lexical_index = getattr(self.vector_store, "lexical_index", None)
         self.app_db = get_app_db()
     
+    def _vector_candidates(self, query: str, where: Optional[Dict[str, Any]], n_results: int) -> List[Dict[str, Any]]:
+        t0 = time.perf_counter()
+        try:
+            results = self.vector_store.search(query=query, n_results=n_results, where=where)
+        finally:
+            RETRIEVAL_STAGE_SECONDS.observe(time.perf_counter() - t0, stage="vector")
+        chunks = []
+        if results and results.get("ids") and results["ids"][0]:
+            for i, chunk_id in enumerate(results["ids"][0]):
+                chunks.append({
+                    "chunk_id": chunk_id,
+                    "content": results["documents"][0][i] if results.get("documents") else "",
+                    "metadata": (results["metadatas"][0][i] if results.get("metadatas") else None) or {},
+                    "score": 1.0 - (results["distances"][0][i] if results.get("distances") else 0)
+                })
+        return chunks
+    
+    @traced("rag.retrieve_documents", kind="retrieval",
+            attributes_from_result=lambda r: {"retrieval_count": r.get("total_found", 0),
+                                              "retrieval_mode": r.get("retrieval_mode")})
     def retrieve_documents(
         self,
         query: str,
@@ -45,64 +147,88 @@ class DocumentRetriever:
             - chunks: List of chunk dicts with content and metadata
             - total_found: Total matching chunks
             - filters_applied: What filters were used
+            - retrieval_mode: "hybrid", "vector" or "lexical"
+            - timings_ms: per-stage latency (vector, lexical, fusion, rerank, total)
+            - degraded: stages skipped or failed (e.g. "vector_timeout", "rerank_budget")
         """
-        # Build metadata filter
-        where = {}
+        t_start = time.perf_counter()
+        deadline = t_start + _env_int("RAG_RETRIEVAL_BUDGET_MS", 2000) / 1000.0
+        n_candidates = max(top_k, top_k * _env_int("RAG_CANDIDATE_MULTIPLIER", 4))
+        timings: Dict[str, float] = {}
+        degraded: List[str] = []
         
-        if supplier_id:
-            where["supplier_id"] = supplier_id
+        # Every filter (supplier, category, $in over document types, per-stage DTP flag) runs
+        # inside the vector store, so each hit counts: vector-only retrieval asks for exactly
+        # top_k, hybrid retrieval asks for the fusion depth.
+        where = build_where(supplier_id, category_id, document_types, dtp_stage)
+        n_vector = n_candidates if self.lexical_index is not None else top_k
+        t_vector = time.perf_counter()
+        vector_future = _vector_pool.submit(
+            contextvars.copy_context().run, self._vector_candidates, query, where, n_vector
+        )
         
-        if category_id:
-            where["category_id"] = category_id
+        ranked: Dict[str, List[Dict[str, Any]]] = {}
+        if self.lexical_index is not None:
+            t0 = time.perf_counter()
+            try:
+                ranked["lexical"] = self.lexical_index.search(
+                    query,
+                    n_results=n_candidates,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    document_types=document_types,
+                    dtp_stage=dtp_stage,
+                )
+            except Exception as e:
+                logger.warning("Lexical retrieval failed: %s", e)
+                degraded.append("lexical_error")
+            timings["lexical"] = (time.perf_counter() - t0) * 1000
+            RETRIEVAL_STAGE_SECONDS.observe(timings["lexical"] / 1000, stage="lexical")
         
-        if document_types and len(document_types) == 1:
-            where["document_type"] = document_types[0]
+        try:
+            # Without a keyword leg the vector results are all there is; wait for them.
+            timeout = max(0.0, deadline - time.perf_counter()) if "lexical" in ranked else None
+            ranked["vector"] = vector_future.result(timeout=timeout)
+        except FutureTimeout:
+            degraded.append("vector_timeout")
+        except Exception as e:
+            if "lexical" not in ranked:
+                raise
+            logger.warning("Vector retrieval failed, using keyword results: %s", e)
+            degraded.append("vector_error")
+        timings["vector"] = (time.perf_counter() - t_vector) * 1000
         
-        # DTP stage filtering is more complex (stored as JSON string)
-        # We'll filter post-retrieval for now
+        t0 = time.perf_counter()
+        if len(ranked) > 1:
+            candidates = reciprocal_rank_fusion({"vector": ranked["vector"], "lexical": ranked["lexical"]})
+            mode = "hybrid"
+        else:
+            mode, only = next(iter(ranked.items()), ("vector", []))
+            candidates = [{**c, f"{mode}_score": c.get("score")} for c in only]
+        timings["fusion"] = (time.perf_counter() - t0) * 1000
+        RETRIEVAL_STAGE_SECONDS.observe(timings["fusion"] / 1000, stage="fusion")
         
-        # Execute search
-        where_filter = where if where else None
-        results = self.vector_store.search(
-            query=query,
-            n_results=top_k * 2,  # Get more, filter down
-            where=where_filter
-        )
+        reranker = get_reranker() if len(candidates) > 1 else None
+        if reranker is not None:
+            if time.perf_counter() >= deadline:
+                degraded.append("rerank_budget")
+            else:
+                t0 = time.perf_counter()
+                head = candidates[:_env_int("RAG_RERANK_CANDIDATES", 20)]
+                try:
+                    scores = reranker.predict([(query, c["content"]) for c in head])
+                    for c, s in zip(head, scores):
+                        c["rerank_score"] = c["score"] = float(s)
+                    candidates = sorted(head, key=lambda c: c["score"], reverse=True) + candidates[len(head):]
+                except Exception as e:
+                    logger.warning("Rerank failed, using fused ranking: %s", e)
+                    degraded.append("rerank_error")
+                timings["rerank"] = (time.perf_counter() - t0) * 1000
+                RETRIEVAL_STAGE_SECONDS.observe(timings["rerank"] / 1000, stage="rerank")
         
-        # Process results
-        chunks = []
-        if results and results.get("ids") and results["ids"][0]:
-            for i, chunk_id in enumerate(results["ids"][0]):
-                chunk_data = {
-                    "chunk_id": chunk_id,
-                    "content": results["documents"][0][i] if results.get("documents") else "",
-                    "metadata": results["metadatas"][0][i] if results.get("metadatas") else {},
-                    "score": 1.0 - (results["distances"][0][i] if results.get("distances") else 0)
-                }
-                
-                # Apply DTP stage filter if specified
-                if dtp_stage:
-                    chunk_dtp = chunk_data["metadata"].get("dtp_relevance", "[]")
-                    if isinstance(chunk_dtp, str):
-                        try:
-                            chunk_dtp = json.loads(chunk_dtp)
-                        except:
-                            chunk_dtp = []
-                    
-                    # Include if DTP stage matches or if no DTP specified for chunk
-                    if chunk_dtp and dtp_stage not in chunk_dtp:
-                        continue
-                
-                # Apply document type filter if multiple types
-                if document_types and len(document_types) > 1:
-                    doc_type = chunk_data["metadata"].get("document_type")
-                    if doc_type and doc_type not in document_types:
-                        continue
-                
-                chunks.append(chunk_data)
-                
-                if len(chunks) >= top_k:
-                    break
+        chunks = candidates[:top_k]
+        timings["total"] = (time.perf_counter() - t_start) * 1000
+        RETRIEVAL_STAGE_SECONDS.observe(timings["total"] / 1000, stage="total")
         
         return {
             "query": query,
@@ -113,7 +239,46 @@ class DocumentRetriever:
                 "category_id": category_id,
                 "dtp_stage": dtp_stage,
                 "document_types": document_types
+            },
+            "retrieval_mode": mode,
+            "timings_ms": {k: round(v, 2) for k, v in timings.items()},
+            "degraded": degraded,
+        }
+    
+    @staticmethod
+    def _performance_record(r: SupplierPerformance) -> Dict[str, Any]:
+        return {
+            "record_id": r.record_id,
+            "supplier_id": r.supplier_id,
+            "supplier_name": r.supplier_name,
+            "category_id": r.category_id,
+            "overall_score": r.overall_score,
+            "quality_score": r.quality_score,
+            "delivery_score": r.delivery_score,
+            "cost_variance": r.cost_variance,
+            "responsiveness_score": r.responsiveness_score,
+            "trend": r.trend,
+            "risk_level": r.risk_level,
+            "measurement_date": r.measurement_date
+        }
+    
+    @staticmethod
+    def _performance_result(supplier_id: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Records are newest first
+        summary = None
+        if records:
+            latest = records[0]
+            summary = {
+                "latest_score": latest["overall_score"],
+                "trend": latest["trend"],
+                "risk_level": latest["risk_level"],
+                "record_count": len(records)
             }
+        return {
+            "supplier_id": supplier_id,
+            "data_type": "performance",
+            "records": records,
+            "summary": summary
         }
     
     def get_supplier_performance(
@@ -133,53 +298,41 @@ class DocumentRetriever:
         Returns:
             Dict with performance records and summary
         """
-        session = self.app_db.get_db_session()
-        
-        query = select(SupplierPerformance).where(
-            SupplierPerformance.supplier_id == supplier_id
+        performance = self.get_supplier_performance_many(
+            [supplier_id], time_window=time_window, category_id=category_id
         )
+        # The bulk lookup skips empty IDs
+        return performance.get(supplier_id) or self._performance_result(supplier_id, [])
+    
+    def get_supplier_performance_many(
+        self,
+        supplier_ids: List[str],
+        time_window: Optional[str] = None,
+        category_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Performance data for several suppliers in one query.
         
-        if category_id:
-            query = query.where(SupplierPerformance.category_id == category_id)
-        
-        # Order by date descending
-        query = query.order_by(SupplierPerformance.measurement_date.desc())
-        
-        results = session.exec(query).all()
-        session.close()
-        
-        records = []
-        for r in results:
-            records.append({
-                "record_id": r.record_id,
-                "supplier_id": r.supplier_id,
-                "category_id": r.category_id,
-                "overall_score": r.overall_score,
-                "quality_score": r.quality_score,
-                "delivery_score": r.delivery_score,
-                "cost_variance": r.cost_variance,
-                "trend": r.trend,
-                "risk_level": r.risk_level,
-                "measurement_date": r.measurement_date
-            })
-        
-        # Build summary
-        summary = None
-        if records:
-            latest = records[0]
-            summary = {
-                "latest_score": latest["overall_score"],
-                "trend": latest["trend"],
-                "risk_level": latest["risk_level"],
-                "record_count": len(records)
-            }
+        Returns:
+            Dict keyed by supplier ID, each value shaped like `get_supplier_performance`
+            (suppliers without records get empty records and a None summary)
+        """
+        ids = list(dict.fromkeys(s for s in supplier_ids if s))
+        grouped: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in ids}
+        if ids:
+            query = select(SupplierPerformance).where(SupplierPerformance.supplier_id.in_(ids))
+            if category_id:
+                query = query.where(SupplierPerformance.category_id == category_id)
+            query = query.order_by(SupplierPerformance.measurement_date.desc())
+            
+            session = self.app_db.get_db_session()
+            try:
+                for r in session.exec(query).all():
+                    grouped[r.supplier_id].append(self._performance_record(r))
+            finally:
+                session.close()
         
-        return {
-            "supplier_id": supplier_id,
-            "data_type": "performance",
-            "records": records,
-            "summary": summary
-        }
+        return {sid: self._performance_result(sid, records) for sid, records in grouped.items()}
     
     def get_supplier_spend(
         self,
@@ -233,33 +386,64 @@ class DocumentRetriever:
         status: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get SLA events for a supplier."""
-        session = self.app_db.get_db_session()
-        
-        query = select(SLAEvent).where(SLAEvent.supplier_id == supplier_id)
-        
-        if severity:
-            query = query.where(SLAEvent.severity == severity)
-        
-        if status:
-            query = query.where(SLAEvent.status == status)
-        
-        query = query.order_by(SLAEvent.event_date.desc())
-        
-        results = session.exec(query).all()
-        session.close()
-        
-        records = []
-        for r in results:
-            records.append({
-                "event_id": r.event_id,
-                "supplier_id": r.supplier_id,
-                "event_type": r.event_type,
-                "sla_metric": r.sla_metric,
-                "severity": r.severity,
-                "status": r.status,
-                "event_date": r.event_date
-            })
+        events = self.get_sla_events_many([supplier_id], severity=severity, status=status)
+        # The bulk lookup skips empty IDs
+        return events.get(supplier_id) or self._sla_result(supplier_id, [])
+    
+    def get_sla_events_many(
+        self,
+        supplier_ids: List[str],
+        severity: Optional[str] = None,
+        status: Optional[str] = None,
+        limit_per_supplier: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        SLA events for several suppliers in one query, keyed by supplier ID and shaped like
+        `get_sla_events`. `limit_per_supplier` keeps only each supplier's most recent events.
+        """
+        ids = list(dict.fromkeys(s for s in supplier_ids if s))
+        grouped: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in ids}
+        if ids:
+            query = select(SLAEvent).where(SLAEvent.supplier_id.in_(ids))
+            if severity:
+                query = query.where(SLAEvent.severity == severity)
+            if status:
+                query = query.where(SLAEvent.status == status)
+            if limit_per_supplier is not None:
+                # Cap each supplier's history in SQL so long histories are not loaded
+                ranked = query.add_columns(
+                    func.row_number().over(
+                        partition_by=SLAEvent.supplier_id, order_by=SLAEvent.event_date.desc()
+                    ).label("rn")
+                ).subquery()
+                event = aliased(SLAEvent, ranked)
+                query = (
+                    select(event)
+                    .where(ranked.c.rn <= limit_per_supplier)
+                    .order_by(event.event_date.desc())
+                )
+            else:
+                query = query.order_by(SLAEvent.event_date.desc())
+            
+            session = self.app_db.get_db_session()
+            try:
+                for r in session.exec(query).all():
+                    grouped[r.supplier_id].append({
+                        "event_id": r.event_id,
+                        "supplier_id": r.supplier_id,
+                        "event_type": r.event_type,
+                        "sla_metric": r.sla_metric,
+                        "severity": r.severity,
+                        "status": r.status,
+                        "event_date": r.event_date
+                    })
+            finally:
+                session.close()
         
+        return {sid: self._sla_result(sid, records) for sid, records in grouped.items()}
+    
+    @staticmethod
+    def _sla_result(supplier_id: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "supplier_id": supplier_id,
             "data_type": "sla_events",
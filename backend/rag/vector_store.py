@@ -3,6 +3,7 @@ ChromaDB vector store for document embeddings.
 """
 import os
 import json
+import logging
 import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -10,7 +11,20 @@ from uuid import uuid4
 import chromadb
 from chromadb.config import Settings
 
+from backend.rag.embedding_cache import cached_embeddings
+from backend.rag.embedding_models import (
+    check_collection_model,
+    embedding_model_label,
+    embedding_model_name,
+    recover_interrupted_reembed,
+    reembed_collection,
+)
+from backend.rag.vector_store_interface import stage_flag
 from backend.services.llm_provider import get_langchain_embeddings
+from shared.constants import DTP_STAGES
+from utils.metrics import VECTOR_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
 
 
 # Vector store path - use temp directory for Streamlit Cloud
@@ -29,6 +43,28 @@ def _get_chroma_path() -> Path:
 CHROMA_PATH = _get_chroma_path()
 COLLECTION_NAME = "sourcing_documents"
 
+# Version of the derived filter fields written into chunk metadata (stored on the collection).
+# Bump it and extend _backfill_filter_fields when a new derived field is added.
+METADATA_VERSION = 1
+
+
+def stage_flags(dtp_relevance: Any) -> Dict[str, bool]:
+    """
+    Per-stage boolean flags for a chunk's DTP relevance (list or JSON string). Chroma metadata
+    cannot hold lists, so stage membership is one flag per stage; a chunk without a stage list
+    is relevant to every stage.
+    """
+    stages = dtp_relevance
+    if isinstance(stages, str):
+        try:
+            stages = json.loads(stages)
+        except ValueError:
+            stages = [stages] if stages else []
+    stages = [s for s in (stages or []) if isinstance(s, str)]
+    flags = {stage_flag(s): (not stages or s in stages) for s in DTP_STAGES}
+    flags.update({stage_flag(s): True for s in stages})
+    return flags
+
 
 class VectorStore:
     """
@@ -38,7 +74,8 @@ class VectorStore:
     - id: unique chunk ID
     - document: text content
     - embedding: vector representation
-    - metadata: document_id, document_type, supplier_id, category_id, dtp_relevance, etc.
+    - metadata: document_id, document_type, supplier_id, category_id, dtp_relevance, etc.,
+      plus one boolean `dtp_<stage>` flag per DTP stage for filtering
     """
     
     def __init__(self):
@@ -53,7 +90,8 @@ class VectorStore:
             )
         )
         
-        # Get or create collection
+        # Get or create collection (after finishing any interrupted re-embed swap)
+        recover_interrupted_reembed(self.client, COLLECTION_NAME)
         self.collection = self.client.get_or_create_collection(
             name=COLLECTION_NAME,
             metadata={"description": "Sourcing documents for RAG"}
@@ -62,12 +100,72 @@ class VectorStore:
         # Initialize embedding function
         self._embedding_fn = None
         try:
-            self._embedding_fn = get_langchain_embeddings(
+            # Query/chunk vectors are cached by (model, text); see backend.rag.embedding_cache
+            self._embedding_fn = cached_embeddings(get_langchain_embeddings(
                 default_model="text-embedding-3-small",
                 deployment_env="AZURE_OPENAI_EMBEDDING_DEPLOYMENT",
-            )
-        except Exception:
+            ))
+        except Exception as e:
+            logger.error("Embedding backend unavailable, using Chroma's built-in embedder: %s", e)
             self._embedding_fn = None
+        
+        # Vectors from different models must not share a collection
+        self.embedding_model = embedding_model_name(self._embedding_fn)
+        self.embedding_model_label = embedding_model_label(self._embedding_fn)
+        self._model_mismatch = check_collection_model(self.collection, self._embedding_fn)
+        if self._model_mismatch:
+            logger.error(self._model_mismatch)
+        
+        try:
+            self._backfill_filter_fields()
+        except Exception as e:
+            logger.warning("Chunk metadata backfill failed; stage filters may miss old chunks: %s", e)
+        
+        # Keyword index mirrored from this collection (see backend.rag.lexical_index)
+        self.lexical_index = None
+        try:
+            from backend.rag.lexical_index import get_lexical_index
+
+            self.lexical_index = get_lexical_index()
+            self.lexical_index.backfill_from(self.collection)
+        except Exception as e:
+            logger.warning("Lexical index unavailable, retrieval falls back to vector only: %s", e)
+    
+    def _backfill_filter_fields(self, batch_size: int = 500) -> int:
+        """
+        One-time migration for collections written before METADATA_VERSION: adds the per-stage
+        flags to every existing chunk, then records the version on the collection.
+        """
+        collection_meta = dict(self.collection.metadata or {})
+        if int(collection_meta.get("metadata_version", 0)) >= METADATA_VERSION:
+            return 0
+        updated, offset = 0, 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            metas = page.get("metadatas") or [{}] * len(ids)
+            self.collection.update(
+                ids=ids,
+                metadatas=[stage_flags((m or {}).get("dtp_relevance")) for m in metas],
+            )
+            updated += len(ids)
+            offset += len(ids)
+        collection_meta["metadata_version"] = METADATA_VERSION
+        self.collection.modify(metadata=collection_meta)
+        if updated:
+            logger.info("Backfilled DTP stage flags on %d chunks in %s", updated, COLLECTION_NAME)
+        return updated
+    
+    def _mirror(self, op: str, *args) -> None:
+        """Apply a write to the lexical index; it must never fail the vector write."""
+        if self.lexical_index is None:
+            return
+        try:
+            getattr(self.lexical_index, op)(*args)
+        except Exception as e:
+            logger.warning("Lexical index %s failed: %s", op, e)
     
     def add_chunks(
         self,
@@ -107,18 +205,19 @@ class VectorStore:
                 **{k: v for k, v in metadata.items() if v is not None}
             }
             
-            # Handle list fields (ChromaDB doesn't support lists directly)
+            # Handle list fields (ChromaDB doesn't support lists directly): keep the JSON
+            # string for display and add one boolean flag per stage for `where` filters.
+            chunk_meta.update(stage_flags(chunk_meta.get("dtp_relevance")))
             if "dtp_relevance" in chunk_meta and isinstance(chunk_meta["dtp_relevance"], list):
                 chunk_meta["dtp_relevance"] = json.dumps(chunk_meta["dtp_relevance"])
             
             metadatas.append(chunk_meta)
         
-        # Generate embeddings if available
+        # Generate embeddings if available. No fallback to Chroma's embedder on failure:
+        # that would mix vector spaces inside the collection.
+        self._ensure_model()
         if self._embedding_fn:
-            try:
-                embeddings = self._embedding_fn.embed_documents(documents)
-            except Exception:
-                embeddings = None
+            embeddings = self._embedding_fn.embed_documents(documents)
         
         # Add to collection
         if embeddings:
@@ -136,6 +235,7 @@ class VectorStore:
                 metadatas=metadatas
             )
         
+        self._mirror("add_chunks", chunk_ids, documents, metadatas)
         return chunk_ids
     
     def search(
@@ -158,12 +258,10 @@ class VectorStore:
             Dict with ids, documents, metadatas, distances
         """
         # Generate query embedding if available
+        self._ensure_model()
         query_embedding = None
         if self._embedding_fn:
-            try:
-                query_embedding = self._embedding_fn.embed_query(query)
-            except Exception:
-                pass
+            query_embedding = self._embedding_fn.embed_query(query)
         
         # Build query kwargs
         kwargs = {
@@ -181,7 +279,8 @@ class VectorStore:
         if where_document:
             kwargs["where_document"] = where_document
         
-        results = self.collection.query(**kwargs)
+        with VECTOR_QUERY_SECONDS.time(store="rag"):
+            results = self.collection.query(**kwargs)
         
         return results
     
@@ -197,6 +296,7 @@ class VectorStore:
             where={"document_id": document_id}
         )
         
+        self._mirror("delete_document", document_id)
         if results["ids"]:
             self.collection.delete(ids=results["ids"])
             return len(results["ids"])
@@ -213,13 +313,32 @@ class VectorStore:
         """Get total number of chunks."""
         return self.collection.count()
     
+    def _ensure_model(self) -> None:
+        if self._model_mismatch:
+            raise RuntimeError(self._model_mismatch)
+    
+    def reembed(self, batch_size: int = 64) -> int:
+        """
+        Rebuild the collection with the configured embedding model (see
+        backend.rag.embedding_models); returns the number of chunks re-embedded.
+        """
+        self.collection = reembed_collection(self.client, self.collection, self._embedding_fn, batch_size)
+        self._model_mismatch = None
+        return self.collection.count()
+    
     def reset(self):
         """Delete all data (use with caution)."""
         self.client.delete_collection(COLLECTION_NAME)
+        self._mirror("reset")
         self.collection = self.client.get_or_create_collection(
             name=COLLECTION_NAME,
-            metadata={"description": "Sourcing documents for RAG"}
+            metadata={
+                "description": "Sourcing documents for RAG",
+                "metadata_version": METADATA_VERSION,
+                "embedding_model": self.embedding_model,
+            }
         )
+        self._model_mismatch = None
 
 
 # Singleton instance
@@ -2,6 +2,38 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 
 
+# Filters use Chroma's `where` syntax; other backends translate it in their adapter.
+
+def stage_flag(stage: str) -> str:
+    """Boolean metadata key marking a chunk as relevant to a DTP stage, e.g. "dtp_DTP-04"."""
+    return f"dtp_{stage}"
+
+
+def build_where(
+    supplier_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    document_types: Optional[List[str]] = None,
+    dtp_stage: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Chroma `where` filter that does all retrieval narrowing inside the collection."""
+    clauses: List[Dict[str, Any]] = []
+    if supplier_id:
+        clauses.append({"supplier_id": supplier_id})
+    if category_id:
+        clauses.append({"category_id": category_id})
+    types = [t for t in (document_types or []) if t]
+    if len(types) == 1:
+        clauses.append({"document_type": types[0]})
+    elif types:
+        clauses.append({"document_type": {"$in": types}})
+    if dtp_stage:
+        clauses.append({stage_flag(dtp_stage): True})
+    if not clauses:
+        return None
+    # Chroma requires exactly one top-level operator per filter.
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
 class VectorStoreInterface(ABC):
     """
     Abstract interface for vector store operations.
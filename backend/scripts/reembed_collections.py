@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Re-embed the Chroma collections with the currently configured embedding model.
+
+Each collection records the model it was built with; after switching EMBEDDING_BACKEND (or the
+OpenAI/Azure/local model) the stores refuse to mix vectors until the collection is migrated.
+
+Run from repo root:
+  python backend/scripts/reembed_collections.py            # migrate collections whose model differs
+  python backend/scripts/reembed_collections.py --dry-run  # only report recorded vs configured model
+  python backend/scripts/reembed_collections.py --force --store rag
+"""
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import backend.services  # noqa: E402,F401  (import order: services before rag)
+from backend.heatmap.persistence.heatmap_vector_store import get_heatmap_vector_store  # noqa: E402
+from backend.rag.embedding_models import recorded_model  # noqa: E402
+from backend.rag.vector_store import get_vector_store  # noqa: E402
+
+STORES = {"rag": get_vector_store, "heatmap": get_heatmap_vector_store}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", choices=sorted(STORES), action="append", help="limit to one store (repeatable)")
+    parser.add_argument("--force", action="store_true", help="re-embed even when the recorded model matches")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    for name in args.store or sorted(STORES):
+        store = STORES[name]()
+        built_with = recorded_model(store.collection)
+        stale = args.force or built_with != store.embedding_model
+        print(f"{name:8} {store.collection.name:22} chunks={store.count():<6} built_with={built_with} configured={store.embedding_model}")
+        if not stale or args.dry_run:
+            continue
+        n = store.reembed(batch_size=args.batch_size)
+        print(f"{name:8} re-embedded {n} chunks with {store.embedding_model}")
+
+
+if __name__ == "__main__":
+    main()
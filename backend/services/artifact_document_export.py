@@ -17,6 +17,9 @@ from docx.shared import Pt
 from shared.constants import ArtifactType
 from shared.schemas import Artifact, ArtifactPack
 
+# Bump whenever rendered output changes so cached exports (export_cache.py) are not reused.
+EXPORT_RENDERER_VERSION = "1"
+
 
 def _safe_json(obj: Any) -> str:
     try:
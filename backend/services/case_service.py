@@ -5,9 +5,9 @@ import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from uuid import uuid4
-from sqlmodel import select
+from sqlmodel import func, select
 
-from backend.persistence.database import get_db_session
+from backend.persistence.database import get_db_session, get_read_session
 from backend.persistence.models import (
     CaseState, 
     Artifact as ArtifactModel,
@@ -16,6 +16,7 @@ from backend.persistence.models import (
 from backend.supervisor.state import StateManager, SupervisorState
 from shared.case_context_derive import merge_derived_case_context
 from shared.copilot_focus import build_copilot_focus
+from backend.services.export_cache import schedule_pack_prerender
 from backend.services.supplier_pool import get_category_supplier_pool
 from shared.schemas import (
     CaseSummary, CaseDetail, Artifact, ArtifactPack, ArtifactPackSummary,
@@ -24,6 +25,9 @@ from shared.schemas import (
     ExecutionMetadata, TaskExecutionDetail
 )
 
+# Artifact ids per IN (...) query; stays well under SQLITE_MAX_VARIABLE_NUMBER on old builds.
+_ARTIFACT_ID_CHUNK = 500
+
 
 class CaseService:
     """
@@ -41,7 +45,7 @@ class CaseService:
         limit: int = 50
     ) -> List[CaseSummary]:
         """Get list of cases with optional filters."""
-        session = get_db_session()
+        session = get_read_session()
         
         query = select(CaseState)
         
@@ -78,7 +82,7 @@ class CaseService:
     
     def get_case(self, case_id: str) -> Optional[CaseDetail]:
         """Get full case details."""
-        session = get_db_session()
+        session = get_read_session()
         
         case = session.exec(
             select(CaseState).where(CaseState.case_id == case_id)
@@ -199,7 +203,7 @@ class CaseService:
     def _artifact_pack_summaries_for_case(
         self, case_id: str, latest_pack_id: Optional[str]
     ) -> List[ArtifactPackSummary]:
-        session = get_db_session()
+        session = get_read_session()
         try:
             packs = session.exec(
                 select(ArtifactPackModel)
@@ -228,9 +232,22 @@ class CaseService:
             )
         return out
 
+    def get_case_name(self, case_id: str) -> Optional[str]:
+        """Display name for exports (falls back to the id); None if the case does not exist."""
+        session = get_read_session()
+        try:
+            row = session.exec(
+                select(CaseState.case_id, CaseState.name).where(CaseState.case_id == case_id)
+            ).first()
+        finally:
+            session.close()
+        if not row:
+            return None
+        return row[1] or row[0]
+
     def get_artifact_pack_for_case(self, case_id: str, pack_id: str) -> Optional[ArtifactPack]:
         """Load a pack only if it belongs to ``case_id`` (for export URLs)."""
-        session = get_db_session()
+        session = get_read_session()
         try:
             row = session.exec(
                 select(ArtifactPackModel).where(ArtifactPackModel.pack_id == pack_id)
@@ -535,6 +552,16 @@ class CaseService:
         
         return state
     
+    def get_case_revision(self, case_id: str) -> Optional[str]:
+        """Last-modified stamp of a case, without loading it (None if the case does not exist)."""
+        session = get_read_session()
+        try:
+            return session.exec(
+                select(CaseState.updated_at).where(CaseState.case_id == case_id)
+            ).first()
+        finally:
+            session.close()
+
     def save_case_state(self, state: SupervisorState) -> bool:
         """Save Supervisor state back to case."""
         updates = {
@@ -627,7 +654,10 @@ class CaseService:
                     "cache_hits": exec_meta.cache_hits,
                     "total_tasks": exec_meta.total_tasks,
                     "completed_tasks": exec_meta.completed_tasks,
-                    "model_used": exec_meta.model_used
+                    "model_used": exec_meta.model_used,
+                    "trace_id": exec_meta.trace_id,
+                    "trace_duration_ms": exec_meta.trace_duration_ms,
+                    "waterfall": [s.model_dump(exclude_none=True) for s in exec_meta.waterfall],
                 })
             
             # Save the pack
@@ -680,6 +710,7 @@ class CaseService:
                 session.add(case)
             
             session.commit()
+            schedule_pack_prerender(case_id, pack.pack_id)
             return True
             
         except Exception as e:
@@ -697,7 +728,7 @@ class CaseService:
         """
         List artifacts for a case, optionally filtered by type.
         """
-        session = get_db_session()
+        session = get_read_session()
         
         query = select(ArtifactModel).where(ArtifactModel.case_id == case_id)
         if artifact_type:
@@ -712,7 +743,7 @@ class CaseService:
     
     def get_artifact(self, case_id: str, artifact_id: str) -> Optional[Artifact]:
         """Get a specific artifact."""
-        session = get_db_session()
+        session = get_read_session()
         
         result = session.exec(
             select(ArtifactModel).where(
@@ -727,7 +758,7 @@ class CaseService:
     
     def get_latest_artifact_pack(self, case_id: str) -> Optional[ArtifactPack]:
         """Get the latest artifact pack for a case."""
-        session = get_db_session()
+        session = get_read_session()
         
         # Get case to find latest pack ID
         case = session.exec(
@@ -752,7 +783,7 @@ class CaseService:
         """
         Get artifact pack by ID.
         """
-        session = get_db_session()
+        session = get_read_session()
         
         pack = session.exec(
             select(ArtifactPackModel).where(ArtifactPackModel.pack_id == pack_id)
@@ -765,26 +796,58 @@ class CaseService:
         
         return self._model_to_pack(pack, pack.case_id)
     
-    def get_all_artifact_packs(self, case_id: str) -> List[ArtifactPack]:
+    def get_all_artifact_packs(
+        self,
+        case_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[ArtifactPack]:
         """
-        Get all artifact packs for a case, ordered by creation time.
+        Get artifact packs for a case, ordered by creation time (optionally one page of them).
         Includes full execution metadata for audit trail.
+
+        Packs and every artifact they reference are loaded with two queries in one session.
         """
-        session = get_db_session()
-        
-        packs = session.exec(
-            select(ArtifactPackModel)
-            .where(ArtifactPackModel.case_id == case_id)
-            .order_by(ArtifactPackModel.created_at)
-        ).all()
-        
-        session.close()
-        
-        return [self._model_to_pack(p, case_id) for p in packs]
-    
+        session = get_read_session()
+        try:
+            query = (
+                select(ArtifactPackModel)
+                .where(ArtifactPackModel.case_id == case_id)
+                .order_by(ArtifactPackModel.created_at, ArtifactPackModel.id)
+            )
+            if offset:
+                query = query.offset(max(0, int(offset)))
+            if limit is not None:
+                query = query.limit(max(0, int(limit)))
+            packs = session.exec(query).all()
+            ids_by_pack = {p.pack_id: self._pack_artifact_ids(p) for p in packs}
+            all_ids = [aid for ids in ids_by_pack.values() for aid in ids]
+            artifacts_by_id = self._load_artifacts(session, case_id, all_ids)
+        finally:
+            session.close()
+
+        return [
+            self._model_to_pack(p, case_id, artifacts_by_id, ids_by_pack[p.pack_id])
+            for p in packs
+        ]
+
+    def count_artifact_packs(self, case_id: str) -> int:
+        """Number of artifact packs stored for a case (for paging the audit trail)."""
+        session = get_read_session()
+        try:
+            return int(
+                session.exec(
+                    select(func.count())
+                    .select_from(ArtifactPackModel)
+                    .where(ArtifactPackModel.case_id == case_id)
+                ).one()
+            )
+        finally:
+            session.close()
+
     def get_next_actions(self, case_id: str) -> List[NextAction]:
         """Get cached next actions for a case."""
-        session = get_db_session()
+        session = get_read_session()
         
         case = session.exec(
             select(CaseState).where(CaseState.case_id == case_id)
@@ -843,15 +906,53 @@ class CaseService:
             verification_status=model.verification_status
         )
     
-    def _model_to_pack(self, model: ArtifactPackModel, case_id: str) -> ArtifactPack:
-        """Convert database model to ArtifactPack schema."""
+    @staticmethod
+    def _pack_artifact_ids(model: ArtifactPackModel) -> List[str]:
+        try:
+            ids = json.loads(model.artifact_ids) if model.artifact_ids else []
+        except json.JSONDecodeError:
+            return []
+        return [str(a) for a in ids] if isinstance(ids, list) else []
+
+    def _load_artifacts(self, session, case_id: str, artifact_ids: List[str]) -> Dict[str, Artifact]:
+        """Fetch artifacts of a case by id with IN queries (chunked below SQLite's variable limit)."""
+        wanted = list(dict.fromkeys(artifact_ids))
+        out: Dict[str, Artifact] = {}
+        for start in range(0, len(wanted), _ARTIFACT_ID_CHUNK):
+            chunk = wanted[start:start + _ARTIFACT_ID_CHUNK]
+            rows = session.exec(
+                select(ArtifactModel).where(
+                    ArtifactModel.case_id == case_id,
+                    ArtifactModel.artifact_id.in_(chunk),
+                )
+            ).all()
+            for row in rows:
+                out[row.artifact_id] = self._model_to_artifact(row)
+        return out
+
+    def _model_to_pack(
+        self,
+        model: ArtifactPackModel,
+        case_id: str,
+        artifacts_by_id: Optional[Dict[str, Artifact]] = None,
+        artifact_ids: Optional[List[str]] = None,
+    ) -> ArtifactPack:
+        """
+        Convert database model to ArtifactPack schema.
+
+        Pass artifacts_by_id (from _load_artifacts) when converting several packs; otherwise the
+        pack's artifacts are fetched here in a single query.
+        """
         # Load artifacts
-        artifact_ids = json.loads(model.artifact_ids) if model.artifact_ids else []
-        artifacts = []
-        for aid in artifact_ids:
-            artifact = self.get_artifact(case_id, aid)
-            if artifact:
-                artifacts.append(artifact)
+        if artifact_ids is None:
+            artifact_ids = self._pack_artifact_ids(model)
+        if artifacts_by_id is None:
+            session = get_read_session()
+            try:
+                artifacts_by_id = self._load_artifacts(session, case_id, artifact_ids)
+            finally:
+                session.close()
+        artifacts = [artifacts_by_id[aid] for aid in artifact_ids if aid in artifacts_by_id]
         
         # Load next actions
         next_actions = []
@@ -907,7 +1008,10 @@ class CaseService:
                     cache_hits=exec_data.get("cache_hits", 0),
                     total_tasks=exec_data.get("total_tasks", 0),
                     completed_tasks=exec_data.get("completed_tasks", 0),
-                    model_used=exec_data.get("model_used", "")
+                    model_used=exec_data.get("model_used", ""),
+                    trace_id=exec_data.get("trace_id", ""),
+                    trace_duration_ms=exec_data.get("trace_duration_ms", 0.0),
+                    waterfall=exec_data.get("waterfall", []),
                 )
             except (json.JSONDecodeError, TypeError, KeyError) as e:
                 print(f"Warning: Could not parse execution metadata: {e}")
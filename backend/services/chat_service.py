@@ -35,6 +35,7 @@ except ImportError:
     ENABLE_CLARIFIER_FALLBACK = True
 
 from backend.services.case_service import get_case_service
+from backend.persistence.workflow_checkpoints import checkpoints_enabled, get_workflow_checkpointer
 from backend.supervisor.state import SupervisorState, StateManager
 from backend.supervisor.router import IntentRouter
 from backend.supervisor.router import IntentRouter
@@ -52,6 +53,7 @@ from shared.constants import UserIntent, UserGoal
 from shared.decision_definitions import DTP_DECISIONS
 from shared.case_context_derive import merge_derived_case_context
 from shared.supplier_master_catalog import compact_catalog_for_llm, supplier_master_catalog_count
+from utils.tracing import metadata_fields, trace_request
 
 # Import new official agents
 from backend.agents import (
@@ -137,6 +139,21 @@ STRING_TO_AGENT_NAME = {
     "Supervisor": AgentName.SUPERVISOR,
 }
 
+# Workflow inputs a chat turn sends when it resumes the case checkpoint; every other
+# PipelineState field carries over from the previous turn.
+TURN_INPUT_FIELDS = (
+    "case_id",
+    "user_intent",
+    "use_tier_2",
+    "conversation_history",
+    "latest_agent_output",
+    "latest_agent_name",
+    "waiting_for_human",
+    "human_decision",
+    "visited_agents",
+    "iteration_count",
+)
+
 def get_agent_name_enum(agent_str: str) -> Optional[AgentName]:
     """Convert string agent name to AgentName enum, or None if not found."""
     return STRING_TO_AGENT_NAME.get(agent_str)
@@ -277,18 +294,33 @@ class ChatService:
         3. Generates natural, non-templated responses
         4. Asks for more data if needed
         5. Preserves conversation memory
+
+        The whole turn runs inside one trace (utils.tracing); artifact packs saved during
+        the turn carry its waterfall in ExecutionMetadata.
         """
-        from backend.services.llm_responder import get_llm_responder
-        
         # Generate trace_id for this request
         trace_id = str(uuid.uuid4())
+        with trace_request("chat.process_message", trace_id=trace_id, case_id=case_id):
+            return self._process_message(case_id, user_message, use_tier_2, trace_id)
+
+    def _process_message(
+        self,
+        case_id: str,
+        user_message: str,
+        use_tier_2: bool,
+        trace_id: str,
+    ) -> ChatResponse:
+        from backend.services.llm_responder import get_llm_responder
         
         # Log incoming message if routing logs enabled
         if ENABLE_ROUTING_LOGS:
             logger.info(f"[{trace_id}] CHAT_INPUT case={case_id} message={user_message[:100]}...")
         
-        # 1. Load case state
-        state = self.case_service.get_case_state(case_id)
+        # 1. Load case state (from the case's workflow checkpoint while it is in sync with the DB)
+        state = self._checkpointed_case_state(case_id)
+        resumed = state is not None
+        if not resumed:
+            state = self.case_service.get_case_state(case_id)
         if not state:
             logger.warning(f"[{trace_id}] Case not found: {case_id}")
             return self._create_response(
@@ -629,12 +661,18 @@ class ChatService:
             # state["human_decision"] = None # FIX: Do NOT clear historical decisions
             state["latest_agent_output"] = None
             state["latest_agent_name"] = None
+            # Agents get the remembered context plus this turn (chat_history is not stored with the case)
+            if conversation_history:
+                state["conversation_history"] = [
+                    *conversation_history, {"role": "user", "content": user_message}
+                ]
             
             result = self.process_message_langgraph(
                 case_id=case_id,
                 user_message=user_message,
                 use_tier_2=use_tier_2,
-                case_state=state
+                case_state=state,
+                resumed=resumed
             )
             assistant_message = result.assistant_message
             agents_called = result.agents_called or []
@@ -716,7 +754,8 @@ class ChatService:
                         ],
                         user_message=user_message or "",
                         intent_classified=intent.get("intent_summary", "Question"),
-                        model_used="gpt-4o-mini"
+                        model_used="gpt-4o-mini",
+                        **metadata_fields(),
                     )
                 )
                 self.case_service.save_artifact_pack(case_id, copilot_pack)
@@ -1591,7 +1630,8 @@ class ChatService:
         case_id: str,
         user_message: str,
         use_tier_2: bool = False,
-        case_state: Optional[Dict[str, Any]] = None
+        case_state: Optional[Dict[str, Any]] = None,
+        resumed: bool = False
     ) -> ChatResponse:
         """
         Process a user message using the unified LangGraph workflow.
@@ -1600,11 +1640,20 @@ class ChatService:
             case_id: The ID of the case context
             user_message: The raw natural language message from the user
             use_tier_2: Whether to use more powerful (expensive) models
+            case_state: Case state already loaded for this turn (loaded here when omitted)
+            resumed: case_state was read from the case's workflow checkpoint
             
         Returns:
             ChatResponse: Structured response including natural language, artifacts, and metadata
         """
         # 1. Get or create case state
+        if case_state is None:
+            case_state = self._checkpointed_case_state(case_id)
+            resumed = case_state is not None
+        # A resumed turn sends only the per-turn fields (see _turn_input), which is only safe
+        # while nothing has saved the case since the checkpoint was synced (e.g. a decision
+        # recorded earlier in this turn); otherwise the full state overwrites the checkpoint.
+        resumed = resumed and self._checkpoint_in_sync(case_id)
         # If case_state is provided (from frontend session), use it directly
         if case_state is not None:
             # Convert Case object to dict if needed
@@ -1689,6 +1738,12 @@ class ChatService:
         # If we already injected a remembered subset into `conversation_history`,
         # prefer that (it is token-budgeted and more relevant).
         # PipelineState expects List[Dict[str, str]]
+        if not workflow_state.get("conversation_history"):
+            # chat_history is not persisted with the case, so earlier turns come from the
+            # stored ChatMessage rows
+            stored = self._stored_conversation(case_id, user_message)
+            if stored:
+                workflow_state["conversation_history"] = stored
         if "chat_history" in workflow_state and (not workflow_state.get("conversation_history")):
             workflow_state["conversation_history"] = [
                 {"role": m.get("role"), "content": m.get("content")}
@@ -1731,8 +1786,13 @@ class ChatService:
             workflow_state["iteration_count"] = 0
             
         # 4. Run the Workflow
+        thread_id = case_id if checkpoints_enabled() else None
         try:
-            final_state = self._run_workflow(workflow_state)
+            final_state = self._run_workflow(
+                self._turn_input(workflow_state, resumed) if thread_id else workflow_state,
+                thread_id=thread_id,
+            )
+            logged = len(final_state.get("activity_log") or [])
             
             # 5. Generate Response using ResponseAdapter (MOVED BEFORE SAVE)
             # This decouples the "what happened" (state) from "what we say" (chat)
@@ -1910,7 +1970,8 @@ class ChatService:
                             task_details=[task_detail],
                             user_message=user_message,
                             intent_classified=final_state.get("intent_classification", ""),
-                            model_used=log_dict.get("model_used", "Unknown")
+                            model_used=log_dict.get("model_used", "Unknown"),
+                            **metadata_fields(),
                         )
 
                     # Create Artifact
@@ -2009,7 +2070,8 @@ class ChatService:
                                 total_tokens_used=entry_dict.get("token_total", 0),
                                 task_details=[task_detail],
                                 user_message=user_message or "",
-                                intent_classified=final_state.get("intent_classification", "")
+                                intent_classified=final_state.get("intent_classification", ""),
+                                **metadata_fields(),
                             )
                         )
                         self.case_service.save_artifact_pack(case_id, sup_pack)
@@ -2017,6 +2079,8 @@ class ChatService:
                         logger.error(f"Failed to save Supervisor artifact: {e}")
 
             self.case_service.save_case_state(final_state)
+            if thread_id:
+                self._sync_checkpoint(case_id, final_state, logged)
             
             # 7. Construct and return structured ChatResponse
             # Handle budget_state as either dict or Pydantic object
@@ -2045,22 +2109,144 @@ class ChatService:
             
         except Exception as e:
             logger.error(f"Workflow execution failed: {e}", exc_info=True)
+            if thread_id:
+                self._invalidate_checkpoint(case_id)
             return self._create_error_response(case_id, user_message, str(e))
 
-    def _run_workflow(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
+    # Checkpoint channels a chat turn reads before the run, in place of CaseService.get_case_state
+    _CASE_STATE_CHANNELS = (
+        "trigger_source", "case_summary", "latest_agent_output", "latest_agent_name",
+        "activity_log", "human_decision",
+    )
+
+    def _checkpoint_in_sync(self, case_id: str) -> bool:
+        """True when the case's workflow checkpoint was last synced with the current case revision."""
+        if not checkpoints_enabled():
+            return False
+        try:
+            revision = self.case_service.get_case_revision(case_id)
+            return revision is not None and get_workflow_checkpointer().thread_revision(case_id) == revision
+        except Exception as e:
+            logger.warning(f"Workflow checkpoint lookup failed for {case_id}: {e}")
+            return False
+
+    def _checkpointed_case_state(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Case state (SupervisorState fields) read from the case's workflow checkpoint when it is
+        in sync with the case record; None means load it from the DB.
+        """
+        if not self._checkpoint_in_sync(case_id):
+            return None
+        try:
+            values = get_workflow_checkpointer().read_channels(case_id, self._CASE_STATE_CHANNELS)
+        except Exception as e:
+            logger.warning(f"Workflow checkpoint read failed for {case_id}: {e}")
+            return None
+        summary = (values or {}).get("case_summary")
+        if summary is None:
+            return None
+        return {
+            "case_id": case_id,
+            "name": summary.name,
+            "summary_text": summary.summary_text,
+            "key_findings": summary.key_findings,
+            "dtp_stage": summary.dtp_stage,
+            "category_id": summary.category_id,
+            "contract_id": summary.contract_id,
+            "supplier_id": summary.supplier_id,
+            "trigger_source": values.get("trigger_source", summary.trigger_source),
+            "status": summary.status,
+            "user_intent": "",
+            "intent_classification": "UNKNOWN",
+            "latest_agent_output": values.get("latest_agent_output"),
+            "latest_agent_name": values.get("latest_agent_name"),
+            "activity_log": list(values.get("activity_log") or []),
+            "human_decision": values.get("human_decision"),
+            # Derived from the status like get_case_state, which is what the saved case holds
+            "waiting_for_human": summary.status == "Waiting for Human Decision",
+        }
+
+    def _stored_conversation(self, case_id: str, user_message: str) -> List[Dict[str, str]]:
+        """Token-budgeted conversation context from stored messages, ending with this turn."""
+        if not (self.conversation_manager and self.enable_conversation_memory):
+            return []
+        try:
+            history = self.conversation_manager.get_relevant_context(
+                case_id=case_id,
+                current_message=user_message,
+                max_tokens=self.max_conversation_tokens
+            )
+        except Exception as e:
+            logger.warning(f"Failed to retrieve conversation context: {e}")
+            return []
+        if not history:
+            return []
+        if history[-1].get("role") != "user" or history[-1].get("content") != user_message:
+            history.append({"role": "user", "content": user_message})
+        return history
+
+    @staticmethod
+    def _turn_input(workflow_state: Dict[str, Any], resumed: bool) -> Dict[str, Any]:
+        """
+        Graph input for a checkpointed run: only TURN_INPUT_FIELDS when resuming, otherwise
+        the full rebuilt state (which overwrites the checkpoint). Per-run bookkeeping left in
+        the checkpoint by the previous turn is reset either way.
+        """
+        from utils.state import fresh_run_fields
+
+        if resumed:
+            turn = {k: workflow_state[k] for k in TURN_INPUT_FIELDS if k in workflow_state}
+        else:
+            turn = dict(workflow_state)
+        for key, value in fresh_run_fields().items():
+            turn.setdefault(key, value)
+        return turn
+
+    def _sync_checkpoint(self, case_id: str, final_state: Dict[str, Any], logged: int) -> None:
+        """Copy post-run log entries into the case checkpoint and mark it in sync with the saved case."""
+        try:
+            activity_log = final_state.get("activity_log") or []
+            if len(activity_log) != logged:
+                # Synthetic/error entries added after the run. Recorded as the terminal
+                # wait_for_human node so the update does not trigger any routing.
+                from graphs.workflow import get_checkpointed_workflow_graph
+                get_checkpointed_workflow_graph().update_state(
+                    {"configurable": {"thread_id": case_id}},
+                    {"activity_log": activity_log},
+                    as_node="wait_for_human",
+                )
+            get_workflow_checkpointer().set_thread_revision(case_id, self.case_service.get_case_revision(case_id))
+        except Exception as e:
+            logger.warning(f"Workflow checkpoint sync failed for {case_id}: {e}")
+            self._invalidate_checkpoint(case_id)
+
+    def _invalidate_checkpoint(self, case_id: str) -> None:
+        """Force the next turn to rebuild from the DB (the checkpoint may not match the case)."""
+        try:
+            get_workflow_checkpointer().set_thread_revision(case_id, None)
+        except Exception as e:
+            logger.warning(f"Workflow checkpoint invalidation failed for {case_id}: {e}")
+
+    def _run_workflow(self, initial_state: Dict[str, Any], thread_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute the LangGraph workflow.
+
+        With a thread_id (the case id) the checkpointed graph runs: the input is applied on top
+        of the case's last checkpoint and only the end state of the run is saved.
         """
-        from graphs.workflow import get_workflow_graph
-        
-        # Get the compiled graph
-        app = get_workflow_graph()
-        
-        # Invoke the graph
-        # config can include thread_id for checkpointer if we use it
-        config = {"recursion_limit": 50} 
+        from graphs.workflow import get_checkpointed_workflow_graph, get_workflow_graph
+        
+        config = {"recursion_limit": 50}
+        kwargs = {}
+        if thread_id:
+            app = get_checkpointed_workflow_graph()
+            config["configurable"] = {"thread_id": thread_id}
+            kwargs["durability"] = "exit"
+        else:
+            app = get_workflow_graph()
         
-        final_state = app.invoke(initial_state, config)
+        with trace_request("workflow.invoke", case_id=initial_state.get("case_id")):
+            final_state = app.invoke(initial_state, config, **kwargs)
         return final_state
 
     def _extract_agents_called(self, state: Dict[str, Any]) -> List[str]:
@@ -0,0 +1,54 @@
+"""
+Strong ETags and conditional GET for polled read endpoints.
+
+An endpoint derives a cheap version stamp (case `updated_at`, `table_revision` counters
+maintained by triggers, pipeline status) and calls `not_modified` before doing any heavy
+loading or serialization; a matching If-None-Match returns an empty 304. Otherwise it sets
+the ETag on the normal response.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import bindparam, text
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the JSON form of `parts`."""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 §13.1.2): ignore W/ prefixes.
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag in tags
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """304 response when the client already has `etag`; otherwise stamps `response` and returns None."""
+    inm = request.headers.get("if-none-match")
+    if inm and _matches(inm, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return None
+
+
+def table_revisions(session, tables: Iterable[str]) -> Dict[str, int]:
+    """Current `table_revision` counters (0 for tables without a counter yet)."""
+    names = list(tables)
+    stmt = text("SELECT name, revision FROM table_revision WHERE name IN :names").bindparams(
+        bindparam("names", expanding=True)
+    )
+    try:
+        rows = session.execute(stmt, {"names": names}).all()
+    except Exception:
+        rows = []
+    found = {str(r[0]): int(r[1]) for r in rows}
+    return {n: found.get(n, 0) for n in names}
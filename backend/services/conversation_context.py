@@ -4,11 +4,19 @@ Conversation Context Manager - Cost-aware conversation memory.
 Manages conversation history with intelligent context selection,
 summarization, and cost estimation to enable ChatGPT-like multi-turn
 conversations while maintaining cost controls.
+
+Token accounting is incremental: each message is tokenized once when saved and the count
+is stored in `chat_messages.context_tokens` (older rows are backfilled on first read). The
+context window is then chosen from prefix sums of those counts instead of re-tokenizing
+the candidate context on every step.
 """
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from uuid import uuid4
 from sqlmodel import select
 from datetime import datetime
@@ -57,30 +65,72 @@ class ConversationContextManager:
             except Exception as e:
                 logger.warning(f"Failed to initialize tiktoken: {e}")
                 self.encoding = None
+
+        # Token counts of recent system blocks (structured memory, summaries), by text.
+        self._block_tokens: "OrderedDict[str, int]" = OrderedDict()
+        self._block_tokens_max = 256
     
-    def estimate_context_tokens(self, messages: List[Dict[str, str]]) -> int:
+    def message_tokens(self, role: str, content: str) -> int:
         """
-        Estimate token count for message list.
+        Token count of one message as it appears in the prompt ("role: content\n").
         
         Uses tiktoken if available, else approximation (4 chars ≈ 1 token).
         """
-        if not messages:
-            return 0
-        
+        text = f"{role}: {content}\n"
         if self.encoding:
             try:
-                total = 0
-                for msg in messages:
-                    # Format: "role: content\n"
-                    text = f"{msg['role']}: {msg['content']}\n"
-                    total += len(self.encoding.encode(text))
-                return total
+                return len(self.encoding.encode(text))
             except Exception as e:
                 logger.warning(f"Token estimation error: {e}, falling back to approximation")
         
         # Fallback: approximation (4 characters per token - conservative)
-        total_chars = sum(len(f"{m['role']}: {m['content']}\n") for m in messages)
-        return int(total_chars / 4)
+        return int(len(text) / 4)
+
+    def estimate_context_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Estimate token count for message list (sum of per-message counts)."""
+        return sum(self.message_tokens(m["role"], m["content"]) for m in messages or [])
+
+    def _system_block_tokens(self, content: str) -> int:
+        """Token count of a system block; the same memory/summary text is only tokenized once."""
+        tokens = self._block_tokens.get(content)
+        if tokens is None:
+            tokens = self.message_tokens("system", content)
+            self._block_tokens[content] = tokens
+            if len(self._block_tokens) > self._block_tokens_max:
+                self._block_tokens.popitem(last=False)
+        else:
+            self._block_tokens.move_to_end(content)
+        return tokens
+
+    def _stored_token_counts(self, messages: Sequence[ChatMessageModel]) -> List[int]:
+        """
+        Per-message token counts from `context_tokens`; rows saved before counts were stored
+        are tokenized here once and written back.
+        """
+        counts: List[int] = []
+        backfill: Dict[int, int] = {}
+        for msg in messages:
+            tokens = getattr(msg, "context_tokens", None)
+            if tokens is None:
+                tokens = self.message_tokens(msg.role, msg.content)
+                row_id = getattr(msg, "id", None)
+                if row_id is not None:
+                    backfill[row_id] = tokens
+            counts.append(tokens)
+        if backfill:
+            session = get_db_session()
+            try:
+                rows = session.exec(select(ChatMessageModel).where(ChatMessageModel.id.in_(list(backfill)))).all()
+                for row in rows:
+                    row.context_tokens = backfill[row.id]
+                    session.add(row)
+                session.commit()
+            except Exception as e:
+                logger.warning(f"Failed to store message token counts: {e}")
+                session.rollback()
+            finally:
+                session.close()
+        return counts
     
     def get_recent_messages(
         self,
@@ -142,69 +192,53 @@ class ConversationContextManager:
                 return []
             return [{"role": "system", "content": structured_memory}]
         
+        # prefix[i] = tokens of all_messages[:i], so any suffix window costs O(1) to measure
+        counts = self._stored_token_counts(all_messages)
+        prefix = [0, *accumulate(counts)]
+        total = prefix[-1]
         # Start with most recent messages
-        recent_messages = all_messages[-self.recent_messages_count:]
-        
-        # Convert to dict format
-        context = [
-            {"role": msg.role, "content": msg.content}
-            for msg in recent_messages
-        ]
-        
-        # Estimate tokens
-        estimated_tokens = self.estimate_context_tokens(context)
+        start = max(0, len(all_messages) - self.recent_messages_count)
         
         summary_context: List[Dict[str, str]] = []
         structured_memory = self._build_structured_case_memory(case_id)
         if structured_memory:
             summary_context.append({"role": "system", "content": structured_memory})
+        use_summary_context = bool(summary_context)
 
         # If we have more messages and tokens are under budget, try to include more
-        if len(all_messages) > self.recent_messages_count:
-            older_messages = all_messages[:-self.recent_messages_count]
+        if start > 0:
+            older_messages = all_messages[:start]
             
             # If we have many older messages and summarization is enabled, summarize them
             if len(older_messages) > self.summarize_threshold and self.enable_summarization:
                 try:
                     summary = self.summarize_conversation(case_id, [m.message_id for m in older_messages])
+                    use_summary_context = bool(summary)
                     if summary:
                         # Add summary as a system message
                         summary_context.append({"role": "system", "content": f"Previous conversation summary: {summary}"})
-                        full_context = summary_context + context
-                        full_tokens = self.estimate_context_tokens(full_context)
-                        
-                        if full_tokens <= max_tokens:
-                            context = full_context
-                        # If summary + recent is still too large, just use recent
+                        # If summary + recent is still too large, just use recent (below)
                 except Exception as e:
                     logger.warning(f"Summarization failed: {e}, using only recent messages")
-                    if summary_context:
-                        test_context = summary_context + context
-                        if self.estimate_context_tokens(test_context) <= max_tokens:
-                            context = test_context
             else:
-                # Try to include more messages if under token limit
-                for msg in reversed(older_messages):
-                    test_context = [{"role": msg.role, "content": msg.content}] + context
-                    test_tokens = self.estimate_context_tokens(test_context)
-                    if test_tokens <= max_tokens:
-                        context = test_context
-                    else:
-                        break
-                if summary_context:
-                    test_context = summary_context + context
-                    if self.estimate_context_tokens(test_context) <= max_tokens:
-                        context = test_context
-        elif summary_context:
-            test_context = summary_context + context
-            if self.estimate_context_tokens(test_context) <= max_tokens:
-                context = test_context
+                # Include older messages, newest first, while the window stays under budget:
+                # the earliest start whose suffix fits (prefix sums are non-decreasing).
+                start = min(start, bisect_left(prefix, total - max_tokens))
+        
+        # System blocks go in front only if they fit together with the chosen window
+        block_tokens = [self._system_block_tokens(b["content"]) for b in summary_context]
+        if not use_summary_context or sum(block_tokens) + total - prefix[start] > max_tokens:
+            summary_context, block_tokens = [], []
         
-        # Final check: trim if still over limit
-        while self.estimate_context_tokens(context) > max_tokens and len(context) > 1:
-            context = context[1:]  # Remove oldest message
+        context = summary_context + [
+            {"role": msg.role, "content": msg.content}
+            for msg in all_messages[start:]
+        ]
         
-        return context
+        # Final check: trim oldest entries if still over limit (keeping at least one)
+        window = [0, *accumulate(block_tokens + counts[start:])]
+        drop = min(bisect_left(window, window[-1] - max_tokens), len(context) - 1)
+        return context[max(drop, 0):]
     
     def summarize_conversation(
         self,
@@ -442,7 +476,8 @@ class ConversationContextManager:
         metadata: Optional[Dict[str, Any]] = None
     ) -> str:
         """
-        Persist chat message to database.
+        Persist chat message to database. `tokens_used` keeps the caller's
+        `metadata["tokens_used"]`; the message's own token count goes to `context_tokens`.
         
         Returns: message_id
         """
@@ -458,6 +493,8 @@ class ConversationContextManager:
                 intent_classified=metadata.get("intent"),
                 agents_called=json.dumps(metadata.get("agents_called", [])) if metadata.get("agents_called") else None,
                 tokens_used=metadata.get("tokens_used"),
+                # Prompt tokens of this message, counted once for context assembly
+                context_tokens=self.message_tokens(role, content),
                 estimated_cost_usd=metadata.get("estimated_cost_usd")
             )
             session.add(message)
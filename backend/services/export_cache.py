@@ -0,0 +1,193 @@
+"""
+Content-addressed disk cache for artifact / artifact-pack downloads (docx, pdf, md).
+
+Saved artifacts and packs never change, so rendered bytes are keyed by
+(kind, id, format, sha256 of the rendered inputs incl. case name, EXPORT_RENDERER_VERSION)
+and served straight from disk on repeat downloads. The cache is trimmed least-recently-used
+first once it exceeds EXPORT_CACHE_MAX_MB.
+
+Env:
+- EXPORT_CACHE_MAX_MB (default 256; 0 disables the cache)
+- EXPORT_PRERENDER_FORMATS (default empty): e.g. "md,docx" renders those pack formats in
+  the background right after a pack is saved
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from utils.metrics import record_cache
+from backend.services.artifact_document_export import (
+    EXPORT_RENDERER_VERSION,
+    build_artifact_docx_bytes,
+    build_artifact_pack_docx_bytes,
+    build_artifact_pack_markdown_bytes,
+    build_artifact_pack_pdf_bytes,
+    build_artifact_pdf_bytes,
+    export_filename,
+    export_pack_filename,
+)
+from shared.schemas import Artifact, ArtifactPack
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "export_cache"
+
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "md": "text/markdown; charset=utf-8",
+}
+
+_ARTIFACT_RENDERERS = {
+    "docx": build_artifact_docx_bytes,
+    "pdf": build_artifact_pdf_bytes,
+}
+_PACK_RENDERERS = {
+    "md": build_artifact_pack_markdown_bytes,
+    "docx": build_artifact_pack_docx_bytes,
+    "pdf": build_artifact_pack_pdf_bytes,
+}
+
+_evict_lock = threading.Lock()
+
+
+def _max_bytes() -> int:
+    try:
+        mb = float(os.getenv("EXPORT_CACHE_MAX_MB", "256"))
+    except (TypeError, ValueError):
+        mb = 256.0
+    return int(max(0.0, mb) * 1024 * 1024)
+
+
+def _cache_path(kind: str, object_id: str, fmt: str, content_hash: str) -> Path:
+    key = hashlib.sha256(
+        f"{kind}|{object_id}|{fmt}|{content_hash}|{EXPORT_RENDERER_VERSION}".encode("utf-8")
+    ).hexdigest()
+    return EXPORT_CACHE_DIR / f"{key}.{fmt}"
+
+
+def _evict(limit: int) -> None:
+    """Delete least-recently-used files until the cache fits in `limit` bytes."""
+    with _evict_lock:
+        try:
+            entries = [(p, p.stat()) for p in EXPORT_CACHE_DIR.iterdir() if p.is_file()]
+        except OSError:
+            return
+        total = sum(st.st_size for _, st in entries)
+        if total <= limit:
+            return
+        for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= st.st_size
+            if total <= limit:
+                break
+
+
+def get_or_render(
+    kind: str,
+    object_id: str,
+    fmt: str,
+    content_hash: str,
+    render: Callable[[], bytes],
+) -> bytes:
+    """Return cached bytes for the key, rendering (and storing) them on a miss."""
+    limit = _max_bytes()
+    if limit <= 0:
+        return render()
+    path = _cache_path(kind, object_id, fmt, content_hash)
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # recency for LRU eviction
+        record_cache("export", True)
+        return data
+    except OSError:
+        pass
+    record_cache("export", False)
+    data = render()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        _evict(limit)
+    except OSError as e:
+        logger.warning("Export cache write failed for %s %s: %s", kind, object_id, e)
+    return data
+
+
+def _content_hash(model_json: str, case_id: str, case_name: str) -> str:
+    return hashlib.sha256(f"{case_id}\x00{case_name}\x00{model_json}".encode("utf-8")).hexdigest()
+
+
+def export_artifact(
+    artifact: Artifact, fmt: str, case_id: str, case_name: str
+) -> Tuple[bytes, str, str]:
+    """(bytes, media type, filename) for one artifact as docx or pdf."""
+    render = _ARTIFACT_RENDERERS[fmt]
+    data = get_or_render(
+        "artifact",
+        artifact.artifact_id,
+        fmt,
+        _content_hash(artifact.model_dump_json(), case_id, case_name),
+        lambda: render(artifact, case_id, case_name),
+    )
+    return data, MEDIA_TYPES[fmt], export_filename(artifact, fmt)
+
+
+def export_artifact_pack(
+    pack: ArtifactPack, fmt: str, case_id: str, case_name: str
+) -> Tuple[bytes, str, str]:
+    """(bytes, media type, filename) for a whole pack as md, docx or pdf."""
+    render = _PACK_RENDERERS[fmt]
+    data = get_or_render(
+        "pack",
+        pack.pack_id,
+        fmt,
+        _content_hash(pack.model_dump_json(), case_id, case_name),
+        lambda: render(pack, case_id, case_name),
+    )
+    return data, MEDIA_TYPES[fmt], export_pack_filename(pack, fmt)
+
+
+def _prerender_formats() -> Tuple[str, ...]:
+    raw = os.getenv("EXPORT_PRERENDER_FORMATS", "")
+    return tuple(f for f in (p.strip().lower() for p in raw.split(",")) if f in _PACK_RENDERERS)
+
+
+def schedule_pack_prerender(case_id: str, pack_id: str) -> Optional[threading.Thread]:
+    """
+    Warm the cache for a freshly saved pack when EXPORT_PRERENDER_FORMATS is set.
+    The pack is reloaded from the DB so the key matches what the download path computes.
+    """
+    formats = _prerender_formats()
+    if not formats or _max_bytes() <= 0:
+        return None
+
+    def _run() -> None:
+        from backend.services.case_service import get_case_service
+
+        t0 = time.monotonic()
+        service = get_case_service()
+        case_name = service.get_case_name(case_id)
+        pack = service.get_artifact_pack_for_case(case_id, pack_id)
+        if case_name is None or pack is None:
+            return
+        for fmt in formats:
+            try:
+                export_artifact_pack(pack, fmt, case_id, case_name)
+            except Exception as e:
+                logger.warning("Pre-render of pack %s as %s failed: %s", pack_id, fmt, e)
+        logger.info("Pre-rendered pack %s (%s) in %.2fs", pack_id, ",".join(formats), time.monotonic() - t0)
+
+    thread = threading.Thread(target=_run, name=f"export-prerender-{pack_id}", daemon=True)
+    thread.start()
+    return thread
@@ -4,7 +4,13 @@ Shared LLM provider helpers with OpenAI/Azure OpenAI fallback logic.
 from __future__ import annotations
 
 import os
-from typing import Any, Optional
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.metrics import record_llm_call
 
 
 def _clean_env(name: str) -> str:
@@ -31,6 +37,60 @@ def has_llm_credentials() -> bool:
     return bool(_openai_api_key())
 
 
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records call count, latency and provider-reported tokens for a LangChain chat model."""
+
+    def __init__(self, deployment: str):
+        self.deployment = deployment
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        t0 = self._started.pop(run_id, None)
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        record_llm_call(
+            self.deployment,
+            time.perf_counter() - t0 if t0 is not None else 0.0,
+            prompt_tokens=int(usage.get("prompt_tokens") or 0),
+            completion_tokens=int(usage.get("completion_tokens") or 0),
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        t0 = self._started.pop(run_id, None)
+        record_llm_call(self.deployment, time.perf_counter() - t0 if t0 is not None else 0.0, error=True)
+
+
+def _instrument_openai_client(client: Any) -> Any:
+    """Wrap client.chat.completions.create so raw OpenAI calls feed the same LLM metrics."""
+    completions = client.chat.completions
+    create = completions.create
+
+    def _create(*args: Any, **kwargs: Any) -> Any:
+        deployment = str(kwargs.get("model") or "unknown")
+        t0 = time.perf_counter()
+        try:
+            resp = create(*args, **kwargs)
+        except Exception:
+            record_llm_call(deployment, time.perf_counter() - t0, error=True)
+            raise
+        usage = getattr(resp, "usage", None)
+        record_llm_call(
+            deployment,
+            time.perf_counter() - t0,
+            prompt_tokens=int(getattr(usage, "prompt_tokens", 0) or 0),
+            completion_tokens=int(getattr(usage, "completion_tokens", 0) or 0),
+        )
+        return resp
+
+    completions.create = _create
+    return client
+
+
 def get_openai_client() -> Optional[Any]:
     """
     Return configured OpenAI-compatible client.
@@ -48,12 +108,12 @@ def get_openai_client() -> Optional[Any]:
         api_version = _clean_env("AZURE_OPENAI_API_VERSION") or "2024-02-01"
         if not endpoint or not key:
             return None
-        return AzureOpenAI(api_key=key, azure_endpoint=endpoint, api_version=api_version)
+        return _instrument_openai_client(AzureOpenAI(api_key=key, azure_endpoint=endpoint, api_version=api_version))
 
     key = _openai_api_key()
     if not key:
         return None
-    return OpenAI(api_key=key)
+    return _instrument_openai_client(OpenAI(api_key=key))
 
 
 def resolve_chat_model(default_model: str, *, deployment_env: Optional[str] = None) -> str:
@@ -101,6 +161,7 @@ def get_langchain_chat_model(
             temperature=temperature,
             max_tokens=max_tokens,
             model_kwargs=model_kwargs or {},
+            callbacks=[LLMMetricsCallback(deployment)],
         )
 
     from langchain_openai import ChatOpenAI
@@ -111,11 +172,26 @@ def get_langchain_chat_model(
         temperature=temperature,
         max_tokens=max_tokens,
         model_kwargs=model_kwargs or {},
+        callbacks=[LLMMetricsCallback(default_model)],
     )
 
 
 def get_langchain_embeddings(*, default_model: str = "text-embedding-3-small", deployment_env: Optional[str] = None):
-    """Return LangChain embeddings client for OpenAI/Azure OpenAI."""
+    """
+    Return LangChain embeddings client for the configured backend.
+
+    Env:
+    - EMBEDDING_BACKEND=auto|openai|local. `auto` (default) uses OpenAI/Azure OpenAI when
+      credentials exist and otherwise returns None (Chroma's built-in embedder); `local` runs
+      a sentence-transformers model on CPU (see backend.services.local_embeddings).
+    """
+    backend = (_clean_env("EMBEDDING_BACKEND") or "auto").lower()
+    if backend == "local":
+        from backend.services.local_embeddings import get_local_embeddings
+
+        return get_local_embeddings()
+    if backend not in ("auto", "openai"):
+        raise ValueError(f"Unsupported EMBEDDING_BACKEND: {backend}")
     if not has_llm_credentials():
         return None
 
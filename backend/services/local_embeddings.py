@@ -0,0 +1,77 @@
+"""
+Local sentence-embedding backend (sentence-transformers on CPU) for offline deployments.
+
+`LocalSentenceEmbeddings` has the LangChain embeddings surface (`embed_query`,
+`embed_documents`) so the vector stores and the embedding cache treat it like the
+OpenAI/Azure clients. The model is loaded once per process and documents are encoded in
+batches; vectors are L2-normalized so cosine and inner-product search agree.
+
+Env:
+- LOCAL_EMBEDDING_MODEL (default sentence-transformers/all-MiniLM-L6-v2; name or local path)
+- LOCAL_EMBEDDING_DEVICE (default cpu)
+- LOCAL_EMBEDDING_BATCH_SIZE (default 32)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_LOCAL_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def local_embeddings_available() -> bool:
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class LocalSentenceEmbeddings:
+    """Batched CPU sentence embeddings behind the LangChain embeddings interface."""
+
+    def __init__(self, model: Optional[str] = None, device: Optional[str] = None, batch_size: Optional[int] = None):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = model or os.getenv("LOCAL_EMBEDDING_MODEL") or DEFAULT_LOCAL_EMBEDDING_MODEL
+        self.device = device or os.getenv("LOCAL_EMBEDDING_DEVICE") or "cpu"
+        try:
+            self.batch_size = int(batch_size or os.getenv("LOCAL_EMBEDDING_BATCH_SIZE") or 32)
+        except ValueError:
+            self.batch_size = 32
+        self._encoder = SentenceTransformer(self.model, device=self.device)
+        # Encoders are not guaranteed thread-safe; requests share one instance.
+        self._lock = threading.Lock()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            vectors = self._encoder.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        return [[float(x) for x in v] for v in vectors]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+
+_local: Dict[str, Any] = {}
+_local_lock = threading.Lock()
+
+
+def get_local_embeddings() -> LocalSentenceEmbeddings:
+    """One loaded model per configured name (loading takes seconds and hundreds of MB)."""
+    name = os.getenv("LOCAL_EMBEDDING_MODEL") or DEFAULT_LOCAL_EMBEDDING_MODEL
+    with _local_lock:
+        if name not in _local:
+            _local[name] = LocalSentenceEmbeddings(name)
+        return _local[name]
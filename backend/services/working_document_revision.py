@@ -1,17 +1,55 @@
 """
 LLM revision pass for user working documents (RFX / contract plain text from Word).
+
+Large drafts are revised section by section: the text is split on heading lines, the
+sections an instruction touches are picked (heading / number references, else a small
+outline-only LLM routing call), only those are sent to the LLM (in parallel), and the
+results are spliced back with a unified diff. Short or unstructured drafts still take the
+single full-document pass.
+
+Env:
+- WORKING_DOC_SECTION_MIN_CHARS (default 6000): below this, revise the whole draft at once
+- WORKING_DOC_REVISION_CONCURRENCY (default 4)
 """
 from __future__ import annotations
 
+import difflib
+import json
 import logging
 import os
-from typing import Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from backend.services.llm_provider import get_langchain_chat_model
 
 logger = logging.getLogger(__name__)
 
+_DIFF_MAX_CHARS = 20000
+_NUMBERED_HEADING = re.compile(
+    r"^(?P<prefix>(?:section|article|schedule)\s+)?(?P<number>\d+(?:\.\d+)*)[.)]?\s+(?P<title>\S.*)$",
+    re.IGNORECASE,
+)
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+\S")
+_SECTION_REF = re.compile(r"\b(?:section|clause|article|schedule|§)\s*(\d+(?:\.\d+)*)", re.IGNORECASE)
+_BARE_NUMBER_REF = re.compile(r"(?<![\w.])(\d+\.\d+(?:\.\d+)*)(?![\w.])")
+_GLOBAL_HINTS = (
+    "entire document",
+    "whole document",
+    "throughout",
+    "all sections",
+    "every section",
+    "everywhere",
+    "overall tone",
+    "globally",
+)
+_STOPWORDS = {
+    "the", "and", "for", "with", "section", "clause", "please", "update", "change", "make",
+    "into", "from", "this", "that", "add", "remove", "more", "less", "our", "their", "about",
+}
+
 
 def revise_working_document_text(
     *,
@@ -21,6 +59,7 @@ def revise_working_document_text(
     case_name: str,
     category_id: str,
     dtp_stage: str,
+    llm: Any = None,
 ) -> Optional[str]:
     """
     Return full revised plain text, or None if API unavailable / error.
@@ -53,12 +92,7 @@ CURRENT DRAFT (plain text):
 """
 
     try:
-        llm = get_langchain_chat_model(
-            default_model="gpt-4o-mini",
-            temperature=0.25,
-            max_tokens=4096,
-            deployment_env="AZURE_OPENAI_WORKING_DOC_DEPLOYMENT",
-        )
+        llm = llm or _revision_llm()
         if llm is None:
             logger.warning("OpenAI/Azure configuration missing — cannot revise working document")
             return None
@@ -70,3 +104,303 @@ CURRENT DRAFT (plain text):
     except Exception as e:
         logger.exception("revise_working_document_text failed: %s", e)
         return None
+
+
+def _revision_llm():
+    return get_langchain_chat_model(
+        default_model="gpt-4o-mini",
+        temperature=0.25,
+        max_tokens=4096,
+        deployment_env="AZURE_OPENAI_WORKING_DOC_DEPLOYMENT",
+    )
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class DocumentSection:
+    index: int
+    heading: str  # "" for text before the first heading
+    number: Optional[str]  # "3.2" for "3.2 Payment terms"
+    text: str  # heading line + body, including trailing newlines
+
+
+@dataclass
+class WorkingDocumentRevision:
+    text: str
+    mode: str  # "sections" | "full"
+    revised_sections: List[str] = field(default_factory=list)
+    failed_sections: List[int] = field(default_factory=list)  # left unchanged (LLM call failed)
+    diff: str = ""
+
+
+def _is_heading_title(title: str) -> bool:
+    """A few words without sentence punctuation ("Payment terms", not "Invoices are due in 30 days.")."""
+    return 0 < len(title.split()) <= 8 and len(title) <= 60 and not title.endswith((".", ";", ",", "!", "?"))
+
+
+def _list_number(line: Optional[str]) -> Optional[List[int]]:
+    """Number of a plain numbered line ("2.3 Scope" -> [2, 3]), None if it is not one."""
+    m = _NUMBERED_HEADING.match((line or "").strip())
+    if not m or m.group("prefix"):
+        return None
+    return [int(p) for p in m.group("number").split(".")]
+
+
+def _follows(prev: Optional[List[int]], nxt: Optional[List[int]]) -> bool:
+    """nxt is the next item after prev at the same level (1 -> 2, 3.1 -> 3.2)."""
+    return bool(prev and nxt) and len(prev) == len(nxt) and prev[:-1] == nxt[:-1] and nxt[-1] == prev[-1] + 1
+
+
+def _is_heading(line: str, prev_line: Optional[str] = None, next_line: Optional[str] = None) -> bool:
+    """
+    Heading test for one line; prev_line / next_line are the neighbouring non-blank lines.
+    Numbered lines need a Section / Article / Schedule prefix, or a short title and no
+    neighbour continuing the numbering (consecutive numbered lines are a list:
+    "1. Deliver by Friday" / "2. Return all equipment").
+    """
+    t = line.strip()
+    if not t or len(t) > 90:
+        return False
+    if _MARKDOWN_HEADING.match(t):
+        return True
+    m = _NUMBERED_HEADING.match(t)
+    if m:
+        if m.group("prefix"):
+            return len(t) <= 70 and not t.endswith((".", ";", ","))
+        number = _list_number(t)
+        in_list = _follows(_list_number(prev_line), number) or _follows(number, _list_number(next_line))
+        return _is_heading_title(m.group("title")) and not in_list
+    letters = [c for c in t if c.isalpha()]
+    if len(letters) >= 3 and len(t) <= 70 and all(c.isupper() for c in letters):
+        return True
+    return t.endswith(":") and len(t) <= 60 and len(t.split()) <= 8
+
+
+def split_sections(text: str) -> List[DocumentSection]:
+    """Split on heading lines; concatenating section texts reproduces the input exactly."""
+    lines = (text or "").splitlines(keepends=True)
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    neighbours = {
+        i: (lines[filled[k - 1]] if k else None, lines[filled[k + 1]] if k + 1 < len(filled) else None)
+        for k, i in enumerate(filled)
+    }
+    sections: List[DocumentSection] = []
+    heading, number, buf = "", None, []
+    for i, line in enumerate(lines):
+        is_heading = i in neighbours and _is_heading(line, *neighbours[i])
+        if is_heading and buf:
+            sections.append(DocumentSection(len(sections), heading, number, "".join(buf)))
+            buf = []
+        if is_heading and not buf:
+            heading = line.strip().lstrip("#").strip()
+            m = _NUMBERED_HEADING.match(line.strip())
+            number = m.group("number") if m else None
+        buf.append(line)
+    if buf:
+        sections.append(DocumentSection(len(sections), heading, number, "".join(buf)))
+    return sections
+
+
+def _heading_tokens(heading: str) -> set:
+    return {
+        w for w in re.findall(r"[a-z]{4,}", heading.lower()) if w not in _STOPWORDS
+    }
+
+
+def select_target_sections(sections: Sequence[DocumentSection], instruction: str) -> Optional[List[int]]:
+    """
+    Indices of sections the instruction refers to (by number, quoted heading or heading words),
+    every index for document-wide instructions, or None when nothing can be inferred.
+    """
+    low = (instruction or "").lower()
+    if any(h in low for h in _GLOBAL_HINTS):
+        return [s.index for s in sections]
+    refs = set(_SECTION_REF.findall(low)) | set(_BARE_NUMBER_REF.findall(low))
+    quoted = [q.strip().lower() for q in re.findall(r"[\"“']([^\"”']{3,})[\"”']", instruction or "")]
+    words = set(re.findall(r"[a-z]{4,}", low))
+    picked: List[int] = []
+    for sec in sections:
+        if not sec.heading:
+            continue
+        h = sec.heading.lower()
+        by_number = sec.number is not None and any(
+            sec.number == r or sec.number.startswith(r + ".") for r in refs
+        )
+        by_quote = any(q in h for q in quoted)
+        tokens = _heading_tokens(sec.heading)
+        by_words = bool(tokens) and tokens <= words
+        if by_number or by_quote or by_words:
+            picked.append(sec.index)
+    return picked or None
+
+
+def _outline(sections: Sequence[DocumentSection]) -> str:
+    lines = []
+    for sec in sections:
+        label = sec.heading or "(untitled opening text)"
+        preview = " ".join(sec.text.split())[:120]
+        lines.append(f"[{sec.index}] {label} — {preview}")
+    return "\n".join(lines)
+
+
+def _route_sections_with_llm(llm: Any, sections: Sequence[DocumentSection], instruction: str) -> Optional[List[int]]:
+    """Ask which sections an instruction touches, sending only the outline (not the draft)."""
+    prompt = f"""Document outline (index, heading, opening words):
+{_outline(sections)}
+
+Edit instruction:
+{instruction}
+
+Return ONLY JSON: {{"sections": [indices that must change to satisfy the instruction]}}.
+Use every index if the instruction applies to the whole document."""
+    try:
+        msg = llm.invoke([HumanMessage(content=prompt)])
+        raw = str(msg.content or "").strip()
+        raw = raw[raw.find("{"): raw.rfind("}") + 1] if "{" in raw else raw
+        data = json.loads(raw)
+        valid = {s.index for s in sections}
+        out = sorted({int(i) for i in data.get("sections") or [] if int(i) in valid})
+        return out or None
+    except Exception as e:
+        logger.warning("Section routing failed, revising every section: %s", e)
+        return None
+
+
+def _revise_section(
+    llm: Any,
+    section: DocumentSection,
+    *,
+    outline: str,
+    instruction: str,
+    doc_label: str,
+    case_context: str,
+) -> Optional[str]:
+    system = f"""You are a senior procurement counsel and sourcing lead helping edit one section of a {doc_label}.
+Revise ONLY the section you are given, according to the instruction.
+
+Rules:
+- Output ONLY the revised section as plain text, starting with its heading line unchanged (if it has one).
+- Do not write other sections, a preamble or a postscript.
+- Keep numbering, lists and defined terms consistent with the outline of the full document."""
+    user = f"""{case_context}
+
+DOCUMENT OUTLINE (for context only):
+{outline}
+
+USER INSTRUCTION:
+{instruction}
+
+SECTION TO REVISE:
+{section.text}
+"""
+    try:
+        msg = llm.invoke([SystemMessage(content=system), HumanMessage(content=user)])
+        out = str(msg.content or "").strip()
+        return out or None
+    except Exception as e:
+        logger.warning("Revision of section %s failed: %s", section.index, e)
+        return None
+
+
+def _trailing_ws(text: str) -> str:
+    return text[len(text.rstrip()):]
+
+
+def revision_diff(old: str, new: str) -> str:
+    diff = "\n".join(
+        difflib.unified_diff(
+            old.splitlines(), new.splitlines(), "current", "revised", lineterm="", n=2
+        )
+    )
+    return diff if len(diff) <= _DIFF_MAX_CHARS else diff[:_DIFF_MAX_CHARS] + "\n... (diff truncated)"
+
+
+def revise_working_document(
+    *,
+    role: str,
+    current_text: str,
+    instruction: str,
+    case_name: str,
+    category_id: str,
+    dtp_stage: str,
+    llm: Any = None,
+) -> Optional[WorkingDocumentRevision]:
+    """
+    Revise only the sections an instruction touches (full pass for short / unstructured drafts).
+    Returns None if the LLM is unavailable or every section call failed; sections whose call
+    failed are left unchanged and listed in `failed_sections`.
+    """
+    llm = llm or _revision_llm()
+    if llm is None:
+        logger.warning("OpenAI/Azure configuration missing — cannot revise working document")
+        return None
+
+    sections = split_sections(current_text)
+    min_chars = _env_int("WORKING_DOC_SECTION_MIN_CHARS", 6000)
+    if len(current_text or "") < min_chars or len([s for s in sections if s.heading]) < 2:
+        revised = revise_working_document_text(
+            role=role,
+            current_text=current_text,
+            instruction=instruction,
+            case_name=case_name,
+            category_id=category_id,
+            dtp_stage=dtp_stage,
+            llm=llm,
+        )
+        if not revised:
+            return None
+        return WorkingDocumentRevision(
+            text=revised, mode="full", diff=revision_diff(current_text, revised)
+        )
+
+    instr = (instruction or "").strip() or (
+        "Improve clarity, fix inconsistencies, and strengthen procurement-appropriate language."
+    )
+    targets = select_target_sections(sections, instr)
+    if targets is None:
+        targets = _route_sections_with_llm(llm, sections, instr) or [s.index for s in sections]
+
+    doc_label = "RFx (RFP / RFQ / RFI) draft" if role == "rfx" else "contract / commercial draft"
+    case_context = f"Case name: {case_name}\nCategory: {category_id}\nDTP stage: {dtp_stage}"
+    outline = _outline(sections)
+    workers = min(len(targets), _env_int("WORKING_DOC_REVISION_CONCURRENCY", 4))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wd-revise") as pool:
+        results = list(
+            pool.map(
+                lambda i: _revise_section(
+                    llm,
+                    sections[i],
+                    outline=outline,
+                    instruction=instr,
+                    doc_label=doc_label,
+                    case_context=case_context,
+                ),
+                targets,
+            )
+        )
+    if not any(results):
+        return None
+
+    parts = [s.text for s in sections]
+    revised_headings: List[str] = []
+    failed: List[int] = []
+    for idx, new_text in zip(targets, results):
+        if not new_text:
+            failed.append(idx)
+            continue
+        parts[idx] = new_text + (_trailing_ws(sections[idx].text) or "\n")
+        revised_headings.append(sections[idx].heading or "(opening text)")
+    text = "".join(parts)
+    return WorkingDocumentRevision(
+        text=text,
+        mode="sections",
+        revised_sections=revised_headings,
+        failed_sections=failed,
+        diff=revision_diff(current_text, text),
+    )
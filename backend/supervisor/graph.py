@@ -10,6 +10,7 @@ from langgraph.graph import StateGraph, END
 from backend.supervisor.state import SupervisorState, StateManager
 from backend.supervisor.router import IntentRouter
 from shared.constants import UserIntent, CaseStatus
+from utils.tracing import trace_request, traced_node
 
 
 class SupervisorGraph:
@@ -33,12 +34,12 @@ class SupervisorGraph:
         workflow = StateGraph(SupervisorState)
         
         # Add nodes
-        workflow.add_node("classify_intent", self._classify_intent_node)
-        workflow.add_node("validate_action", self._validate_action_node)
-        workflow.add_node("execute_agent", self._execute_agent_node)
-        workflow.add_node("check_approval", self._check_approval_node)
-        workflow.add_node("process_decision", self._process_decision_node)
-        workflow.add_node("format_response", self._format_response_node)
+        workflow.add_node("classify_intent", traced_node("supervisor", "classify_intent", self._classify_intent_node))
+        workflow.add_node("validate_action", traced_node("supervisor", "validate_action", self._validate_action_node))
+        workflow.add_node("execute_agent", traced_node("supervisor", "execute_agent", self._execute_agent_node))
+        workflow.add_node("check_approval", traced_node("supervisor", "check_approval", self._check_approval_node))
+        workflow.add_node("process_decision", traced_node("supervisor", "process_decision", self._process_decision_node))
+        workflow.add_node("format_response", traced_node("supervisor", "format_response", self._format_response_node))
         
         # Entry point
         workflow.set_entry_point("classify_intent")
@@ -242,7 +243,8 @@ class SupervisorGraph:
     def invoke(self, state: SupervisorState, config: Optional[Dict] = None) -> SupervisorState:
         """Invoke the workflow."""
         config = config or {"recursion_limit": 25}
-        return self.graph.invoke(state, config)
+        with trace_request("supervisor.invoke", case_id=state.get("case_id")):
+            return self.graph.invoke(state, config)
 
 
 # Singleton instance
@@ -28,6 +28,7 @@ from pydantic import BaseModel, Field
 from shared.constants import UserIntent, UserGoal, WorkType, AgentName
 from shared.schemas import IntentResult, ActionPlan
 from backend.services.llm_provider import get_langchain_chat_model
+from utils.metrics import record_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -708,7 +709,9 @@ class IntentRouter:
         cache_key = cls._get_cache_key(user_message, context)
         if cache_key in cls._llm_cache:
             logger.debug(f"Cache hit for classification: {cache_key[:8]}...")
+            record_cache("intent", True)
             return cls._llm_cache[cache_key]
+        record_cache("intent", False)
         
         # Build LLM prompt with few-shot examples
         prompt = f"""Classify this user message in a procurement sourcing context.
@@ -14,6 +14,7 @@ from datetime import datetime
 from uuid import uuid4
 
 from shared.schemas import GroundingReference
+from utils.tracing import span
 
 
 @dataclass
@@ -97,9 +98,28 @@ class BaseTask(ABC):
         start_time = datetime.now()
         result = TaskResult(task_name=self.name)
         
+        with span(f"task.{self.name}", kind="task") as task_span:
+            self._execute_steps(context, result)
+            if task_span is not None:
+                task_span.set(
+                    tokens=result.tokens_used,
+                    retrieval_count=len(result.grounded_in),
+                    status="ok" if result.success else "error",
+                    error="; ".join(result.errors)[:300] if result.errors else None,
+                )
+        
+        # Calculate execution time
+        end_time = datetime.now()
+        result.execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        
+        return result
+    
+    def _execute_steps(self, context: Dict[str, Any], result: TaskResult) -> None:
+        """Rules -> retrieval -> analytics -> LLM, each in its own trace span."""
         try:
             # Step 1: Run rules/policy checks
-            rules_result = self.run_rules(context)
+            with span("rules", kind="task_step"):
+                rules_result = self.run_rules(context)
             result.data.update(rules_result.get("data", {}))
             result.grounded_in.extend(rules_result.get("grounded_in", []))
             
@@ -107,33 +127,34 @@ class BaseTask(ABC):
             if rules_result.get("stop"):
                 result.data["stopped_at"] = "rules"
                 result.data["stop_reason"] = rules_result.get("stop_reason", "")
-                return result
+                return
             
             # Step 2: Run retrieval
-            retrieval_result = self.run_retrieval(context, rules_result)
+            with span("retrieval", kind="task_step") as s:
+                retrieval_result = self.run_retrieval(context, rules_result)
+                if s is not None:
+                    s.set(retrieval_count=len(retrieval_result.get("grounded_in", [])))
             result.data.update(retrieval_result.get("data", {}))
             result.grounded_in.extend(retrieval_result.get("grounded_in", []))
             
             # Step 3: Run analytics
-            analytics_result = self.run_analytics(context, rules_result, retrieval_result)
+            with span("analytics", kind="task_step"):
+                analytics_result = self.run_analytics(context, rules_result, retrieval_result)
             result.data.update(analytics_result.get("data", {}))
             result.grounded_in.extend(analytics_result.get("grounded_in", []))
             
             # Step 4: Run LLM narration (optional)
             if self.needs_llm_narration(context, analytics_result):
-                llm_result = self.run_llm(context, rules_result, retrieval_result, analytics_result)
+                with span("llm", kind="task_step") as s:
+                    llm_result = self.run_llm(context, rules_result, retrieval_result, analytics_result)
+                    if s is not None:
+                        s.set(tokens=llm_result.get("tokens_used", 0))
                 result.data.update(llm_result.get("data", {}))
                 result.tokens_used = llm_result.get("tokens_used", 0)
             
         except Exception as e:
             result.success = False
             result.errors.append(str(e))
-        
-        # Calculate execution time
-        end_time = datetime.now()
-        result.execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
-        
-        return result
     
     def run_rules(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -211,11 +232,14 @@ class BaseTask(ABC):
         if not self.llm:
             return "", 0
         
-        response = self.llm.invoke(prompt)
+        with span(f"llm.{self.name}", kind="llm") as llm_span:
+            response = self.llm.invoke(prompt)
         tokens = 0
         if hasattr(response, 'response_metadata') and response.response_metadata:
             usage = response.response_metadata.get('token_usage', {})
             tokens = usage.get('total_tokens', 0)
+        if llm_span is not None:
+            llm_span.set(tokens=tokens)
         
         return response.content, tokens
 
@@ -109,12 +109,11 @@ class LeveragePointExtractionTask(BaseTask):
         
         # Query performance data for bidding suppliers
         supplier_ids = [b["supplier_id"] for b in bids]
-        performance_data = {}
-        
-        for supplier_id in supplier_ids:
-            perf = self.retriever.get_supplier_performance(supplier_id)
-            if perf.get("summary"):
-                performance_data[supplier_id] = perf["summary"]
+        performance_data = {
+            supplier_id: perf["summary"]
+            for supplier_id, perf in self.retriever.get_supplier_performance_many(supplier_ids).items()
+            if perf.get("summary")
+        }
         
         return {
             "data": {"performance_by_supplier": performance_data},
@@ -9,8 +9,9 @@ from sqlmodel import select
 
 from backend.tasks.base_task import BaseTask
 from backend.persistence.database import get_db_session
-from backend.persistence.models import SupplierPerformance, SLAEvent
+from backend.persistence.models import SupplierPerformance
 from shared.schemas import GroundingReference
+from utils.supplier_scoring import DEFAULT_CRITERIA, SupplierScoringEngine, priority_weight_scenarios
 
 
 class BuildEvaluationCriteriaTask(BaseTask):
@@ -18,17 +19,8 @@ class BuildEvaluationCriteriaTask(BaseTask):
     
     def run_rules(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Define default evaluation criteria."""
-        # Default criteria if none provided
-        default_criteria = [
-            {"name": "Quality", "weight": 0.25, "description": "Product/service quality"},
-            {"name": "Delivery", "weight": 0.20, "description": "On-time delivery performance"},
-            {"name": "Price", "weight": 0.25, "description": "Cost competitiveness"},
-            {"name": "Responsiveness", "weight": 0.15, "description": "Communication and support"},
-            {"name": "Risk", "weight": 0.15, "description": "Financial and operational risk"},
-        ]
-        
-        # Use provided criteria or defaults
-        criteria = context.get("evaluation_criteria", default_criteria)
+        # Use provided criteria or the default template
+        criteria = context.get("evaluation_criteria", [dict(c) for c in DEFAULT_CRITERIA])
         
         return {
             "data": {"criteria": criteria},
@@ -94,22 +86,19 @@ class PullRiskIndicatorsTask(BaseTask):
     
     def run_retrieval(self, context: Dict[str, Any], rules_result: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve SLA events and risk data."""
-        session = get_db_session()
         supplier_performance = context.get("supplier_performance", [])
         supplier_ids = [s["supplier_id"] for s in supplier_performance]
         
         risk_data = {}
         grounded_in = []
         
-        for supplier_id in supplier_ids:
-            query = select(SLAEvent).where(
-                SLAEvent.supplier_id == supplier_id
-            ).order_by(SLAEvent.event_date.desc()).limit(20)
+        # One query for the whole shortlist, latest 20 events per supplier
+        sla_by_supplier = self.retriever.get_sla_events_many(supplier_ids, limit_per_supplier=20)
+        for supplier_id, sla in sla_by_supplier.items():
+            events = sla["records"]
             
-            events = session.exec(query).all()
-            
-            breach_count = sum(1 for e in events if e.event_type == "breach")
-            high_severity_count = sum(1 for e in events if e.severity in ["high", "critical"])
+            breach_count = sum(1 for e in events if e["event_type"] == "breach")
+            high_severity_count = sum(1 for e in events if e["severity"] in ["high", "critical"])
             
             risk_data[supplier_id] = {
                 "supplier_id": supplier_id,
@@ -121,13 +110,11 @@ class PullRiskIndicatorsTask(BaseTask):
             
             for e in events[:3]:
                 grounded_in.append(GroundingReference(
-                    ref_id=e.event_id,
+                    ref_id=e["event_id"],
                     ref_type="structured_data",
-                    source_name=f"SLA Event: {e.event_type}"
+                    source_name=f"SLA Event: {e['event_type']}"
                 ))
         
-        session.close()
-        
         return {
             "data": {"risk_indicators": list(risk_data.values())},
             "grounded_in": grounded_in
@@ -139,30 +126,14 @@ class NormalizeMetricsTask(BaseTask):
     
     def run_analytics(self, context: Dict[str, Any], rules_result: Dict[str, Any],
                       retrieval_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize all metrics to 0-10 scale."""
-        performance = context.get("supplier_performance", [])
-        risk = {r["supplier_id"]: r for r in context.get("risk_indicators", [])}
-        
-        normalized = []
-        for p in performance:
-            supplier_id = p["supplier_id"]
-            risk_info = risk.get(supplier_id, {})
-            
-            # Normalize scores (already 0-10 in our data)
-            normalized.append({
-                "supplier_id": supplier_id,
-                "supplier_name": p.get("supplier_name", supplier_id),
-                "quality_normalized": min(10, max(0, p.get("quality_score", 5))),
-                "delivery_normalized": min(10, max(0, p.get("delivery_score", 5))),
-                "responsiveness_normalized": min(10, max(0, p.get("responsiveness_score", 5))),
-                "risk_normalized": 10 - min(10, risk_info.get("risk_score", 0)),  # Invert risk
-                "cost_normalized": 10 - min(10, abs(p.get("cost_variance", 0)) / 5),  # Lower variance = better
-                "raw_data": p,
-                "risk_data": risk_info,
-            })
+        """Normalize all metrics to 0-10 scale (risk and cost variance inverted)."""
+        engine = SupplierScoringEngine.from_performance(
+            context.get("supplier_performance", []),
+            context.get("risk_indicators", []),
+        )
         
         return {
-            "data": {"normalized_metrics": normalized},
+            "data": {"normalized_metrics": engine.normalized_metrics()},
             "grounded_in": []
         }
 
@@ -172,55 +143,29 @@ class ComputeScoresAndRankTask(BaseTask):
     
     def run_analytics(self, context: Dict[str, Any], rules_result: Dict[str, Any],
                       retrieval_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate weighted scores and rank suppliers."""
-        criteria = context.get("criteria", [])
-        normalized = context.get("normalized_metrics", [])
-        
-        # Map criteria to normalized fields
-        field_map = {
-            "Quality": "quality_normalized",
-            "Delivery": "delivery_normalized",
-            "Price": "cost_normalized",
-            "Responsiveness": "responsiveness_normalized",
-            "Risk": "risk_normalized",
-        }
+        """
+        Calculate weighted scores and rank suppliers.
         
-        scored = []
-        for supplier in normalized:
-            total_score = 0
-            score_breakdown = {}
-            
-            for criterion in criteria:
-                field = field_map.get(criterion["name"])
-                if field and field in supplier:
-                    weight = criterion.get("weight", 0.2)
-                    value = supplier[field]
-                    weighted = value * weight
-                    total_score += weighted
-                    score_breakdown[criterion["name"]] = {
-                        "raw": value,
-                        "weight": weight,
-                        "weighted": weighted,
-                    }
-            
-            scored.append({
-                "supplier_id": supplier["supplier_id"],
-                "supplier_name": supplier.get("supplier_name", supplier["supplier_id"]),
-                "total_score": round(total_score, 2),
-                "score_breakdown": score_breakdown,
-                "raw_data": supplier.get("raw_data", {}),
-                "risk_data": supplier.get("risk_data", {}),
-            })
-        
-        # Sort by score descending
-        ranked = sorted(scored, key=lambda x: x["total_score"], reverse=True)
+        Suppliers excluded by the case's execution constraints are left out of the
+        ranking. `weight_scenarios` ({criterion: weight} per scenario), or what-ifs
+        built from the constraints' priority criteria, add a sensitivity analysis.
+        """
+        criteria = context.get("criteria", [])
+        constraints = context.get("execution_constraints")
+        engine = SupplierScoringEngine.from_normalized(
+            context.get("normalized_metrics", []),
+            excluded=getattr(constraints, "excluded_suppliers", []),
+        )
         
-        # Add rank
-        for i, s in enumerate(ranked):
-            s["rank"] = i + 1
+        data = {"ranked_suppliers": engine.rank(criteria)}
+        scenarios = context.get("weight_scenarios") or priority_weight_scenarios(
+            criteria, getattr(constraints, "priority_criteria", [])
+        )
+        if scenarios:
+            data["sensitivity"] = engine.sensitivity(scenarios)
         
         return {
-            "data": {"ranked_suppliers": ranked},
+            "data": data,
             "grounded_in": []
         }
 
@@ -6,9 +6,24 @@ Supports two modes:
 2. INTEGRATED MODE: Direct imports (Streamlit Cloud single-process deployment)
 
 The mode is auto-detected based on backend availability.
+
+HTTP calls share one pooled keep-alive `requests.Session` (idempotent requests retried on
+connection errors / 502-504) with explicit timeouts. Read calls go through a short-TTL
+response cache: within the TTL a Streamlit rerun reuses the last payload; after it the
+client revalidates with If-None-Match and reuses the payload on 304. Any write call clears
+the cache.
+
+Env:
+- API_TIMEOUT_SEC (default 60): read timeout for regular calls (chat/exports allow longer)
+- API_CACHE_TTL_SEC (default 5): response cache TTL; 0 disables caching
 """
+import copy
+import threading
+import time
 import requests
-from typing import Optional, List, Dict, Any, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from io import BytesIO
 import os
 
@@ -22,8 +37,60 @@ from shared.schemas import (
 )
 
 
+CONNECT_TIMEOUT_SEC = 3.05
+READ_TIMEOUT_SEC = float(os.environ.get("API_TIMEOUT_SEC", "60") or 60)
+LONG_READ_TIMEOUT_SEC = max(READ_TIMEOUT_SEC, 300.0)  # chat turns, exports, ingestion
+CACHE_TTL_SEC = float(os.environ.get("API_CACHE_TTL_SEC", "5") or 0)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_mode_by_base_url: Dict[str, bool] = {}
+
+
+def _http_session() -> requests.Session:
+    """Process-wide pooled session (Streamlit reruns reuse its keep-alive connections)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=2,
+                connect=2,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            s = requests.Session()
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _session = s
+        return _session
+
+
+class _ResponseCache:
+    """TTL + ETag cache of parsed JSON payloads keyed by (path, params)."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Optional[str], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Tuple[float, Optional[str], Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Tuple, etag: Optional[str], data: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, etag, data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 # Check if we should use integrated mode (direct imports instead of HTTP)
-def _should_use_integrated_mode() -> bool:
+def _should_use_integrated_mode(base_url: str = API_BASE_URL) -> bool:
     """Determine if we should use integrated mode (direct imports)."""
     # Check for explicit override to use API mode (local development)
     if os.environ.get("USE_API_MODE", "").lower() == "true":
@@ -47,18 +114,22 @@ def _should_use_integrated_mode() -> bool:
         print(f"[APIClient] Detected Streamlit Cloud environment, using integrated mode")
         return True
     
-    # Try to connect to backend - if fails, use integrated mode
+    # Try to connect to backend - if fails, use integrated mode (probed once per process)
+    if base_url in _mode_by_base_url:
+        return _mode_by_base_url[base_url]
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
+        response = requests.get(f"{base_url}/health", timeout=(0.5, 2))
         if response.status_code == 200:
-            print(f"[APIClient] Backend available at {API_BASE_URL}, using API mode")
-            return False
+            print(f"[APIClient] Backend available at {base_url}, using API mode")
+            integrated = False
         else:
             print(f"[APIClient] Backend returned {response.status_code}, using integrated mode")
-            return True
+            integrated = True
     except Exception as e:
         print(f"[APIClient] Cannot reach backend ({e}), using integrated mode")
-        return True
+        integrated = True
+    _mode_by_base_url[base_url] = integrated
+    return integrated
 
 
 class APIClient:
@@ -72,8 +143,10 @@ class APIClient:
     
     def __init__(self, base_url: str = None):
         self.base_url = base_url or API_BASE_URL
-        self._integrated_mode = _should_use_integrated_mode()
+        self._mode: Optional[bool] = None  # resolved on first call, not at construction
         self._services_initialized = False
+        self._http = _http_session()
+        self._cache = _ResponseCache(CACHE_TTL_SEC)
         
         # Lazy-loaded services for integrated mode
         self._case_service = None
@@ -111,9 +184,58 @@ class APIClient:
                 print(traceback.format_exc())
                 raise
     
+    @property
+    def _integrated_mode(self) -> bool:
+        if self._mode is None:
+            self._mode = _should_use_integrated_mode(self.base_url)
+        return self._mode
+
+    @_integrated_mode.setter
+    def _integrated_mode(self, value: bool) -> None:
+        self._mode = value
+
     def _url(self, path: str) -> str:
         """Build full URL."""
         return f"{self.base_url}{path}"
+
+    def _request(self, method: str, path: str, *, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Pooled request with (connect, read) timeouts; writes invalidate the read cache."""
+        if method.upper() not in ("GET", "HEAD"):
+            self._cache.clear()
+        return self._http.request(
+            method, self._url(path), timeout=(CONNECT_TIMEOUT_SEC, timeout or READ_TIMEOUT_SEC), **kwargs
+        )
+
+    def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET through the TTL/ETag cache; returns a private copy of the parsed payload."""
+        key = (path, tuple(sorted((params or {}).items())))
+        entry = self._cache.get(key) if self._cache.ttl > 0 else None
+        if entry and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[2])
+        headers = {"If-None-Match": entry[1]} if entry and entry[1] else {}
+        response = self._request("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and entry:
+            self._cache.put(key, entry[1], entry[2])
+            return copy.deepcopy(entry[2])
+        data = self._handle_response(response)
+        if self._cache.ttl > 0:
+            self._cache.put(key, response.headers.get("ETag"), data)
+        return copy.deepcopy(data)
+
+    def _cached_call(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        """Integrated-mode counterpart of _get_json: TTL cache around a direct service call."""
+        if self._cache.ttl <= 0:
+            return fetch()
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[2])
+        data = fetch()
+        self._cache.put(key, None, data)
+        return copy.deepcopy(data)
+
+    def invalidate_cache(self) -> None:
+        """Drop cached reads (e.g. after changing data outside this client)."""
+        self._cache.clear()
     
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response."""
@@ -140,7 +262,7 @@ class APIClient:
                 return {"status": "unhealthy", "error": f"Integrated mode error: {str(e)}", "mode": "integrated"}
         
         try:
-            response = requests.get(self._url("/health"), timeout=5)
+            response = self._request("GET", "/health", timeout=5)
             result = self._handle_response(response)
             result["mode"] = "api"
             return result
@@ -165,11 +287,14 @@ class APIClient:
         """Get list of cases."""
         if self._integrated_mode:
             self._init_services()
-            cases = self._case_service.list_cases(
-                status=status,
-                dtp_stage=dtp_stage,
-                category_id=category_id,
-                limit=limit
+            cases = self._cached_call(
+                ("list_cases", status, dtp_stage, category_id, limit),
+                lambda: self._case_service.list_cases(
+                    status=status,
+                    dtp_stage=dtp_stage,
+                    category_id=category_id,
+                    limit=limit
+                ),
             )
             return CaseListResponse(
                 cases=cases,
@@ -185,87 +310,40 @@ class APIClient:
         if category_id:
             params["category_id"] = category_id
         
-        response = requests.get(self._url("/api/cases"), params=params)
-        data = self._handle_response(response)
+        data = self._get_json("/api/cases", params)
         return CaseListResponse(**data)
     
     def get_case(self, case_id: str) -> CaseDetail:
         """Get case details."""
         if self._integrated_mode:
             self._init_services()
-            case = self._case_service.get_case(case_id)
+            case = self._cached_call(("get_case", case_id), lambda: self._case_service.get_case(case_id))
             if not case:
                 raise APIError("Case not found", 404)
             return case
         
-        response = requests.get(self._url(f"/api/cases/{case_id}"))
-        data = self._handle_response(response)
+        data = self._get_json(f"/api/cases/{case_id}")
         return CaseDetail(**data)
     
-    def get_artifact_packs(self, case_id: str) -> List[Dict[str, Any]]:
-        """Get all artifact packs for a case (for audit trail)."""
+    def get_artifact_packs(
+        self, case_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get artifact packs for a case (for audit trail), oldest first; offset/limit page them."""
         if self._integrated_mode:
             self._init_services()
-            packs = self._case_service.get_all_artifact_packs(case_id)
-            # Convert to dicts for consistent handling
-            result = []
-            for pack in packs:
-                # Convert execution metadata properly
-                exec_meta_dict = None
-                if pack.execution_metadata:
-                    try:
-                        # Try model_dump first (Pydantic v2)
-                        if hasattr(pack.execution_metadata, 'model_dump'):
-                            exec_meta_dict = pack.execution_metadata.model_dump()
-                        # Try dict() method (Pydantic v1)
-                        elif hasattr(pack.execution_metadata, 'dict'):
-                            exec_meta_dict = pack.execution_metadata.dict()
-                        # Fallback to __dict__
-                        elif hasattr(pack.execution_metadata, '__dict__'):
-                            exec_meta_dict = pack.execution_metadata.__dict__
-                        else:
-                            exec_meta_dict = pack.execution_metadata
-                        
-                        # Convert task_details list
-                        if exec_meta_dict and "task_details" in exec_meta_dict:
-                            task_details_list = exec_meta_dict["task_details"]
-                            exec_meta_dict["task_details"] = [
-                                (
-                                    td.model_dump() if hasattr(td, 'model_dump') else
-                                    (td.dict() if hasattr(td, 'dict') else
-                                    (td.__dict__ if hasattr(td, '__dict__') else td))
-                                )
-                                for td in task_details_list
-                            ]
-                    except Exception as e:
-                        print(f"Warning: Could not convert execution metadata: {e}")
-                        exec_meta_dict = None
-                
-                pack_dict = {
-                    "pack_id": pack.pack_id,
-                    "agent_name": pack.agent_name,
-                    "tasks_executed": pack.tasks_executed,
-                    "artifacts": [
-                        {
-                            "artifact_id": a.artifact_id,
-                            "type": a.type,
-                            "title": a.title,
-                            "content": a.content,
-                            "content_text": a.content_text,
-                            "verification_status": a.verification_status
-                        }
-                        for a in pack.artifacts
-                    ],
-                    "created_at": pack.created_at,
-                    "execution_metadata": exec_meta_dict
-                }
-                result.append(pack_dict)
-            return result
-        
-        # HTTP mode - not yet implemented
+            return self._cached_call(
+                ("get_artifact_packs", case_id, offset, limit),
+                lambda: [
+                    pack.model_dump()
+                    for pack in self._case_service.get_all_artifact_packs(case_id, offset=offset, limit=limit)
+                ],
+            )
+
+        params: Dict[str, Any] = {"offset": offset}
+        if limit is not None:
+            params["limit"] = limit
         try:
-            response = requests.get(self._url(f"/api/cases/{case_id}/artifact_packs"))
-            data = self._handle_response(response)
+            data = self._get_json(f"/api/cases/{case_id}/artifact_packs", params)
             return data if isinstance(data, list) else []
         except:
             return []
@@ -285,31 +363,22 @@ class APIClient:
 
         if self._integrated_mode:
             self._init_services()
-            from backend.services.artifact_document_export import (
-                build_artifact_docx_bytes,
-                build_artifact_pdf_bytes,
-                export_filename,
-            )
+            from backend.services.export_cache import export_artifact
 
-            case = self._case_service.get_case(case_id)
-            if not case:
+            name = self._case_service.get_case_name(case_id)
+            if name is None:
                 raise APIError("Case not found", 404)
             art = self._case_service.get_artifact(case_id, artifact_id)
             if not art:
                 raise APIError("Artifact not found", 404)
-            name = case.name or case_id
-            if fmt == "docx":
-                data = build_artifact_docx_bytes(art, case_id, name)
-                return (
-                    data,
-                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    export_filename(art, "docx"),
-                )
-            data = build_artifact_pdf_bytes(art, case_id, name)
-            return data, "application/pdf", export_filename(art, "pdf")
-
-        url = self._url(f"/api/cases/{case_id}/artifacts/{artifact_id}/export")
-        response = requests.get(url, params={"export_format": fmt}, timeout=120)
+            return export_artifact(art, fmt, case_id, name)
+
+        response = self._request(
+            "GET",
+            f"/api/cases/{case_id}/artifacts/{artifact_id}/export",
+            params={"export_format": fmt},
+            timeout=LONG_READ_TIMEOUT_SEC,
+        )
         if response.status_code != 200:
             raise APIError(response.text or "Export failed", response.status_code)
         cd = response.headers.get("Content-Disposition") or ""
@@ -331,6 +400,7 @@ class APIClient:
         """Create a new case."""
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             case_id = self._case_service.create_case(
                 category_id=category_id,
                 trigger_source=trigger_source,
@@ -352,10 +422,7 @@ class APIClient:
             name=name
         )
         
-        response = requests.post(
-            self._url("/api/cases"),
-            json=request.model_dump()
-        )
+        response = self._request("POST", "/api/cases", json=request.model_dump())
         data = self._handle_response(response)
         return CreateCaseResponse(**data)
     
@@ -374,6 +441,7 @@ class APIClient:
         """
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             return self._chat_service.process_message(
                 case_id=case_id,
                 user_message=message,
@@ -386,10 +454,7 @@ class APIClient:
             use_tier_2=use_tier_2
         )
         
-        response = requests.post(
-            self._url("/api/chat"),
-            json=request.model_dump()
-        )
+        response = self._request("POST", "/api/chat", json=request.model_dump(), timeout=LONG_READ_TIMEOUT_SEC)
         data = self._handle_response(response)
         return ChatResponse(**data)
     
@@ -405,6 +470,7 @@ class APIClient:
         """Approve a pending decision."""
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             result = self._chat_service.process_decision(
                 case_id=case_id,
                 decision="Approve",
@@ -428,9 +494,8 @@ class APIClient:
             decision_data=decision_data
         )
         
-        response = requests.post(
-            self._url("/api/decisions/approve"),
-            json=request.model_dump()
+        response = self._request(
+            "POST", "/api/decisions/approve", json=request.model_dump(), timeout=LONG_READ_TIMEOUT_SEC
         )
         data = self._handle_response(response)
         return DecisionResponse(**data)
@@ -443,6 +508,7 @@ class APIClient:
         """Reject a pending decision."""
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             result = self._chat_service.process_decision(
                 case_id=case_id,
                 decision="Reject",
@@ -462,9 +528,8 @@ class APIClient:
             reason=reason
         )
         
-        response = requests.post(
-            self._url("/api/decisions/reject"),
-            json=request.model_dump()
+        response = self._request(
+            "POST", "/api/decisions/reject", json=request.model_dump(), timeout=LONG_READ_TIMEOUT_SEC
         )
         data = self._handle_response(response)
         return DecisionResponse(**data)
@@ -488,6 +553,7 @@ class APIClient:
         
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             return self._ingestion_service.ingest_document(
                 file_content=file_content,
                 filename=filename,
@@ -521,10 +587,8 @@ class APIClient:
         if description:
             data["description"] = description
         
-        response = requests.post(
-            self._url("/api/ingest/document"),
-            files=files,
-            data=data
+        response = self._request(
+            "POST", "/api/ingest/document", files=files, data=data, timeout=LONG_READ_TIMEOUT_SEC
         )
         result = self._handle_response(response)
         return DocumentIngestResponse(**result)
@@ -538,10 +602,13 @@ class APIClient:
         """List ingested documents."""
         if self._integrated_mode:
             self._init_services()
-            return self._ingestion_service.list_documents(
-                supplier_id=supplier_id,
-                category_id=category_id,
-                document_type=document_type
+            return self._cached_call(
+                ("list_documents", supplier_id, category_id, document_type),
+                lambda: self._ingestion_service.list_documents(
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    document_type=document_type
+                ),
             )
         
         params = {}
@@ -552,17 +619,17 @@ class APIClient:
         if document_type:
             params["document_type"] = document_type
         
-        response = requests.get(self._url("/api/documents"), params=params)
-        data = self._handle_response(response)
+        data = self._get_json("/api/documents", params)
         return DocumentListResponse(**data)
     
     def delete_document(self, document_id: str) -> bool:
         """Delete a document."""
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             return self._ingestion_service.delete_document(document_id)
         
-        response = requests.delete(self._url(f"/api/documents/{document_id}"))
+        response = self._request("DELETE", f"/api/documents/{document_id}")
         self._handle_response(response)
         return True
     
@@ -591,10 +658,8 @@ class APIClient:
             "data_type": data_type
         }
         
-        response = requests.post(
-            self._url("/api/ingest/data/preview"),
-            files=files,
-            data=data
+        response = self._request(
+            "POST", "/api/ingest/data/preview", files=files, data=data, timeout=LONG_READ_TIMEOUT_SEC
         )
         result = self._handle_response(response)
         return DataPreviewResponse(**result)
@@ -612,6 +677,7 @@ class APIClient:
         """Ingest structured data."""
         if self._integrated_mode:
             self._init_services()
+            self.invalidate_cache()
             return self._ingestion_service.ingest_data(
                 file_content=file_content,
                 filename=filename,
@@ -639,10 +705,8 @@ class APIClient:
         if description:
             data["description"] = description
         
-        response = requests.post(
-            self._url("/api/ingest/data"),
-            files=files,
-            data=data
+        response = self._request(
+            "POST", "/api/ingest/data", files=files, data=data, timeout=LONG_READ_TIMEOUT_SEC
         )
         result = self._handle_response(response)
         return DataIngestResponse(**result)
@@ -664,8 +728,7 @@ class APIClient:
         if data_type:
             params["data_type"] = data_type
         
-        response = requests.get(self._url("/api/ingest/history"), params=params)
-        data = self._handle_response(response)
+        data = self._get_json("/api/ingest/history", params)
         return data.get("history", [])
     
     # ==================== SOURCING SIGNALS ====================
@@ -701,7 +764,7 @@ class APIClient:
         
         # HTTP mode - call endpoint (not yet implemented on backend)
         try:
-            response = requests.get(self._url("/api/signals/scan"))
+            response = self._request("GET", "/api/signals/scan")
             data = self._handle_response(response)
             return data if isinstance(data, list) else []
         except:
@@ -1248,6 +1248,26 @@ def _render_audit_history_from_packs(packs, case=None):
                     st.markdown(f"- {t}")
             else:
                 st.caption("No specific tasks recorded.")
+
+            waterfall = meta.get("waterfall") or []
+            if waterfall:
+                st.markdown(f"#### ⏱️ Timing Waterfall ({meta.get('trace_duration_ms', 0):.0f} ms)")
+                st.dataframe(
+                    [
+                        {
+                            "step": ("  " * int(s.get("depth", 0))) + s.get("name", ""),
+                            "kind": s.get("kind", ""),
+                            "start_ms": s.get("start_offset_ms", 0.0),
+                            "duration_ms": s.get("duration_ms", 0.0),
+                            "tokens": s.get("tokens"),
+                            "cache_hit": s.get("cache_hit"),
+                            "retrieved": s.get("retrieval_count"),
+                        }
+                        for s in waterfall
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
                 
             # Show artifacts - Enhanced
             st.markdown("#### Artifacts Produced")
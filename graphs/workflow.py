@@ -35,17 +35,26 @@ from utils.constraint_compliance import (
     ComplianceStatus,
     ComplianceResult,
 )
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import contextvars
 import json
 import os
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import JsonOutputParser
 from backend.services.llm_provider import get_langchain_chat_model
+from utils.tracing import traced_node
 
 
 # Lazy agent initialization - agents created on demand to avoid API key check at import time
 _agent_cache = {}
 
+# Safety limit on Supervisor iterations per workflow run (loop detection)
+MAX_SUPERVISOR_ITERATIONS = 20
+
+_STRATEGY_INTENT_KEYWORDS = ["strategy", "analyze", "recommend", "analysis", "what should"]
+_SUPPLIER_INTENT_KEYWORDS = ["supplier", "evaluate", "sourcing", "market scan", "identify suppliers"]
+
 
 def _is_error_output(output) -> bool:
     """
@@ -323,6 +332,119 @@ def get_implementation_agent(state: PipelineState):
     return _agent_cache[cache_key]
 
 
+def _review_agent_output(state: PipelineState, agent_name: str, output: Any) -> None:
+    """Validate an agent output and detect contradictions with earlier outputs (Supervisor review)."""
+    # PHASE 2 - OBJECTIVE C: Validate agent output in code
+    policy_context_for_validation = state.get("dtp_policy_context", {})
+    validation_context = {}
+    if policy_context_for_validation:
+        if hasattr(policy_context_for_validation, "allowed_strategies"):
+            validation_context["allowed_strategies"] = policy_context_for_validation.allowed_strategies
+        elif isinstance(policy_context_for_validation, dict):
+            validation_context["allowed_strategies"] = policy_context_for_validation.get("allowed_strategies")
+    
+    validation_result = validate_agent_output(agent_name, output, validation_context)
+    
+    if not validation_result.is_valid:
+        # Log validation violations
+        state["validation_violations"] = validation_result.violations
+        # Add to guardrail events
+        if "guardrail_events" not in state:
+            state["guardrail_events"] = []
+        for violation in validation_result.violations:
+            state["guardrail_events"].append(f"VALIDATION: {violation}")
+    
+    if validation_result.warnings:
+        if "validation_warnings" not in state:
+            state["validation_warnings"] = []
+        state["validation_warnings"].extend(validation_result.warnings)
+    
+    # PHASE 2 - OBJECTIVE E: Detect contradictions
+    # Get previous outputs from state history if available
+    previous_outputs = []
+    output_history = state.get("output_history", [])
+    for hist in output_history[-5:]:  # Check last 5 outputs
+        if hist.get("output") is not None:
+            previous_outputs.append((hist.get("agent", "Unknown"), hist.get("output")))
+    
+    # Get memory state for contradiction checking
+    case_memory = state.get("case_memory")
+    memory_state = None
+    if case_memory and hasattr(case_memory, "current_strategy"):
+        memory_state = {
+            "current_strategy": case_memory.current_strategy,
+            "current_supplier_choice": case_memory.current_supplier_choice,
+            "human_decisions": case_memory.human_decisions if hasattr(case_memory, "human_decisions") else []
+        }
+    
+    contradictions = detect_contradictions(
+        output, agent_name, previous_outputs, memory_state
+    )
+    
+    if contradictions:
+        # Store contradictions for surfacing to user
+        state["detected_contradictions"] = [c.description for c in contradictions]
+        # Add to guardrail events
+        for c in contradictions:
+            if "guardrail_events" not in state:
+                state["guardrail_events"] = []
+            state["guardrail_events"].append(f"CONTRADICTION ({c.severity}): {c.description}")
+
+
+def _summarize_agent_output(output: Any) -> Tuple[List[str], Optional[str]]:
+    """Key findings and recommended action the Supervisor writes into the case summary."""
+    key_findings = []
+    recommended_action = None
+    
+    if output:
+        if isinstance(output, StrategyRecommendation):
+            key_findings = output.rationale
+            recommended_action = output.recommended_strategy
+        elif isinstance(output, SupplierShortlist):
+            key_findings = [f"Shortlisted {len(output.shortlisted_suppliers)} suppliers"]
+            recommended_action = output.recommendation
+        elif isinstance(output, RFxDraft):
+            key_findings = [f"RFx draft created with {len(output.rfx_sections)} sections"]
+            recommended_action = "Review RFx draft completeness"
+        elif isinstance(output, NegotiationPlan):
+            key_findings = output.negotiation_objectives
+            recommended_action = "Proceed with negotiation"
+        elif isinstance(output, ContractExtraction):
+            key_findings = [f"Extracted {len(output.extracted_terms)} contract terms"]
+            recommended_action = "Review contract extraction"
+        elif isinstance(output, ImplementationPlan):
+            key_findings = [f"Implementation plan with {len(output.rollout_steps)} steps"]
+            recommended_action = "Proceed with implementation"
+        elif isinstance(output, SignalAssessment):
+            key_findings = output.rationale
+            recommended_action = output.recommended_action
+    
+    return list(key_findings or []), recommended_action
+
+
+def _record_agent_output(state: PipelineState, case_memory: Any, agent_name: str, output: Any) -> None:
+    """Update case memory and the output history used for contradiction detection."""
+    update_memory_from_workflow_result(
+        case_memory,
+        agent_name,
+        output,
+        user_intent=state.get("user_intent")
+    )
+    
+    # Store output in history for contradiction detection
+    if "output_history" not in state or state["output_history"] is None:
+        state["output_history"] = []
+    state["output_history"].append({
+        "agent": agent_name,
+        "output": output,
+        "output_type": type(output).__name__,
+        "timestamp": datetime.now().isoformat()
+    })
+    # Keep only last 10 outputs
+    if len(state["output_history"]) > 10:
+        state["output_history"] = state["output_history"][-10:]
+
+
 def supervisor_node(state: PipelineState) -> PipelineState:
     """
     Supervisor node - Central coordinator for the agentic system.
@@ -345,16 +467,23 @@ def supervisor_node(state: PipelineState) -> PipelineState:
     state["iteration_count"] = state.get("iteration_count", 0) + 1
     
     # Safety check: prevent infinite loops
-    if state["iteration_count"] > 20:
+    if state["iteration_count"] > MAX_SUPERVISOR_ITERATIONS:
         state["error_state"] = {
             "error": "Maximum iterations reached",
-            "reason": "Workflow exceeded 20 Supervisor iterations. Possible infinite loop detected."
+            "reason": f"Workflow exceeded {MAX_SUPERVISOR_ITERATIONS} Supervisor iterations. Possible infinite loop detected."
         }
         return state
     
     case_summary = state["case_summary"]
     latest_output = state.get("latest_agent_output")
     latest_agent_name = state.get("latest_agent_name", "Unknown")
+    # Outputs merged from parallel branches other than latest_agent_output (consumed once)
+    fanned_out = state.get("parallel_outputs") or []
+    parallel_outputs = [
+        entry for entry in fanned_out
+        if latest_output is not None and entry["output"] is not latest_output
+    ]
+    state["parallel_outputs"] = None
     
     # Determine task description based on context
     task_description = "Coordinate Workflow"
@@ -413,91 +542,25 @@ def supervisor_node(state: PipelineState) -> PipelineState:
         elif isinstance(latest_output, ClarificationRequest):
             task_description = "Review Clarification Request"
         
-        # PHASE 2 - OBJECTIVE C: Validate agent output in code
-        policy_context_for_validation = state.get("dtp_policy_context", {})
-        validation_context = {}
-        if policy_context_for_validation:
-            if hasattr(policy_context_for_validation, "allowed_strategies"):
-                validation_context["allowed_strategies"] = policy_context_for_validation.allowed_strategies
-            elif isinstance(policy_context_for_validation, dict):
-                validation_context["allowed_strategies"] = policy_context_for_validation.get("allowed_strategies")
-        
-        validation_result = validate_agent_output(latest_agent_name, latest_output, validation_context)
-        
-        if not validation_result.is_valid:
-            # Log validation violations
-            state["validation_violations"] = validation_result.violations
-            # Add to guardrail events
-            if "guardrail_events" not in state:
-                state["guardrail_events"] = []
-            for violation in validation_result.violations:
-                state["guardrail_events"].append(f"VALIDATION: {violation}")
-        
-        if validation_result.warnings:
-            if "validation_warnings" not in state:
-                state["validation_warnings"] = []
-            state["validation_warnings"].extend(validation_result.warnings)
-        
-        # PHASE 2 - OBJECTIVE E: Detect contradictions
-        # Get previous outputs from state history if available
-        previous_outputs = []
-        output_history = state.get("output_history", [])
-        for hist in output_history[-5:]:  # Check last 5 outputs
-            if hist.get("output") is not None:
-                previous_outputs.append((hist.get("agent", "Unknown"), hist.get("output")))
-        
-        # Get memory state for contradiction checking
-        case_memory = state.get("case_memory")
-        memory_state = None
-        if case_memory and hasattr(case_memory, "current_strategy"):
-            memory_state = {
-                "current_strategy": case_memory.current_strategy,
-                "current_supplier_choice": case_memory.current_supplier_choice,
-                "human_decisions": case_memory.human_decisions if hasattr(case_memory, "human_decisions") else []
-            }
-        
-        contradictions = detect_contradictions(
-            latest_output, latest_agent_name, previous_outputs, memory_state
-        )
-        
-        if contradictions:
-            # Store contradictions for surfacing to user
-            state["detected_contradictions"] = [c.description for c in contradictions]
-            # Add to guardrail events
-            for c in contradictions:
-                if "guardrail_events" not in state:
-                    state["guardrail_events"] = []
-                state["guardrail_events"].append(f"CONTRADICTION ({c.severity}): {c.description}")
+        # Other outputs of a parallel fan-out get the same review, and count as visited
+        # for loop detection (the router records the primary agent itself). Agents of the
+        # fan-out are not routed to again in this run.
+        for entry in parallel_outputs:
+            _review_agent_output(state, entry["agent"], entry["output"])
+            state["visited_agents"].append(f"{entry['agent']}_{type(entry['output']).__name__}")
+        if fanned_out:
+            state["parallel_agents_run"] = (state.get("parallel_agents_run") or []) + [e["agent"] for e in fanned_out]
+        _review_agent_output(state, latest_agent_name, latest_output)
     
     # Note: Human decision processing is now handled above in the task_description section
     
     # Supervisor updates case summary based on latest agent output
     # Update summary with findings
     key_findings = []
-    recommended_action = None
-    
-    if latest_output:
-        if isinstance(latest_output, StrategyRecommendation):
-            key_findings = latest_output.rationale
-            recommended_action = latest_output.recommended_strategy
-        elif isinstance(latest_output, SupplierShortlist):
-            key_findings = [f"Shortlisted {len(latest_output.shortlisted_suppliers)} suppliers"]
-            recommended_action = latest_output.recommendation
-        elif isinstance(latest_output, RFxDraft):
-            key_findings = [f"RFx draft created with {len(latest_output.rfx_sections)} sections"]
-            recommended_action = "Review RFx draft completeness"
-        elif isinstance(latest_output, NegotiationPlan):
-            key_findings = latest_output.negotiation_objectives
-            recommended_action = "Proceed with negotiation"
-        elif isinstance(latest_output, ContractExtraction):
-            key_findings = [f"Extracted {len(latest_output.extracted_terms)} contract terms"]
-            recommended_action = "Review contract extraction"
-        elif isinstance(latest_output, ImplementationPlan):
-            key_findings = [f"Implementation plan with {len(latest_output.rollout_steps)} steps"]
-            recommended_action = "Proceed with implementation"
-        elif isinstance(latest_output, SignalAssessment):
-            key_findings = latest_output.rationale
-            recommended_action = latest_output.recommended_action
+    for entry in parallel_outputs:
+        key_findings.extend(_summarize_agent_output(entry["output"])[0])
+    findings, recommended_action = _summarize_agent_output(latest_output)
+    key_findings.extend(findings)
     
     # Update case summary (only Supervisor can do this)
     supervisor = get_supervisor()
@@ -516,26 +579,11 @@ def supervisor_node(state: PipelineState) -> PipelineState:
         case_memory = create_case_memory(case_summary.case_id)
         state["case_memory"] = case_memory
     
+    # Parallel branch outputs are recorded before the primary agent's, in branch order
+    for entry in parallel_outputs:
+        _record_agent_output(state, case_memory, entry["agent"], entry["output"])
     if latest_output and latest_agent_name:
-        update_memory_from_workflow_result(
-            case_memory,
-            latest_agent_name,
-            latest_output,
-            user_intent=state.get("user_intent")
-        )
-        
-        # Store output in history for contradiction detection
-        if "output_history" not in state:
-            state["output_history"] = []
-        state["output_history"].append({
-            "agent": latest_agent_name,
-            "output": latest_output,
-            "output_type": type(latest_output).__name__,
-            "timestamp": datetime.now().isoformat()
-        })
-        # Keep only last 10 outputs
-        if len(state["output_history"]) > 10:
-            state["output_history"] = state["output_history"][-10:]
+        _record_agent_output(state, case_memory, latest_agent_name, latest_output)
     
     # Load policy context with trigger type for renewal constraints
     policy_loader = PolicyLoader()
@@ -1747,28 +1795,183 @@ def route_after_negotiation(state: PipelineState) -> Literal["wait_for_human", "
     return "end"
 
 
+# ---------------------------------------------------------------------------
+# Parallel agent fan-out
+# ---------------------------------------------------------------------------
+# Some turns need two independent analyses (e.g. strategy context + supplier evaluation).
+# Instead of running them across two Supervisor iterations, the Supervisor fans out to
+# `parallel_agents`, which runs the agent nodes side by side on copies of the state and
+# merges them back in a fixed order. Agent nodes return the whole state, so a native
+# LangGraph fan-out would write every channel twice; merging inside one node keeps
+# PipelineState free of reducers.
+
+PARALLEL_AGENTS_ENABLED = os.getenv("WORKFLOW_PARALLEL_AGENTS", "1") != "0"
+_parallel_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WORKFLOW_PARALLEL_WORKERS", "4") or 4),
+    thread_name_prefix="workflow-agent",
+)
+
+# Node name -> latest_agent_name the node reports (used for loop detection)
+AGENT_NODE_NAMES = {
+    "strategy": "Strategy",
+    "supplier_evaluation": "SupplierEvaluation",
+    "contract_support": "ContractSupport",
+    "implementation": "Implementation",
+}
+
+_CONTRACT_INTENT_KEYWORDS = ["contract", "clause", "terms", "extract"]
+_IMPLEMENTATION_INTENT_KEYWORDS = ["implementation", "rollout", "readiness", "onboarding"]
+
+
+def parallel_branches(state: PipelineState) -> Tuple[str, ...]:
+    """
+    Agent nodes to run side by side for this turn, or () for the usual single route.
+
+    Only on the Supervisor's initial allocation, when the user asks for two independent
+    analyses of the stage. The last node is the stage's primary agent: its output becomes
+    `latest_agent_output` and drives Supervisor routing and human approval.
+    """
+    if not PARALLEL_AGENTS_ENABLED:
+        return ()
+    if state.get("latest_agent_output") is not None or state.get("waiting_for_human"):
+        return ()
+    if state.get("iteration_count", 0) >= MAX_SUPERVISOR_ITERATIONS:
+        return ()
+
+    dtp_stage = state.get("dtp_stage")
+    user_intent = (state.get("user_intent") or "").lower()
+    case_summary = state.get("case_summary")
+
+    def asks(keywords: List[str]) -> bool:
+        return any(k in user_intent for k in keywords)
+
+    if dtp_stage in ("DTP-02", "DTP-03") and asks(_STRATEGY_INTENT_KEYWORDS) and asks(_SUPPLIER_INTENT_KEYWORDS):
+        group = ("strategy", "supplier_evaluation")
+    elif (
+        dtp_stage == "DTP-05"
+        and asks(_CONTRACT_INTENT_KEYWORDS)
+        and asks(_IMPLEMENTATION_INTENT_KEYWORDS)
+        # Implementation only stands alone when it doesn't need the contract's supplier
+        and getattr(case_summary, "supplier_id", None)
+    ):
+        group = ("implementation", "contract_support")
+    else:
+        return ()
+
+    # Loop detection: never fan out to an agent that already reported in this run
+    visited = state.get("visited_agents") or []
+    if any(v.startswith(f"{AGENT_NODE_NAMES[node]}_") for node in group for v in visited):
+        return ()
+    return group
+
+
+def _branch_state(state: PipelineState) -> PipelineState:
+    """Shallow copy with private lists, so branches can append without seeing each other."""
+    branch = dict(state)
+    for key, value in state.items():
+        if isinstance(value, list):
+            branch[key] = list(value)
+    return branch
+
+
+def merge_branch_states(base: PipelineState, branches: List[Tuple[str, PipelineState]]) -> PipelineState:
+    """
+    Fold branch results into `base` deterministically (branch order, not completion order):
+    - lists (activity_log, guardrail_events, ...): entries each branch appended, in order
+    - budget_state: base plus every branch's token/cost/call increments
+    - error_state: first branch error
+    - latest_agent_output/name: the last branch; every branch's output is kept in
+      `parallel_outputs` for Supervisor review
+    - other keys: later branches win
+    """
+    merged = dict(base)
+    outputs = []
+    budget_deltas = []
+    first_error = base.get("error_state")
+    for node, branch in branches:
+        for key, value in branch.items():
+            before = base.get(key)
+            if key == "budget_state":
+                if value is not None and before is not None and value is not before:
+                    budget_deltas.append({
+                        f: getattr(value, f) - getattr(before, f)
+                        for f in ("tokens_used", "tokens_remaining", "cost_usd", "model_calls", "tier_1_calls", "tier_2_calls")
+                    })
+            elif key == "error_state":
+                if value is not None and value is not before and first_error is None:
+                    first_error = value
+            elif isinstance(value, list) and isinstance(before, list):
+                merged[key] = list(merged.get(key) or []) + value[len(before):]
+            elif isinstance(value, list) and before is None:
+                merged[key] = list(merged.get(key) or []) + value
+            elif value is not before:
+                merged[key] = value
+        outputs.append({"agent": branch.get("latest_agent_name") or AGENT_NODE_NAMES[node], "output": branch.get("latest_agent_output")})
+
+    if budget_deltas and base.get("budget_state") is not None:
+        budget = base["budget_state"]
+        merged["budget_state"] = budget.model_copy(update={
+            f: getattr(budget, f) + sum(d[f] for d in budget_deltas) for f in budget_deltas[0]
+        })
+    merged["error_state"] = first_error
+    merged["parallel_outputs"] = [o for o in outputs if o["output"] is not None]
+    return merged
+
+
+_AGENT_NODES = {
+    "strategy": strategy_node,
+    "supplier_evaluation": supplier_evaluation_node,
+    "contract_support": contract_support_node,
+    "implementation": implementation_node,
+}
+
+
+def parallel_agents_node(state: PipelineState) -> PipelineState:
+    """Run this turn's independent agents concurrently and merge them into one state."""
+    group = parallel_branches(state)
+    if not group:
+        return state
+    nodes = {name: traced_node("workflow", name, _AGENT_NODES[name]) for name in group}
+    # Each branch gets its own context copy so request tracing follows it onto the worker
+    futures = [
+        (name, _parallel_pool.submit(contextvars.copy_context().run, nodes[name], _branch_state(state)))
+        for name in group
+    ]
+    branches = []
+    for name, future in futures:
+        try:
+            branches.append((name, future.result()))
+        except Exception as e:
+            print(f"[WARNING] Parallel branch {name} failed: {type(e).__name__}: {e}")
+            failed = _branch_state(state)
+            failed["error_state"] = {"error": str(e), "agent": AGENT_NODE_NAMES[name]}
+            branches.append((name, failed))
+    return merge_branch_states(state, branches)
+
+
 # Build graph
-def create_workflow_graph():
-    """Create the LangGraph workflow"""
+def create_workflow_graph(checkpointer=None):
+    """Create the LangGraph workflow (optionally compiled with a checkpointer)"""
     workflow = StateGraph(PipelineState)
     
     # Add nodes (Table 3 aligned)
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("strategy", strategy_node)
-    workflow.add_node("supplier_evaluation", supplier_evaluation_node)  # Supplier Scoring Agent (DTP-02/03)
-    workflow.add_node("rfx_draft", rfx_draft_node)  # RFx Draft Agent (DTP-03)
-    workflow.add_node("negotiation", negotiation_node)  # Negotiation Support Agent (DTP-04)
-    workflow.add_node("contract_support", contract_support_node)  # Contract Support Agent (DTP-04/05)
-    workflow.add_node("implementation", implementation_node)  # Implementation Agent (DTP-05/06)
-    workflow.add_node("case_clarifier", case_clarifier_node)
-    workflow.add_node("wait_for_human", wait_for_human_node)
-    workflow.add_node("process_decision", process_human_decision)
+    workflow.add_node("supervisor", traced_node("workflow", "supervisor", supervisor_node))
+    workflow.add_node("strategy", traced_node("workflow", "strategy", strategy_node))
+    workflow.add_node("supplier_evaluation", traced_node("workflow", "supplier_evaluation", supplier_evaluation_node))  # Supplier Scoring Agent (DTP-02/03)
+    workflow.add_node("rfx_draft", traced_node("workflow", "rfx_draft", rfx_draft_node))  # RFx Draft Agent (DTP-03)
+    workflow.add_node("negotiation", traced_node("workflow", "negotiation", negotiation_node))  # Negotiation Support Agent (DTP-04)
+    workflow.add_node("contract_support", traced_node("workflow", "contract_support", contract_support_node))  # Contract Support Agent (DTP-04/05)
+    workflow.add_node("implementation", traced_node("workflow", "implementation", implementation_node))  # Implementation Agent (DTP-05/06)
+    workflow.add_node("case_clarifier", traced_node("workflow", "case_clarifier", case_clarifier_node))
+    workflow.add_node("parallel_agents", traced_node("workflow", "parallel_agents", parallel_agents_node))  # Independent agents side by side
+    workflow.add_node("wait_for_human", traced_node("workflow", "wait_for_human", wait_for_human_node))
+    workflow.add_node("process_decision", traced_node("workflow", "process_decision", process_human_decision))
     
     # Set entry point
     workflow.set_entry_point("supervisor")
     
     # Add edges - Supervisor is the central coordinator
-    def route_from_supervisor(state: PipelineState) -> Literal["strategy", "supplier_evaluation", "rfx_draft", "negotiation", "contract_support", "implementation", "case_clarifier", "wait_for_human", "end"]:
+    def route_from_supervisor(state: PipelineState) -> Literal["strategy", "supplier_evaluation", "rfx_draft", "negotiation", "contract_support", "implementation", "case_clarifier", "parallel_agents", "wait_for_human", "end"]:
         """
         Supervisor routing logic - decides which agent to allocate task to.
         
@@ -1838,6 +2041,10 @@ def create_workflow_graph():
                 visited_agents = visited_agents[-5:]  # Keep only last 5
             state["visited_agents"] = visited_agents
             
+            # An agent that already reported through the parallel fan-out is not re-run
+            if next_agent in (state.get("parallel_agents_run") or []):
+                return "end"
+            
             # If Supervisor says we need another agent, route there (Table 3 alignment)
             if next_agent == "Strategy":
                 return "strategy"
@@ -1858,12 +2065,16 @@ def create_workflow_graph():
                 return "end"
         
         # No agent output yet - Supervisor allocates initial task
+        # Priority 0: Independent analyses requested together run side by side
+        if parallel_branches(state):
+            return "parallel_agents"
+        
         # Priority 1: Check user intent for explicit requests (user intent overrides stage)
-        if any(keyword in user_intent for keyword in ["strategy", "analyze", "recommend", "analysis", "what should"]):
+        if any(keyword in user_intent for keyword in _STRATEGY_INTENT_KEYWORDS):
             if dtp_stage in ["DTP-01", "DTP-02", "DTP-03"]:
                 return "strategy"
         
-        if any(keyword in user_intent for keyword in ["supplier", "evaluate", "sourcing", "market scan", "identify suppliers"]):
+        if any(keyword in user_intent for keyword in _SUPPLIER_INTENT_KEYWORDS):
             if dtp_stage in ["DTP-02", "DTP-03", "DTP-04"]:
                 return "supplier_evaluation"
         
@@ -1903,6 +2114,7 @@ def create_workflow_graph():
             "contract_support": "contract_support",
             "implementation": "implementation",
             "case_clarifier": "case_clarifier",
+            "parallel_agents": "parallel_agents",
             "wait_for_human": "wait_for_human",
             "end": END
         }
@@ -1918,6 +2130,7 @@ def create_workflow_graph():
     workflow.add_edge("contract_support", "supervisor")  # Contract Support agent reports back to Supervisor
     workflow.add_edge("implementation", "supervisor")  # Implementation agent reports back to Supervisor
     workflow.add_edge("case_clarifier", "supervisor")  # Case Clarifier reports back to Supervisor
+    workflow.add_edge("parallel_agents", "supervisor")  # Merged parallel outputs report back to Supervisor
     
     # CRITICAL: wait_for_human should END the workflow (pause it)
     # Human decision must be injected externally via inject_human_decision()
@@ -1929,11 +2142,12 @@ def create_workflow_graph():
     # - Agent output review
     # - Human decision processing
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
-# Global graph instance
+# Global graph instances
 workflow_graph = None
+checkpointed_workflow_graph = None
 
 def get_workflow_graph():
     """Get or create workflow graph"""
@@ -1942,3 +2156,15 @@ def get_workflow_graph():
         workflow_graph = create_workflow_graph()
     return workflow_graph
 
+
+def get_checkpointed_workflow_graph():
+    """
+    Get or create the workflow graph backed by the per-case SQLite checkpointer.
+    Invoke it with {"configurable": {"thread_id": case_id}}.
+    """
+    global checkpointed_workflow_graph
+    if checkpointed_workflow_graph is None:
+        from backend.persistence.workflow_checkpoints import get_workflow_checkpointer
+        checkpointed_workflow_graph = create_workflow_graph(checkpointer=get_workflow_checkpointer())
+    return checkpointed_workflow_graph
+
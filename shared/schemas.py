@@ -80,6 +80,10 @@ class WorkingDocumentReviseResponse(BaseModel):
     role: str
     message: str = ""
     chars: int = 0
+    mode: str = "full"  # full | sections
+    revised_sections: List[str] = Field(default_factory=list)
+    failed_sections: List[int] = Field(default_factory=list)  # section indexes left unchanged
+    diff: str = ""  # unified diff of current -> revised draft
 
 
 class CaseDetail(BaseModel):
@@ -502,6 +506,20 @@ class TaskExecutionDetail(BaseModel):
     error_message: Optional[str] = None
 
 
+class TraceSpan(BaseModel):
+    """One row of a request waterfall (graph node, task step, LLM call or retrieval)."""
+    name: str
+    kind: str = "internal"  # request, node, task, task_step, llm, retrieval
+    depth: int = 0
+    start_offset_ms: float = 0.0
+    duration_ms: float = 0.0
+    tokens: Optional[int] = None
+    cache_hit: Optional[bool] = None
+    retrieval_count: Optional[int] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
 class ExecutionMetadata(BaseModel):
     """Comprehensive execution metadata for audit trail."""
     agent_name: str
@@ -518,6 +536,9 @@ class ExecutionMetadata(BaseModel):
     total_tasks: int = 0
     completed_tasks: int = 0
     model_used: str = ""
+    trace_id: str = ""
+    trace_duration_ms: float = 0.0
+    waterfall: List[TraceSpan] = Field(default_factory=list)  # utils.tracing spans, start order
 
 
 class ArtifactPack(BaseModel):
@@ -0,0 +1,56 @@
+"""Frontend APIClient: pooled session use, TTL/ETag response cache, write invalidation."""
+from __future__ import annotations
+
+from frontend import api_client
+
+
+class _Resp:
+    def __init__(self, status, payload=None, etag=None):
+        self.status_code = status
+        self._payload = payload
+        self.headers = {"ETag": etag} if etag else {}
+        self.text = ""
+
+    def json(self):
+        return self._payload
+
+
+class _RecordingSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+
+def _client(responses, ttl=60.0):
+    client = api_client.APIClient(base_url="http://backend")
+    client._integrated_mode = False
+    client._http = _RecordingSession(responses)
+    client._cache = api_client._ResponseCache(ttl)
+    return client
+
+
+def test_reads_are_served_from_cache_within_ttl_and_writes_invalidate():
+    payload = {"cases": [], "total_count": 0, "filters_applied": {}}
+    client = _client([_Resp(200, payload), _Resp(200, {"case_id": "C", "success": True, "message": "ok"}), _Resp(200, payload)])
+    client.list_cases()
+    client.list_cases()
+    assert len(client._http.calls) == 1
+    method, _, kwargs = client._http.calls[0]
+    assert method == "GET" and kwargs["timeout"] == (api_client.CONNECT_TIMEOUT_SEC, api_client.READ_TIMEOUT_SEC)
+
+    client.create_case(category_id="IT")
+    client.list_cases()
+    assert [c[0] for c in client._http.calls] == ["GET", "POST", "GET"]
+
+
+def test_stale_entry_revalidates_with_etag_and_reuses_payload_on_304():
+    packs = [{"pack_id": "p1"}]
+    client = _client([_Resp(200, packs, etag='"v1"'), _Resp(304)], ttl=1e-9)
+    assert client.get_artifact_packs("CASE-1") == packs
+    out = client.get_artifact_packs("CASE-1")
+    assert out == packs and out is not packs
+    assert client._http.calls[1][2]["headers"] == {"If-None-Match": '"v1"'}
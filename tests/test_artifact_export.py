@@ -58,3 +58,56 @@ def test_build_pdf_bytes():
     )
     raw = build_artifact_pdf_bytes(a, "CASE-002", "Case")
     assert raw.startswith(b"%PDF")
+
+
+def _strategy_artifact(text: str = "We recommend competitive bidding.") -> Artifact:
+    return Artifact(
+        artifact_id="a-cache",
+        type=ArtifactType.STRATEGY_RECOMMENDATION.value,
+        title="Strategy",
+        content={"recommendation": "Run RFx"},
+        content_text=text,
+        created_at="2026-01-01T00:00:00",
+        created_by_agent="Strategy",
+    )
+
+
+def test_export_cache_reuses_bytes_until_content_changes(tmp_path, monkeypatch):
+    from backend.services import export_cache
+
+    monkeypatch.setattr(export_cache, "EXPORT_CACHE_DIR", tmp_path)
+    calls = []
+
+    def _render(artifact, case_id, case_name):
+        calls.append(artifact.content_text)
+        return f"{case_name}:{artifact.content_text}".encode()
+
+    monkeypatch.setitem(export_cache._ARTIFACT_RENDERERS, "docx", _render)
+    first = export_cache.export_artifact(_strategy_artifact(), "docx", "CASE-1", "Demo")
+    second = export_cache.export_artifact(_strategy_artifact(), "docx", "CASE-1", "Demo")
+    assert first == second
+    assert first[2] == "Strategy.docx"
+    assert len(calls) == 1
+
+    export_cache.export_artifact(_strategy_artifact("Revised text"), "docx", "CASE-1", "Demo")
+    export_cache.export_artifact(_strategy_artifact(), "docx", "CASE-1", "Renamed case")
+    assert len(calls) == 3
+
+
+def test_export_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    import os
+
+    from backend.services import export_cache
+
+    monkeypatch.setattr(export_cache, "EXPORT_CACHE_DIR", tmp_path)
+    monkeypatch.setenv("EXPORT_CACHE_MAX_MB", str(2.5 / 1024))  # 2.5 KiB
+    blob = b"x" * 1024
+    for i in range(3):
+        export_cache.get_or_render("pack", f"p{i}", "md", "h", lambda: blob)
+        path = export_cache._cache_path("pack", f"p{i}", "md", "h")
+        os.utime(path, (1000 + i, 1000 + i))
+    export_cache.get_or_render("pack", "p3", "md", "h", lambda: blob)
+    remaining = {p.name for p in tmp_path.iterdir()}
+    assert export_cache._cache_path("pack", "p0", "md", "h").name not in remaining
+    assert export_cache._cache_path("pack", "p1", "md", "h").name not in remaining
+    assert export_cache._cache_path("pack", "p3", "md", "h").name in remaining
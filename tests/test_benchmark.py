@@ -0,0 +1,46 @@
+"""Benchmark harness: fake-LLM seed-case run and baseline comparison."""
+from __future__ import annotations
+
+import copy
+
+from utils import benchmark
+
+
+def test_seed_case_benchmark_runs_offline_with_node_metrics():
+    results = benchmark.run_benchmarks(
+        scenarios=["seed_cases"], concurrency=[1, 2], case_ids=["CASE-0003"], warmup=False
+    )
+    c1 = results["scenarios"]["seed_cases@c1"]
+    assert c1["runs"] == 1 and c1["errors"] == []
+    assert "supervisor" in c1["nodes"]
+    assert c1["tokens"]["input"] > 0
+    assert sum(n["tokens"] for n in c1["nodes"].values()) == c1["tokens"]["input"] + c1["tokens"]["output"]
+    # Deterministic fake LLM + cold agent cache per level -> identical token counts.
+    assert results["scenarios"]["seed_cases@c2"]["tokens"] == c1["tokens"]
+
+
+def test_compare_to_baseline_flags_query_growth_and_timing_only_when_asked():
+    base = {
+        "scenarios": {
+            "seed_cases@c1": {
+                "runs": 5,
+                "concurrency": 1,
+                "latency_ms": {"p50": 80.0, "p95": 90.0},
+                "db_queries": 10,
+                "tokens": {"input": 100, "output": 20},
+                "peak_mem_mb": 1.0,
+                "errors": [],
+            }
+        }
+    }
+    noisy = copy.deepcopy(base)
+    noisy["scenarios"]["seed_cases@c1"]["latency_ms"]["p95"] = 120.0
+    assert benchmark.compare_to_baseline(noisy, base) == []
+
+    worse = copy.deepcopy(base)
+    worse["scenarios"]["seed_cases@c1"]["db_queries"] = 11
+    worse["scenarios"]["seed_cases@c1"]["latency_ms"]["p50"] = 400.0
+    metrics = {r["metric"] for r in benchmark.compare_to_baseline(worse, base)}
+    assert metrics == {"db_queries"}
+    metrics = {r["metric"] for r in benchmark.compare_to_baseline(worse, base, timed=True)}
+    assert metrics == {"db_queries", "latency_ms.p50"}
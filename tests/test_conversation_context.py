@@ -73,3 +73,63 @@ def test_get_relevant_context_uses_summary_and_structured_memory(monkeypatch):
     assert "Structured memory snapshot" in ctx[0]["content"]
     assert ctx[1]["role"] == "system"
     assert "Previous conversation summary" in ctx[1]["content"]
+
+
+def test_context_window_comes_from_stored_token_counts(monkeypatch):
+    mgr = ConversationContextManager(_FakeCaseService({}))
+    mgr.recent_messages_count = 3
+    mgr.summarize_threshold = 100
+
+    messages = [_msg(i, "user", f"message {i}") for i in range(30)]
+    for m in messages:
+        m.context_tokens = 10
+    memory = "Structured memory snapshot (human-confirmed inputs):\n- Current stage: DTP-02"
+    monkeypatch.setattr(mgr, "get_recent_messages", lambda case_id, limit=100: messages)
+    monkeypatch.setattr(mgr, "_build_structured_case_memory", lambda case_id: memory)
+
+    tokenized = []
+    real_message_tokens = mgr.message_tokens
+
+    def counting(role, content):
+        tokenized.append(content)
+        return real_message_tokens(role, content)
+
+    monkeypatch.setattr(mgr, "message_tokens", counting)
+    block = mgr._system_block_tokens(memory)
+
+    # Older messages are added newest-first while they fit; the memory block only if it fits too
+    ctx = mgr.get_relevant_context("CASE-3", "next?", max_tokens=125)
+    assert [m["content"] for m in ctx] == [f"message {i}" for i in range(18, 30)]
+    monkeypatch.setattr(mgr, "get_recent_messages", lambda case_id, limit=100: messages[-12:])
+    ctx = mgr.get_relevant_context("CASE-3", "next?", max_tokens=120 + block)
+    assert ctx[0]["content"] == memory and len(ctx) == 13
+    assert mgr.get_relevant_context("CASE-3", "next?", max_tokens=119 + block)[0]["content"] == "message 18"
+    # Stored counts are used as-is and the memory block was tokenized once
+    assert tokenized == [memory]
+
+    # Recent messages over budget are trimmed oldest-first, keeping at least one
+    assert [m["content"] for m in mgr.get_relevant_context("CASE-3", "next?", max_tokens=25)] == [
+        "message 28", "message 29",
+    ]
+    assert len(mgr.get_relevant_context("CASE-3", "next?", max_tokens=5)) == 1
+
+
+def test_save_message_keeps_caller_usage_and_stores_its_own_token_count(monkeypatch, tmp_path):
+    from sqlmodel import Session, SQLModel, create_engine, select
+
+    import backend.services.conversation_context as conversation_context
+    from backend.persistence.models import ChatMessage
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'chat.db'}")
+    SQLModel.metadata.create_all(engine, tables=[ChatMessage.__table__])
+    monkeypatch.setattr(conversation_context, "get_db_session", lambda: Session(engine))
+    mgr = ConversationContextManager(_FakeCaseService({}))
+
+    mgr.save_message("CASE-4", "assistant", "Shortlist ready.", metadata={"tokens_used": 812})
+    mgr.save_message("CASE-4", "user", "thanks")
+
+    with Session(engine) as s:
+        rows = s.exec(select(ChatMessage).order_by(ChatMessage.id)).all()
+    assert [r.tokens_used for r in rows] == [812, None]
+    assert rows[0].context_tokens == mgr.message_tokens("assistant", "Shortlist ready.")
+    assert rows[1].context_tokens > 0
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import text
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from backend.rag.embedding_cache import CachedEmbeddings, EmbeddingCache, model_id, model_name
+from utils.metrics import CACHE_REQUESTS
+
+
+class _FakeEmbeddings:
+    model = "text-embedding-3-small"
+
+    def __init__(self):
+        self.queries = []
+        self.documents = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 0.5, -1.0]
+
+    def embed_documents(self, texts):
+        self.documents.append(list(texts))
+        return [[float(len(t)), 0.25, 1.0] for t in texts]
+
+
+@pytest.fixture
+def fake():
+    return _FakeEmbeddings()
+
+
+def test_repeated_queries_skip_the_embedding_call(tmp_path, fake):
+    emb = CachedEmbeddings(fake, EmbeddingCache(tmp_path / "emb.db"))
+    hits_before = CACHE_REQUESTS.value(cache="embedding", result="hit")
+
+    first = emb.embed_query("contract renewal  terms")
+    assert emb.embed_query(" contract renewal terms ") == first
+    assert fake.queries == ["contract renewal  terms"]
+    assert emb.cache.stats()["memory_hits"] == 1 and emb.cache.stats()["hit_rate"] == 0.5
+    assert CACHE_REQUESTS.value(cache="embedding", result="hit") == hits_before + 1
+
+
+def test_vectors_persist_across_instances_and_models_stay_separate(tmp_path, fake):
+    CachedEmbeddings(fake, EmbeddingCache(tmp_path / "emb.db")).embed_query("sla breach")
+
+    restarted = CachedEmbeddings(fake, EmbeddingCache(tmp_path / "emb.db"))
+    assert restarted.embed_query("sla breach") == [10.0, 0.5, -1.0]
+    assert restarted.cache.stats()["disk_hits"] == 1
+    assert len(fake.queries) == 1
+
+    other = _FakeEmbeddings()
+    other.model = "text-embedding-3-large"
+    assert model_id(other) != model_id(fake)
+    CachedEmbeddings(other, EmbeddingCache(tmp_path / "emb.db")).embed_query("sla breach")
+    assert other.queries == ["sla breach"]
+
+
+def test_openai_models_get_distinct_ids_and_azure_uses_the_deployment():
+    from langchain_openai import AzureOpenAIEmbeddings, OpenAIEmbeddings
+
+    small = OpenAIEmbeddings(model="text-embedding-3-small", api_key="test")
+    large = OpenAIEmbeddings(model="text-embedding-3-large", api_key="test")
+    assert model_id(small) == "OpenAIEmbeddings:text-embedding-3-small"
+    assert model_id(large) != model_id(small)
+
+    azure = AzureOpenAIEmbeddings(
+        azure_deployment="emb-prod", model="text-embedding-3-small", api_key="test",
+        azure_endpoint="https://example.openai.azure.com", api_version="2024-02-01",
+    )
+    assert model_name(azure) == "emb-prod"
+    assert model_id(azure) == "AzureOpenAIEmbeddings:emb-prod"
+
+
+def test_embed_documents_only_embeds_misses_and_disk_is_lru_bounded(tmp_path, fake):
+    cache = EmbeddingCache(tmp_path / "emb.db", max_entries=3, memory_entries=0)
+    emb = CachedEmbeddings(fake, cache)
+
+    emb.embed_documents(["a", "bb", "ccc"])
+    emb.embed_query("a")  # refresh "a" so it outlives "bb" / "ccc"
+    vectors = emb.embed_documents(["a", "dddd"])
+
+    assert fake.documents == [["a", "bb", "ccc"], ["dddd"]]
+    assert [v[0] for v in vectors] == [1.0, 4.0]
+    with cache.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM embedding_cache")).scalar() == 3
+    a, bb, ccc = cache.get_many(model_id(fake), ["a", "bb", "ccc"])
+    assert a is not None and (bb is None) != (ccc is None)
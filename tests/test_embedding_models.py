@@ -0,0 +1,142 @@
+import sys
+import types
+
+import chromadb
+import pytest
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from backend.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+from backend.rag.embedding_models import (
+    CHROMA_DEFAULT_MODEL,
+    check_collection_model,
+    embedding_model_label,
+    embedding_model_name,
+    recorded_model,
+    recover_interrupted_reembed,
+    reembed_collection,
+)
+from backend.services import local_embeddings
+from backend.services.llm_provider import get_langchain_embeddings
+
+
+class _Embeddings:
+    def __init__(self, model, dim):
+        self.model = model
+        self.dim = dim
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        return [[float(len(t))] + [0.5] * (self.dim - 1) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def client(tmp_path):
+    return chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+
+
+def test_collection_records_model_and_flags_a_different_one(client):
+    small = _Embeddings("small", 2)
+    col = client.get_or_create_collection("docs_test")
+    assert check_collection_model(col, small) is None
+    assert recorded_model(col) == "_Embeddings:small"
+
+    col.add(ids=["a"], documents=["x"], embeddings=[[1.0, 0.0]])
+    problem = check_collection_model(col, _Embeddings("large", 3))
+    assert "was embedded with _Embeddings:small" in problem
+    assert check_collection_model(col, small) is None
+    assert embedding_model_name(None) == CHROMA_DEFAULT_MODEL
+
+
+def test_switching_between_openai_models_is_flagged(client, tmp_path):
+    from langchain_openai import OpenAIEmbeddings
+
+    small = CachedEmbeddings(
+        OpenAIEmbeddings(model="text-embedding-3-small", api_key="test"), EmbeddingCache(tmp_path / "e.db")
+    )
+    col = client.get_or_create_collection("docs_test")
+    assert check_collection_model(col, small) is None
+    col.add(ids=["a"], documents=["x"], embeddings=[[1.0, 0.0]])
+
+    large = OpenAIEmbeddings(model="text-embedding-3-large", api_key="test")
+    assert "OpenAIEmbeddings:text-embedding-3-small" in check_collection_model(col, large)
+    # DocumentRecord stores the plain model name
+    assert embedding_model_label(small) == "text-embedding-3-small"
+    assert embedding_model_label(None) == CHROMA_DEFAULT_MODEL
+
+
+def test_reembed_collection_swaps_in_new_vectors_and_keeps_chunks(client, tmp_path):
+    col = client.get_or_create_collection("docs_test", metadata={"description": "d"})
+    col.add(
+        ids=[f"c{i}" for i in range(5)],
+        documents=[f"chunk {'x' * i}" for i in range(5)],
+        metadatas=[{"document_id": "d1", "chunk_index": i} for i in range(5)],
+        embeddings=[[1.0, float(i)] for i in range(5)],
+    )
+    large = CachedEmbeddings(_Embeddings("large", 3), EmbeddingCache(tmp_path / "emb.db"))
+
+    migrated = reembed_collection(client, col, large, batch_size=2)
+
+    assert migrated.name == "docs_test"
+    assert migrated.metadata == {"description": "d", "embedding_model": "_Embeddings:large"}
+    assert large.inner.batches == [2, 2, 1]
+    got = migrated.get(ids=["c3"], include=["embeddings", "metadatas", "documents"])
+    assert list(got["embeddings"][0]) == [9.0, 0.5, 0.5]
+    assert got["metadatas"][0] == {"document_id": "d1", "chunk_index": 3}
+    assert [c.name for c in client.list_collections()] == ["docs_test"]
+    assert check_collection_model(migrated, large) is None
+
+
+def test_interrupted_reembed_never_drops_the_only_copy(client):
+    def _chunks(name, n):
+        col = client.create_collection(name)
+        col.add(ids=[f"c{i}" for i in range(n)], documents=["x"] * n, embeddings=[[1.0, 0.0]] * n)
+        return col
+
+    # Stopped between the renames: the original only exists as the backup and the store
+    # has recreated the collection empty.
+    _chunks("docs_test__backup", 3)
+    _chunks("docs_test__reembed", 3)
+    client.create_collection("docs_test")
+    recover_interrupted_reembed(client, "docs_test")
+    assert [c.name for c in client.list_collections()] == ["docs_test"]
+    assert client.get_collection("docs_test").count() == 3
+
+    # A finished copy left by a run that dropped the original first is kept, not deleted
+    client.delete_collection("docs_test")
+    _chunks("docs_test__reembed", 2)
+    migrated = reembed_collection(client, client.get_or_create_collection("docs_test"), _Embeddings("large", 2))
+    assert migrated.count() == 2
+    assert [c.name for c in client.list_collections()] == ["docs_test"]
+
+
+def test_local_backend_batches_and_normalizes_on_cpu(monkeypatch):
+    calls = []
+
+    class _SentenceTransformer:
+        def __init__(self, name, device):
+            calls.append(("load", name, device))
+
+        def encode(self, texts, **kwargs):
+            calls.append(("encode", len(texts), kwargs["batch_size"], kwargs["normalize_embeddings"]))
+            return [[0.6, 0.8] for _ in texts]
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=_SentenceTransformer))
+    monkeypatch.setattr(local_embeddings, "_local", {})
+    monkeypatch.setenv("EMBEDDING_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_EMBEDDING_MODEL", "tiny-model")
+    monkeypatch.setenv("LOCAL_EMBEDDING_BATCH_SIZE", "16")
+
+    emb = get_langchain_embeddings()
+    assert get_langchain_embeddings() is emb
+    assert emb.embed_documents(["a", "b", "c"]) == [[0.6, 0.8]] * 3
+    assert emb.embed_query("q") == [0.6, 0.8]
+    assert calls == [("load", "tiny-model", "cpu"), ("encode", 3, 16, True), ("encode", 1, 16, True)]
+    assert embedding_model_name(emb) == "LocalSentenceEmbeddings:tiny-model"
+
+    monkeypatch.setenv("EMBEDDING_BACKEND", "bogus")
+    with pytest.raises(ValueError):
+        get_langchain_embeddings()
@@ -190,6 +190,65 @@ def test_case_cancel_with_reason(client: TestClient):
     assert g.json()["status"] == "Cancelled"
 
 
+def test_case_artifact_packs_load_in_two_queries_and_page(client: TestClient):
+    from sqlalchemy import event
+
+    from backend.persistence.database import get_read_engine
+    from backend.services.case_service import get_case_service
+    from shared.schemas import Artifact, ArtifactPack
+
+    c = client.post(
+        "/api/cases",
+        json={"category_id": "IT Infrastructure", "trigger_source": "pytest"},
+    )
+    assert c.status_code == 200
+    case_id = c.json()["case_id"]
+    service = get_case_service()
+    for i in range(3):
+        pack_id = f"pk-{case_id}-{i}"
+        service.save_artifact_pack(
+            case_id,
+            ArtifactPack(
+                pack_id=pack_id,
+                agent_name="Strategy",
+                created_at=f"2026-01-0{i + 1}T00:00:00",
+                artifacts=[
+                    Artifact(
+                        artifact_id=f"{pack_id}-a{j}",
+                        type="STRATEGY_RECOMMENDATION",
+                        title=f"Artifact {i}.{j}",
+                        content={"n": j},
+                        created_at=f"2026-01-0{i + 1}T00:00:00",
+                        created_by_agent="Strategy",
+                    )
+                    for j in range(2)
+                ],
+            ),
+        )
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = get_read_engine()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        packs = service.get_all_artifact_packs(case_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert [len(p.artifacts) for p in packs] == [2, 2, 2]
+    assert len(statements) == 2
+
+    r = client.get(f"/api/cases/{case_id}/artifact_packs", params={"offset": 1, "limit": 1})
+    assert r.status_code == 200
+    assert r.headers["X-Total-Count"] == "3"
+    page = r.json()
+    assert [p["pack_id"] for p in page] == [f"pk-{case_id}-1"]
+    assert [a["title"] for a in page[0]["artifacts"]] == ["Artifact 1.0", "Artifact 1.1"]
+
+
 def test_category_cards_extract_from_unstructured_text(client: TestClient):
     raw_text = """
     Default supplier status: allowed
@@ -367,6 +426,173 @@ def test_system1_approve_requires_warning_ack(client: TestClient):
     assert ok.json()["success"] is True
 
 
+def test_system1_approve_bulk_inserts_rows_with_overrides(client: TestClient):
+    csv_bytes = (
+        b"row_type,category,supplier_name,estimated_spend_usd,contract_id,months_to_expiry,preferred_supplier_status\n"
+        b"renewal,IT Infrastructure,BulkA,1200000,CNT-B1,6,preferred\n"
+        b"renewal,IT Infrastructure,BulkB,800000,CNT-B2,3,preferred\n"
+        b"renewal,IT Infrastructure,BulkC,400000,CNT-B3,9,preferred\n"
+    )
+    p = client.post(
+        "/api/system1/upload/preview",
+        files={"files": ("bulk_rows.csv", csv_bytes, "text/csv")},
+    )
+    assert p.status_code == 200
+    payload = p.json()
+    row_ids = [c["row_id"] for c in payload["candidates"]]
+    edited = row_ids[0]
+
+    ok = client.post(
+        "/api/system1/upload/approve",
+        json={
+            "job_id": payload["job_id"],
+            "approved_row_ids": row_ids,
+            "approver_id": "pytest",
+            "row_overrides": {edited: {"supplier_name": "BulkEdited"}},
+            "acknowledge_warning_row_ids": row_ids,
+        },
+    )
+    assert ok.status_code == 200
+    created = ok.json()["created_opportunity_ids"]
+    assert len(created) == 3
+    assert len(set(created)) == 3
+
+    from backend.heatmap.persistence.heatmap_models import Opportunity
+    from backend.infrastructure.storage_providers import get_heatmap_db
+
+    session = get_heatmap_db().get_db_session()
+    try:
+        names = {session.get(Opportunity, oid).supplier_name for oid in created}
+    finally:
+        session.close()
+    assert "BulkEdited" in names
+
+    job = client.get(f"/api/system1/upload/jobs/{payload['job_id']}").json()
+    assert job["status"] == "approved"
+    assert job["total_candidates"] == 0
+
+
+def test_system1_preview_defers_document_rows(client: TestClient):
+    import time
+
+    csv_bytes = (
+        b"row_type,category,supplier_name,estimated_spend_usd,contract_id,months_to_expiry\n"
+        b"renewal,IT Infrastructure,VendorA,1200000,CNT-1,6\n"
+        b"renewal,IT Infrastructure,VendorB,,,\n"
+    )
+    r = client.post(
+        "/api/system1/upload/preview",
+        data={"defer_documents": "true", "top_n": "1"},
+        files=[
+            ("files", ("rows.csv", csv_bytes, "text/csv")),
+            ("files", ("vendor_notes.txt", b"Acme renewal for 1M USD next year.", "text/plain")),
+        ],
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["status"] == "extracting_documents"
+    assert [c["supplier_name"] for c in data["candidates"]] == ["VendorA"]
+
+    job = {}
+    for _ in range(50):
+        job = client.get(f"/api/system1/upload/jobs/{data['job_id']}").json()
+        if job["status"] != "extracting_documents":
+            break
+        time.sleep(0.1)
+    assert job["status"] == "preview_ready"
+    assert job["total_candidates"] >= 2
+    assert sum(n.startswith("Applied top_n=1") for n in job["parsing_notes"]) == 1
+
+
+def test_system1_job_preview_is_persisted_and_paginated(client: TestClient):
+    csv_bytes = (
+        b"row_type,category,supplier_name,estimated_spend_usd,contract_id,months_to_expiry\n"
+        b"renewal,IT Infrastructure,VendorA,1200000,CNT-1,6\n"
+        b"renewal,IT Infrastructure,VendorB,800000,CNT-2,3\n"
+        b"renewal,IT Infrastructure,VendorC,400000,CNT-3,9\n"
+    )
+    p = client.post(
+        "/api/system1/upload/preview",
+        files={"files": ("rows.csv", csv_bytes, "text/csv")},
+    )
+    assert p.status_code == 200
+    job_id = p.json()["job_id"]
+    all_ids = [c["row_id"] for c in p.json()["candidates"]]
+
+    page = client.get(f"/api/system1/upload/jobs/{job_id}/preview", params={"offset": 1, "limit": 1})
+    assert page.status_code == 200
+    data = page.json()
+    assert data["total_candidates"] == 3
+    assert [c["row_id"] for c in data["candidates"]] == all_ids[1:2]
+    assert data["candidates"][0]["contract_end_date"] is None or "T" in data["candidates"][0]["contract_end_date"]
+
+    status = client.get(f"/api/system1/upload/jobs/{job_id}")
+    assert status.status_code == 200
+    assert status.json()["total_candidates"] == 3
+
+    assert client.delete(f"/api/system1/upload/jobs/{job_id}").json()["removed"] is True
+    assert client.get(f"/api/system1/upload/jobs/{job_id}").status_code == 404
+
+
+def test_system1_default_preview_is_empty_once_the_top_block_is_approved(client: TestClient):
+    csv_bytes = (
+        b"row_type,category,supplier_name,estimated_spend_usd,contract_id,months_to_expiry\n"
+        b"renewal,IT Infrastructure,VendorA,1200000,CNT-1,6\n"
+        b"renewal,IT Infrastructure,VendorB,800000,CNT-2,3\n"
+    )
+    p = client.post(
+        "/api/system1/upload/preview",
+        data={"top_n": "1"},
+        files={"files": ("rows.csv", csv_bytes, "text/csv")},
+    )
+    assert p.status_code == 200
+    job_id = p.json()["job_id"]
+    top_id = p.json()["candidates"][0]["row_id"]
+
+    ok = client.post(
+        "/api/system1/upload/approve",
+        json={
+            "job_id": job_id,
+            "approved_row_ids": [top_id],
+            "approver_id": "pytest",
+            "acknowledge_warning_row_ids": [top_id],
+        },
+    )
+    assert ok.status_code == 200
+
+    preview = client.get(f"/api/system1/upload/jobs/{job_id}/preview").json()
+    assert preview["candidates"] == [] and preview["total_candidates"] == 1
+    rest = client.get(f"/api/system1/upload/jobs/{job_id}/preview", params={"offset": 0, "limit": 10}).json()
+    assert [c["supplier_name"] for c in rest["candidates"]] == ["VendorB"]
+
+
+def test_system1_job_store_expires_jobs(monkeypatch):
+    from datetime import timedelta
+
+    from backend.heatmap.services import system1_upload_jobs
+    from backend.heatmap.services.system1_upload_jobs import (
+        decode_candidates,
+        encode_candidates,
+        get_system1_upload_job_store,
+    )
+
+    rows = [{"row_id": f"r{i}", "score": float(i), "warnings": []} for i in range(5)]
+    page, total = decode_candidates(encode_candidates(rows), offset=3, limit=10)
+    assert total == 5
+    assert page == rows[3:]
+
+    store = get_system1_upload_job_store()
+    monkeypatch.setenv("SYSTEM1_UPLOAD_JOB_TTL_HOURS", "1")
+    job_id = f"up-test-{uuid4().hex[:8]}"
+    store.create_job({"job_id": job_id, "candidates": rows})
+    assert store.get_job(job_id)["candidates"] == rows
+
+    real_now = system1_upload_jobs._utcnow
+    monkeypatch.setattr(system1_upload_jobs, "_utcnow", lambda: real_now() + timedelta(hours=2))
+    assert store.get_job(job_id) is None
+    assert store.purge_expired_jobs() >= 1
+
+
 def test_system1_templates_endpoint(client: TestClient):
     r = client.get("/api/system1/upload/templates")
     assert r.status_code == 200
@@ -554,6 +780,31 @@ def test_system1_preview_rank_by_score_with_top_n(client: TestClient):
     assert data["analysis"]["rank_by_applied"] == "score"
 
 
+def test_system1_preview_top_n_keeps_remaining_rows_for_paging(client: TestClient):
+    csv_bytes = (
+        b"row_type,category,supplier_name,estimated_spend_usd,contract_id,months_to_expiry\n"
+        b"renewal,IT Infrastructure,VendorA,1000,CNT-1,6\n"
+        b"renewal,IT Infrastructure,VendorB,1200000,CNT-2,2\n"
+        b"renewal,IT Infrastructure,VendorC,5000,CNT-3,9\n"
+    )
+    r = client.post(
+        "/api/system1/upload/preview",
+        data={"top_n": "1", "rank_by": "score"},
+        files={"files": ("rows.csv", csv_bytes, "text/csv")},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total_candidates"] == 3
+    assert [c["supplier_name"] for c in data["candidates"]] == ["VendorB"]
+
+    job_id = data["job_id"]
+    first = client.get(f"/api/system1/upload/jobs/{job_id}/preview").json()
+    assert [c["supplier_name"] for c in first["candidates"]] == ["VendorB"]
+    assert first["total_candidates"] == 3
+    rest = client.get(f"/api/system1/upload/jobs/{job_id}/preview", params={"offset": 1}).json()
+    assert [c["supplier_name"] for c in rest["candidates"]] == ["VendorA", "VendorC"]
+
+
 def test_system1_preview_uses_learned_weight_mix(client: TestClient):
     wr = client.put(
         "/api/heatmap/scoring-weights",
@@ -850,3 +1101,41 @@ def test_stage_generation_check_preconditions(client: TestClient):
     assert ok.status_code == 200
     assert ok.json()["can_generate"] is True
 
+
+
+def test_case_and_heatmap_reads_support_conditional_get(client: TestClient):
+    c = client.post("/api/cases", json={"category_id": "IT Infrastructure", "trigger_source": "pytest"})
+    case_id = c.json()["case_id"]
+    for path in (
+        f"/api/cases/{case_id}",
+        f"/api/cases/{case_id}/documents/center",
+        f"/api/cases/{case_id}/artifact_packs?limit=10",
+        "/api/cases",
+        "/api/documents",
+        "/api/ingest/history",
+    ):
+        first = client.get(path)
+        etag = first.headers["etag"]
+        again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.headers["etag"] == etag and not again.content
+
+    detail_tag = client.get(f"/api/cases/{case_id}").headers["etag"]
+    packs_tag = client.get(f"/api/cases/{case_id}/artifact_packs").headers["etag"]
+    client.post(f"/api/cases/{case_id}/cancel", json={"reason_code": "OTHER", "reason_text": "etag test"})
+    changed = client.get(f"/api/cases/{case_id}", headers={"If-None-Match": detail_tag})
+    assert changed.status_code == 200 and changed.headers["etag"] != detail_tag
+    packs = client.get(f"/api/cases/{case_id}/artifact_packs", headers={"If-None-Match": packs_tag})
+    assert packs.status_code == 200 and packs.headers["etag"] != packs_tag
+
+    for path in ("/api/heatmap/opportunities?enrich=false", "/api/heatmap/metrics/dashboard"):
+        client.get(path)  # settles the time-dependent score refresh
+        etag = client.get(path).headers["etag"]
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    dash_tag = client.get("/api/heatmap/metrics/dashboard").headers["etag"]
+    r = client.post(
+        "/api/heatmap/qa/feedback",
+        json={"response_id": uuid4().hex, "vote": "up", "question": "Why?", "answer": "Because.", "user_id": "pytest"},
+    )
+    assert r.status_code == 200
+    assert client.get("/api/heatmap/metrics/dashboard", headers={"If-None-Match": dash_tag}).status_code == 200
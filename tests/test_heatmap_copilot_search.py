@@ -0,0 +1,105 @@
+"""Copilot opportunity search index (FTS5) and cached provenance blocks."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend.heatmap.persistence import heatmap_models  # noqa: F401 - registers tables
+from backend.heatmap.persistence.heatmap_database import HeatmapDatabase
+from backend.heatmap.persistence.heatmap_models import Opportunity, OpportunityContextCache
+from backend.heatmap.services import heatmap_copilot
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    HeatmapDatabase()._ensure_opportunity_search_index(engine)
+    with Session(engine) as s:
+        for i in range(5):
+            s.add(
+                Opportunity(
+                    supplier_name=f"Vendor {i}",
+                    category="IT Infrastructure",
+                    contract_id=f"CNT-{i:03d}",
+                    total_score=9.0 - i,
+                )
+            )
+        s.add(
+            Opportunity(
+                supplier_name="Zeta Widgets Ltd",
+                category="Facilities",
+                request_id="REQ-ZETA-7",
+                total_score=0.5,
+            )
+        )
+        s.commit()
+        yield s
+    engine.dispose()
+
+
+def test_targeted_rows_come_from_index_and_provenance_is_cached(session, monkeypatch):
+    monkeypatch.setattr(heatmap_copilot, "MAX_OPPS_IN_CONTEXT", 2)
+    ctx = heatmap_copilot.build_opportunities_context(session, 'Why is "Zeta Widgets" ranked low?')
+    assert "TARGETED MATCHES" in ctx
+    assert "supplier=Zeta Widgets Ltd" in ctx
+    assert "supplier=Vendor 4" not in ctx
+    assert "... and 4 more rows not shown." in ctx
+
+    ctx_by_id = heatmap_copilot.build_opportunities_context(session, "Explain REQ-ZETA-7")
+    assert "supplier=Zeta Widgets Ltd" in ctx_by_id
+
+    cached_ids = {c.opportunity_id for c in session.exec(select(OpportunityContextCache)).all()}
+    zeta = session.exec(select(Opportunity).where(Opportunity.request_id == "REQ-ZETA-7")).one()
+    assert zeta.id in cached_ids
+
+    zeta.total_score = 8.5
+    session.add(zeta)
+    session.commit()
+    assert session.get(OpportunityContextCache, zeta.id) is None
+
+
+def test_index_follows_supplier_rename(session, monkeypatch):
+    monkeypatch.setattr(heatmap_copilot, "MAX_OPPS_IN_CONTEXT", 1)
+    zeta = session.exec(select(Opportunity).where(Opportunity.request_id == "REQ-ZETA-7")).one()
+    zeta.supplier_name = "Omega Parts"
+    session.add(zeta)
+    session.commit()
+    assert "Omega Parts" in heatmap_copilot.build_opportunities_context(session, '"Omega Parts" status?')
+    assert "TARGETED MATCHES" not in heatmap_copilot.build_opportunities_context(session, '"Zeta Widgets"?')
+
+
+def test_failed_index_query_falls_back_to_scan(session):
+    from sqlalchemy import text
+
+    from backend.heatmap.services.opportunity_search import search_opportunity_ids
+
+    assert search_opportunity_ids(session, ["zeta"], limit=3) != []
+    session.execute(text("DROP TABLE opportunity_fts"))
+    assert search_opportunity_ids(session, ["zeta"], limit=3) is None
+
+
+def test_provenance_cache_write_does_not_commit_the_callers_session(tmp_path):
+    from backend.heatmap.services.opportunity_search import cached_provenance_details
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'heatmap.db'}")
+    SQLModel.metadata.create_all(engine)
+    HeatmapDatabase()._ensure_opportunity_search_index(engine)
+    with Session(engine) as s:
+        s.add(Opportunity(supplier_name="Acme", category="IT", total_score=5.0))
+        s.commit()
+
+    with Session(engine) as s:
+        rows = s.exec(select(Opportunity)).all()
+        oid = rows[0].id
+        s.add(Opportunity(supplier_name="Pending edit", category="IT", total_score=1.0))
+        assert cached_provenance_details(s, rows, lambda o: f"detail {o.id}") == {oid: f"detail {oid}"}
+        s.rollback()
+
+    with Session(engine) as s:
+        assert [o.supplier_name for o in s.exec(select(Opportunity)).all()] == ["Acme"]
+        assert s.get(OpportunityContextCache, oid).detail_text == f"detail {oid}"
+    engine.dispose()
@@ -0,0 +1,78 @@
+import json
+import shutil
+
+import pytest
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from utils import knowledge_layer
+from utils.knowledge_layer import get_vector_context
+from utils.metrics import CACHE_REQUESTS
+
+
+@pytest.fixture
+def layer(tmp_path, monkeypatch):
+    """Knowledge layer over a copy of data/ with the ingested corpus stubbed out."""
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ("category_strategies.json", "categories.json"):
+        shutil.copy(knowledge_layer.DATA_DIR / name, data / name)
+    shutil.copytree(knowledge_layer.DATA_DIR / "synthetic_docs", data / "synthetic_docs")
+    corpus = {"revision": "0:0", "calls": 0}
+
+    def corpus_passages(category_id, dtp_stage, topic, limit):
+        corpus["calls"] += 1
+        return [{"source": "chunk:c1", "title": "Rollout plan", "text": f"{category_id} {dtp_stage} plan"}][:limit]
+
+    monkeypatch.setattr(knowledge_layer, "DATA_DIR", data)
+    monkeypatch.setattr(knowledge_layer, "_corpus_revision", lambda: corpus["revision"])
+    monkeypatch.setattr(knowledge_layer, "_corpus_passages", corpus_passages)
+    monkeypatch.setattr(knowledge_layer, "_cache", knowledge_layer._KnowledgeCache())
+    monkeypatch.setenv("KNOWLEDGE_CHECK_INTERVAL_SEC", "0")
+    return data, corpus
+
+
+def test_contexts_are_grounded_in_category_and_stage_scoped_passages(layer):
+    ctx = get_vector_context("CAT-01", "DTP-03", "rfq_template")
+    sources = [p["source"] for p in ctx["passages"]]
+    assert ctx["grounded"] and ctx["content"]["sections"]
+    assert "category_strategies.json#CAT-01.sourcing_rules" in sources
+    assert all("CAT-02" not in s for s in sources)
+
+    procedure = [p["title"] for p in get_vector_context("CAT-02", "DTP-04", "dtp_procedure")["passages"]]
+    assert any("DTP-04" in t for t in procedure)
+    assert not any("DTP-03" in t for t in procedure)
+
+    rollout = get_vector_context("CAT-01", "DTP-06", "rollout_playbook")
+    assert rollout["content"]["steps"] and rollout["passages"][0]["source"] == "chunk:c1"
+    json.dumps(rollout)
+
+
+def test_repeat_calls_are_served_from_cache_as_copies(layer):
+    _, corpus = layer
+    first = get_vector_context("CAT-01", "DTP-06", "rollout_playbook")
+    hits = CACHE_REQUESTS.value(cache="knowledge", result="hit")
+    first["content"]["steps"].append("mutated by caller")
+
+    second = get_vector_context("CAT-01", "DTP-06", "rollout_playbook")
+    assert "mutated by caller" not in second["content"]["steps"]
+    assert corpus["calls"] == 1
+    assert CACHE_REQUESTS.value(cache="knowledge", result="hit") == hits + 1
+
+
+def test_source_and_corpus_changes_invalidate_the_cache(layer):
+    data, corpus = layer
+    get_vector_context("CAT-01", "DTP-01", "category_strategy")
+    strategies = json.loads((data / "category_strategies.json").read_text())
+    for entry in strategies:
+        if entry["category_id"] == "CAT-01":
+            entry["sourcing_rules"]["preferred_route"] = "Reverse auction"
+    (data / "category_strategies.json").write_text(json.dumps(strategies))
+
+    texts = [p["text"] for p in get_vector_context("CAT-01", "DTP-01", "category_strategy")["passages"]]
+    assert any("Reverse auction" in t for t in texts)
+
+    get_vector_context("CAT-01", "DTP-06", "rollout_playbook")
+    calls = corpus["calls"]
+    corpus["revision"] = "1:1"
+    get_vector_context("CAT-01", "DTP-06", "rollout_playbook")
+    assert corpus["calls"] == calls + 1
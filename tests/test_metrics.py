@@ -0,0 +1,50 @@
+"""Prometheus metrics: exposition format, route-template labels and cache/DB recording."""
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from utils import metrics
+from utils.caching import cache, get_cache_meta
+from utils.schemas import CaseSummary
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    hist = metrics.Histogram("t_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    hist.observe(0.05, op="a")
+    hist.observe(0.5, op="a")
+    hist.observe(5.0, op="a")
+    lines = hist.collect()
+    assert 't_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{op="a",le="1"} 2' in lines
+    assert 't_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{op="a"} 3' in lines and 't_seconds_sum{op="a"} 5.55' in lines
+
+    ctr = metrics.Counter("t_total", "Test.", ("cache", "result"))
+    ctr.inc(cache="x", result="hit")
+    ctr.inc(2, cache="x", result="hit")
+    assert ctr.collect()[-1] == 't_total{cache="x",result="hit"} 3'
+
+
+def test_metrics_endpoint_reports_routes_db_and_cache():
+    client = TestClient(app)
+    assert client.get("/api/cases").status_code == 200
+
+    summary = CaseSummary(
+        case_id="CASE-M", category_id="IT", dtp_stage="DTP-01", trigger_source="User",
+        status="In Progress", created_date="2026-01-01", summary_text="m",
+    )
+    cache.clear()
+    hits_before = metrics.CACHE_REQUESTS.value(cache="agent", result="hit")
+    meta, _ = get_cache_meta("CASE-M", "Probe", "intent", summary)
+    cache.set(meta.cache_key, {"ok": True})
+    get_cache_meta("CASE-M", "Probe", "intent", summary)
+    assert metrics.CACHE_REQUESTS.value(cache="agent", result="hit") == hits_before + 1
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/cases",status="200",le="+Inf"}' in body
+    assert "http_requests_in_flight" in body
+    assert 'db_query_duration_seconds_count{db="datalake.db"}' in body
+    assert 'cache_requests_total{cache="agent",result="miss"}' in body
@@ -0,0 +1,63 @@
+"""Schema migrations and the hot-query plan audit (no full table scans / temp sorts)."""
+from __future__ import annotations
+
+import pytest
+from sqlmodel import SQLModel
+
+from backend.heatmap.persistence import heatmap_models  # noqa: F401  (registers heatmap tables)
+from backend.persistence import models  # noqa: F401  (registers app tables)
+from backend.persistence.migrations import (
+    APP_MIGRATIONS,
+    HEATMAP_MIGRATIONS,
+    applied_migrations,
+    apply_migrations,
+)
+from backend.persistence.query_plans import HOT_QUERIES, explain, plan_problems
+from backend.persistence.sqlite_engine import create_sqlite_engine
+
+_MIGRATIONS = {"app": APP_MIGRATIONS, "heatmap": HEATMAP_MIGRATIONS}
+
+
+def _engine(tmp_path, db, migrate=True):
+    engine = create_sqlite_engine(tmp_path / f"{db}.db")
+    SQLModel.metadata.create_all(engine)
+    if migrate:
+        apply_migrations(engine, _MIGRATIONS[db])
+    return engine
+
+
+def test_migrations_apply_once(tmp_path):
+    engine = _engine(tmp_path, "app", migrate=False)
+    assert apply_migrations(engine, APP_MIGRATIONS) == [m.id for m in APP_MIGRATIONS]
+    assert apply_migrations(engine, APP_MIGRATIONS) == []
+    assert applied_migrations(engine) == [m.id for m in APP_MIGRATIONS]
+
+
+def test_column_migration_adds_the_column_to_an_older_file(tmp_path):
+    from sqlalchemy import text
+
+    engine = create_sqlite_engine(tmp_path / "old.db")
+    SQLModel.metadata.create_all(engine, tables=[
+        t for t in SQLModel.metadata.sorted_tables if t.name != "chat_messages"
+    ])
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE chat_messages (id INTEGER PRIMARY KEY, case_id TEXT, created_at TEXT)"))
+    assert "app_0003_chat_message_context_tokens" in apply_migrations(engine, APP_MIGRATIONS)
+    with engine.connect() as conn:
+        columns = {r[1] for r in conn.execute(text("PRAGMA table_info(chat_messages)"))}
+    assert "context_tokens" in columns
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES, ids=[q.name for q in HOT_QUERIES])
+def test_hot_query_uses_an_index(tmp_path, query):
+    engine = _engine(tmp_path, query.db)
+    with engine.connect() as conn:
+        plan = explain(conn, query.build())
+    assert plan_problems(plan) == [], f"{query.name}: {plan}"
+
+
+def test_checker_flags_missing_indexes(tmp_path):
+    engine = _engine(tmp_path, "heatmap", migrate=False)
+    q = next(q for q in HOT_QUERIES if q.name == "heatmap.copilot_top_opportunities")
+    with engine.connect() as conn:
+        assert plan_problems(explain(conn, q.build()))
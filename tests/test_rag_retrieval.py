@@ -0,0 +1,230 @@
+import time
+
+import pytest
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from backend.rag import retriever as retriever_mod
+from backend.rag.lexical_index import LexicalIndex, match_expression
+from backend.rag.retriever import DocumentRetriever, reciprocal_rank_fusion
+from backend.rag.vector_store_interface import build_where, stage_flag
+
+
+def _meta(doc_id, supplier="SUP-001", doc_type="Contract", dtp='["DTP-04"]'):
+    return {"document_id": doc_id, "supplier_id": supplier, "document_type": doc_type, "dtp_relevance": dtp}
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = LexicalIndex(tmp_path / "fts.db")
+    idx.add_chunks(
+        ["c1", "c2", "c3", "c4"],
+        [
+            "Master agreement CTR-2024-017 clause 4.2.1 limits liability to annual fees.",
+            "Clause 7 covers payment terms of net 60 days.",
+            "Quarterly business review notes for the cloud hosting supplier.",
+            "Liability cap and indemnity for Acme Logistics.",
+        ],
+        [_meta("d1"), _meta("d1"), _meta("d2", doc_type="Report", dtp="[]"), _meta("d3", supplier="SUP-002")],
+    )
+    return idx
+
+
+def test_match_expression_quotes_terms_and_keeps_identifiers_as_phrases():
+    expr = match_expression('CTR-2024-017 the "liability" OR NEAR(')
+    assert '"ctr 2024 017"' in expr
+    assert '"liability"' in expr and '"the"' not in expr
+    assert "NEAR(" not in expr
+    assert match_expression("  ") == ""
+
+
+def test_lexical_index_ranks_exact_ids_and_filters_in_sql(index):
+    hits = index.search("CTR-2024-017 liability", n_results=5)
+    assert hits[0]["chunk_id"] == "c1"
+    assert {h["chunk_id"] for h in hits} >= {"c1", "c4"}
+
+    hits = index.search("liability", supplier_id="SUP-001", document_types=["Contract"], dtp_stage="DTP-04")
+    assert [h["chunk_id"] for h in hits] == ["c1"]
+    # Chunks without a DTP list match every stage
+    assert [h["chunk_id"] for h in index.search("cloud hosting", dtp_stage="DTP-01")] == ["c3"]
+    assert index.search("liability", dtp_stage="DTP-01", document_types=["Contract"]) == []
+
+    index.add_chunks(["c1"], ["replaced text"], [_meta("d1")])
+    assert index.count() == 4
+    assert index.delete_document("d1") == 2
+    assert index.count() == 2
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        {
+            "vector": [{"chunk_id": "a", "score": 0.9}, {"chunk_id": "b", "score": 0.8}],
+            "lexical": [{"chunk_id": "b", "score": 7.0}, {"chunk_id": "c", "score": 3.0}],
+        }
+    )
+    assert [c["chunk_id"] for c in fused] == ["b", "a", "c"]
+    assert fused[0]["vector_score"] == 0.8 and fused[0]["lexical_score"] == 7.0
+
+
+class _FakeVectorStore:
+    def __init__(self, lexical_index, delay=0.0):
+        self.lexical_index = lexical_index
+        self.delay = delay
+        self.calls = []
+
+    def search(self, query, n_results=5, where=None, where_document=None):
+        time.sleep(self.delay)
+        self.calls.append({"n_results": n_results, "where": where})
+        # The stage filter is pushed into the store, so only the matching chunk comes back.
+        return {
+            "ids": [["c2"]],
+            "documents": [["Clause 7 covers payment terms of net 60 days."]],
+            "metadatas": [[_meta("d1")]],
+            "distances": [[0.3]],
+        }
+
+
+def _retriever(monkeypatch, store):
+    monkeypatch.setattr(retriever_mod, "get_legacy_vector_store", lambda: store)
+    monkeypatch.setattr(retriever_mod, "get_app_db", lambda: None)
+    monkeypatch.delenv("RAG_RERANK_MODEL", raising=False)
+    return DocumentRetriever()
+
+
+def test_hybrid_retrieval_fills_selective_filters_and_reports_timings(monkeypatch, index):
+    r = _retriever(monkeypatch, _FakeVectorStore(index))
+    out = r.retrieve_documents("CTR-2024-017 liability payment", supplier_id="SUP-001", dtp_stage="DTP-04", top_k=3)
+
+    assert out["retrieval_mode"] == "hybrid"
+    assert r.vector_store.calls[0]["where"] == {
+        "$and": [{"supplier_id": "SUP-001"}, {stage_flag("DTP-04"): True}]
+    }
+    assert {c["chunk_id"] for c in out["chunks"]} == {"c1", "c2"}
+    both = next(c for c in out["chunks"] if c["chunk_id"] == "c2")
+    assert both["vector_score"] is not None and both["lexical_score"] is not None
+    assert {"vector", "lexical", "fusion", "total"} <= set(out["timings_ms"])
+    assert out["degraded"] == []
+
+
+def test_slow_vector_leg_falls_back_to_keyword_results_within_budget(monkeypatch, index):
+    monkeypatch.setenv("RAG_RETRIEVAL_BUDGET_MS", "50")
+    r = _retriever(monkeypatch, _FakeVectorStore(index, delay=0.5))
+    t0 = time.perf_counter()
+    out = r.retrieve_documents("CTR-2024-017", top_k=2)
+
+    assert time.perf_counter() - t0 < 0.4
+    assert out["retrieval_mode"] == "lexical"
+    assert out["degraded"] == ["vector_timeout"]
+    assert out["chunks"][0]["chunk_id"] == "c1"
+
+
+def test_reranker_reorders_fused_candidates(monkeypatch, index):
+    class _Reranker:
+        def predict(self, pairs):
+            return [1.0 if "payment" in text else 0.0 for _, text in pairs]
+
+    r = _retriever(monkeypatch, _FakeVectorStore(index))
+    monkeypatch.setattr(retriever_mod, "get_reranker", lambda: _Reranker())
+    out = r.retrieve_documents("liability clause", supplier_id="SUP-001", dtp_stage="DTP-04", top_k=2)
+
+    assert out["chunks"][0]["chunk_id"] == "c2"
+    assert out["chunks"][0]["rerank_score"] == 1.0
+    assert "rerank" in out["timings_ms"]
+
+
+def test_vector_only_retrieval_asks_for_exactly_top_k(monkeypatch, index):
+    store = _FakeVectorStore(None)
+    r = _retriever(monkeypatch, store)
+    out = r.retrieve_documents("payment", document_types=["Contract", "Report"], top_k=3)
+
+    assert out["retrieval_mode"] == "vector"
+    assert store.calls == [{"n_results": 3, "where": {"document_type": {"$in": ["Contract", "Report"]}}}]
+
+
+def test_build_where_pushes_every_filter_into_one_operator():
+    assert build_where() is None
+    assert build_where(dtp_stage="DTP-02") == {"dtp_DTP-02": True}
+    assert build_where("SUP-1", "CAT-1", ["Contract"]) == {
+        "$and": [{"supplier_id": "SUP-1"}, {"category_id": "CAT-1"}, {"document_type": "Contract"}]
+    }
+
+
+def test_stage_flags_backfilled_on_existing_collection(monkeypatch, tmp_path):
+    import chromadb
+    from chromadb.config import Settings
+
+    from backend.rag import lexical_index as lexical_mod
+    from backend.rag import vector_store as vs_mod
+
+    monkeypatch.setattr(vs_mod, "CHROMA_PATH", tmp_path / "chroma")
+    monkeypatch.setattr(lexical_mod, "_lexical_index", LexicalIndex(tmp_path / "fts.db"))
+    client = chromadb.PersistentClient(
+        path=str(tmp_path / "chroma"), settings=Settings(anonymized_telemetry=False, allow_reset=True)
+    )
+    legacy = client.get_or_create_collection(
+        vs_mod.COLLECTION_NAME, metadata={"description": "pre-flag collection"}
+    )
+    legacy.add(
+        ids=["a", "b", "c"],
+        documents=["negotiation playbook", "strategy memo", "general policy"],
+        embeddings=[[1.0, 0.0], [0.9, 0.1], [0.8, 0.2]],
+        metadatas=[
+            _meta("d1", dtp='["DTP-04"]'),
+            _meta("d2", doc_type="Report", dtp='["DTP-01"]'),
+            _meta("d3", doc_type="Policy", dtp="[]"),
+        ],
+    )
+
+    store = vs_mod.VectorStore()
+
+    assert store.collection.metadata["metadata_version"] == vs_mod.METADATA_VERSION
+    assert store.lexical_index.count() == 3
+    where = build_where(supplier_id="SUP-001", document_types=["Contract", "Policy"], dtp_stage="DTP-04")
+    hits = store.collection.query(query_embeddings=[[1.0, 0.0]], n_results=2, where=where)
+    assert hits["ids"][0] == ["a", "c"]
+    assert store._backfill_filter_fields() == 0
+
+
+def test_bulk_supplier_lookups_use_one_query(monkeypatch, tmp_path):
+    from sqlalchemy import event
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from backend.persistence.models import SLAEvent, SupplierPerformance
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    SQLModel.metadata.create_all(engine, tables=[SupplierPerformance.__table__, SLAEvent.__table__])
+    with Session(engine) as s:
+        for i in range(25):
+            sid = f"SUP-{i:03d}"
+            s.add(SupplierPerformance(supplier_id=sid, overall_score=6.0, trend="stable", measurement_date="2024-01-01"))
+            s.add(SupplierPerformance(supplier_id=sid, overall_score=7.0 + i / 10, trend="improving", measurement_date="2024-06-01"))
+            for d in range(3):
+                s.add(SLAEvent(supplier_id=sid, event_type="breach", sla_metric="uptime", severity="high", event_date=f"2024-0{d + 1}-01"))
+        s.commit()
+
+    class _AppDb:
+        def get_db_session(self):
+            return Session(engine)
+
+    r = _retriever(monkeypatch, _FakeVectorStore(None))
+    r.app_db = _AppDb()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    ids = [f"SUP-{i:03d}" for i in range(25)] + ["SUP-404"]
+    perf = r.get_supplier_performance_many(ids)
+    assert len(statements) == 1
+    assert perf["SUP-003"]["summary"] == {"latest_score": 7.3, "trend": "improving", "risk_level": None, "record_count": 2}
+    assert perf["SUP-404"]["records"] == [] and perf["SUP-404"]["summary"] is None
+    assert r.get_supplier_performance("SUP-003") == perf["SUP-003"]
+
+    statements.clear()
+    sla = r.get_sla_events_many(ids, limit_per_supplier=2)
+    assert len(statements) == 1 and "row_number() over" in statements[0].lower()
+    assert [e["event_date"] for e in sla["SUP-010"]["records"]] == ["2024-03-01", "2024-02-01"]
+    assert sla["SUP-404"]["summary"]["total_events"] == 0
+    assert r.get_sla_events("SUP-010")["summary"]["high_severity"] == 3
+
+    # Missing IDs come back empty rather than raising
+    missing = r.get_supplier_performance(None)
+    assert missing["supplier_id"] is None and missing["records"] == [] and missing["summary"] is None
+    assert r.get_sla_events("")["records"] == [] and r.get_sla_events("")["summary"]["total_events"] == 0
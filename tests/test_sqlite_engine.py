@@ -0,0 +1,52 @@
+"""SQLite engine tuning: WAL/busy timeout pragmas, read-only pool, concurrent writers."""
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.persistence.sqlite_engine import create_sqlite_engine
+from utils import metrics
+
+
+def test_pragmas_and_read_only_pool(tmp_path):
+    db = tmp_path / "t.db"
+    rw = create_sqlite_engine(db)
+    ro = create_sqlite_engine(db, read_only=True)
+    with rw.begin() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 15000
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        conn.execute(text("CREATE TABLE t (v INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    with ro.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+    assert metrics.DB_POOL_WAIT_SECONDS.count(db="t.db", mode="ro") >= 1
+
+
+def test_concurrent_writers_wait_instead_of_locking(tmp_path):
+    engine = create_sqlite_engine(tmp_path / "w.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (v INTEGER)"))
+    errors = []
+
+    def _write(n):
+        try:
+            for i in range(20):
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO t VALUES (:v)"), {"v": n * 100 + i})
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=_write, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 80
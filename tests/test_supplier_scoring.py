@@ -0,0 +1,105 @@
+import numpy as np
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from agents.supplier_agent import SupplierEvaluationAgent
+from backend.tasks.scoring_tasks import ComputeScoresAndRankTask, NormalizeMetricsTask
+from utils.execution_constraints import ExecutionConstraints
+from utils.supplier_scoring import SupplierScoringEngine, clip_scores, priority_weight_scenarios
+
+CRITERIA = [
+    {"name": "Quality", "weight": 0.25},
+    {"name": "Delivery", "weight": 0.20},
+    {"name": "Price", "weight": 0.25},
+    {"name": "Responsiveness", "weight": 0.15},
+    {"name": "Risk", "weight": 0.15},
+    {"name": "Innovation", "weight": 0.5},  # no metric behind it: ignored
+]
+
+PERFORMANCE = [
+    {"supplier_id": "SUP-A", "supplier_name": "Alpha", "quality_score": 9, "delivery_score": 8,
+     "responsiveness_score": 7, "cost_variance": -10},
+    {"supplier_id": "SUP-B", "quality_score": 12, "delivery_score": 6, "responsiveness_score": 9, "cost_variance": 0},
+    {"supplier_id": "SUP-C", "supplier_name": "Gamma", "quality_score": 6, "delivery_score": 9, "cost_variance": 60},
+]
+RISK = [{"supplier_id": "SUP-A", "risk_score": 4, "sla_breach_count": 2}, {"supplier_id": "SUP-C", "risk_score": 14}]
+
+
+def _run(task, context):
+    return task.run_analytics(context, {}, {})["data"]
+
+
+def test_tasks_normalize_and_rank_in_the_existing_format():
+    normalized = _run(NormalizeMetricsTask("normalize_metrics"),
+                      {"supplier_performance": PERFORMANCE, "risk_indicators": RISK})["normalized_metrics"]
+    b = normalized[1]
+    assert b["supplier_name"] == "SUP-B" and b["quality_normalized"] == 10 and b["risk_normalized"] == 10
+    assert normalized[0]["cost_normalized"] == 8 and normalized[0]["risk_data"]["sla_breach_count"] == 2
+    assert normalized[2]["responsiveness_normalized"] == 5 and normalized[2]["cost_normalized"] == 0
+    assert normalized[2]["risk_normalized"] == 0
+
+    ranked = _run(ComputeScoresAndRankTask("compute_scores_and_rank"),
+                  {"criteria": CRITERIA, "normalized_metrics": normalized})["ranked_suppliers"]
+    assert [(s["supplier_id"], s["rank"]) for s in ranked] == [("SUP-B", 1), ("SUP-A", 2), ("SUP-C", 3)]
+    # 10*.25 + 6*.2 + 10*.25 + 9*.15 + 10*.15
+    assert ranked[0]["total_score"] == 9.05
+    assert set(ranked[0]["score_breakdown"]) == {"Quality", "Delivery", "Price", "Responsiveness", "Risk"}
+    assert ranked[1]["score_breakdown"]["Price"] == {"raw": 8.0, "weight": 0.25, "weighted": 2.0}
+    assert ranked[1]["raw_data"]["supplier_name"] == "Alpha"
+
+
+def test_eligibility_mask_drops_suppliers_from_the_ranking():
+    engine = SupplierScoringEngine.from_performance(PERFORMANCE, RISK)
+    engine.eligible = np.array([True, False, True])
+    assert [s["supplier_id"] for s in engine.rank(CRITERIA)] == ["SUP-A", "SUP-C"]
+    assert list(clip_scores([None, -1, 11, 7.5])) == [5.0, 0.0, 10.0, 7.5]
+
+
+def test_sensitivity_reranks_under_many_weight_vectors_at_once():
+    engine = SupplierScoringEngine.from_performance(PERFORMANCE, RISK)
+    scenarios = [{"Quality": 1.0}, {"Delivery": 1.0}, {"Price": 0.5, "Risk": 0.5}]
+    result = engine.sensitivity(scenarios)
+
+    assert result["scenarios"] == 3
+    assert result["ranks"]["SUP-C"] == [3, 1, 3]
+    assert result["ranks"]["SUP-B"] == [1, 3, 1]
+    top = result["suppliers"][0]
+    assert top["supplier_id"] == "SUP-B" and top["top_share"] == round(2 / 3, 4) and top["worst_rank"] == 3
+
+    data = _run(ComputeScoresAndRankTask("compute_scores_and_rank"), {
+        "criteria": CRITERIA,
+        "normalized_metrics": engine.normalized_metrics(),
+        "weight_scenarios": scenarios,
+    })
+    assert data["sensitivity"]["ranks"] == result["ranks"]
+
+
+def test_execution_constraints_mask_excluded_suppliers_and_drive_the_sensitivity_analysis():
+    normalized = SupplierScoringEngine.from_performance(PERFORMANCE, RISK).normalized_metrics()
+    constraints = ExecutionConstraints(excluded_suppliers=["SUP-B"], priority_criteria=["reliability"])
+    data = _run(ComputeScoresAndRankTask("compute_scores_and_rank"), {
+        "criteria": CRITERIA,
+        "normalized_metrics": normalized,
+        "execution_constraints": constraints,
+    })
+
+    assert [s["supplier_id"] for s in data["ranked_suppliers"]] == ["SUP-A", "SUP-C"]
+    # Base weights, then Delivery doubled
+    assert data["sensitivity"]["scenarios"] == 2 and set(data["sensitivity"]["ranks"]) == {"SUP-A", "SUP-C"}
+    assert priority_weight_scenarios(CRITERIA, ["innovation"]) == []
+
+
+def test_supplier_agent_masks_rule_failures_out_of_the_priority_what_ifs():
+    panel = [
+        {"supplier": {"supplier_id": "SUP-A", "name": "Alpha"},
+         "performance": {"metrics": {"quality": 9, "delivery": 5, "responsiveness": 7},
+                         "cost_variance": {"variance_percent": 2.0}}},
+        {"supplier": {"supplier_id": "SUP-B", "name": "Beta"},
+         "performance": {"metrics": {"quality": 5, "delivery": 9, "responsiveness": 7},
+                         "cost_variance": {"variance_percent": 2.0}}},
+        {"supplier": {"supplier_id": "SUP-C", "name": "Gamma"}, "performance": None},
+    ]
+    result = SupplierEvaluationAgent._weight_sensitivity(panel, [True, True, False], ["reliability"])
+
+    assert set(result["ranks"]) == {"SUP-A", "SUP-B"}
+    assert result["ranks"]["SUP-A"] == [1, 2] and result["ranks"]["SUP-B"] == [2, 1]
+    assert SupplierEvaluationAgent._weight_sensitivity(panel, [True, True, False], []) is None
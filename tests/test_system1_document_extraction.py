@@ -0,0 +1,91 @@
+"""Unit tests for concurrent, cached System 1 document extraction."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.heatmap.services import system1_document_extraction as ext
+
+
+@pytest.fixture(autouse=True)
+def _tmp_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ext, "EXTRACT_CACHE_DIR", tmp_path / "extract_cache")
+
+
+def _text(content: bytes, filename: str) -> str:
+    return content.decode("utf-8")
+
+
+def test_results_keep_input_order_and_run_concurrently():
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def rows(text, filename, timeout=None):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return [{"supplier_name": text}]
+
+    docs = [(f"doc{i}.txt", f"Vendor{i}".encode()) for i in range(6)]
+    out = ext.extract_documents_concurrently(
+        docs, text_extractor=_text, row_extractor=rows, namespace="m", max_workers=3
+    )
+    assert [r.filename for r in out] == [d[0] for d in docs]
+    assert [r.rows[0]["supplier_name"] for r in out] == [f"Vendor{i}" for i in range(6)]
+    assert 1 < active["peak"] <= 3
+
+
+def test_second_upload_of_same_content_hits_cache():
+    calls = []
+
+    def rows(text, filename, timeout=None):
+        calls.append(filename)
+        return [{"supplier_name": "Acme"}]
+
+    docs = [("a.txt", b"same bytes")]
+    first = ext.extract_documents_concurrently(docs, text_extractor=_text, row_extractor=rows, namespace="m")
+    second = ext.extract_documents_concurrently(
+        [("renamed.txt", b"same bytes")], text_extractor=_text, row_extractor=rows, namespace="m"
+    )
+    assert not first[0].cache_hit
+    assert second[0].cache_hit
+    assert second[0].rows == [{"supplier_name": "Acme"}]
+    assert calls == ["a.txt"]
+
+
+def test_empty_results_are_not_cached():
+    calls = []
+
+    def rows(text, filename, timeout=None):
+        calls.append(filename)
+        return []
+
+    docs = [("a.txt", b"nothing useful")]
+    for _ in range(2):
+        out = ext.extract_documents_concurrently(docs, text_extractor=_text, row_extractor=rows, namespace="m")
+        assert out[0].note and "unavailable" in out[0].note
+    assert len(calls) == 2
+
+
+def test_slow_file_times_out_without_blocking_others():
+    release = threading.Event()
+
+    def rows(text, filename, timeout=None):
+        if text == "slow":
+            release.wait(5)
+        return [{"supplier_name": text}]
+
+    docs = [("slow.txt", b"slow"), ("fast.txt", b"fast")]
+    t0 = time.monotonic()
+    out = ext.extract_documents_concurrently(
+        docs, text_extractor=_text, row_extractor=rows, namespace="m", max_workers=2, timeout_sec=1.0
+    )
+    release.set()
+    assert time.monotonic() - t0 < 3
+    assert out[0].timed_out and not out[0].rows
+    assert out[1].rows == [{"supplier_name": "fast"}]
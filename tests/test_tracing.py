@@ -0,0 +1,46 @@
+"""Request tracing: graph node / task step spans, waterfall metadata and exports."""
+from __future__ import annotations
+
+import json
+
+from backend.tasks.base_task import BaseTask
+from shared.schemas import ExecutionMetadata
+from utils import benchmark, tracing
+from utils.scenario_runner import load_seed_cases, run_case_headless
+
+
+class _RetrievalTask(BaseTask):
+    def run_retrieval(self, context, rules_result):
+        return {"data": {"docs": 2}, "grounded_in": ["a", "b"]}
+
+
+def test_workflow_nodes_and_llm_calls_form_one_waterfall(tmp_path):
+    case = next(c for c in load_seed_cases() if c.case_id == "CASE-0003")
+    with benchmark.fake_llm(), tracing.trace_request("test.turn", case_id=case.case_id) as trace:
+        run_case_headless(case, user_intent="What should we do next?")
+        _RetrievalTask("Probe").execute({})
+        meta = ExecutionMetadata(agent_name="Test", execution_timestamp="now", **tracing.metadata_fields())
+
+    rows = meta.waterfall
+    assert meta.trace_id == trace.trace_id and rows[0].kind == "request" and rows[0].depth == 0
+    nodes = [r for r in rows if r.kind == "node"]
+    assert nodes and all(r.name.startswith("workflow.") and r.depth == 1 for r in nodes)
+    llm = [r for r in rows if r.kind == "llm"]
+    assert llm and all(r.tokens and r.depth == 2 for r in llm)
+    steps = {r.name: r for r in rows if r.kind == "task_step"}
+    assert set(steps) == {"rules", "retrieval", "analytics"}
+    assert steps["retrieval"].retrieval_count == 2
+    offsets = [r.start_offset_ms for r in rows]
+    assert offsets == sorted(offsets)
+
+    plain = json.loads(tracing.export_trace(trace, tmp_path / "t.json").read_text())
+    assert len(plain["spans"]) == len(rows)
+    otlp = json.loads(tracing.export_trace(trace, tmp_path / "t.otlp.json", fmt="otlp").read_text())
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(spans) == len(rows) and len(spans[0]["traceId"]) == 32
+
+
+def test_spans_are_noops_without_active_trace():
+    result = _RetrievalTask("Probe").execute({})
+    assert result.success and result.data["docs"] == 2
+    assert tracing.metadata_fields() == {}
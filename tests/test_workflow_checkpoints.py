@@ -0,0 +1,204 @@
+from types import SimpleNamespace
+from typing import List, Optional, TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+import backend.services  # noqa: F401  (import order: services before rag)
+import backend.services.chat_service as chat_service_mod
+import backend.services.llm_responder as llm_responder_mod
+import graphs.workflow as workflow_mod
+from backend.persistence.workflow_checkpoints import SQLiteCheckpointSaver, _state_serde
+from backend.services.chat_service import ChatService
+from utils.schemas import BudgetState
+from utils.state import PipelineState
+
+
+class _State(TypedDict):
+    case_id: str
+    user_intent: str
+    document: str
+    budget_state: BudgetState
+    activity_log: List[str]
+    iteration_count: int
+    detected_contradictions: Optional[List[str]]
+
+
+def _supervisor(state):
+    state["activity_log"] = state.get("activity_log", []) + [f"turn: {state['user_intent']}"]
+    state["iteration_count"] = state.get("iteration_count", 0) + 1
+    return state
+
+
+@pytest.fixture
+def saver(tmp_path):
+    return SQLiteCheckpointSaver(tmp_path / "checkpoints.db", keep=2, serde=_state_serde())
+
+
+@pytest.fixture
+def graph(saver):
+    g = StateGraph(_State)
+    g.add_node("supervisor", _supervisor)
+    g.set_entry_point("supervisor")
+    g.add_edge("supervisor", END)
+    return g.compile(checkpointer=saver)
+
+
+def _config(case_id="CASE-0001"):
+    return {"configurable": {"thread_id": case_id}}
+
+
+def test_turns_resume_from_the_checkpoint_and_unchanged_values_are_stored_once(saver, graph):
+    first = {
+        "case_id": "CASE-0001",
+        "user_intent": "start",
+        "document": "clause " * 5000,
+        "budget_state": BudgetState(tokens_used=10, tokens_remaining=2990),
+        "activity_log": [],
+        "iteration_count": 0,
+    }
+    graph.invoke(first, _config(), durability="exit")
+    size_after_first = saver.stats("CASE-0001")["bytes"]
+
+    resumed = graph.invoke({"user_intent": "explain", "iteration_count": 0}, _config(), durability="exit")
+
+    assert resumed["activity_log"] == ["turn: start", "turn: explain"]
+    assert resumed["document"] == first["document"]
+    assert isinstance(resumed["budget_state"], BudgetState) and resumed["budget_state"].tokens_used == 10
+    assert resumed["iteration_count"] == 1
+    # The large unchanged document is not written again by the second turn
+    assert saver.stats("CASE-0001")["bytes"] - size_after_first < len(first["document"]) // 4
+    assert saver.read_channels("CASE-0001", ("user_intent", "missing")) == {"user_intent": "explain"}
+    assert saver.read_channels("CASE-0002", ("user_intent",)) is None
+
+
+def test_old_checkpoints_are_compacted_and_threads_are_independent(saver, graph):
+    for turn in range(5):
+        graph.invoke(
+            {"case_id": "CASE-0001", "user_intent": f"turn {turn}", "document": f"rev {turn}", "activity_log": []},
+            _config(),
+            durability="exit",
+        )
+    graph.invoke({"case_id": "CASE-0002", "user_intent": "other", "document": "x", "activity_log": []}, _config("CASE-0002"))
+
+    stats = saver.stats("CASE-0001")
+    assert stats["checkpoints"] == 2
+    history = list(saver.list(_config()))
+    assert [t.checkpoint["channel_values"]["document"] for t in history] == ["rev 4", "rev 3"]
+    assert history[-1].parent_config is None
+    # Values only referenced by compacted checkpoints are gone
+    assert stats["values"] <= 2 * len(_State.__annotations__)
+
+    saver.set_thread_revision("CASE-0001", "2025-01-01T00:00:00")
+    assert saver.thread_revision("CASE-0001") == "2025-01-01T00:00:00"
+    saver.delete_thread("CASE-0001")
+    assert saver.get_tuple(_config()) is None and saver.thread_revision("CASE-0001") is None
+    assert graph.get_state(_config("CASE-0002")).values["user_intent"] == "other"
+
+
+def test_turn_input_resets_run_bookkeeping_and_sends_only_turn_fields_when_resuming():
+    workflow_state = {
+        "case_id": "CASE-0001",
+        "user_intent": "what changed?",
+        "use_tier_2": False,
+        "conversation_history": [{"role": "user", "content": "what changed?"}],
+        "case_summary": object(),
+        "budget_state": BudgetState(),
+        "visited_agents": [],
+        "iteration_count": 0,
+    }
+
+    resumed = ChatService._turn_input(workflow_state, resumed=True)
+    assert "case_summary" not in resumed and "budget_state" not in resumed
+    assert resumed["user_intent"] == "what changed?"
+    assert resumed["detected_contradictions"] == [] and resumed["parallel_agents_run"] is None
+
+    rebuilt = ChatService._turn_input(workflow_state, resumed=False)
+    assert rebuilt["case_summary"] is workflow_state["case_summary"]
+    assert rebuilt["guardrail_events"] == []
+
+
+class _CaseService:
+    """Saved case record; every save bumps the revision the checkpoint is compared against."""
+
+    def __init__(self):
+        self.revision = 1
+        self.loads = 0
+        self.saved = None
+
+    def get_case_state(self, case_id):
+        self.loads += 1
+        return {
+            "case_id": case_id, "name": "Laptops", "summary_text": "", "key_findings": [],
+            "dtp_stage": "DTP-01", "category_id": "IT", "contract_id": None, "supplier_id": None,
+            "trigger_source": "User", "status": "In Progress", "latest_agent_output": None,
+            "latest_agent_name": None, "activity_log": [], "human_decision": None,
+            "waiting_for_human": False,
+        }
+
+    def get_case_revision(self, case_id):
+        return f"rev-{self.revision}"
+
+    def save_case_state(self, state):
+        self.revision += 1
+        self.saved = state
+        return True
+
+    def save_artifact_pack(self, case_id, pack):
+        return True
+
+    def get_case(self, case_id):
+        return SimpleNamespace(case_id=case_id, category_id="IT", trigger_source="User")
+
+
+class _Conversation:
+    def __init__(self):
+        self.messages = []
+
+    def get_relevant_context(self, case_id, current_message, max_tokens=None):
+        return [dict(m) for m in self.messages]
+
+    def save_message(self, case_id, role, content, metadata=None):
+        self.messages.append({"role": role, "content": content})
+
+
+class _Responder:
+    def analyze_intent(self, user_message, case_context, conversation_history):
+        return {"needs_agent": True}
+
+
+def test_process_message_resumes_from_the_checkpoint_with_stored_history(monkeypatch, saver):
+    seen = []
+
+    def supervisor(state):
+        seen.append(state["conversation_history"])
+        return {"activity_log": [*state.get("activity_log", []), {"agent_name": "Supervisor"}]}
+
+    g = StateGraph(PipelineState)
+    g.add_node("supervisor", supervisor)
+    g.set_entry_point("supervisor")
+    g.add_edge("supervisor", END)
+    graph = g.compile(checkpointer=saver)
+    monkeypatch.setattr(chat_service_mod, "checkpoints_enabled", lambda: True)
+    monkeypatch.setattr(chat_service_mod, "get_workflow_checkpointer", lambda: saver)
+    monkeypatch.setattr(workflow_mod, "get_checkpointed_workflow_graph", lambda: graph)
+    monkeypatch.setattr(llm_responder_mod, "get_llm_responder", lambda: _Responder())
+
+    service = ChatService.__new__(ChatService)
+    service.case_service = _CaseService()
+    service.conversation_manager = _Conversation()
+    service.enable_conversation_memory = True
+    service.max_conversation_tokens = 3000
+
+    service.process_message("CASE-0001", "analyze the market")
+    service.process_message("CASE-0001", "run the next analysis")
+
+    # The second turn reads the case from the checkpoint, not the DB
+    assert service.case_service.loads == 1
+    assert saver.thread_revision("CASE-0001") == "rev-3"
+    # Earlier turns reach the agents from the stored messages
+    assert [m["role"] for m in seen[1]] == ["user", "assistant", "user"]
+    assert seen[1][0]["content"] == "analyze the market" and seen[1][-1]["content"] == "run the next analysis"
+    # State the second turn did not send carried over from the checkpoint
+    assert len(service.case_service.saved["activity_log"]) == 2
+    assert graph.get_state(_config()).values["case_summary"].name == "Laptops"
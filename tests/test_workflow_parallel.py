@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+import backend.services  # noqa: F401  (import order: services before rag)
+from graphs import workflow
+from utils.schemas import BudgetState, CaseSummary
+
+
+def _state(**overrides):
+    state = {
+        "case_id": "CASE-0001",
+        "dtp_stage": "DTP-02",
+        "user_intent": "Analyze the strategy and evaluate suppliers",
+        "case_summary": CaseSummary(
+            case_id="CASE-0001", category_id="CAT-01", contract_id=None, supplier_id=None,
+            trigger_source="User", dtp_stage="DTP-02", status="In Progress", created_date="2025-01-01",
+            summary_text="Renewal", key_findings=[], recommended_action=None,
+        ),
+        "latest_agent_output": None,
+        "latest_agent_name": None,
+        "activity_log": ["seed"],
+        "budget_state": BudgetState(tokens_used=100, tokens_remaining=2900),
+        "error_state": None,
+        "waiting_for_human": False,
+        "visited_agents": [],
+        "iteration_count": 1,
+    }
+    state.update(overrides)
+    return state
+
+
+def _fake_node(agent_name, output, delay, tokens):
+    def node(state):
+        time.sleep(delay)
+        state["activity_log"].append(f"{agent_name} log")
+        budget = state["budget_state"]
+        state["budget_state"] = budget.model_copy(update={
+            "tokens_used": budget.tokens_used + tokens,
+            "tokens_remaining": budget.tokens_remaining - tokens,
+            "model_calls": budget.model_calls + 1,
+        })
+        state["latest_agent_output"] = output
+        state["latest_agent_name"] = agent_name
+        return state
+    return node
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    monkeypatch.setattr(workflow, "PARALLEL_AGENTS_ENABLED", True)
+    monkeypatch.setattr(workflow, "_AGENT_NODES", {
+        "strategy": _fake_node("Strategy", {"kind": "strategy"}, 0.3, 40),
+        "supplier_evaluation": _fake_node("SupplierEvaluation", {"kind": "shortlist"}, 0.1, 60),
+    })
+
+
+def test_fan_out_only_for_independent_requests_and_respects_loop_detection(fake_agents):
+    assert workflow.parallel_branches(_state()) == ("strategy", "supplier_evaluation")
+    assert workflow.parallel_branches(_state(user_intent="evaluate suppliers")) == ()
+    assert workflow.parallel_branches(_state(dtp_stage="DTP-04")) == ()
+    assert workflow.parallel_branches(_state(latest_agent_output={"kind": "strategy"})) == ()
+    assert workflow.parallel_branches(_state(visited_agents=["Strategy_StrategyRecommendation"])) == ()
+    assert workflow.parallel_branches(_state(iteration_count=workflow.MAX_SUPERVISOR_ITERATIONS)) == ()
+    # Implementation runs alongside contract support only when the supplier is already known
+    dtp05 = _state(dtp_stage="DTP-05", user_intent="extract contract terms and check rollout readiness")
+    assert workflow.parallel_branches(dtp05) == ()
+    dtp05["case_summary"] = dtp05["case_summary"].model_copy(update={"supplier_id": "SUP-001"})
+    assert workflow.parallel_branches(dtp05) == ("implementation", "contract_support")
+
+
+def test_branches_run_concurrently_and_merge_in_branch_order(fake_agents):
+    start = time.perf_counter()
+    merged = workflow.parallel_agents_node(_state())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.38  # slowest branch (0.3s), not the sum (0.4s)
+    # Strategy finished last but merges first: order is fixed by the group, not by timing
+    assert merged["activity_log"] == ["seed", "Strategy log", "SupplierEvaluation log"]
+    assert merged["latest_agent_name"] == "SupplierEvaluation"
+    assert merged["parallel_outputs"] == [
+        {"agent": "Strategy", "output": {"kind": "strategy"}},
+        {"agent": "SupplierEvaluation", "output": {"kind": "shortlist"}},
+    ]
+    budget = merged["budget_state"]
+    assert (budget.tokens_used, budget.tokens_remaining, budget.model_calls) == (200, 2800, 2)
+    assert merged["error_state"] is None
+
+
+def test_failed_branch_keeps_the_other_result(fake_agents, monkeypatch):
+    def boom(state):
+        raise RuntimeError("agent crashed")
+
+    monkeypatch.setitem(workflow._AGENT_NODES, "strategy", boom)
+    merged = workflow.parallel_agents_node(_state())
+    assert merged["latest_agent_name"] == "SupplierEvaluation"
+    assert merged["error_state"] == {"error": "agent crashed", "agent": "Strategy"}
+    assert merged["activity_log"] == ["seed", "SupplierEvaluation log"]
+
+
+def test_graph_reviews_both_outputs_without_rerunning_either(monkeypatch):
+    from utils.schemas import StrategyRecommendation, SupplierShortlist
+
+    strategy = StrategyRecommendation(case_id="CASE-0001", category_id="CAT-01", recommended_strategy="RFx",
+                                      confidence=0.9, rationale=["Market has credible alternatives"])
+    shortlist = SupplierShortlist(case_id="CASE-0001", category_id="CAT-01", recommendation="Shortlist SUP-001",
+                                  shortlisted_suppliers=[{"supplier_id": "SUP-001"}], top_choice_supplier_id="SUP-001")
+    nodes = {
+        "strategy": _fake_node("Strategy", strategy, 0.05, 40),
+        "supplier_evaluation": _fake_node("SupplierEvaluation", shortlist, 0.05, 60),
+    }
+    calls = []
+
+    def unexpected(name):
+        def node(state):
+            calls.append(name)
+            return state
+        return node
+
+    monkeypatch.setattr(workflow, "PARALLEL_AGENTS_ENABLED", True)
+    monkeypatch.setattr(workflow, "_AGENT_NODES", nodes)
+    for name in ("strategy_node", "supplier_evaluation_node", "rfx_draft_node", "case_clarifier_node"):
+        monkeypatch.setattr(workflow, name, unexpected(name))
+
+    final = workflow.create_workflow_graph().invoke(
+        _state(trigger_source="User", activity_log=[]), {"recursion_limit": 20}
+    )
+
+    agents = [getattr(e, "agent_name", e) for e in final["activity_log"]]
+    assert calls == []
+    assert agents.count("Strategy log") == 1 and agents.count("SupplierEvaluation log") == 1
+    assert [h["agent"] for h in final["output_history"]] == ["Strategy", "SupplierEvaluation"]
+    assert "Market has credible alternatives" in final["case_summary"].key_findings
+    assert final["parallel_outputs"] is None
@@ -42,3 +42,117 @@ def test_format_working_documents_prompt():
         }
     )
     assert "RFx" in block or "widgets" in block
+
+
+class _FakeLLM:
+    """Echoes the section it was asked to revise in upper case; records every prompt."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, messages):
+        from types import SimpleNamespace
+
+        body = messages[-1].content
+        self.prompts.append(body)
+        section = body.split("SECTION TO REVISE:\n", 1)[-1]
+        return SimpleNamespace(content=section.strip().upper())
+
+
+def _long_contract() -> str:
+    filler = "The supplier shall perform the services with reasonable skill and care. " * 30
+    return (
+        "Master services agreement between Buyer and Supplier.\n\n"
+        f"1. Scope of Work\n{filler}\n\n"
+        f"2. Payment Terms\nInvoices are payable net 30 days. {filler}\n\n"
+        f"3. Termination\n{filler}\n\n"
+        f"4. Confidentiality\n{filler}\n"
+    )
+
+
+def test_split_sections_roundtrips_and_finds_numbered_headings():
+    from backend.services.working_document_revision import split_sections
+
+    text = _long_contract()
+    sections = split_sections(text)
+    assert "".join(s.text for s in sections) == text
+    assert [s.number for s in sections] == [None, "1", "2", "3", "4"]
+
+
+def test_numbered_list_items_are_not_section_headings():
+    from backend.services.working_document_revision import split_sections
+
+    text = _long_contract().replace(
+        "3. Termination\n", "3. Termination\n1. Deliver by Friday\n2. Return all equipment\n"
+    ) + "Section 5 governing law\nEnglish law applies.\n"
+    sections = split_sections(text)
+    assert "".join(s.text for s in sections) == text
+    assert [s.number for s in sections] == [None, "1", "2", "3", "4", "5"]
+    assert "2. Return all equipment" in sections[3].text
+
+
+def test_failed_sections_are_reported_and_left_unchanged():
+    from backend.services.working_document_revision import revise_working_document
+
+    class _FailsOnTermination(_FakeLLM):
+        def invoke(self, messages):
+            if "SECTION TO REVISE:\n3. Termination" in messages[-1].content:
+                raise TimeoutError("LLM timed out")
+            return super().invoke(messages)
+
+    text = _long_contract()
+    out = revise_working_document(
+        role="contract",
+        current_text=text,
+        instruction="Tighten section 2 and section 3",
+        case_name="Demo",
+        category_id="IT",
+        dtp_stage="DTP-04",
+        llm=_FailsOnTermination(),
+    )
+    assert out.revised_sections == ["2. Payment Terms"]
+    assert out.failed_sections == [3]
+    assert "3. Termination" in out.text
+
+
+def test_section_revision_only_sends_targeted_section():
+    from backend.services.working_document_revision import revise_working_document
+
+    llm = _FakeLLM()
+    text = _long_contract()
+    out = revise_working_document(
+        role="contract",
+        current_text=text,
+        instruction="Change the payment terms to net 60",
+        case_name="Demo",
+        category_id="IT",
+        dtp_stage="DTP-04",
+        llm=llm,
+    )
+    assert out.mode == "sections"
+    assert out.revised_sections == ["2. Payment Terms"]
+    assert len(llm.prompts) == 1 and "3. Termination" not in llm.prompts[0].split("SECTION TO REVISE:")[1]
+    assert "INVOICES ARE PAYABLE NET 30 DAYS" in out.text
+    assert out.text.endswith(text.split("3. Termination", 1)[1])
+    assert out.diff.startswith("--- current")
+
+
+def test_short_draft_uses_full_document_pass():
+    from backend.services.working_document_revision import revise_working_document
+
+    class _Whole:
+        def invoke(self, messages):
+            from types import SimpleNamespace
+
+            return SimpleNamespace(content="Rewritten draft.")
+
+    out = revise_working_document(
+        role="rfx",
+        current_text="Scope: widgets",
+        instruction="tighten",
+        case_name="Demo",
+        category_id="IT",
+        dtp_stage="DTP-03",
+        llm=_Whole(),
+    )
+    assert out.mode == "full" and out.text == "Rewritten draft."
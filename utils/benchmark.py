@@ -0,0 +1,600 @@
+"""
+Benchmark / load-test harness built on `utils.scenario_runner`.
+
+Runs the seed cases through the case workflow graph and the synthetic heatmap batch
+through `heatmap_graph` with a deterministic fake LLM and fake embeddings (no OpenAI/Azure
+or model-download access needed), and records per scenario and concurrency level:
+- wall time per run (p50 / p95 / max) and throughput
+- per-node wall time, call count, DB queries and tokens
+- total DB queries (SQLAlchemy engines) and fake-LLM tokens
+- peak traced memory (tracemalloc)
+
+Results are written as JSON and can be compared against a stored baseline; the CLI exits
+non-zero when a deterministic metric (DB queries, tokens) regresses. Wall time and memory
+depend on the host, so they are only compared with --timed (same machine as the baseline).
+
+    python -m utils.benchmark --concurrency 1,4 --out bench_results.json
+    python -m utils.benchmark --baseline data/benchmark_baseline.json
+    python -m utils.benchmark --baseline data/benchmark_baseline.json --timed
+    python -m utils.benchmark --baseline data/benchmark_baseline.json --update-baseline
+
+The heatmap scenario only runs the scoring graph; nothing is written to heatmap.db.
+Seed-case runs still touch the case DB / cache the same way `run_all_seed_cases` does.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import contextvars
+import hashlib
+import json
+import math
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import backend.services  # noqa: F401 - import before agents.* (agents <-> backend.services cycle)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = ROOT_DIR / "data" / "benchmark_baseline.json"
+DEFAULT_INTENT = "What is the next best action I should take on this case?"
+SCENARIOS = ("seed_cases", "heatmap_pipeline")
+
+# Modules that bind `get_langchain_chat_model` / `get_openai_client` at import time.
+_CHAT_MODEL_MODULES = (
+    "backend.services.llm_provider",
+    "agents.base_agent",
+    "graphs.workflow",
+    "backend.supervisor.router",
+    "backend.services.llm_responder",
+    "backend.services.conversation_context",
+    "backend.services.working_document_revision",
+    "backend.agents.legacy.base",
+)
+_OPENAI_CLIENT_MODULES = (
+    "backend.services.llm_provider",
+    "backend.main",
+    "backend.heatmap.services.feedback_memory",
+    "backend.heatmap.services.llm_interpreter",
+    "backend.heatmap.services.heatmap_copilot",
+)
+
+
+# ---------------------------------------------------------------------------
+# Metrics collection
+# ---------------------------------------------------------------------------
+
+class RunMetrics:
+    """Counters for one scenario run; nodes are attributed by `mark_node`."""
+
+    def __init__(self) -> None:
+        self.db_queries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self._t_mark = time.perf_counter()
+        self._q_mark = 0
+        self._tok_mark = 0
+
+    def mark_node(self, node_name: str) -> None:
+        """Attribute everything since the previous mark to `node_name`."""
+        now = time.perf_counter()
+        tokens = self.input_tokens + self.output_tokens
+        n = self.nodes.setdefault(node_name, {"calls": 0, "wall_ms": 0.0, "db_queries": 0, "tokens": 0})
+        n["calls"] += 1
+        n["wall_ms"] += (now - self._t_mark) * 1000.0
+        n["db_queries"] += self.db_queries - self._q_mark
+        n["tokens"] += tokens - self._tok_mark
+        self._t_mark, self._q_mark, self._tok_mark = now, self.db_queries, tokens
+
+
+# Propagates into LangGraph's executor threads (tasks run in a copied context).
+_active_run: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar(
+    "benchmark_active_run", default=None
+)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    run = _active_run.get()
+    if run is not None:
+        run.db_queries += 1
+
+
+@contextlib.contextmanager
+def count_db_queries() -> Iterator[None]:
+    """Count statements on every SQLAlchemy engine for the active run."""
+    event.listen(Engine, "before_cursor_execute", _count_query)
+    try:
+        yield
+    finally:
+        event.remove(Engine, "before_cursor_execute", _count_query)
+
+
+# ---------------------------------------------------------------------------
+# Deterministic fake LLM
+# ---------------------------------------------------------------------------
+
+def _prompt_text(prompt: Any) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, (list, tuple)):
+        return "\n".join(str(getattr(m, "content", m)) for m in prompt)
+    return str(getattr(prompt, "content", prompt))
+
+
+def estimate_tokens(text: str) -> int:
+    """Same words * 1.3 estimate BaseAgent falls back to."""
+    return int(len(text.split()) * 1.3)
+
+
+class FakeChatModel:
+    """
+    Drop-in for the LangChain chat model: returns one JSON object that satisfies every
+    agent output schema (extra keys are ignored by the Pydantic models), plus the
+    supervisor routing keys. Output depends only on the prompt, so runs are repeatable.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.model_name = kwargs.get("default_model") or "fake-chat"
+
+    def _payload(self, text: str) -> Dict[str, Any]:
+        case_match = re.search(r"CASE-\d+", text)
+        case_id = case_match.group(0) if case_match else "CASE-BENCH"
+        return {
+            "case_id": case_id,
+            "category_id": "BENCH",
+            "supplier_id": "SUP-BENCH",
+            "signal_id": f"SIG-{case_id}",
+            "recommended_strategy": "Renegotiate",
+            "recommended_action": "Renegotiate",
+            "recommendation": "Proceed with the current shortlist.",
+            "assessment": "Benchmark assessment.",
+            "confidence": 0.8,
+            "urgency_score": 5,
+            "reason": "benchmark",
+            "reasoning": "Deterministic benchmark response.",
+            "action": "Proceed",
+            "next_agent": None,
+            "rationale": ["Deterministic benchmark response."],
+        }
+
+    def invoke(self, prompt: Any, *args: Any, **kwargs: Any) -> AIMessage:
+        text = _prompt_text(prompt)
+        content = json.dumps(self._payload(text))
+        usage = {"prompt_tokens": estimate_tokens(text), "completion_tokens": estimate_tokens(content)}
+        run = _active_run.get()
+        if run is not None:
+            run.input_tokens += usage["prompt_tokens"]
+            run.output_tokens += usage["completion_tokens"]
+        return AIMessage(content=content, response_metadata={"token_usage": usage})
+
+
+def _fake_chat_model_factory(*args: Any, **kwargs: Any) -> FakeChatModel:
+    return FakeChatModel(*args, **kwargs)
+
+
+@contextlib.contextmanager
+def fake_llm() -> Iterator[None]:
+    """Route every chat-model / OpenAI-client lookup to the fake for the duration."""
+    import importlib
+
+    patched: List[tuple] = []
+    for name, attr, value in (
+        [(m, "get_langchain_chat_model", _fake_chat_model_factory) for m in _CHAT_MODEL_MODULES]
+        + [(m, "get_openai_client", lambda: None) for m in _OPENAI_CLIENT_MODULES]
+    ):
+        try:
+            module = importlib.import_module(name)
+        except Exception:
+            continue
+        if hasattr(module, attr):
+            patched.append((module, attr, getattr(module, attr)))
+            setattr(module, attr, value)
+    try:
+        yield
+    finally:
+        for module, attr, original in reversed(patched):
+            setattr(module, attr, original)
+
+
+class FakeEmbeddings:
+    """Deterministic feature-hashing embeddings (LangChain interface), no model or network."""
+
+    model = "benchmark-hashing"
+
+    def __init__(self, dimensions: int = 64) -> None:
+        self.dimensions = dimensions
+
+    def embed_query(self, text: str) -> List[float]:
+        vec = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", (text or "").lower()):
+            vec[int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16) % self.dimensions] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+def _copy_collections(source_path: Path, target_path: Path, names: Sequence[str], embeddings: FakeEmbeddings):
+    """Copy chunks of the named Chroma collections, re-embedded with `embeddings`."""
+    import chromadb
+    from chromadb.config import Settings
+
+    # One Settings per client: PersistentClient writes its path into the object it is given,
+    # and a shared one would leave the cached client for `source_path` pointing at the copy.
+    source = chromadb.PersistentClient(
+        path=str(source_path), settings=Settings(anonymized_telemetry=False, allow_reset=True)
+    )
+    target = chromadb.PersistentClient(
+        path=str(target_path), settings=Settings(anonymized_telemetry=False, allow_reset=True)
+    )
+    copies = {}
+    for name in names:
+        try:
+            collection = source.get_collection(name)
+        except Exception:
+            continue
+        # The stores record the fake model on first open (see backend.rag.embedding_models)
+        metadata = {k: v for k, v in (collection.metadata or {}).items() if k != "embedding_model"}
+        copy = target.create_collection(name=name, metadata=metadata or None)
+        page = collection.get(include=["documents", "metadatas"])
+        if page.get("ids"):
+            documents = page.get("documents") or [""] * len(page["ids"])
+            copy.add(
+                ids=page["ids"],
+                documents=documents,
+                metadatas=page.get("metadatas"),
+                embeddings=embeddings.embed_documents([d or "" for d in documents]),
+            )
+        copies[name] = copy
+    return copies
+
+
+@contextlib.contextmanager
+def fake_embeddings() -> Iterator[None]:
+    """
+    Serve retrieval from throwaway copies of the repo's Chroma collections embedded with
+    FakeEmbeddings, plus a matching lexical index, for the duration. Chroma's built-in
+    embedder downloads its model and the OpenAI one needs credentials, so without this the
+    retrieved context (and token counts) would depend on the host.
+    """
+    from backend.heatmap.persistence import heatmap_vector_store as heatmap_store_mod
+    from backend.infrastructure import storage_providers
+    from backend.rag import lexical_index as lexical_mod
+    from backend.rag import vector_store as vector_store_mod
+    from utils.knowledge_layer import invalidate_knowledge_cache
+
+    embeddings = FakeEmbeddings()
+    with tempfile.TemporaryDirectory(prefix="bench_rag_", ignore_cleanup_errors=True) as tmp:
+        chroma_path = Path(tmp) / "chromadb"
+        copies = _copy_collections(
+            vector_store_mod.CHROMA_PATH,
+            chroma_path,
+            (vector_store_mod.COLLECTION_NAME, heatmap_store_mod.COLLECTION_NAME),
+            embeddings,
+        )
+        index = lexical_mod.LexicalIndex(Path(tmp) / "rag_fts.db")
+        if vector_store_mod.COLLECTION_NAME in copies:
+            index.backfill_from(copies[vector_store_mod.COLLECTION_NAME])
+
+        patched: List[tuple] = []
+        for module, attr, value in (
+            (vector_store_mod, "CHROMA_PATH", chroma_path),
+            (heatmap_store_mod, "CHROMA_PATH", chroma_path),
+            (vector_store_mod, "get_langchain_embeddings", lambda **kwargs: embeddings),
+            (heatmap_store_mod, "get_langchain_embeddings", lambda **kwargs: embeddings),
+            # Keep fake vectors out of the shared embedding cache
+            (vector_store_mod, "cached_embeddings", lambda inner: inner),
+            (heatmap_store_mod, "cached_embeddings", lambda inner: inner),
+            (vector_store_mod, "_vector_store", None),
+            (heatmap_store_mod, "_heatmap_vector_store", None),
+            (storage_providers, "_legacy_vector_singleton", None),
+            (storage_providers, "_heatmap_vector_singleton", None),
+            (lexical_mod, "_lexical_index", index),
+        ):
+            patched.append((module, attr, getattr(module, attr)))
+            setattr(module, attr, value)
+        invalidate_knowledge_cache()
+        try:
+            yield
+        finally:
+            for module, attr, original in reversed(patched):
+                setattr(module, attr, original)
+            invalidate_knowledge_cache()
+            index.engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# Scenarios (each callable runs one unit of work and marks nodes on `run`)
+# ---------------------------------------------------------------------------
+
+def _seed_case_jobs(user_intent: str, case_ids: Optional[Sequence[str]]) -> List[Callable[[RunMetrics], None]]:
+    from utils.scenario_runner import load_seed_cases, run_case_headless
+
+    cases = load_seed_cases()
+    if case_ids:
+        wanted = set(case_ids)
+        cases = [c for c in cases if c.case_id in wanted]
+
+    def _job(case):
+        def _run(run: RunMetrics) -> None:
+            run_case_headless(case, user_intent=user_intent, on_node=run.mark_node)
+        return _run
+
+    return [_job(c) for c in cases]
+
+
+def _heatmap_jobs(seed: int) -> List[Callable[[RunMetrics], None]]:
+    from backend.heatmap.agents.graph import heatmap_graph
+    from backend.heatmap.run_pipeline_init import build_initial_state
+    from backend.heatmap.seed_synthetic_data import (
+        DATA_DIR,
+        generate_contracts,
+        generate_spend,
+        generate_supplier_metrics,
+    )
+
+    csvs = ("synthetic_supplier_metrics.csv", "synthetic_contracts.csv", "synthetic_spend.csv")
+    if not all((DATA_DIR / name).exists() for name in csvs):
+        random.seed(seed)
+        generate_supplier_metrics()
+        generate_contracts()
+        generate_spend()
+
+    def _run(run: RunMetrics) -> None:
+        random.seed(seed)
+        initial_state, _, _ = build_initial_state()
+        run.mark_node("build_initial_state")
+        for chunk in heatmap_graph.stream(initial_state, {"recursion_limit": 1000}, stream_mode="updates"):
+            for node_name in chunk:
+                run.mark_node(node_name)
+
+    return [_run]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def _execute(job: Callable[[RunMetrics], None]) -> Dict[str, Any]:
+    run = RunMetrics()
+    token = _active_run.set(run)
+    t0 = time.perf_counter()
+    error = None
+    try:
+        job(run)
+    except Exception as e:  # a failing run is reported, not fatal for the suite
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        _active_run.reset(token)
+    return {"wall_ms": (time.perf_counter() - t0) * 1000.0, "metrics": run, "error": error}
+
+
+def _clear_agent_cache() -> None:
+    from utils.caching import cache
+
+    cache.clear()
+
+
+def run_scenario(
+    jobs: List[Callable[[RunMetrics], None]],
+    concurrency: int = 1,
+    repeat: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run every job `repeat` times across `concurrency` threads and aggregate.
+    The agent output cache is cleared first, so each level starts cold.
+    """
+    work = [job for _ in range(max(1, repeat)) for job in jobs]
+    _clear_agent_cache()
+    tracemalloc_was_on = tracemalloc.is_tracing()
+    if not tracemalloc_was_on:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    if concurrency <= 1:
+        outcomes = [_execute(job) for job in work]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+            outcomes = list(pool.map(_execute, work))
+    total_sec = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    if not tracemalloc_was_on:
+        tracemalloc.stop()
+
+    latencies = [o["wall_ms"] for o in outcomes]
+    nodes: Dict[str, Dict[str, float]] = {}
+    for o in outcomes:
+        for name, n in o["metrics"].nodes.items():
+            agg = nodes.setdefault(name, {"calls": 0, "wall_ms": 0.0, "db_queries": 0, "tokens": 0})
+            for key in agg:
+                agg[key] += n[key]
+    for agg in nodes.values():
+        agg["wall_ms"] = round(agg["wall_ms"], 3)
+        agg["mean_ms"] = round(agg["wall_ms"] / agg["calls"], 3) if agg["calls"] else 0.0
+
+    return {
+        "runs": len(outcomes),
+        "concurrency": concurrency,
+        "repeat": max(1, repeat),
+        "errors": [o["error"] for o in outcomes if o["error"]],
+        "total_sec": round(total_sec, 4),
+        "throughput_per_sec": round(len(outcomes) / total_sec, 3) if total_sec > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "max": round(max(latencies), 3) if latencies else 0.0,
+        },
+        "db_queries": sum(o["metrics"].db_queries for o in outcomes),
+        "tokens": {
+            "input": sum(o["metrics"].input_tokens for o in outcomes),
+            "output": sum(o["metrics"].output_tokens for o in outcomes),
+        },
+        "peak_mem_mb": round(peak / (1024 * 1024), 3),
+        "nodes": dict(sorted(nodes.items())),
+    }
+
+
+def run_benchmarks(
+    scenarios: Sequence[str] = SCENARIOS,
+    concurrency: Sequence[int] = (1,),
+    repeat: int = 1,
+    user_intent: str = DEFAULT_INTENT,
+    case_ids: Optional[Sequence[str]] = None,
+    seed: int = 7,
+    warmup: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the requested scenarios at each concurrency level; results keyed '<scenario>@c<n>'.
+    With `warmup`, every job runs once unmeasured first (imports, vector store, graph compile).
+    """
+    builders = {
+        "seed_cases": lambda: _seed_case_jobs(user_intent, case_ids),
+        "heatmap_pipeline": lambda: _heatmap_jobs(seed),
+    }
+    results: Dict[str, Any] = {}
+    with fake_llm(), fake_embeddings(), count_db_queries():
+        for name in scenarios:
+            if name not in builders:
+                raise ValueError(f"Unknown benchmark scenario: {name}")
+            jobs = builders[name]()
+            if warmup:
+                for job in jobs:
+                    _execute(job)
+            for level in concurrency:
+                results[f"{name}@c{int(level)}"] = run_scenario(jobs, concurrency=int(level), repeat=repeat)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "concurrency": [int(c) for c in concurrency],
+        },
+        "scenarios": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+# Deterministic under the fake LLM and embeddings, so any increase is a regression.
+_EXACT_METRICS = ("db_queries", "tokens.input", "tokens.output")
+# Timing / memory (opt-in, host dependent): regress only past the relative tolerance and an
+# absolute floor.
+_TIMED_METRICS = {"latency_ms.p50": 50.0, "latency_ms.p95": 50.0, "peak_mem_mb": 2.0}
+
+
+def _metric(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    timed: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Regressions of `current` vs `baseline` for scenarios present in both. Wall time and
+    memory are only compared with `timed` (meaningful against a baseline from the same host).
+    """
+    regressions: List[Dict[str, Any]] = []
+    base_scenarios = baseline.get("scenarios") or {}
+    for key, result in (current.get("scenarios") or {}).items():
+        base = base_scenarios.get(key)
+        if not base:
+            continue
+        if base.get("runs") != result.get("runs"):
+            continue  # different workload (case filter / repeat); numbers are not comparable
+        # Repeated runs of one case across threads race on the agent cache (hit vs miss).
+        exact_tol = tolerance if result.get("concurrency", 1) > 1 and result.get("repeat", 1) > 1 else 0.0
+        checks = [(p, exact_tol, 0.0) for p in _EXACT_METRICS]
+        if timed:
+            checks += [(p, tolerance, floor) for p, floor in _TIMED_METRICS.items()]
+        for path, tol, floor in checks:
+            now, before = _metric(result, path), _metric(base, path)
+            if now is None or before is None:
+                continue
+            if now > before * (1.0 + tol) and now - before > floor:
+                regressions.append({"scenario": key, "metric": path, "baseline": before, "current": now})
+        if result.get("errors") and not base.get("errors"):
+            regressions.append(
+                {"scenario": key, "metric": "errors", "baseline": 0, "current": len(result["errors"])}
+            )
+    return regressions
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark seed cases and the heatmap pipeline with a fake LLM.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1", help="comma-separated thread counts, e.g. 1,4,8")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--cases", default="", help="comma-separated case ids (default: all seed cases)")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default="", help=f"baseline JSON to compare with (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--timed", action="store_true", help="also fail on wall-time / memory regressions")
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true", help="write results to --baseline instead of comparing")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    results = run_benchmarks(
+        scenarios=[s.strip() for s in args.scenarios.split(",") if s.strip()],
+        concurrency=[int(c) for c in args.concurrency.split(",") if c.strip()],
+        repeat=args.repeat,
+        case_ids=[c.strip() for c in args.cases.split(",") if c.strip()] or None,
+        warmup=not args.no_warmup,
+    )
+    out = Path(args.out)
+    out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for key, r in results["scenarios"].items():
+        print(
+            f"{key}: runs={r['runs']} p50={r['latency_ms']['p50']:.1f}ms p95={r['latency_ms']['p95']:.1f}ms "
+            f"db={r['db_queries']} tokens={r['tokens']['input'] + r['tokens']['output']} "
+            f"peak={r['peak_mem_mb']:.1f}MB errors={len(r['errors'])}"
+        )
+    print(f"Results written to {out}")
+
+    if not args.baseline:
+        return 0
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance, timed=args.timed)
+    for r in regressions:
+        print(f"REGRESSION {r['scenario']} {r['metric']}: {r['baseline']} -> {r['current']}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Caching utilities with SHA-256 input hashing.
 from typing import Optional, Dict, Any
 from utils.hashing import compute_input_hash, generate_cache_key
 from utils.schemas import CaseSummary, CacheMeta
+from utils.metrics import record_cache
 
 
 class Cache:
@@ -51,6 +52,7 @@ def get_cache_meta(
     # Check cache
     cached_value = cache.get(cache_key)
     cache_hit = cached_value is not None
+    record_cache("agent", cache_hit)
     
     cache_meta = CacheMeta(
         cache_hit=cache_hit,
@@ -2,9 +2,22 @@
 Vector Knowledge Layer (read‑only, governed retrieval).
 
 This module represents the **Vector Knowledge Layer** described in the
-capstone design. In a production system this would front a vector database
-or similar retrieval system. For the POC it is a conceptual, read‑only
-abstraction with simple hooks that can be wired to real retrieval later.
+capstone design. Each topic keeps its fixed governance notes, and grounding
+passages come from a category- and stage-scoped index over:
+  - `data/category_strategies.json` and `data/categories.json`
+  - playbooks / templates / policies in `data/synthetic_docs/`
+  - the ingested RAG corpus (BM25 index kept next to Chroma, see
+    `backend.rag.lexical_index`)
+
+Results are computed once per (category_id, dtp_stage, topic) and served from
+memory. The cache is dropped when a source file or the ingested corpus
+changes (checked at most every KNOWLEDGE_CHECK_INTERVAL_SEC, default 5), and
+`warm_knowledge_cache()` precomputes every key at API startup.
+
+Env:
+- KNOWLEDGE_TOP_K (default 4): passages per context
+- KNOWLEDGE_CHECK_INTERVAL_SEC (default 5)
+- KNOWLEDGE_PREWARM (default 1): precompute contexts in the background at startup
 
 DESIGN INTENT:
 - Centralized, governed access to unstructured / semi‑structured knowledge
@@ -31,102 +44,396 @@ IMPORTANT:
   - Human decision makers (via WAIT_FOR_HUMAN).
 """
 
-from typing import Dict, Any, Optional, List
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, FrozenSet, Optional, List, Tuple
 
+from shared.constants import DTP_STAGES
+from utils.metrics import record_cache
 
-def get_vector_context(
-    category_id: Optional[str],
-    dtp_stage: str,
-    topic: str,
-) -> Dict[str, Any]:
-    """
-    Retrieve read‑only, stage‑scoped context from the Vector Knowledge Layer.
+logger = logging.getLogger(__name__)
 
-    Args:
-        category_id: Category being sourced (e.g., "CAT-01"), or None for generic guidance.
-        dtp_stage: Current DTP stage (e.g., "DTP-01", "DTP-03").
-        topic: High‑level topic, e.g. "category_strategy", "rfq_template",
-               "negotiation_playbook", "dtp_procedure".
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+_SOURCE_FILES = ("category_strategies.json", "categories.json")
 
-    Returns:
-        A small, structured context dictionary that can be passed into
-        agent prompts as **grounding information only**.
+TOPICS = (
+    "dtp_procedure",
+    "category_strategy",
+    "rfq_template",
+    "negotiation_playbook",
+    "contract_clauses",
+    "rollout_playbook",
+    "historical_cases",
+)
 
-    NOTE:
-        - This POC implementation returns illustrative placeholders only.
-        - In a full system, this would call a vector store and perform
-          filtered, policy‑governed retrieval.
-    """
-    context: Dict[str, Any] = {
-        "category_id": category_id,
-        "dtp_stage": dtp_stage,
-        "topic": topic,
-        "notes": [],
-    }
-
-    if topic == "dtp_procedure":
-        context["notes"] = [
+# Fixed governance framing per topic; retrieval adds passages, it never replaces these.
+_GUIDANCE: Dict[str, Dict[str, Any]] = {
+    "dtp_procedure": {
+        "notes": [
             "Follow DTP stage ordering and PolicyLoader constraints.",
             "SupervisorAgent owns routing and approvals; agents only propose.",
-        ]
-        context["content"] = "DTP procedures require stage-by-stage progression with Supervisor approval."
-    elif topic == "category_strategy":
-        context["notes"] = [
+        ],
+        "content": "DTP procedures require stage-by-stage progression with Supervisor approval.",
+    },
+    "category_strategy": {
+        "notes": [
             "Use category strategy as background context only.",
             "Do not override encoded rules or enterprise policies.",
-        ]
-        context["content"] = f"Category {category_id} strategy context (for grounding reasoning only, not binding decisions)."
-    elif topic == "rfq_template":
-        context["notes"] = [
+        ],
+        "content": "Category {category_id} strategy context (for grounding reasoning only, not binding decisions).",
+    },
+    "rfq_template": {
+        "notes": [
             "Templates provide structure for RFx documentation.",
             "All commercial terms still require human/legal approval.",
-        ]
-        context["content"] = {
+        ],
+        "content": {
             "sections": ["Overview", "Requirements", "Evaluation Criteria", "Timeline", "Terms & Conditions"],
             "structure": "Template-driven RFx with sections for category requirements and evaluation criteria.",
-            "instructions": "Fill template sections with case-specific data. Do not invent commercial terms."
-        }
-    elif topic == "negotiation_playbook":
-        context["notes"] = [
+            "instructions": "Fill template sections with case-specific data. Do not invent commercial terms.",
+        },
+    },
+    "negotiation_playbook": {
+        "notes": [
             "Playbooks provide negotiation heuristics and benchmarks.",
             "Do not make award decisions or enforce policy.",
-        ]
-        context["content"] = {
+        ],
+        "content": {
             "leverage_analysis": "Compare bid terms against market benchmarks and contract history.",
             "scenario_planning": "Prepare for common negotiation scenarios based on bid gaps.",
-            "benchmark_guidance": "Reference historical pricing and terms as context only."
-        }
-    elif topic == "contract_clauses":
-        context["notes"] = [
+            "benchmark_guidance": "Reference historical pricing and terms as context only.",
+        },
+    },
+    "contract_clauses": {
+        "notes": [
             "Clause snippets are for reference; they are not legal advice.",
             "Supervisor + humans decide which clauses to adopt.",
-        ]
-        context["content"] = {
+        ],
+        "content": {
             "standard_clauses": ["Service Levels", "Termination", "Payment Terms", "Compliance"],
-            "guidance": "Use clause library as reference. Legal review required before adoption."
-        }
-    elif topic == "rollout_playbook":
-        context["notes"] = [
+            "guidance": "Use clause library as reference. Legal review required before adoption.",
+        },
+    },
+    "rollout_playbook": {
+        "notes": [
             "Rollout playbooks provide structured implementation steps.",
             "Calculations are deterministic; LLM explains impacts only.",
-        ]
-        context["content"] = {
+        ],
+        "content": {
             "steps": ["Contract execution", "Supplier onboarding", "System integration", "Monitoring setup"],
-            "kpis": ["Savings realization", "Service levels", "Compliance metrics"]
-        }
-    elif topic == "historical_cases":
-        context["notes"] = [
+            "kpis": ["Savings realization", "Service levels", "Compliance metrics"],
+        },
+    },
+    "historical_cases": {
+        "notes": [
             "Use past cases as qualitative reference, not as binding precedent.",
             "Never leak one customer's data into another customer's case.",
-        ]
-        context["content"] = f"Historical cases for category {category_id} (anonymized examples for pattern recognition only)."
+        ],
+        "content": "Historical cases for category {category_id} (anonymized examples for pattern recognition only).",
+    },
+}
+
+# Which playbooks in data/synthetic_docs ground which topics (matched on file-name prefix).
+_DOC_TOPICS: Tuple[Tuple[str, FrozenSet[str]], ...] = (
+    ("Procurement_Policy", frozenset({"dtp_procedure"})),
+    ("RFP_Template", frozenset({"rfq_template"})),
+    ("Sample_Contract_Terms", frozenset({"contract_clauses", "negotiation_playbook"})),
+    ("Market_Benchmark", frozenset({"category_strategy", "negotiation_playbook"})),
+)
+
+# Ingested-corpus search per topic: BM25 query terms and eligible document types.
+_CORPUS_QUERIES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "dtp_procedure": ("procurement policy stage gate approval requirements", ("Policy",)),
+    "category_strategy": ("category strategy market trends pricing sourcing", ("Market Report", "Policy")),
+    "rfq_template": ("RFP template scope requirements evaluation criteria", ("Template", "RFx")),
+    "negotiation_playbook": ("pricing benchmark discount terms negotiation", ("Market Report", "Proposal", "Contract")),
+    "contract_clauses": ("liability termination payment terms service levels clause", ("Contract", "Template")),
+    "rollout_playbook": ("implementation rollout onboarding migration plan milestones", ("Implementation Plan",)),
+    "historical_cases": ("previous sourcing outcome lessons learned award", ("Proposal", "Contract", "Performance Report")),
+}
+
+_STAGE_RE = re.compile(r"DTP-0[1-6]")
+_PASSAGE_CHARS = 700
+
+
+@dataclass(frozen=True)
+class Passage:
+    source: str
+    title: str
+    text: str
+    topics: FrozenSet[str]
+    category_id: Optional[str] = None  # None: applies to every category
+    stages: FrozenSet[str] = frozenset()  # empty: applies to every stage
+
+    def applies(self, category_id: Optional[str], dtp_stage: str, topic: str) -> bool:
+        if topic not in self.topics:
+            return False
+        if self.category_id is not None and self.category_id != category_id:
+            return False
+        return not self.stages or dtp_stage in self.stages
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"source": self.source, "title": self.title, "text": self.text[:_PASSAGE_CHARS]}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _load_json(path: Path) -> List[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except (OSError, ValueError) as e:
+        logger.warning("Knowledge source %s unreadable: %s", path, e)
+        return []
+
+
+def _render(value: Any) -> str:
+    if isinstance(value, dict):
+        return "; ".join(f"{k.replace('_', ' ')}: {_render(v)}" for k, v in value.items() if not str(k).startswith("_"))
+    if isinstance(value, list):
+        return ", ".join(_render(v) for v in value)
+    return str(value)
+
+
+def _doc_sections(text: str) -> List[Tuple[str, str]]:
+    """Split a plain-text playbook into (heading, section) pairs on blank-line boundaries."""
+    sections: List[Tuple[str, str]] = []
+    heading, lines = "", []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        first = block.strip().splitlines()[0].strip() if block.strip() else ""
+        is_heading = first and first.upper() == first and len(first) < 80
+        if is_heading and lines:
+            sections.append((heading, "\n".join(lines).strip()))
+            lines = []
+        if is_heading:
+            heading = first
+            rest = block.strip().splitlines()[1:]
+            lines.extend(rest)
+        else:
+            lines.append(block.strip())
+    if lines:
+        sections.append((heading, "\n".join(lines).strip()))
+    return [(h, t) for h, t in sections if t]
+
 
+def build_passages(data_dir: Optional[Path] = None) -> List[Passage]:
+    """Scoped passages from the strategy/category JSON and the playbooks in synthetic_docs."""
+    data_dir = data_dir or DATA_DIR
+    passages: List[Passage] = []
+    categories = _load_json(data_dir / "categories.json")
+    names = {str(c.get("name", "")).lower().replace(" ", "_"): c.get("category_id") for c in categories}
+
+    for entry in _load_json(data_dir / "category_strategies.json"):
+        cat = entry.get("category_id")
+        scope = None if cat == "GLOBAL" else cat
+        title = f"Category strategy {entry.get('category_name') or cat}"
+        rules = entry.get("sourcing_rules") or {}
+        defaults = entry.get("defaults") or {}
+        if rules:
+            passages.append(Passage(
+                f"category_strategies.json#{cat}.sourcing_rules", title, f"Sourcing rules: {_render(rules)}",
+                frozenset({"category_strategy", "dtp_procedure", "rfq_template"}), scope,
+            ))
+        if defaults:
+            passages.append(Passage(
+                f"category_strategies.json#{cat}.defaults", title, f"Commercial defaults: {_render(defaults)}",
+                frozenset({"category_strategy", "negotiation_playbook", "contract_clauses"}), scope,
+            ))
+
+    for cat in categories:
+        cid = cat.get("category_id")
+        body = {k: v for k, v in cat.items() if k not in ("category_id", "name")}
+        passages.append(Passage(
+            f"categories.json#{cid}", f"Category profile {cat.get('name') or cid}", _render(body),
+            frozenset({"category_strategy", "rfq_template", "historical_cases"}), cid,
+        ))
+
+    docs_dir = data_dir / "synthetic_docs"
+    for path in sorted(docs_dir.glob("*.txt")) if docs_dir.is_dir() else []:
+        topics = next((t for prefix, t in _DOC_TOPICS if path.name.startswith(prefix)), None)
+        if topics is None:
+            continue
+        stem = path.stem.lower()
+        scope = next((cid for name, cid in names.items() if name and name in stem), None)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning("Knowledge source %s unreadable: %s", path, e)
+            continue
+        for i, (heading, section) in enumerate(_doc_sections(text)):
+            stages = frozenset(_STAGE_RE.findall(heading)) if "dtp_procedure" in topics else frozenset()
+            passages.append(Passage(
+                f"synthetic_docs/{path.name}#{i}", f"{path.stem.replace('_', ' ')}: {heading}".rstrip(": "),
+                section, topics, scope, stages,
+            ))
+    return passages
+
+
+def _corpus_revision() -> str:
+    try:
+        from backend.rag.lexical_index import get_lexical_index
+
+        return get_lexical_index().revision()
+    except Exception:
+        return "unavailable"
+
+
+def _corpus_passages(category_id: Optional[str], dtp_stage: str, topic: str, limit: int) -> List[Dict[str, Any]]:
+    query, doc_types = _CORPUS_QUERIES.get(topic, ("", ()))
+    if not query:
+        return []
+    try:
+        from backend.rag.lexical_index import get_lexical_index
+
+        hits = get_lexical_index().search(
+            query, n_results=limit, category_id=category_id, document_types=doc_types, dtp_stage=dtp_stage
+        )
+    except Exception as e:
+        logger.debug("Corpus knowledge lookup failed: %s", e)
+        return []
+    return [
+        {
+            "source": f"chunk:{h['chunk_id']}",
+            "title": (h.get("metadata") or {}).get("filename") or (h.get("metadata") or {}).get("document_type") or "Document",
+            "text": (h.get("content") or "")[:_PASSAGE_CHARS],
+        }
+        for h in hits
+    ]
+
+
+class _KnowledgeCache:
+    """Passages + per-key contexts, rebuilt when the source fingerprint changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._passages: List[Passage] = []
+        self._contexts: Dict[Tuple[Optional[str], str, str], Dict[str, Any]] = {}
+
+    @staticmethod
+    def fingerprint() -> Tuple:
+        stamps = []
+        paths = [DATA_DIR / f for f in _SOURCE_FILES]
+        docs_dir = DATA_DIR / "synthetic_docs"
+        if docs_dir.is_dir():
+            paths += sorted(docs_dir.glob("*.txt"))
+        for p in paths:
+            try:
+                st = p.stat()
+                stamps.append((p.name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append((p.name, None, None))
+        return tuple(stamps), _corpus_revision()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._fingerprint is not None and now - self._checked_at < _env_int("KNOWLEDGE_CHECK_INTERVAL_SEC", 5):
+            return
+        fp = self.fingerprint()
+        self._checked_at = now
+        if fp != self._fingerprint:
+            self._passages = build_passages()
+            self._contexts = {}
+            self._fingerprint = fp
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fingerprint = None
+            self._contexts = {}
+
+    def get(self, category_id: Optional[str], dtp_stage: str, topic: str) -> Dict[str, Any]:
+        key = (category_id, dtp_stage, topic)
+        with self._lock:
+            self._refresh()
+            context = self._contexts.get(key)
+            passages = self._passages
+        record_cache("knowledge", context is not None)
+        if context is None:
+            context = _compose(category_id, dtp_stage, topic, passages)
+            with self._lock:
+                self._contexts[key] = context
+        return copy.deepcopy(context)
+
+
+def _compose(category_id: Optional[str], dtp_stage: str, topic: str, passages: List[Passage]) -> Dict[str, Any]:
+    guidance = _GUIDANCE.get(topic, {"notes": [], "content": None})
+    content = guidance["content"]
+    if isinstance(content, str):
+        content = content.format(category_id=category_id)
+    context: Dict[str, Any] = {
+        "category_id": category_id,
+        "dtp_stage": dtp_stage,
+        "topic": topic,
+        "notes": list(guidance["notes"]),
+    }
+    if content is not None:
+        context["content"] = copy.deepcopy(content)
+
+    top_k = _env_int("KNOWLEDGE_TOP_K", 4)
+    scoped = [p for p in passages if p.applies(category_id, dtp_stage, topic)]
+    # Most specific first: category + stage, then category, then stage, then global.
+    scoped.sort(key=lambda p: (p.category_id is None, not p.stages))
+    selected = [p.as_dict() for p in scoped[:top_k]]
+    if len(selected) < top_k:
+        selected += _corpus_passages(category_id, dtp_stage, topic, top_k - len(selected))
+    context["passages"] = selected
+    context["grounded"] = bool(selected)
     return context
 
 
+_cache = _KnowledgeCache()
 
 
+def get_vector_context(
+    category_id: Optional[str],
+    dtp_stage: str,
+    topic: str,
+) -> Dict[str, Any]:
+    """
+    Retrieve read‑only, stage‑scoped context from the Vector Knowledge Layer.
+
+    Args:
+        category_id: Category being sourced (e.g., "CAT-01"), or None for generic guidance.
+        dtp_stage: Current DTP stage (e.g., "DTP-01", "DTP-03").
+        topic: High‑level topic, e.g. "category_strategy", "rfq_template",
+               "negotiation_playbook", "dtp_procedure".
+
+    Returns:
+        A small, structured context dictionary that can be passed into
+        agent prompts as **grounding information only**: the topic's governance
+        `notes` and `content`, plus up to KNOWLEDGE_TOP_K scoped `passages`
+        (`source`, `title`, `text`) and `grounded` (False when nothing matched).
+    """
+    return _cache.get(category_id, dtp_stage, topic)
 
 
+def invalidate_knowledge_cache() -> None:
+    """Drop cached contexts now (e.g. right after an ingestion) instead of on the next check."""
+    _cache.invalidate()
 
 
+def warm_knowledge_cache(category_ids: Optional[List[Optional[str]]] = None) -> int:
+    """Precompute contexts for every (category, stage, topic); returns the number of keys."""
+    if category_ids is None:
+        category_ids = [None] + [c.get("category_id") for c in _load_json(DATA_DIR / "categories.json")]
+    n = 0
+    for cat in category_ids:
+        for stage in DTP_STAGES:
+            for topic in TOPICS:
+                _cache.get(cat, stage, topic)
+                n += 1
+    return n
@@ -0,0 +1,303 @@
+"""
+In-process Prometheus metrics (text exposition format 0.0.4) without extra dependencies.
+
+Counters, gauges and histograms are plain dicts keyed by label values behind one lock each,
+so recording costs a dict update; `render()` produces the `/metrics` payload. All metrics
+the app records are declared at the bottom of this module so the catalog lives in one place.
+
+Env:
+- METRICS_ENABLED (default 1): 0 turns every record call into a no-op and /metrics into 404
+"""
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-ms SQLite statements up to multi-minute batch runs.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+_ENABLED = (os.getenv("METRICS_ENABLED", "1") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def metrics_enabled() -> bool:
+    return _ENABLED
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _label_str(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not metrics_enabled():
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        if not metrics_enabled():
+            return
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not metrics_enabled():
+            return
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self._header()
+        for key, row in items:
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{self._label_str(key, ('le', _fmt(bound)))} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(row[-1])}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(cumulative)}")
+        return lines
+
+
+_registry: Dict[str, _Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def histogram(name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def timed(hist: Histogram, **labels: str) -> Callable:
+    """Decorator: observe the wrapped call's duration in `hist`."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with hist.time(**labels):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_llm_call(deployment: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False) -> None:
+    LLM_CALLS.inc(deployment=deployment, outcome="error" if error else "ok")
+    LLM_CALL_SECONDS.observe(seconds, deployment=deployment)
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, deployment=deployment, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, deployment=deployment, kind="completion")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request latency per (method, route template, status) plus in-flight
+    gauge. Route templates (e.g. /api/cases/{case_id}) keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") != "http" or not _ENABLED:
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def _send(message):
+            if message.get("type") == "http.response.start":
+                status["code"] = message.get("status", 500)
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - t0,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", None) or "unmatched",
+                status=str(status["code"]),
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_metrics_t0")
+    if not starts:
+        return
+    db = os.path.basename(conn.engine.url.database or "") or "memory"
+    DB_QUERY_SECONDS.observe(time.perf_counter() - starts.pop(), db=db)
+
+
+_sql_installed = False
+
+
+def install_sqlalchemy_metrics() -> None:
+    """Time every statement on every SQLAlchemy engine (idempotent)."""
+    global _sql_installed
+    if _sql_installed or not _ENABLED:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _sql_installed = True
+
+
+# ---------------------------------------------------------------------------
+# Metric catalog
+# ---------------------------------------------------------------------------
+
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = gauge("http_requests_in_flight", "HTTP requests currently being served.")
+LLM_CALLS = counter("llm_calls_total", "Chat completion calls by model/deployment.", ("deployment", "outcome"))
+LLM_CALL_SECONDS = histogram("llm_call_duration_seconds", "Chat completion latency.", ("deployment",))
+LLM_TOKENS = counter("llm_tokens_total", "Tokens reported by the provider.", ("deployment", "kind"))
+CACHE_REQUESTS = counter(
+    "cache_requests_total", "Cache lookups (agent, intent, export, extraction, copilot_provenance, embedding, knowledge).", ("cache", "result")
+)
+DB_QUERY_SECONDS = histogram(
+    "db_query_duration_seconds", "SQL statement latency per SQLite database.", ("db",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_WAIT_SECONDS = histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled SQLite connection.", ("db", "mode"),
+    buckets=(0.0001, 0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_COMMIT_SECONDS = histogram(
+    "db_commit_duration_seconds", "Session commit latency (flush, write-lock wait, WAL sync).", ("db",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 15.0),
+)
+DB_LOCK_ERRORS = counter("db_lock_errors_total", "'database is locked' errors after the busy timeout.", ("db",))
+VECTOR_QUERY_SECONDS = histogram("vector_query_duration_seconds", "Chroma similarity search latency.", ("store",))
+RETRIEVAL_STAGE_SECONDS = histogram(
+    "rag_retrieval_stage_seconds", "Hybrid RAG retrieval latency per stage (vector, lexical, fusion, rerank, total).", ("stage",)
+)
+PIPELINE_RUN_SECONDS = histogram(
+    "pipeline_run_duration_seconds", "Batch pipeline run duration.", ("pipeline", "outcome")
+)
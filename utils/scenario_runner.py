@@ -10,7 +10,7 @@ These helpers let you:
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from utils.schemas import (
     Case,
@@ -105,15 +105,30 @@ def run_case_headless(
     user_intent: str,
     use_tier_2: bool = False,
     recursion_limit: int = 30,
+    on_node: Optional[Callable[[str], None]] = None,
 ) -> Tuple[PipelineState, Case]:
     """
     Run a single case through the LangGraph workflow without Streamlit.
 
+    `on_node(node_name)` is called as each graph node finishes (used by
+    `utils.benchmark` to time nodes); without it the graph is simply invoked.
+
     Returns (final_state, updated_case_clone).
     """
     state = build_pipeline_state(case, user_intent=user_intent, use_tier_2=use_tier_2)
     graph = get_workflow_graph()
-    final_state = graph.invoke(state, {"recursion_limit": recursion_limit})
+    config = {"recursion_limit": recursion_limit}
+    if on_node is None:
+        final_state = graph.invoke(state, config)
+    else:
+        final_state = state
+        for mode, chunk in graph.stream(state, config, stream_mode=["updates", "values"]):
+            if mode == "values":
+                final_state = chunk
+            else:
+                for node_name in chunk:
+                    if not node_name.startswith("__"):
+                        on_node(node_name)
 
     # Create an updated Case clone that reflects post‑run state
     updated_case_dict = case.model_dump()
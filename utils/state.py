@@ -36,6 +36,8 @@ class PipelineState(TypedDict):
         ImplementationPlan
     ]]
     latest_agent_name: Optional[str]
+    parallel_outputs: Optional[List[Dict[str, Any]]]  # {"agent", "output"} per branch of a parallel fan-out, until Supervisor review
+    parallel_agents_run: Optional[List[str]]  # Agents that already reported through a parallel fan-out (not re-routed)
     activity_log: List[AgentActionLog]  # Current run
     conversation_history: List[Dict[str, str]]  # Serialized ChatMessages (role, content)
     human_decision: Optional[Dict[str, Any]] # Changed from HumanDecision to Dict to support DTP-01/02 rich structure
@@ -74,3 +76,20 @@ class PipelineState(TypedDict):
     constraint_violations: Optional[List[str]]  # List of constraint violations detected
     constraint_reflection: Optional[str]  # Required acknowledgment text that MUST appear in response
 
+
+def fresh_run_fields() -> Dict[str, Any]:
+    """Per-run bookkeeping, reset at the start of a turn that resumes a checkpointed case."""
+    return {
+        "iteration_count": 0,
+        "visited_agents": [],
+        "parallel_outputs": None,
+        "parallel_agents_run": None,
+        "error_state": None,
+        "detected_contradictions": [],
+        "validation_violations": [],
+        "validation_warnings": [],
+        "guardrail_events": [],
+        "constraint_compliance_status": None,
+        "constraint_violations": [],
+        "constraint_reflection": None,
+    }
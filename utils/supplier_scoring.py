@@ -0,0 +1,243 @@
+"""
+Multi-criteria supplier scoring on a NumPy matrix.
+
+Suppliers are rows and normalized metrics (0-10, higher is better) are columns. Criteria
+weights, the risk/cost inversions and eligibility masks are applied to the whole panel at
+once, so ranking a large category panel is one matrix product. `sensitivity()` re-ranks
+under many weight vectors in one pass for interactive weight what-ifs.
+
+Used by the SUPPLIER_SCORING tasks (`NormalizeMetricsTask`, `ComputeScoresAndRankTask`)
+and `SupplierEvaluationAgent`; output matches the `ranked_suppliers` structure those tasks
+have always produced.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Normalized metric columns, in matrix order.
+METRIC_FIELDS = (
+    "quality_normalized",
+    "delivery_normalized",
+    "responsiveness_normalized",
+    "risk_normalized",
+    "cost_normalized",
+)
+
+# Evaluation criterion name -> normalized metric column.
+CRITERIA_FIELDS = {
+    "Quality": "quality_normalized",
+    "Delivery": "delivery_normalized",
+    "Price": "cost_normalized",
+    "Responsiveness": "responsiveness_normalized",
+    "Risk": "risk_normalized",
+}
+
+DEFAULT_CRITERION_WEIGHT = 0.2
+
+# Evaluation template used when the case defines no criteria of its own.
+DEFAULT_CRITERIA = [
+    {"name": "Quality", "weight": 0.25, "description": "Product/service quality"},
+    {"name": "Delivery", "weight": 0.20, "description": "On-time delivery performance"},
+    {"name": "Price", "weight": 0.25, "description": "Cost competitiveness"},
+    {"name": "Responsiveness", "weight": 0.15, "description": "Communication and support"},
+    {"name": "Risk", "weight": 0.15, "description": "Financial and operational risk"},
+]
+
+# Execution-constraint priority (see constraint_extractor) -> evaluation criterion.
+PRIORITY_CRITERIA = {
+    "price": "Price",
+    "quality": "Quality",
+    "reliability": "Delivery",
+}
+
+
+def priority_weight_scenarios(
+    criteria: Sequence[Dict[str, Any]],
+    priorities: Sequence[str],
+    boost: float = 2.0,
+) -> List[Dict[str, float]]:
+    """
+    Weight what-ifs for the user's priority criteria: the base weights, then one scenario
+    per priority with that criterion's weight multiplied by `boost`. Empty when no
+    priority maps to a criterion.
+    """
+    base = {c["name"]: float(c.get("weight", DEFAULT_CRITERION_WEIGHT)) for c in criteria if c.get("name")}
+    scenarios = []
+    for priority in priorities:
+        name = PRIORITY_CRITERIA.get(str(priority).lower())
+        if name in base:
+            scenarios.append({**base, name: base[name] * boost})
+    return [base, *scenarios] if scenarios else []
+
+
+def clip_scores(values: Sequence[Any], default: float = 5.0) -> np.ndarray:
+    """0-10 scores as floats; missing values take `default`."""
+    arr = np.array([default if v is None else v for v in values], dtype=float)
+    return np.clip(arr, 0.0, 10.0)
+
+
+def _column(rows: Sequence[Mapping[str, Any]], key: str, default: float) -> List[Any]:
+    return [r.get(key, default) for r in rows]
+
+
+class SupplierScoringEngine:
+    """Supplier x metric matrix with vectorized weighting, masking and ranking."""
+
+    def __init__(
+        self,
+        supplier_ids: Sequence[str],
+        matrix: np.ndarray,
+        supplier_names: Optional[Sequence[str]] = None,
+        rows: Optional[Sequence[Dict[str, Any]]] = None,
+        eligible: Optional[Sequence[bool]] = None,
+    ):
+        self.supplier_ids = list(supplier_ids)
+        self.matrix = np.asarray(matrix, dtype=float).reshape(len(self.supplier_ids), len(METRIC_FIELDS))
+        self.supplier_names = list(supplier_names) if supplier_names is not None else list(self.supplier_ids)
+        self.rows = list(rows) if rows is not None else [{} for _ in self.supplier_ids]
+        n = len(self.supplier_ids)
+        self.eligible = np.ones(n, dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool)
+
+    @classmethod
+    def from_performance(
+        cls,
+        performance: Sequence[Dict[str, Any]],
+        risk_indicators: Sequence[Dict[str, Any]] = (),
+    ) -> "SupplierScoringEngine":
+        """
+        Normalize raw performance records (0-10 scores) and risk indicators in one pass.
+        Risk score and absolute cost variance are inverted so higher is always better.
+        """
+        risk = {r["supplier_id"]: r for r in risk_indicators}
+        ids = [p["supplier_id"] for p in performance]
+        risk_rows = [risk.get(s, {}) for s in ids]
+        risk_scores = np.array([r.get("risk_score", 0) or 0 for r in risk_rows], dtype=float)
+        cost_variance = np.abs(np.array([p.get("cost_variance", 0) or 0 for p in performance], dtype=float))
+        matrix = np.column_stack([
+            clip_scores(_column(performance, "quality_score", 5)),
+            clip_scores(_column(performance, "delivery_score", 5)),
+            clip_scores(_column(performance, "responsiveness_score", 5)),
+            10 - np.minimum(10, risk_scores),
+            10 - np.minimum(10, cost_variance / 5),  # Lower variance = better
+        ]) if ids else np.empty((0, len(METRIC_FIELDS)))
+        rows = [{"raw_data": p, "risk_data": r} for p, r in zip(performance, risk_rows)]
+        names = [p.get("supplier_name", p["supplier_id"]) for p in performance]
+        return cls(ids, matrix, names, rows)
+
+    @classmethod
+    def from_normalized(
+        cls,
+        normalized_metrics: Sequence[Dict[str, Any]],
+        excluded: Sequence[str] = (),
+    ) -> "SupplierScoringEngine":
+        """
+        Rebuild the matrix from `normalized_metrics` dicts (as passed between tasks).
+        Suppliers in `excluded` are masked out of ranking and sensitivity.
+        """
+        ids = [s["supplier_id"] for s in normalized_metrics]
+        matrix = np.array(
+            [[s.get(f, np.nan) for f in METRIC_FIELDS] for s in normalized_metrics], dtype=float
+        ).reshape(len(ids), len(METRIC_FIELDS))
+        rows = [{"raw_data": s.get("raw_data", {}), "risk_data": s.get("risk_data", {})} for s in normalized_metrics]
+        names = [s.get("supplier_name", s["supplier_id"]) for s in normalized_metrics]
+        excluded = set(excluded)
+        return cls(ids, matrix, names, rows, eligible=[s not in excluded for s in ids])
+
+    def normalized_metrics(self) -> List[Dict[str, Any]]:
+        """Per-supplier dicts in the `normalized_metrics` task format."""
+        out = []
+        for i, supplier_id in enumerate(self.supplier_ids):
+            entry: Dict[str, Any] = {"supplier_id": supplier_id, "supplier_name": self.supplier_names[i]}
+            entry.update({f: float(v) for f, v in zip(METRIC_FIELDS, self.matrix[i])})
+            entry.update(self.rows[i])
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def resolve_criteria(criteria: Sequence[Dict[str, Any]]) -> List[tuple]:
+        """(criterion name, metric column index, weight) for every criterion that maps to a metric."""
+        resolved = []
+        for criterion in criteria:
+            field = CRITERIA_FIELDS.get(criterion.get("name"))
+            if field:
+                weight = criterion.get("weight", DEFAULT_CRITERION_WEIGHT)
+                resolved.append((criterion["name"], METRIC_FIELDS.index(field), float(weight)))
+        return resolved
+
+    def weight_vector(self, criteria: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Criteria weights as one per-metric vector (repeated criteria add up)."""
+        w = np.zeros(len(METRIC_FIELDS))
+        for _, col, weight in self.resolve_criteria(criteria):
+            w[col] += weight
+        return w
+
+    def scores(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Weighted totals for one weight vector (shape m) or many (shape k x m -> k x n).
+        Metrics missing for a supplier contribute nothing.
+        """
+        return np.asarray(weights, dtype=float) @ np.nan_to_num(self.matrix, nan=0.0).T
+
+    def rank(self, criteria: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Eligible suppliers scored and ranked, in the `ranked_suppliers` task format."""
+        resolved = self.resolve_criteria(criteria)
+        totals = np.round(self.scores(self.weight_vector(criteria)), 2)
+        idx = np.flatnonzero(self.eligible)
+        order = idx[np.argsort(-totals[idx], kind="stable")]
+
+        ranked = []
+        for rank, i in enumerate(order, start=1):
+            breakdown = {}
+            for name, col, weight in resolved:
+                value = self.matrix[i, col]
+                if np.isnan(value):
+                    continue
+                breakdown[name] = {"raw": float(value), "weight": weight, "weighted": float(value * weight)}
+            ranked.append({
+                "supplier_id": self.supplier_ids[i],
+                "supplier_name": self.supplier_names[i],
+                "total_score": float(totals[i]),
+                "score_breakdown": breakdown,
+                "raw_data": self.rows[i].get("raw_data", {}),
+                "risk_data": self.rows[i].get("risk_data", {}),
+                "rank": rank,
+            })
+        return ranked
+
+    def sensitivity(self, weight_sets: Sequence[Dict[str, float]]) -> Dict[str, Any]:
+        """
+        Re-rank eligible suppliers under many weight scenarios at once.
+
+        Args:
+            weight_sets: One {criterion name: weight} mapping per scenario.
+
+        Returns:
+            `ranks`: {supplier_id: [rank per scenario]}, plus per-supplier best/worst rank
+            and the share of scenarios in which the supplier ranks first.
+        """
+        idx = np.flatnonzero(self.eligible)
+        if not len(weight_sets) or not len(idx):
+            return {"scenarios": len(weight_sets), "ranks": {}, "suppliers": []}
+        weights = np.vstack([
+            self.weight_vector([{"name": n, "weight": w} for n, w in ws.items()]) for ws in weight_sets
+        ])
+        totals = np.round(self.scores(weights)[:, idx], 2)  # k x n
+        order = np.argsort(-totals, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, len(idx) + 1)[None, :], axis=1)
+
+        suppliers = []
+        for j, i in enumerate(idx):
+            suppliers.append({
+                "supplier_id": self.supplier_ids[i],
+                "supplier_name": self.supplier_names[i],
+                "best_rank": int(ranks[:, j].min()),
+                "worst_rank": int(ranks[:, j].max()),
+                "top_share": round(float((ranks[:, j] == 1).mean()), 4),
+            })
+        suppliers.sort(key=lambda s: (-s["top_share"], s["best_rank"]))
+        return {
+            "scenarios": len(weight_sets),
+            "ranks": {self.supplier_ids[i]: ranks[:, j].tolist() for j, i in enumerate(idx)},
+            "suppliers": suppliers,
+        }
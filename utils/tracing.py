@@ -0,0 +1,299 @@
+"""
+Lightweight request tracing for the LangGraph workflows and agent tasks.
+
+A trace is opened per request (`trace_request`, e.g. one chat turn); graph nodes wrapped
+with `traced_node`, `BaseTask` steps, LLM calls and retrievals record nested spans with
+duration, tokens, cache hits and retrieval counts. Spans are only recorded while a trace
+is active, so wrapped code costs one ContextVar lookup otherwise.
+
+- `waterfall()` flattens the active trace for `ExecutionMetadata.waterfall`.
+- `export_trace()` writes a finished trace as plain JSON or OTLP/JSON (OpenTelemetry
+  collector file format).
+
+Env:
+- TRACE_EXPORT_DIR (default empty): write every finished request trace to this directory
+- TRACE_EXPORT_FORMAT (default "json"): "json" or "otlp"
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SPAN_ATTRIBUTES = ("tokens", "cache_hit", "retrieval_count", "status", "error")
+
+
+@dataclass
+class Span:
+    """One timed unit of work; attributes hold tokens / cache_hit / retrieval_count etc."""
+    name: str
+    kind: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    start_ns: int
+    spans: List[Span] = field(default_factory=list)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        ends = [s.end_ns for s in self.spans if s.end_ns is not None]
+        end = max(ends) if ends else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextlib.contextmanager
+def trace_request(name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Trace]:
+    """
+    Open a trace for one request. Nested calls reuse the outer trace (and just add a span),
+    so a chat turn that runs the workflow graph stays a single waterfall.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        with span(name, kind="request", **attributes):
+            yield outer
+        return
+    trace = Trace(trace_id=trace_id or uuid.uuid4().hex, name=name, start_ns=time.time_ns(), attributes=attributes)
+    token = _current_trace.set(trace)
+    try:
+        with span(name, kind="request", **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        _auto_export(trace)
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a child span of the current one; yields None when no trace is active."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    s = Span(
+        name=name,
+        kind=kind,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+    )
+    s.set(**attributes)
+    trace.spans.append(s)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except Exception as e:
+        s.set(status="error", error=f"{type(e).__name__}: {e}"[:300])
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+def traced(
+    name: str,
+    kind: str = "internal",
+    attributes_from_result: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> Callable:
+    """Decorator form of `span`; `attributes_from_result(result)` adds attributes on return."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_trace.get() is None:
+                return fn(*args, **kwargs)
+            with span(name, kind=kind) as s:
+                result = fn(*args, **kwargs)
+                if attributes_from_result is not None:
+                    try:
+                        s.set(**attributes_from_result(result))
+                    except Exception:
+                        pass
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def _tokens_used(state: Any) -> Optional[int]:
+    budget = state.get("budget_state") if isinstance(state, dict) else None
+    value = getattr(budget, "tokens_used", None)
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def traced_node(graph_name: str, node_name: str, fn: Callable) -> Callable:
+    """
+    Wrap a LangGraph node in a "node" span. Token usage is the node's change to
+    `budget_state.tokens_used` when the state carries one; agents mark `cache_hit` themselves.
+    """
+
+    @functools.wraps(fn)
+    def node(state: Any, *args: Any, **kwargs: Any) -> Any:
+        if _current_trace.get() is None:
+            return fn(state, *args, **kwargs)
+        before = _tokens_used(state)
+        with span(f"{graph_name}.{node_name}", kind="node") as s:
+            result = fn(state, *args, **kwargs)
+            after = _tokens_used(result)
+            if before is not None and after is not None and after > before:
+                s.set(tokens=after - before)
+            return result
+
+    return node
+
+
+def waterfall(trace: Optional[Trace] = None) -> List[Dict[str, Any]]:
+    """Spans of the trace in start order with depth and offset from the trace start."""
+    trace = trace or _current_trace.get()
+    if trace is None:
+        return []
+    depth: Dict[str, int] = {}
+    rows: List[Dict[str, Any]] = []
+    for s in sorted(trace.spans, key=lambda x: x.start_ns):
+        d = depth.get(s.parent_id, -1) + 1 if s.parent_id else 0
+        depth[s.span_id] = d
+        row = {
+            "name": s.name,
+            "kind": s.kind,
+            "depth": d,
+            "start_offset_ms": round((s.start_ns - trace.start_ns) / 1_000_000, 3),
+            "duration_ms": round(s.duration_ms, 3),
+        }
+        row.update({k: s.attributes[k] for k in SPAN_ATTRIBUTES if k in s.attributes})
+        rows.append(row)
+    return rows
+
+
+def metadata_fields(trace: Optional[Trace] = None) -> Dict[str, Any]:
+    """`trace_id` / `trace_duration_ms` / `waterfall` keyword arguments for ExecutionMetadata."""
+    trace = trace or _current_trace.get()
+    if trace is None:
+        return {}
+    return {
+        "trace_id": trace.trace_id,
+        "trace_duration_ms": round(trace.duration_ms, 3),
+        "waterfall": waterfall(trace),
+    }
+
+
+def trace_to_dict(trace: Trace) -> Dict[str, Any]:
+    return {
+        "trace_id": trace.trace_id,
+        "name": trace.name,
+        "start_unix_ns": trace.start_ns,
+        "duration_ms": round(trace.duration_ms, 3),
+        "attributes": trace.attributes,
+        "spans": [
+            {
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "kind": s.kind,
+                "start_unix_ns": s.start_ns,
+                "end_unix_ns": s.end_ns,
+                "duration_ms": round(s.duration_ms, 3),
+                "attributes": s.attributes,
+            }
+            for s in trace.spans
+        ],
+    }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def trace_to_otlp(trace: Trace, service_name: str = "agentic-sourcing") -> Dict[str, Any]:
+    """OTLP/JSON `ExportTraceServiceRequest` (what the collector's file exporter reads)."""
+    trace_id = trace.trace_id.replace("-", "")[:32].rjust(32, "0")
+    spans = []
+    for s in trace.spans:
+        attrs = {"span.kind.internal": s.kind, **s.attributes}
+        spans.append(
+            {
+                "traceId": trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attrs.items()],
+                "status": {"code": 2 if s.attributes.get("status") == "error" else 1},
+            }
+        )
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+def export_trace(trace: Trace, path: Path, fmt: str = "json") -> Path:
+    """Write the trace to `path` as plain JSON or OTLP/JSON."""
+    payload = trace_to_otlp(trace) if fmt == "otlp" else trace_to_dict(trace)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+    return path
+
+
+def _auto_export(trace: Trace) -> None:
+    out_dir = (os.getenv("TRACE_EXPORT_DIR") or "").strip()
+    if not out_dir:
+        return
+    fmt = (os.getenv("TRACE_EXPORT_FORMAT") or "json").strip().lower()
+    suffix = ".otlp.json" if fmt == "otlp" else ".json"
+    try:
+        export_trace(trace, Path(out_dir) / f"{trace.trace_id}{suffix}", fmt=fmt)
+    except OSError as e:
+        logger.warning("Trace export failed for %s: %s", trace.trace_id, e)